@@ -20,10 +20,12 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from collections import defaultdict
-from dataclasses import dataclass, asdict
 import json
 import queue
 
+from sensor_records import SignGloveSensorReading
+from serial_stream import LineFramer
+
 # ------------------- 디버그/초기화 옵션 -------------------
 RAW_ECHO = False      # True면 아두이노에서 받은 원문 CSV 라인을 그대로 출력
 PRINT_DELTAS = True   # True면 각도(P/R/Y)의 직전 샘플 대비 Δ(변화량)도 출력
@@ -39,33 +41,6 @@ else:
     import tty
 
 
-@dataclass
-class SignGloveSensorReading:
-    """SignGlove 센서 읽기 데이터 구조"""
-    timestamp_ms: int           # 아두이노 millis() 타임스탬프
-    recv_timestamp_ms: int      # PC 수신 타임스탬프
-
-    # IMU 데이터 (오일러 각)
-    pitch: float
-    roll: float
-    yaw: float
-
-    # 플렉스 센서 데이터
-    flex1: int
-    flex2: int
-    flex3: int
-    flex4: int
-    flex5: int
-
-    # 계산된 Hz
-    sampling_hz: float
-
-    # 가속도 데이터
-    accel_x: float = 0.0
-    accel_y: float = 0.0
-    accel_z: float = 0.0
-
-
 class SignGloveUnifiedCollector:
     """SignGlove 통합 수어 데이터 수집기"""
 
@@ -114,6 +89,7 @@ class SignGloveUnifiedCollector:
         self.serial_thread: Optional[threading.Thread] = None
         self.data_queue: "queue.Queue[SignGloveSensorReading]" = queue.Queue(maxsize=1000)
         self.stop_event = threading.Event()
+        self.line_framer = LineFramer()  # read(n) 청크 → 라인 배치 분리
 
         # 통계
         self.collection_stats = defaultdict(lambda: defaultdict(int))
@@ -214,6 +190,7 @@ class SignGloveUnifiedCollector:
             self.stop_event.set()
             self.serial_thread.join(timeout=2)
         self.stop_event.clear()
+        self.line_framer.reset()
         self.serial_thread = threading.Thread(target=self._data_reception_worker, daemon=True)
         self.serial_thread.start()
         print("📡 데이터 수신 스레드 시작됨")
@@ -227,8 +204,7 @@ class SignGloveUnifiedCollector:
                 if not self.serial_port or not self.serial_port.is_open:
                     break
 
-                if self.serial_port.in_waiting > 0:
-                    raw = self.serial_port.readline()
+                for raw in self.line_framer.read_from(self.serial_port):
                     try:
                         line = raw.decode('utf-8', errors='ignore').strip()
                     except Exception:
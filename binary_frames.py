@@ -0,0 +1,248 @@
+"""
+Fixed-size binary sensor frames (``format,bin`` firmware mode).
+
+A CSV row of imu_flex_serial.ino is 60-70 bytes and every value has to be
+parsed from text. In binary mode the firmware sends one 32-byte
+little-endian frame per sample instead::
+
+    offset  size  field
+    0       2     sync            0xA5 0x5A
+    2       2     seq             uint16, +1 per frame (wraps)
+    4       4     timestamp_ms    uint32 millis()
+    8       6     pitch/roll/yaw  int16, 0.01 deg
+    14      6     accel_x/y/z     int16, 0.001 g
+    20      10    flex1..5        uint16 ADC
+    30      2     crc             CRC-16/CCITT-FALSE over bytes 2..29
+
+The fixed-point scales are the CSV's own print precision (2 and 3 decimals),
+so a frame decodes to exactly the values the CSV row would have parsed to.
+At 115200 baud that is ~360 samples/s of link capacity instead of ~170.
+
+:class:`FrameDecoder` takes arbitrary chunks from the port, views every run
+of back-to-back frames with one ``np.frombuffer`` and validates the sync
+words and CRCs of the whole run in vectorized passes; on a bad frame it
+falls back to searching the next sync word, so text lines the firmware
+prints in between (``# ...`` acknowledgements) and corrupted frames are
+skipped. :func:`frames_to_records` converts frames to ``READING_DTYPE``
+like ``parse_csv_lines`` does for CSV lines, and :func:`encode_frames` is
+the reverse used by the synthetic frame generator.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+import numpy as np
+
+from sensor_records import READING_DTYPE, timestamp_hz
+
+FRAME_SYNC = b'\xa5\x5a'
+ANGLE_SCALE = 100.0     # 0.01 deg
+ACCEL_SCALE = 1000.0    # 0.001 g
+SEQ_MODULO = 1 << 16
+
+FRAME_DTYPE = np.dtype([
+    ('sync', '<u2'),
+    ('seq', '<u2'),
+    ('timestamp_ms', '<u4'),
+    ('pitch', '<i2'),
+    ('roll', '<i2'),
+    ('yaw', '<i2'),
+    ('accel_x', '<i2'),
+    ('accel_y', '<i2'),
+    ('accel_z', '<i2'),
+    ('flex', '<u2', (5,)),
+    ('crc', '<u2'),
+])
+FRAME_SIZE = FRAME_DTYPE.itemsize
+_SYNC_WORD = int.from_bytes(FRAME_SYNC, 'little')
+_CRC_SPAN = slice(2, FRAME_SIZE - 2)
+
+
+def _crc_table() -> np.ndarray:
+    table = np.zeros(256, dtype=np.uint32)
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table[byte] = crc & 0xFFFF
+    return table
+
+
+_CRC_TABLE = _crc_table()
+
+
+def _position_tables() -> np.ndarray:
+    # CRC는 메시지에 대해 아핀: crc(m) = crc(0...0) ^ XOR_i T_i[m_i] (T_i = i번째 바이트만 있는 메시지의 init 0 CRC)
+    n = _CRC_SPAN.stop - _CRC_SPAN.start
+    tables = np.zeros((n, 256), dtype=np.uint32)
+    crc = _CRC_TABLE.copy()  # 마지막 바이트
+    tables[n - 1] = crc
+    for i in range(n - 2, -1, -1):
+        crc = ((crc << 8) & 0xFFFF) ^ _CRC_TABLE[crc >> 8]  # 뒤에 0 바이트 하나 더
+        tables[i] = crc
+    return tables
+
+
+def crc16(data: bytes) -> int:
+    """CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF), as computed by the firmware."""
+    crc = 0xFFFF
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ int(_CRC_TABLE[((crc >> 8) ^ byte) & 0xFF])
+    return crc
+
+
+_POSITION_TABLES = _position_tables()
+_POSITIONS = np.arange(len(_POSITION_TABLES))
+_ZERO_CRC = crc16(bytes(len(_POSITION_TABLES)))
+
+
+def frame_crcs(frames: np.ndarray) -> np.ndarray:
+    """CRC of every frame in a ``FRAME_DTYPE`` array: one gather from per-position tables and an XOR reduce."""
+    payload = frames.view(np.uint8).reshape(len(frames), FRAME_SIZE)[:, _CRC_SPAN]
+    return np.bitwise_xor.reduce(_POSITION_TABLES[_POSITIONS, payload], axis=1) ^ _ZERO_CRC
+
+
+def encode_frames(records: np.ndarray, seq_start: int = 0) -> bytes:
+    """Pack ``READING_DTYPE`` records into consecutive frames (values rounded to the frame scales)."""
+    frames = np.zeros(len(records), dtype=FRAME_DTYPE)
+    frames['sync'] = _SYNC_WORD
+    frames['seq'] = (seq_start + np.arange(len(records))) % SEQ_MODULO
+    frames['timestamp_ms'] = records['timestamp_ms']
+    for name in ('pitch', 'roll', 'yaw'):
+        frames[name] = np.round(records[name] * ANGLE_SCALE)
+    for name in ('accel_x', 'accel_y', 'accel_z'):
+        frames[name] = np.round(records[name] * ACCEL_SCALE)
+    for i in range(5):
+        frames['flex'][:, i] = records[f'flex{i + 1}']
+    frames['crc'] = frame_crcs(frames)
+    return frames.tobytes()
+
+
+def frames_to_records(frames: np.ndarray, recv_timestamp_ms: Optional[int] = None,
+                      last_arduino_ms: Optional[int] = None) -> np.ndarray:
+    """Convert decoded frames to a ``READING_DTYPE`` array (``sampling_hz`` as in ``parse_csv_lines``)."""
+    records = np.zeros(len(frames), dtype=READING_DTYPE)
+    if not len(frames):
+        return records
+    records['timestamp_ms'] = frames['timestamp_ms']
+    records['recv_timestamp_ms'] = int(time.time() * 1000) if recv_timestamp_ms is None else recv_timestamp_ms
+    for name in ('pitch', 'roll', 'yaw'):
+        records[name] = frames[name] / ANGLE_SCALE
+    for name in ('accel_x', 'accel_y', 'accel_z'):
+        records[name] = frames[name] / ACCEL_SCALE
+    for i in range(5):
+        records[f'flex{i + 1}'] = frames['flex'][:, i]
+    records['sampling_hz'] = timestamp_hz(records['timestamp_ms'], last_arduino_ms)
+    return records
+
+
+class FrameDecoder:
+    """Split a byte stream into validated ``FRAME_DTYPE`` frames across arbitrary chunk boundaries.
+
+    Counters: ``frames`` accepted, ``crc_errors`` (sync word found but CRC
+    mismatch), ``discarded_bytes`` (text and corrupted bytes skipped) and
+    ``lost_frames`` (gaps in ``seq`` between accepted frames).
+    """
+
+    def __init__(self, max_read: int = 1 << 16):
+        self.max_read = max_read
+        self._buffer = bytearray()
+        self._last_seq: Optional[int] = None
+
+        # counters
+        self.reads = 0
+        self.bytes_read = 0
+        self.frames = 0
+        self.crc_errors = 0
+        self.discarded_bytes = 0
+        self.lost_frames = 0
+
+    @property
+    def pending(self) -> int:
+        """Bytes of an incomplete frame currently held back."""
+        return len(self._buffer)
+
+    def feed(self, data: bytes) -> np.ndarray:
+        """Append a chunk read from the stream and return all frames completed by it."""
+        if data:
+            self.reads += 1
+            self.bytes_read += len(data)
+            self._buffer += data
+        buf = self._buffer
+        runs = []
+        pos = 0
+        while True:
+            start = buf.find(FRAME_SYNC, pos)
+            if start < 0:
+                # 마지막 바이트가 sync 앞부분일 수 있으므로 남김
+                keep = 1 if buf[-1:] == FRAME_SYNC[:1] else 0
+                self.discarded_bytes += len(buf) - pos - keep
+                pos = len(buf) - keep
+                break
+            self.discarded_bytes += start - pos
+            pos = start
+            n = (len(buf) - start) // FRAME_SIZE
+            if n == 0:
+                break
+            view = np.frombuffer(buf, dtype=FRAME_DTYPE, count=n, offset=start)
+            ok = (view['sync'] == _SYNC_WORD) & (frame_crcs(view) == view['crc'])
+            good = n if ok.all() else int(np.argmin(ok))
+            if good:
+                runs.append(view[:good].copy())
+            del view  # bytearray는 view가 남아 있으면 크기를 바꿀 수 없음
+            if good:
+                pos = start + good * FRAME_SIZE
+            else:
+                self.crc_errors += 1
+                self.discarded_bytes += 1
+                pos = start + 1
+        del buf[:pos]
+
+        if not runs:
+            return np.zeros(0, dtype=FRAME_DTYPE)
+        frames = runs[0] if len(runs) == 1 else np.concatenate(runs)
+        self._count_gaps(frames['seq'])
+        self.frames += len(frames)
+        return frames
+
+    def _count_gaps(self, seq: np.ndarray):
+        seq = seq.astype(np.int64)
+        if self._last_seq is not None:
+            seq = np.concatenate(([self._last_seq], seq))
+        gaps = (np.diff(seq) - 1) % SEQ_MODULO
+        # 재전송이 없는 시리얼 링크: 같은/이전 seq(gap이 매우 큼)는 펌웨어 재시작으로 보고 손실로 세지 않음
+        self.lost_frames += int(gaps[gaps < SEQ_MODULO // 2].sum())
+        self._last_seq = int(seq[-1])
+
+    def read_from(self, port) -> np.ndarray:
+        """Read everything already waiting on ``port`` with one ``read(n)`` and return complete frames."""
+        waiting = port.in_waiting
+        if waiting <= 0:
+            return np.zeros(0, dtype=FRAME_DTYPE)
+        return self.feed(port.read(min(waiting, self.max_read)))
+
+    def resync(self):
+        """Drop the held partial frame (call right after ``serial_port.reset_input_buffer()``)."""
+        self.discarded_bytes += len(self._buffer)
+        self._buffer.clear()
+        self._last_seq = None
+
+    def reset(self):
+        """Forget buffered bytes and counters (e.g. on reconnect)."""
+        self._buffer.clear()
+        self._last_seq = None
+        self.reads = self.bytes_read = self.frames = 0
+        self.crc_errors = self.discarded_bytes = self.lost_frames = 0
+
+    def stats(self) -> dict:
+        return {
+            'reads': self.reads,
+            'bytes_read': self.bytes_read,
+            'frames': self.frames,
+            'pending_bytes': self.pending,
+            'crc_errors': self.crc_errors,
+            'discarded_bytes': self.discarded_bytes,
+            'lost_frames': self.lost_frames,
+        }
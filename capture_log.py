@@ -0,0 +1,140 @@
+"""
+Buffered logging of raw sensor captures.
+
+The raw capture scripts wrote every received line with ``writerow`` +
+``file.flush()`` and printed it twice, i.e. one write syscall plus terminal
+I/O per sample. ``BufferedLineWriter`` keeps rows in a bounded in-memory
+buffer and writes them with one ``write`` once ``flush_bytes`` are pending
+or ``flush_interval_s`` passed since the last write (checked on every write
+and by :meth:`BufferedLineWriter.poll` while the stream is idle), and
+fsyncs on :meth:`BufferedLineWriter.close`. At most ``flush_interval_s`` of
+data is lost on a crash.
+
+``RateLimitedPrinter`` replaces per-line debug prints: at most one line per
+``interval_s``, with the number of suppressed messages.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+
+class BufferedLineWriter:
+    """Append lines to a file in batches, flushed on size or age."""
+
+    def __init__(self, path: Path, header: Optional[str] = None, flush_bytes: int = 4096,
+                 flush_interval_s: float = 0.25, newline: bytes = b'\n', encoding: str = 'utf-8'):
+        """
+        Args:
+            path: file to create (truncated).
+            header: first line (without line ending), if any.
+            flush_bytes: write once this many bytes are buffered.
+            flush_interval_s: write buffered lines at least this often.
+            newline: line terminator appended to every line.
+            encoding: encoding of ``header`` (lines are written as the bytes given).
+        """
+        self.path = Path(path)
+        self.flush_bytes = flush_bytes
+        self.flush_interval_s = flush_interval_s
+        self.newline = newline
+        self._file = open(self.path, 'wb', buffering=0)
+        self._pending = bytearray()
+        self._last_flush = time.monotonic()
+        self.lines = 0
+        self.bytes_written = 0
+        self.flushes = 0
+        if header is not None:
+            self._pending += header.encode(encoding) + newline
+
+    @property
+    def pending(self) -> int:
+        """Bytes buffered and not yet written."""
+        return len(self._pending)
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def write_line(self, line: bytes):
+        self._pending += line
+        self._pending += self.newline
+        self.lines += 1
+        self._maybe_flush()
+
+    def write_lines(self, lines: Iterable[bytes]):
+        lines = list(lines)
+        if not lines:
+            return
+        self._pending += self.newline.join(lines)
+        self._pending += self.newline
+        self.lines += len(lines)
+        self._maybe_flush()
+
+    def poll(self, now: Optional[float] = None):
+        """Flush if the oldest buffered line is older than ``flush_interval_s`` (call while idle)."""
+        if self._pending and (now if now is not None else time.monotonic()) - self._last_flush >= self.flush_interval_s:
+            self.flush()
+
+    def _maybe_flush(self):
+        if len(self._pending) >= self.flush_bytes:
+            self.flush()
+        else:
+            self.poll()
+
+    def flush(self):
+        if self._pending:
+            self._file.write(self._pending)
+            self.bytes_written += len(self._pending)
+            self._pending.clear()
+            self.flushes += 1
+        self._last_flush = time.monotonic()
+
+    def close(self, fsync: bool = True):
+        """Write what is buffered and (by default) fsync before closing."""
+        if self._file.closed:
+            return
+        self.flush()
+        if fsync:
+            os.fsync(self._file.fileno())
+        self._file.close()
+
+    def __enter__(self) -> "BufferedLineWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def stats(self) -> dict:
+        return {
+            'lines': self.lines,
+            'bytes': self.bytes_written + len(self._pending),
+            'flushes': self.flushes,
+            'lines_per_flush': self.lines / self.flushes if self.flushes else 0.0,
+        }
+
+
+class RateLimitedPrinter:
+    """Print at most one message per ``interval_s`` (none when disabled), counting the rest."""
+
+    def __init__(self, interval_s: float = 1.0, enabled: bool = True, print_fn: Callable[[str], None] = print):
+        self.interval_s = interval_s
+        self.enabled = enabled
+        self.print_fn = print_fn
+        self._last = float('-inf')
+        self.suppressed = 0
+
+    def __call__(self, msg: str):
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        if now - self._last < self.interval_s:
+            self.suppressed += 1
+            return
+        if self.suppressed:
+            msg = f"{msg}  (+{self.suppressed} suppressed)"
+            self.suppressed = 0
+        self._last = now
+        self.print_fn(msg)
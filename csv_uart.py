@@ -1,16 +1,28 @@
+import locale
 import serial
-import csv
 from datetime import datetime
 import time
-SERIAL_PORT = 'COM6' 
+
+from capture_log import BufferedLineWriter, RateLimitedPrinter
+from serial_stream import LineFramer
+
+SERIAL_PORT = 'COM6'
 BAUD_RATE = 115200
 
+# ---------- 로깅 설정 ----------
+FLUSH_BYTES = 4096          # 이만큼 쌓이면 한 번에 기록
+FLUSH_INTERVAL_S = 0.25     # 또는 마지막 기록 후 이 시간이 지나면 기록 (크래시 시 최대 손실 구간)
+DEBUG_PRINT = False         # 수신 줄 출력 (켜도 DEBUG_PRINT_INTERVAL_S마다 한 줄만)
+DEBUG_PRINT_INTERVAL_S = 1.0
+STATUS_INTERVAL_S = 5.0     # 저장 현황 출력 주기
+
 # ---------- CSV 파일 설정 ----------
 csv_filename = f"imu_flex_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+CSV_HEADER = 'timestamp(ms),pitch(°),roll(°),yaw(°),accel_x(g),accel_y(g),accel_z(g),flex1,flex2,flex3,flex4,flex5'
 
 # ---------- 로그 출력 함수 ----------
-def debug_print(msg):
-    print(f"[DEBUG] {msg}")
+debug_print = RateLimitedPrinter(DEBUG_PRINT_INTERVAL_S, enabled=DEBUG_PRINT, print_fn=lambda msg: print(f"[DEBUG] {msg}"))
+invalid_print = RateLimitedPrinter(DEBUG_PRINT_INTERVAL_S)
 
 # ---------- 주기 입력 받기 ----------
 try:
@@ -22,12 +34,12 @@ except ValueError:
 
 # ---------- 시리얼 통신 초기화 ----------
 try:
-    ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
+    ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=FLUSH_INTERVAL_S)
     print(f"[+] Connected to {SERIAL_PORT} at {BAUD_RATE} baud")
-    
+
     # 아두이노가 준비될 때까지 잠시 대기
-    time.sleep(2) 
-    
+    time.sleep(2)
+
     # 아두이노로 주기 설정 명령어 전송
     command = f"interval,{interval_ms}\n"
     ser.write(command.encode('utf-8'))
@@ -38,29 +50,45 @@ except Exception as e:
     exit(1)
 
 # ---------- CSV 파일 열기 ----------
-with open(csv_filename, mode='w', newline='') as file:
-    writer = csv.writer(file)
-    writer.writerow(['timestamp(ms)', 'pitch(°)', 'roll(°)', 'yaw(°)', 'accel_x(g)', 'accel_y(g)', 'accel_z(g)', 'flex1', 'flex2', 'flex3', 'flex4', 'flex5'])
+# csv.writer와 같은 \r\n 줄바꿈, 행은 받은 바이트 그대로 저장
+# 헤더(°)는 예전 텍스트 모드 open()처럼 로케일 인코딩으로 기록 (한국어 Windows에서는 cp949)
+writer = BufferedLineWriter(csv_filename, CSV_HEADER, FLUSH_BYTES, FLUSH_INTERVAL_S, newline=b'\r\n',
+                            encoding=locale.getpreferredencoding(False))
+framer = LineFramer()
+invalid = 0
+last_status = time.monotonic()
 
-    try:
-        while True:
-            line = ser.readline().decode('utf-8').strip()
+try:
+    while True:
+        # 대기 중인 바이트를 한 번에 읽음 (없으면 최대 timeout 동안 1바이트 대기)
+        chunk = ser.read(ser.in_waiting or 1)
+        rows = []
+        for line in framer.feed(chunk):
+            line = line.strip()
             if not line:
                 continue
-
-            debug_print(f"Received: {line}")
-            row = line.split(',')
-
-            if len(row) == 12:  # timestamp + pitch/roll/yaw + accel_xyz + flex12345
-                writer.writerow(row)
-                file.flush()
-                print("✔️ Data saved:", row)
+            debug_print(f"Received: {line.decode('utf-8', 'replace')}")
+            if line.count(b',') == 11:  # timestamp + pitch/roll/yaw + accel_xyz + flex12345
+                rows.append(line)
             else:
-                print("❌ Invalid format (expected 12 values):", row)
+                invalid += 1
+                invalid_print(f"❌ Invalid format (expected 12 values): {line.decode('utf-8', 'replace')}")
+        writer.write_lines(rows)
+        writer.poll()  # 데이터가 끊겨도 버퍼가 FLUSH_INTERVAL_S 넘게 남지 않도록
 
-    except KeyboardInterrupt:
-        print("\n[!] Stopped by user")
-    except Exception as e:
-        print("❗ Error during UART read:", e)
-    finally:
-        ser.close()
\ No newline at end of file
+        now = time.monotonic()
+        if now - last_status >= STATUS_INTERVAL_S:
+            last_status = now
+            print(f"✔️ {writer.lines} rows saved ({invalid} invalid, {writer.flushes} writes)")
+
+except KeyboardInterrupt:
+    print("\n[!] Stopped by user")
+except Exception as e:
+    print("❗ Error during UART read:", e)
+finally:
+    writer.write_lines(line.strip() for line in framer.finish() if line.count(b',') == 11)
+    writer.close()  # 남은 버퍼 기록 + fsync
+    ser.close()
+    stats = writer.stats()
+    print(f"[+] {stats['lines']} rows → {csv_filename} ({stats['flushes']} writes, "
+          f"{stats['lines_per_flush']:.0f} rows/write, {invalid} invalid)")
@@ -0,0 +1,234 @@
+"""
+SQLite manifest of saved episodes.
+
+``load_collection_progress`` used to rebuild the per-class/type counts by
+globbing every ``<class>/<type>`` directory on each start, so startup time
+grew with the dataset. The manifest records every saved episode in one
+transaction together with a ``counts`` table keyed by (class, type), so
+startup reads at most classes x types rows no matter how many episodes exist.
+
+The filesystem stays the source of truth: :func:`scan_dataset` lists the
+episodes actually on disk (per-episode H5/CSV files and the rows of the
+consolidated session stores), :meth:`EpisodeManifest.rebuild` replaces the
+manifest with such a scan and :func:`count_drift` compares the two.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from collections import defaultdict
+from dataclasses import astuple, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from episode_store import EpisodeStore, store_files
+
+Counts = Dict[Tuple[str, str], int]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS episodes (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    class_name   TEXT NOT NULL,
+    episode_type TEXT NOT NULL,
+    path         TEXT NOT NULL,     -- relative to the data directory
+    store_index  INTEGER,           -- row in the session store's index (NULL for per-episode files)
+    num_samples  INTEGER,
+    start_ms     INTEGER,
+    end_ms       INTEGER,
+    duration     REAL,
+    saved_at     REAL
+);
+CREATE TABLE IF NOT EXISTS counts (
+    class_name   TEXT NOT NULL,
+    episode_type TEXT NOT NULL,
+    count        INTEGER NOT NULL,
+    PRIMARY KEY (class_name, episode_type)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+@dataclass
+class EpisodeRecord:
+    class_name: str
+    episode_type: str
+    path: str
+    store_index: Optional[int] = None
+    num_samples: Optional[int] = None
+    start_ms: Optional[int] = None
+    end_ms: Optional[int] = None
+    duration: Optional[float] = None
+    saved_at: Optional[float] = None
+
+
+_INSERT = (
+    "INSERT INTO episodes (class_name, episode_type, path, store_index, num_samples,"
+    " start_ms, end_ms, duration, saved_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_BUMP = (
+    "INSERT INTO counts (class_name, episode_type, count) VALUES (?, ?, ?)"
+    " ON CONFLICT(class_name, episode_type) DO UPDATE SET count = count + excluded.count"
+)
+
+
+class EpisodeManifest:
+    """Episode manifest in a WAL-mode SQLite file.
+
+    Each call opens its own connection, so the writer thread, the UI thread
+    and a verification thread can use one instance concurrently.
+    """
+
+    def __init__(self, path: Path, read_only: bool = False):
+        """``read_only`` opens an existing manifest without creating or migrating it (for loaders)."""
+        self.path = Path(path)
+        self.read_only = read_only
+        if read_only:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.read_only:
+            return sqlite3.connect(self.path.resolve().as_uri() + "?mode=ro", uri=True, timeout=30)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=FULL")
+        return conn
+
+    def _run(self, fn):
+        conn = self._connect()
+        try:
+            with conn:  # one transaction: commit on success, rollback on error
+                return fn(conn)
+        finally:
+            conn.close()
+
+    # ---- state ----
+    def is_initialized(self) -> bool:
+        """True once the manifest has been built from a scan (it may still hold zero episodes)."""
+        row = self._run(lambda c: c.execute("SELECT value FROM meta WHERE key = 'initialized'").fetchone())
+        return row is not None
+
+    def counts(self) -> Counts:
+        rows = self._run(lambda c: c.execute("SELECT class_name, episode_type, count FROM counts").fetchall())
+        return {(cls, ety): n for cls, ety, n in rows if n}
+
+    def last_id(self) -> int:
+        row = self._run(lambda c: c.execute("SELECT COALESCE(MAX(id), 0) FROM episodes").fetchone())
+        return row[0]
+
+    def __len__(self) -> int:
+        return sum(self.counts().values())
+
+    def episodes(self) -> List[EpisodeRecord]:
+        """Every recorded episode in save order."""
+        rows = self._run(lambda c: c.execute(
+            "SELECT class_name, episode_type, path, store_index, num_samples, start_ms, end_ms, duration, saved_at"
+            " FROM episodes ORDER BY id").fetchall())
+        return [EpisodeRecord(*row) for row in rows]
+
+    # ---- updates ----
+    def add_episode(self, record: EpisodeRecord):
+        """Record one saved episode and bump its (class, type) count atomically."""
+        self.add_episodes([record])
+
+    def add_episodes(self, records: Sequence[EpisodeRecord]):
+        def txn(conn):
+            conn.executemany(_INSERT, [astuple(r) for r in records])
+            bumps: Counts = defaultdict(int)
+            for r in records:
+                bumps[(r.class_name, r.episode_type)] += 1
+            conn.executemany(_BUMP, [(cls, ety, n) for (cls, ety), n in bumps.items()])
+        self._run(txn)
+
+    def rebuild(self, records: Iterable[EpisodeRecord]):
+        """Replace the whole manifest with ``records`` (e.g. from :func:`scan_dataset`)."""
+        records = list(records)
+
+        def txn(conn):
+            conn.execute("DELETE FROM episodes")
+            conn.execute("DELETE FROM counts")
+            conn.executemany(_INSERT, [astuple(r) for r in records])
+            totals: Counts = defaultdict(int)
+            for r in records:
+                totals[(r.class_name, r.episode_type)] += 1
+            conn.executemany("INSERT INTO counts VALUES (?, ?, ?)",
+                             [(cls, ety, n) for (cls, ety), n in totals.items()])
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('initialized', ?)", (str(time.time()),))
+        self._run(txn)
+
+
+def episode_files(type_dir: Path) -> List[Path]:
+    """One path per episode in a ``<class>/<type>`` directory, H5 preferred over its twin CSV.
+
+    The H5 and CSV names carry the time each file was written, so twins can
+    differ by a second (``episode_20251001_184130_ㅡ_3.h5`` /
+    ``episode_20251001_184131_ㅡ_3.csv``). Identical stems pair first; the
+    remaining H5 and CSV files then pair in name (time) order, and only CSVs
+    beyond the H5 count stand alone, so a directory holds
+    ``max(n_h5, n_csv)`` episodes as in the original progress scan.
+    """
+    h5_files = sorted(type_dir.glob("*.h5"))
+    h5_stems = {path.stem for path in h5_files}
+    csv_files = sorted(type_dir.glob("*.csv"))
+    unpaired = [path for path in csv_files if path.stem not in h5_stems]
+    unpaired_h5 = len(h5_files) - (len(csv_files) - len(unpaired))
+    return h5_files + unpaired[max(0, unpaired_h5):]
+
+
+def scan_dataset(data_dir: Path, classes: Iterable[str], episode_types: Iterable[str],
+                 store_dir: Optional[Path] = None) -> List[EpisodeRecord]:
+    """List the episodes on disk under ``data_dir``.
+
+    A per-episode H5 and its twin CSV count as one episode (see
+    :func:`episode_files`); each index row of a session store counts as one
+    episode.
+    """
+    data_dir = Path(data_dir)
+    episode_types = list(episode_types)
+    records: List[EpisodeRecord] = []
+    for class_name in classes:
+        class_dir = data_dir / class_name
+        if not class_dir.exists():
+            continue
+        for episode_type in episode_types:
+            type_dir = class_dir / episode_type
+            if not type_dir.exists():
+                continue
+            for path in episode_files(type_dir):
+                records.append(EpisodeRecord(class_name, episode_type, path.relative_to(data_dir).as_posix()))
+
+    for path in store_files(store_dir or data_dir / "store"):
+        with EpisodeStore(path, mode='r') as store:
+            index = store.index()
+        rel = path.relative_to(data_dir).as_posix() if path.is_relative_to(data_dir) else str(path)
+        for i, row in enumerate(index):
+            records.append(EpisodeRecord(
+                row['class_name'].decode('utf-8'), row['episode_type'].decode('utf-8'), rel,
+                store_index=i, num_samples=int(row['length']),
+                start_ms=int(row['start_ms']), end_ms=int(row['end_ms']),
+                duration=float(row['duration']), saved_at=float(row['saved_at']),
+            ))
+    return records
+
+
+def count_records(records: Iterable[EpisodeRecord]) -> Counts:
+    counts: Counts = defaultdict(int)
+    for r in records:
+        counts[(r.class_name, r.episode_type)] += 1
+    return dict(counts)
+
+
+def count_drift(manifest_counts: Counts, disk_counts: Counts) -> Dict[Tuple[str, str], Tuple[int, int]]:
+    """``{(class, type): (manifest, disk)}`` for every key where the two disagree."""
+    keys = set(manifest_counts) | set(disk_counts)
+    return {
+        key: (manifest_counts.get(key, 0), disk_counts.get(key, 0))
+        for key in sorted(keys)
+        if manifest_counts.get(key, 0) != disk_counts.get(key, 0)
+    }
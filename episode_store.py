@@ -0,0 +1,240 @@
+"""
+Append-only consolidated episode store.
+
+The collector used to write one gzip H5 file plus a twin CSV per 80-sample
+episode, so ``datasets/unified`` grows by two tiny files per episode. An
+``EpisodeStore`` keeps a whole session in one chunked HDF5 file instead:
+
+- per-sample columns are resizable datasets that every episode is appended
+  to (``sensor_data`` (N, 8) in the usual flex1-5, pitch, roll, yaw order,
+  ``acceleration`` (N, 3), ``timestamps``, ``arduino_timestamps``,
+  ``sampling_rates``);
+- ``episodes`` is the index table: one row per episode with its sample
+  ``offset``/``length`` into those columns, class, type, label index and
+  timestamps.
+
+Appending an episode extends each column once and then writes its index row,
+so a crash mid-append leaves at most unindexed trailing samples, which are
+truncated the next time the file is opened for writing. Loading the dataset
+reads each column contiguously.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import h5py
+import numpy as np
+
+from episode_writer import fsync_file
+from sensor_records import EpisodeBuffer
+from storage_profiles import DEFAULT_STORAGE_PROFILE, StorageProfile, get_profile
+
+STORE_FORMAT = "signglove-episode-store"
+STORE_VERSION = 1
+STORE_GLOB = "session_*.h5"
+
+INDEX_DTYPE = np.dtype([
+    ('offset', np.int64),         # first sample row in the column datasets
+    ('length', np.int32),         # number of samples
+    ('class_name', 'S16'),        # UTF-8
+    ('episode_type', 'S8'),
+    ('label_idx', np.int16),
+    ('start_ms', np.int64),       # recv_timestamp_ms of the first / last sample
+    ('end_ms', np.int64),
+    ('duration', np.float32),     # seconds from start to stop of the episode
+    ('saved_at', np.float64),     # unix time of the append
+])
+
+# name -> (per-sample shape, dtype)
+COLUMNS: Dict[str, Tuple[Tuple[int, ...], np.dtype]] = {
+    'timestamps': ((), np.dtype(np.int64)),
+    'arduino_timestamps': ((), np.dtype(np.int64)),
+    'sampling_rates': ((), np.dtype(np.float32)),
+    'sensor_data': ((8,), np.dtype(np.float32)),
+    'acceleration': ((3,), np.dtype(np.float32)),
+}
+
+
+def session_store_path(store_dir: Path, started: Optional[datetime] = None) -> Path:
+    started = started or datetime.now()
+    return Path(store_dir) / f"session_{started.strftime('%Y%m%d_%H%M%S')}.h5"
+
+
+def store_files(store_dir: Path) -> List[Path]:
+    store_dir = Path(store_dir)
+    if not store_dir.exists():
+        return []
+    return sorted(store_dir.glob(STORE_GLOB))
+
+
+class EpisodeStore:
+    """One consolidated HDF5 file; open with ``mode='a'`` to append, ``'r'`` to read.
+
+    ``profile`` (a ``StorageProfile`` or its name) only applies when the file
+    is created; an existing store keeps the filters it was created with.
+    """
+
+    def __init__(self, path: Path, mode: str = 'a', profile=DEFAULT_STORAGE_PROFILE,
+                 device_id: str = "SIGNGLOVE_UNIFIED_001"):
+        self.path = Path(path)
+        self.mode = mode
+        if mode != 'r':
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = h5py.File(self.path, mode)
+        if mode != 'r':
+            if 'episodes' not in self._file:
+                profile = get_profile(profile) if isinstance(profile, str) else profile
+                self._create_layout(profile, device_id)
+            else:
+                self._truncate_unindexed()
+
+    @property
+    def profile_name(self) -> str:
+        return str(self._file.attrs.get('storage_profile', 'gzip4'))
+
+    @property
+    def file(self) -> h5py.File:
+        """The underlying HDF5 file, for auxiliary datasets kept next to the columns."""
+        return self._file
+
+    # ---- layout ----
+    def _create_layout(self, profile: StorageProfile, device_id: str):
+        f = self._file
+        f.attrs['format'] = STORE_FORMAT
+        f.attrs['version'] = STORE_VERSION
+        f.attrs['device_id'] = device_id
+        f.attrs['created'] = datetime.now().isoformat()
+        f.attrs.update(profile.attrs())
+        for name, (shape, dtype) in COLUMNS.items():
+            f.create_dataset(name, shape=(0,) + shape, maxshape=(None,) + shape, dtype=dtype,
+                             **profile.dataset_kwargs(chunks=profile.appended_chunks(shape)))
+        f.create_dataset('episodes', shape=(0,), maxshape=(None,), dtype=INDEX_DTYPE,
+                         **profile.dataset_kwargs(chunks=(256,)))
+
+    def _truncate_unindexed(self):
+        # Samples written after the last index row belong to an interrupted append.
+        end = self.num_samples
+        for name in COLUMNS:
+            if self._file[name].shape[0] != end:
+                self._file[name].resize(end, axis=0)
+
+    # ---- writing ----
+    def append(self, data: EpisodeBuffer, class_name: str, episode_type: str,
+               label_idx: int = -1, duration: float = 0.0) -> int:
+        """Append one collected episode; returns its index row number."""
+        columns = {
+            'timestamps': data.timestamps,
+            'arduino_timestamps': data.arduino_timestamps,
+            'sampling_rates': data.sampling_rates,
+            'sensor_data': data.sensor_data,
+            'acceleration': data.accel,
+        }
+        return self.append_columns(columns, class_name, episode_type, label_idx, duration)
+
+    def append_columns(self, columns: Dict[str, np.ndarray], class_name: str, episode_type: str,
+                       label_idx: int = -1, duration: float = 0.0) -> int:
+        """Append one episode given as ``COLUMNS``-named arrays of equal length."""
+        n = len(columns['timestamps'])
+        offset = self.num_samples
+        for name in COLUMNS:
+            dataset = self._file[name]
+            dataset.resize(offset + n, axis=0)
+            dataset[offset:offset + n] = columns[name]
+
+        row = np.zeros(1, dtype=INDEX_DTYPE)
+        row['offset'] = offset
+        row['length'] = n
+        row['class_name'] = class_name.encode('utf-8')
+        row['episode_type'] = str(episode_type).encode('utf-8')
+        row['label_idx'] = label_idx
+        if n:
+            row['start_ms'] = columns['timestamps'][0]
+            row['end_ms'] = columns['timestamps'][-1]
+        row['duration'] = duration
+        row['saved_at'] = time.time()
+
+        index = self._file['episodes']
+        episode_id = index.shape[0]
+        index.resize(episode_id + 1, axis=0)
+        index[episode_id] = row[0]
+        return episode_id
+
+    def truncate(self, num_episodes: int):
+        """Drop every episode from ``num_episodes`` on, together with its samples."""
+        index = self._file['episodes']
+        if num_episodes < index.shape[0]:
+            index.resize(num_episodes, axis=0)
+        self._truncate_unindexed()
+
+    def flush(self, durable: bool = True):
+        """Flush HDF5 buffers; with ``durable`` also fsync the file."""
+        self._file.flush()
+        if durable:
+            fsync_file(self.path)
+
+    def close(self):
+        if self._file.id.valid:
+            self._file.close()
+
+    def __enter__(self) -> "EpisodeStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---- reading ----
+    def __len__(self) -> int:
+        return self._file['episodes'].shape[0]
+
+    @property
+    def num_samples(self) -> int:
+        index = self._file['episodes']
+        if index.shape[0] == 0:
+            return 0
+        last = index[-1]
+        return int(last['offset']) + int(last['length'])
+
+    def index(self) -> np.ndarray:
+        """The whole ``INDEX_DTYPE`` table in one read."""
+        return self._file['episodes'][:]
+
+    def read_episode(self, episode_id: int) -> Dict[str, np.ndarray]:
+        row = self._file['episodes'][episode_id]
+        start, stop = int(row['offset']), int(row['offset']) + int(row['length'])
+        return {name: self._file[name][start:stop] for name in COLUMNS}
+
+    def load_all(self) -> Dict[str, np.ndarray]:
+        """Every column plus ``episodes``, one contiguous read each."""
+        out = {name: self._file[name][:self.num_samples] for name in COLUMNS}
+        out['episodes'] = self.index()
+        return out
+
+    def iter_episodes(self) -> Iterator[Tuple[np.void, Dict[str, np.ndarray]]]:
+        """Yield ``(index_row, columns)`` per episode from a single bulk load."""
+        data = self.load_all()
+        for row in data['episodes']:
+            start, stop = int(row['offset']), int(row['offset']) + int(row['length'])
+            yield row, {name: data[name][start:stop] for name in COLUMNS}
+
+    def counts(self) -> Dict[Tuple[str, str], int]:
+        """Episodes per ``(class_name, episode_type)``."""
+        counts: Dict[Tuple[str, str], int] = defaultdict(int)
+        index = self.index()
+        for class_name, episode_type in zip(index['class_name'], index['episode_type']):
+            counts[(class_name.decode('utf-8'), episode_type.decode('utf-8'))] += 1
+        return counts
+
+
+def count_store_episodes(store_dir: Path) -> Dict[Tuple[str, str], int]:
+    """Episodes per ``(class_name, episode_type)`` across every session store in ``store_dir``."""
+    total: Dict[Tuple[str, str], int] = defaultdict(int)
+    for path in store_files(store_dir):
+        with EpisodeStore(path, mode='r') as store:
+            for key, n in store.counts().items():
+                total[key] += n
+    return total
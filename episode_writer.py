@@ -0,0 +1,200 @@
+"""
+Background persistence of finished episodes.
+
+``stop_episode`` used to write the gzip H5 file, the CSV and the progress
+JSON on whichever thread ended the episode - usually the serial reception
+thread - so samples arriving during disk I/O backed up in ``data_queue``.
+``EpisodeWriter`` moves that work to one writer thread fed by a bounded job
+queue:
+
+- ``submit`` hands over an ``EpisodeJob`` (the episode's own buffer plus the
+  metadata needed to name and label the files) and returns immediately
+  unless ``max_pending`` jobs are already waiting, in which case it blocks
+  (backpressure) and the wait is accounted in :meth:`stats`.
+- ``on_durable`` runs on the writer thread only after ``persist`` returned,
+  i.e. after the files were fsync'ed; progress counters belong there.
+- ``flush`` waits for the queue to drain; ``close`` flushes and stops the
+  thread and is also registered with ``atexit``.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from sensor_records import EpisodeBuffer
+
+
+@dataclass
+class EpisodeJob:
+    """Everything needed to persist one finished episode independently of the collector's current state."""
+    data: EpisodeBuffer
+    class_name: str
+    episode_type: str
+    duration: float                 # seconds from start to stop
+    timestamp: str                  # stop time for file names (YYYYmmdd_HHMMSS)
+    submitted_at: float = field(default_factory=time.perf_counter)
+    result: Any = None              # whatever persist() returned (saved paths)
+
+
+def fsync_file(path: Path):
+    """Flush a closed file's data to disk."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_dir(path: Path):
+    """Persist directory entries (new/renamed files). No-op where directories cannot be opened (Windows)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = 'utf-8'):
+    """Write ``text`` to a temp file, fsync it and rename it over ``path``."""
+    path = Path(path)
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w', encoding=encoding) as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    fsync_dir(path.parent)
+
+
+class EpisodeWriter:
+    """Single writer thread with a bounded job queue."""
+
+    def __init__(
+        self,
+        persist: Callable[[EpisodeJob], Any],
+        on_durable: Optional[Callable[[EpisodeJob], None]] = None,
+        on_error: Optional[Callable[[EpisodeJob, BaseException], None]] = None,
+        max_pending: int = 4,
+    ):
+        self.persist = persist
+        self.on_durable = on_durable
+        self.on_error = on_error
+        self.max_pending = max_pending
+        self._jobs: "queue.Queue[Optional[EpisodeJob]]" = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        # backpressure / latency metrics
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.blocked_submits = 0
+        self.blocked_seconds = 0.0
+        self.last_write_ms = 0.0
+        self.max_write_ms = 0.0
+        self.max_latency_ms = 0.0      # submit -> durable
+
+    def start(self) -> "EpisodeWriter":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="episode-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+        return self
+
+    @property
+    def pending(self) -> int:
+        return self._jobs.unfinished_tasks
+
+    def submit(self, job: EpisodeJob):
+        """Queue ``job``; blocks while ``max_pending`` jobs are waiting."""
+        if self._closed:
+            raise RuntimeError("EpisodeWriter is closed")
+        self.start()
+        job.submitted_at = time.perf_counter()
+        try:
+            self._jobs.put_nowait(job)
+        except queue.Full:
+            t0 = time.perf_counter()
+            self._jobs.put(job)
+            with self._lock:
+                self.blocked_submits += 1
+                self.blocked_seconds += time.perf_counter() - t0
+        with self._lock:
+            self.submitted += 1
+            self.max_depth = max(self.max_depth, self._jobs.qsize())
+
+    def flush(self):
+        """Block until every submitted job is durable (or failed)."""
+        if self._thread is not None:
+            self._jobs.join()
+
+    def close(self):
+        """Flush outstanding jobs and stop the writer thread. Safe to call more than once."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._jobs.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'pending': self.pending,
+                'max_depth': self.max_depth,
+                'blocked_submits': self.blocked_submits,
+                'blocked_seconds': self.blocked_seconds,
+                'last_write_ms': self.last_write_ms,
+                'max_write_ms': self.max_write_ms,
+                'max_latency_ms': self.max_latency_ms,
+            }
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                if job is None:
+                    return
+                self._write(job)
+            finally:
+                self._jobs.task_done()
+
+    def _write(self, job: EpisodeJob):
+        t0 = time.perf_counter()
+        try:
+            job.result = self.persist(job)
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            if self.on_error is not None:
+                self.on_error(job, e)
+            return
+        done = time.perf_counter()
+        with self._lock:
+            self.completed += 1
+            self.last_write_ms = (done - t0) * 1000.0
+            self.max_write_ms = max(self.max_write_ms, self.last_write_ms)
+            self.max_latency_ms = max(self.max_latency_ms, (done - job.submitted_at) * 1000.0)
+        if self.on_durable is not None:
+            try:
+                self.on_durable(job)
+            except Exception as e:
+                print(f"⚠️ 저장 완료 처리 실패: {e}")
@@ -0,0 +1,244 @@
+"""
+Offline batch scoring of a trained model over the recorded episodes.
+
+Streams episodes from ``datasets/unified`` (SignGloveDataset), cuts every
+episode into all its sliding windows with stride tricks (a view per
+episode, no per-window Python loop), packs them into preallocated batches of
+``--batch-size`` windows and scores them with
+``SignGloveInference.predict_batch``. Every window carries its episode's
+label.
+
+Reports, for the window size / stride / model given:
+
+- window accuracy and per-class accuracy (windows of that class predicted
+  correctly), plus episode accuracy (argmax of the mean probabilities over
+  an episode's windows);
+- the confusion matrix (rows: true class, columns: predicted);
+- windows/sec of the model calls alone and of the whole run (reading,
+  windowing and scoring).
+
+``--json`` writes the same numbers with the model file's SHA-256, so runs
+for different model revisions can be compared.
+
+Run: python evaluate_model.py --model model.h5 --scaler scaler.pkl --config config.json --stride 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ksl_classes import KSL_CLASSES
+from signglove_dataset import SignGloveDataset
+from sliding_window import SENSOR_DATA_TO_MODEL
+
+PredictFn = Callable[[np.ndarray], np.ndarray]
+
+
+def episode_windows(sensor: np.ndarray, window: int, stride: int = 1) -> np.ndarray:
+    """``(n, window, 8)`` view of every ``stride``-th window of one recorded episode, in model input order."""
+    rows = sensor[:, SENSOR_DATA_TO_MODEL]
+    if len(rows) < window:
+        return np.zeros((0, window, rows.shape[1]), dtype=rows.dtype)
+    return np.lib.stride_tricks.sliding_window_view(rows, window, axis=0)[::stride].transpose(0, 2, 1)
+
+
+@dataclass
+class ScoreReport:
+    classes: List[str]
+    confusion: np.ndarray                  # [true, predicted] window counts
+    episode_correct: int = 0
+    episodes: int = 0
+    skipped_episodes: int = 0              # 윈도우보다 짧은 에피소드
+    model_seconds: float = 0.0
+    total_seconds: float = 0.0
+    extra: Dict = field(default_factory=dict)
+
+    @property
+    def windows(self) -> int:
+        return int(self.confusion.sum())
+
+    @property
+    def accuracy(self) -> float:
+        return float(np.trace(self.confusion) / self.windows) if self.windows else 0.0
+
+    @property
+    def episode_accuracy(self) -> float:
+        return self.episode_correct / self.episodes if self.episodes else 0.0
+
+    def per_class(self) -> Dict[str, Dict[str, float]]:
+        support = self.confusion.sum(axis=1)
+        return {name: {'windows': int(support[i]),
+                       'accuracy': float(self.confusion[i, i] / support[i]) if support[i] else 0.0}
+                for i, name in enumerate(self.classes) if support[i]}
+
+    def to_dict(self) -> Dict:
+        return {
+            **self.extra,
+            'windows': self.windows,
+            'episodes': self.episodes,
+            'skipped_episodes': self.skipped_episodes,
+            'window_accuracy': self.accuracy,
+            'episode_accuracy': self.episode_accuracy,
+            'per_class': self.per_class(),
+            'classes': self.classes,
+            'confusion': self.confusion.tolist(),
+            'model_windows_per_s': self.windows / self.model_seconds if self.model_seconds else 0.0,
+            'total_windows_per_s': self.windows / self.total_seconds if self.total_seconds else 0.0,
+        }
+
+
+def score(predict_fn: PredictFn, dataset: SignGloveDataset, window: int, stride: int = 1,
+          batch_size: int = 1024, max_windows: Optional[int] = None) -> ScoreReport:
+    """Score every window of every episode in ``dataset``; labels are ``dataset.classes`` indices.
+
+    ``predict_fn`` maps a raw ``(B, window, 8)`` float32 batch to ``(B, classes)``
+    probabilities in the same class order.
+    """
+    n_classes = len(dataset.classes)
+    report = ScoreReport(list(dataset.classes), np.zeros((n_classes, n_classes), dtype=np.int64))
+    batch = np.zeros((batch_size, window, len(SENSOR_DATA_TO_MODEL)), dtype=np.float32)
+    labels = np.zeros(batch_size, dtype=np.int64)
+    owner = np.zeros(batch_size, dtype=np.int64)      # 배치의 각 윈도우가 속한 에피소드 번호
+    episode_label: List[int] = []
+    episode_probs: List[Optional[np.ndarray]] = []
+    fill = 0
+
+    def flush():
+        nonlocal fill
+        t0 = time.perf_counter()
+        probs = predict_fn(batch[:fill])
+        report.model_seconds += time.perf_counter() - t0
+        pred = probs.argmax(axis=1)
+        report.confusion += np.bincount(labels[:fill] * n_classes + pred,
+                                        minlength=n_classes * n_classes).reshape(n_classes, n_classes)
+        # 에피소드별 확률 합 (윈도우 순서대로 붙어 있으므로 구간별 합)
+        owners, starts = np.unique(owner[:fill], return_index=True)
+        for ep, total in zip(owners, np.add.reduceat(probs, starts, axis=0)):
+            episode_probs[ep] = total if episode_probs[ep] is None else episode_probs[ep] + total
+        fill = 0
+
+    t_start = time.perf_counter()
+    for sensor_batch, label_idx, _ in dataset:
+        for sensor, label in zip(sensor_batch, label_idx):
+            windows = episode_windows(sensor, window, stride)
+            if max_windows is not None:
+                windows = windows[:max(0, max_windows - report.windows - fill)]
+            if not len(windows):
+                report.skipped_episodes += len(sensor) < window
+                continue
+            ep = len(episode_label)
+            episode_label.append(int(label))
+            episode_probs.append(None)
+            start = 0
+            while start < len(windows):
+                take = min(batch_size - fill, len(windows) - start)
+                batch[fill:fill + take] = windows[start:start + take]
+                labels[fill:fill + take] = label
+                owner[fill:fill + take] = ep
+                fill += take
+                start += take
+                if fill == batch_size:
+                    flush()
+        if max_windows is not None and report.windows + fill >= max_windows:
+            break
+    if fill:
+        flush()
+    report.total_seconds = time.perf_counter() - t_start
+
+    report.episodes = len(episode_label)
+    report.episode_correct = sum(int(np.argmax(p)) == label for p, label in zip(episode_probs, episode_label))
+    return report
+
+
+def format_confusion(confusion: np.ndarray, classes: Sequence[str]) -> str:
+    """Confusion matrix restricted to classes that occur (as true or predicted)."""
+    present = np.flatnonzero(confusion.sum(axis=0) + confusion.sum(axis=1))
+    width = max(5, len(str(int(confusion.max()))) + 1) if confusion.size else 5
+    lines = ["true\\pred" + "".join(f"{classes[j]:>{width}}" for j in present)]
+    for i in present:
+        lines.append(f"{classes[i]:<9}" + "".join(f"{confusion[i, j]:>{width}}" for j in present))
+    return "\n".join(lines)
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    if path.is_dir():  # SavedModel 디렉터리
+        for child in sorted(p for p in path.rglob('*') if p.is_file()):
+            digest.update(child.relative_to(path).as_posix().encode())
+            digest.update(child.read_bytes())
+    else:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a SignGlove model on every window of the recorded episodes.")
+    parser.add_argument("--model", required=True)
+    parser.add_argument("--scaler", default=None)
+    parser.add_argument("--config", default=None)
+    parser.add_argument("--backend", default='auto')
+    parser.add_argument("--fuse-scaler", action="store_true")
+    parser.add_argument("--data-dir", type=Path, default=Path("datasets/unified"))
+    parser.add_argument("--manifest", type=Path, default=None)
+    parser.add_argument("--episode-types", nargs="+", default=None)
+    parser.add_argument("--window", type=int, default=30)
+    parser.add_argument("--stride", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--max-windows", type=int, default=None)
+    parser.add_argument("--json", type=Path, default=None, help="Also write the report here.")
+    args = parser.parse_args()
+
+    from inference import SignGloveInference
+
+    logging.getLogger("inference").setLevel(logging.WARNING)
+    inference = SignGloveInference(args.model, args.scaler, args.config, window_size=args.window,
+                                   batch_size=args.batch_size, backend=args.backend,
+                                   fuse_scaler=args.fuse_scaler)
+    classes = inference.class_names or list(KSL_CLASSES)
+    dataset = SignGloveDataset(args.data_dir, classes=classes, episode_types=args.episode_types,
+                               manifest=args.manifest)
+    report = score(inference.predict_batch, dataset, args.window, args.stride, args.batch_size,
+                   args.max_windows)
+    if not report.windows:
+        print(f"❌ no episodes of at least {args.window} samples under {args.data_dir}")
+        sys.exit(1)
+    report.extra = {
+        'model': str(args.model),
+        'model_sha256': file_sha256(Path(args.model)),
+        'backend': inference.backend.name,
+        'scaler_fused': inference.scaler_fused,
+        'window': args.window,
+        'stride': args.stride,
+        'batch_size': args.batch_size,
+    }
+
+    print(f"model: {args.model} ({report.extra['model_sha256'][:12]}, {inference.backend.name})  "
+          f"window: {args.window}  stride: {args.stride}")
+    print(f"episodes: {report.episodes} (+{report.skipped_episodes} shorter than the window)  "
+          f"windows: {report.windows}")
+    print(f"window accuracy: {report.accuracy:.4f}  episode accuracy: {report.episode_accuracy:.4f}")
+    print(f"throughput: {report.windows / report.model_seconds:.0f} windows/s (model), "
+          f"{report.windows / report.total_seconds:.0f} windows/s (end to end, {report.total_seconds:.1f} s)")
+    print(f"\n{'class':<9}{'windows':>9}{'accuracy':>10}")
+    for name, row in report.per_class().items():
+        print(f"{name:<9}{row['windows']:>9}{row['accuracy']:>10.4f}")
+    print("\n" + format_confusion(report.confusion, report.classes))
+    if args.json:
+        args.json.write_text(json.dumps(report.to_dict(), ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\n✅ report: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
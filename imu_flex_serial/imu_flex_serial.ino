@@ -32,6 +32,10 @@ unsigned long sampleIntervalMs = DEFAULT_INTERVAL_MS;
 unsigned long lastTickUs = 0;
 bool connected = false;
 
+// 출력 형식: false = CSV 텍스트(기본), true = 32바이트 바이너리 프레임 (format,bin)
+bool binaryMode = false;
+uint16_t frameSeq = 0;
+
 // 자이로 바이어스(오프셋)
 float bias_x = 0.0f, bias_y = 0.0f, bias_z = 0.0f;
 
@@ -70,6 +74,50 @@ void printCsvRow(unsigned long ts, float pitch, float roll, float yaw,
   Serial.println();
 }
 
+// ===== 바이너리 프레임 (호스트: binary_frames.py) =====
+// 32바이트, 리틀엔디언:
+// [0xA5 0x5A][seq u16][ts u32][pitch,roll,yaw i16 x0.01°][ax,ay,az i16 x0.001g][flex1..5 u16][crc16]
+// crc16 = CRC-16/CCITT-FALSE(seq..flex, 28바이트). 배율은 CSV 출력 자릿수(2/3자리)와 같음
+const uint8_t FRAME_SYNC0 = 0xA5;
+const uint8_t FRAME_SYNC1 = 0x5A;
+const size_t FRAME_SIZE = 32;
+
+uint16_t crc16Ccitt(const uint8_t *data, size_t len) {
+  uint16_t crc = 0xFFFF;
+  for (size_t i = 0; i < len; i++) {
+    crc ^= (uint16_t)data[i] << 8;
+    for (int b = 0; b < 8; b++) crc = (crc & 0x8000) ? (uint16_t)((crc << 1) ^ 0x1021) : (uint16_t)(crc << 1);
+  }
+  return crc;
+}
+
+inline void putU16(uint8_t *p, uint16_t v) { p[0] = (uint8_t)v; p[1] = (uint8_t)(v >> 8); }
+inline void putU32(uint8_t *p, uint32_t v) { putU16(p, (uint16_t)v); putU16(p + 2, (uint16_t)(v >> 16)); }
+
+inline int16_t toFixed(float v, float scale) {
+  float s = v * scale;
+  if (s > 32767.0f) s = 32767.0f;
+  if (s < -32768.0f) s = -32768.0f;
+  return (int16_t)lroundf(s);
+}
+
+void sendBinaryFrame(unsigned long ts, float pitch, float roll, float yaw,
+                     float ax, float ay, float az, const int flex[5]) {
+  uint8_t f[FRAME_SIZE];
+  f[0] = FRAME_SYNC0; f[1] = FRAME_SYNC1;
+  putU16(f + 2, frameSeq++);
+  putU32(f + 4, (uint32_t)ts);
+  putU16(f + 8,  (uint16_t)toFixed(pitch, 100.0f));
+  putU16(f + 10, (uint16_t)toFixed(roll, 100.0f));
+  putU16(f + 12, (uint16_t)toFixed(yaw, 100.0f));
+  putU16(f + 14, (uint16_t)toFixed(ax, 1000.0f));
+  putU16(f + 16, (uint16_t)toFixed(ay, 1000.0f));
+  putU16(f + 18, (uint16_t)toFixed(az, 1000.0f));
+  for (int i = 0; i < 5; i++) putU16(f + 20 + 2 * i, (uint16_t)flex[i]);
+  putU16(f + 30, crc16Ccitt(f + 2, FRAME_SIZE - 4));
+  Serial.write(f, FRAME_SIZE);
+}
+
 void calibrateGyroBias(unsigned samples = 200, unsigned delay_ms = 5) {
   bias_x = bias_y = bias_z = 0.0f;
   unsigned cnt = 0;
@@ -97,7 +145,7 @@ float pickAxis(int axis, float x, float y, float z) {
   return z;
 }
 
-// 명령: interval,<ms> / header / flush / recal / alpha,<0~1> / axis,roll:x|y|z,pitch:x|y|z / yawzero
+// 명령: interval,<ms> / header / flush / recal / alpha,<0~1> / axis,roll:x|y|z,pitch:x|y|z / yawzero / format,csv|bin
 void handleIncomingCommand() {
   static char lineBuf[64];
   static size_t idx = 0;
@@ -150,6 +198,18 @@ void handleIncomingCommand() {
         Serial.print(ROLL_AXIS==0?"x":(ROLL_AXIS==1?"y":"z"));
         Serial.print(F(", pitch="));
         Serial.println(PITCH_AXIS==0?"x":(PITCH_AXIS==1?"y":"z"));
+      } else if (strncmp(lineBuf, "format,", 7) == 0) {
+        // 응답은 텍스트로 먼저 보냄 (호스트 디코더는 프레임 사이의 텍스트를 건너뜀)
+        if (strcmp(lineBuf + 7, "bin") == 0) {
+          Serial.println(F("# format set to bin"));
+          binaryMode = true;
+          frameSeq = 0;
+        } else if (strcmp(lineBuf + 7, "csv") == 0) {
+          binaryMode = false;
+          Serial.println(F("# format set to csv"));
+        } else {
+          Serial.println(F("# format must be csv or bin"));
+        }
       } else if (strcmp(lineBuf, "yawzero") == 0) {
         yaw_deg = 0.0f;
         Serial.println(F("# yaw reset to 0"));
@@ -205,7 +265,8 @@ void setup() {
 void loop() {
   // 1) 연결 상태 전이
   bool nowConn = (bool)Serial;
-  if (nowConn && !connected) { connected = true; clearSerialBuffers(); sendCsvHeader(); }
+  // 새 연결은 항상 CSV로 시작 (바이너리는 호스트가 format,bin으로 요청)
+  if (nowConn && !connected) { connected = true; binaryMode = false; clearSerialBuffers(); sendCsvHeader(); }
   else if (!nowConn && connected) { connected = false; clearSerialBuffers(); }
 
   // 2) 명령 처리
@@ -279,7 +340,8 @@ void loop() {
   int flex[5];
   for (int i = 0; i < 5; i++) flex[i] = analogRead(FLEX_PINS[i]);
 
-  // CSV 출력 (pitch, roll, yaw, accel_x,y,z, flex1..5)
+  // 출력 (pitch, roll, yaw, accel_x,y,z, flex1..5)
   unsigned long tsMs = millis();
-  printCsvRow(tsMs, pitch_deg, roll_deg, yaw_deg, ax, ay, az, flex);
+  if (binaryMode) sendBinaryFrame(tsMs, pitch_deg, roll_deg, yaw_deg, ax, ay, az, flex);
+  else            printCsvRow(tsMs, pitch_deg, roll_deg, yaw_deg, ax, ay, az, flex);
 }
@@ -1,14 +1,15 @@
 import numpy as np
-import tensorflow as tf
-from sklearn.preprocessing import StandardScaler
-import joblib
 import json
 import time
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Optional
 from dataclasses import dataclass
 from collections import deque
 import logging
 
+from inference_schedule import InferenceSchedule, InferenceScheduler, filter_prediction
+from model_backends import load_backend
+from sliding_window import SlidingWindow, scaler_affine
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -50,27 +51,44 @@ class SignGloveInference:
     """수화 장갑 추론 모델 클래스"""
     
     def __init__(self, model_path: str, scaler_path: str = None, 
-                 config_path: str = None, window_size: int = 30):
+                 config_path: str = None, window_size: int = 30,
+                 compiled: bool = True, batch_size: int = 256,
+                 schedule: Optional[InferenceSchedule] = None, backend: str = 'auto',
+                 fuse_scaler: bool = False):
         """
         Args:
             model_path: 훈련된 모델 파일 경로
             scaler_path: 데이터 정규화용 scaler 파일 경로
             config_path: 설정 파일 경로
             window_size: 시계열 데이터 윈도우 크기
+            compiled: 모델을 고정 입력 시그니처의 tf.function으로 감싸 직접 호출 (False면 model.predict)
+            batch_size: predict_batch가 한 번에 모델에 넣는 최대 윈도우 수
+            schedule: 윈도우가 찬 뒤 어떤 샘플에서 모델을 실행할지 (기본: 매 샘플,
+                설정 파일의 'inference_schedule'로도 지정 가능)
+            backend: 'keras' | 'tflite' | 'onnx' | 'auto' (확장자로 선택, model_export.py로 변환)
+            fuse_scaler: StandardScaler의 mean_/scale_을 백엔드에 접어 넣어 원시 윈도우 → 확률을
+                한 번에 계산 (keras는 tf.function 그래프 안의 affine 연산, 윈도우에는 원시 값 저장)
         """
         self.model_path = model_path
         self.scaler_path = scaler_path
         self.config_path = config_path
         self.window_size = window_size
+        self.compiled = compiled
+        self.batch_size = batch_size
+        self.backend_name = backend
+        self.fuse_scaler = fuse_scaler
         
         # 모델과 관련 컴포넌트 로드
-        self.model = None
+        self.backend = None  # model_backends의 추론 백엔드: backend(batch) → 확률
+        self.model = None    # keras 백엔드일 때의 Keras 모델
         self.scaler = None
         self.config = None
         self.class_names = []
         
-        # 데이터 버퍼 (시계열 데이터용)
-        self.data_buffer = deque(maxlen=window_size)
+        # 데이터 버퍼 (시계열 데이터용): 정규화된 샘플의 이중 링버퍼, 스케일러는 로드 후 설정
+        self.data_buffer = SlidingWindow(window_size)
+        self.scheduler = InferenceScheduler(schedule)
+        self.last_prediction: Optional[Dict] = None
         
         # 추론 결과 필터링을 위한 변수들
         self.prediction_history = deque(maxlen=5)
@@ -84,14 +102,24 @@ class SignGloveInference:
         try:
             # 모델 로드
             logger.info(f"모델 로드 중: {self.model_path}")
-            self.model = tf.keras.models.load_model(self.model_path)
-            logger.info("모델 로드 완료")
+            self.backend = load_backend(self.model_path, self.backend_name, compiled=self.compiled)
+            self.model = getattr(self.backend, 'model', None)
+            logger.info(f"모델 로드 완료 (backend: {self.backend.name})")
             
             # 스케일러 로드 (있는 경우)
             if self.scaler_path:
                 logger.info(f"스케일러 로드 중: {self.scaler_path}")
+                import joblib  # 스케일러가 있을 때만 로드
                 self.scaler = joblib.load(self.scaler_path)
-                logger.info("스케일러 로드 완료")
+                affine = scaler_affine(self.scaler, self.data_buffer.n_features) if self.fuse_scaler else None
+                if affine is not None:
+                    self.backend.set_input_affine(affine)
+                    logger.info("스케일러 로드 완료 (모델 입력에 융합)")
+                else:
+                    if self.fuse_scaler:
+                        logger.warning("스케일러가 특성별 affine 변환이 아니어서 융합하지 않음")
+                    self.data_buffer.set_scaler(self.scaler)
+                    logger.info("스케일러 로드 완료")
             
             # 설정 파일 로드 (있는 경우)
             if self.config_path:
@@ -109,6 +137,12 @@ class SignGloveInference:
                     self.confidence_threshold = self.config['confidence_threshold']
                 if 'stability_threshold' in self.config:
                     self.stability_threshold = self.config['stability_threshold']
+                if 'inference_schedule' in self.config and self.scheduler.schedule == InferenceSchedule():
+                    self.scheduler = InferenceScheduler(InferenceSchedule(**self.config['inference_schedule']))
+            
+            # 융합된 경우 윈도우는 원시 값이므로 adaptive 스케줄의 변화량은 scale_로 나눠 비교
+            if self.scaler_fused:
+                self.scheduler.delta_scale = self.backend.input_affine[1]
             
             logger.info("모든 컴포넌트 로드 완료")
             
@@ -116,25 +150,78 @@ class SignGloveInference:
             logger.error(f"모델 컴포넌트 로드 실패: {e}")
             raise
     
+    @property
+    def scaler_fused(self) -> bool:
+        """스케일러가 백엔드(모델 호출) 안에서 적용되는지 여부"""
+        return getattr(self.backend, 'input_affine', None) is not None
+    
+    @property
+    def sequence_model(self) -> bool:
+        """모델 입력이 [N, window_size, features] 시계열 윈도우인지 (단일 샘플 [N, features]가 아님)"""
+        return self.backend is not None and len(self.backend.input_shape) == 3
+    
+    def run_model(self, batch: np.ndarray) -> np.ndarray:
+        """모델 입력 배치 → 확률 배열 (scaler_fused면 원시 값, 아니면 정규화된 값)
+
+        keras 백엔드는 model.predict 대신 고정 입력 시그니처의 tf.function을
+        직접 호출한다 (predict는 호출마다 데이터 어댑터/콜백을 새로 만들어
+        샘플 하나에도 수 ms가 걸림). compiled=False면 model.predict.
+        """
+        return self.backend(batch)
+    
+    def predict_batch(self, windows: np.ndarray) -> np.ndarray:
+        """여러 윈도우를 한 번에 예측 (오프라인 채점용)
+
+        Args:
+            windows: [N, window_size, 8] 원시 센서 윈도우 (SensorData.to_array 순서)
+        Returns:
+            [N, num_classes] 확률
+        """
+        windows = np.asarray(windows, dtype=np.float32)
+        if windows.ndim == 2:
+            windows = windows[np.newaxis]
+        if self.scaler is not None and not self.scaler_fused:
+            n, steps, features = windows.shape
+            windows = self.scaler.transform(windows.reshape(-1, features)).reshape(n, steps, features)
+        outputs = [self.run_model(windows[start:start + self.batch_size])
+                   for start in range(0, len(windows), self.batch_size)]
+        return np.concatenate(outputs) if outputs else np.zeros((0, len(self.class_names)), dtype=np.float32)
+    
     def preprocess_data(self, sensor_data: SensorData) -> np.ndarray:
         """센서 데이터 전처리"""
         # 센서 데이터를 배열로 변환
         data_array = sensor_data.to_array().reshape(1, -1)
         
-        # 스케일러가 있으면 정규화 적용
-        if self.scaler is not None:
+        # 스케일러가 있으면 정규화 적용 (융합된 경우 모델 호출 안에서 적용)
+        if self.scaler is not None and not self.scaler_fused:
             data_array = self.scaler.transform(data_array)
         
         return data_array
     
+    def _warming_up_result(self, sensor_data: SensorData) -> Dict:
+        """윈도우가 아직 차지 않아 모델을 호출하지 않은 샘플의 결과"""
+        return {
+            'filtered_result': 'warming_up',
+            'buffer_length': len(self.data_buffer),
+            'window_size': self.window_size,
+            'timestamp': time.time(),
+            'sensor_data': sensor_data.to_dict()
+        }
+    
     def predict_single(self, sensor_data: SensorData) -> Dict:
-        """단일 센서 데이터로 예측 수행"""
+        """단일 센서 데이터로 예측 수행
+
+        시계열 모델은 고정된 [None, window_size, 8] 입력만 받으므로 샘플 하나로는
+        호출하지 않고 'warming_up' 결과를 반환합니다 (predict_sequence를 사용).
+        """
+        if self.sequence_model:
+            return self._warming_up_result(sensor_data)
         try:
             # 데이터 전처리
             processed_data = self.preprocess_data(sensor_data)
             
             # 모델 예측
-            predictions = self.model.predict(processed_data, verbose=0)
+            predictions = self.run_model(processed_data)
             
             # 결과 처리
             prediction_probs = predictions[0]
@@ -166,26 +253,24 @@ class SignGloveInference:
     
     def predict_sequence(self, sensor_data: SensorData) -> Optional[Dict]:
         """시계열 데이터로 예측 수행 (윈도우 기반)"""
-        # 데이터 버퍼에 추가
-        self.data_buffer.append(sensor_data.to_array())
+        # 데이터 버퍼에 추가 (도착 시 한 번만 정규화)
+        self.data_buffer.append(sensor_data)
         
         # 윈도우가 충분히 채워지지 않은 경우
-        if len(self.data_buffer) < self.window_size:
+        if not self.data_buffer.full:
+            return None
+        
+        # 스케줄상 이번 샘플에서는 모델을 돌리지 않음 (마지막 결과는 last_prediction)
+        now = sensor_data.timestamp if sensor_data.timestamp is not None else time.time()
+        if not self.scheduler.observe(self.data_buffer.latest(), now):
             return None
         
         try:
-            # 시계열 데이터 준비
-            sequence_data = np.array(list(self.data_buffer))
-            
-            # 스케일러 적용 (있는 경우)
-            if self.scaler is not None:
-                sequence_data = self.scaler.transform(sequence_data)
-            
-            # 모델 입력 형태로 변환 [1, window_size, features]
-            sequence_data = sequence_data.reshape(1, self.window_size, -1)
+            # 정규화된 [1, window_size, features] 연속 뷰 (복사 없음)
+            sequence_data = self.data_buffer.window()
             
             # 모델 예측
-            predictions = self.model.predict(sequence_data, verbose=0)
+            predictions = self.run_model(sequence_data)
             
             # 결과 처리
             prediction_probs = predictions[0]
@@ -206,6 +291,7 @@ class SignGloveInference:
                 'sequence_length': len(self.data_buffer)
             }
             
+            self.last_prediction = result
             return result
             
         except Exception as e:
@@ -218,48 +304,25 @@ class SignGloveInference:
     
     def predict_with_filtering(self, sensor_data: SensorData) -> Optional[Dict]:
         """필터링이 적용된 예측 (노이즈 제거 및 안정성 향상)"""
-        # 기본 예측 수행
-        if len(self.data_buffer) >= self.window_size:
-            prediction = self.predict_sequence(sensor_data)
-        else:
+        # 기본 예측 수행: 샘플은 항상 윈도우에 쌓고, 윈도우가 차기 전에만 단일 샘플 예측
+        # (스케줄로 건너뛴 샘플은 None → 히스토리/안정성 판정은 실제 예측들만으로 진행)
+        prediction = self.predict_sequence(sensor_data)
+        if prediction is None and not self.data_buffer.full:
             prediction = self.predict_single(sensor_data)
         
-        if prediction is None or 'error' in prediction:
-            return prediction
-        
-        # 신뢰도 임계값 체크
-        if prediction['confidence'] < self.confidence_threshold:
-            prediction['filtered_result'] = 'low_confidence'
+        if prediction is None or 'error' in prediction or prediction.get('filtered_result') == 'warming_up':
             return prediction
         
-        # 예측 히스토리에 추가
-        self.prediction_history.append({
-            'class': prediction['predicted_class'],
-            'confidence': prediction['confidence']
-        })
-        
-        # 안정성 체크 (최근 N개의 예측이 같은지 확인)
-        if len(self.prediction_history) >= self.stability_threshold:
-            recent_predictions = list(self.prediction_history)[-self.stability_threshold:]
-            recent_classes = [p['class'] for p in recent_predictions]
-            
-            # 모두 같은 클래스인지 확인
-            if len(set(recent_classes)) == 1:
-                prediction['filtered_result'] = 'stable'
-                prediction['stable_class'] = recent_classes[0]
-                avg_confidence = np.mean([p['confidence'] for p in recent_predictions])
-                prediction['stable_confidence'] = float(avg_confidence)
-            else:
-                prediction['filtered_result'] = 'unstable'
-        else:
-            prediction['filtered_result'] = 'insufficient_history'
-        
-        return prediction
+        # 신뢰도/안정성 필터 (inference_server의 세션들과 같은 규칙)
+        return filter_prediction(prediction, self.prediction_history,
+                                 self.confidence_threshold, self.stability_threshold)
     
     def reset_buffer(self):
         """데이터 버퍼와 히스토리 초기화"""
         self.data_buffer.clear()
         self.prediction_history.clear()
+        self.scheduler.reset()
+        self.last_prediction = None
         logger.info("버퍼 초기화 완료")
     
     def get_model_info(self) -> Dict:
@@ -267,15 +330,21 @@ class SignGloveInference:
         info = {
             'model_path': self.model_path,
             'window_size': self.window_size,
+            'backend': self.backend.name if self.backend else None,
+            'compiled': getattr(self.backend, 'compiled', True),
+            'scaler_fused': self.scaler_fused,
             'confidence_threshold': self.confidence_threshold,
             'stability_threshold': self.stability_threshold,
             'buffer_length': len(self.data_buffer),
+            'schedule': dict(vars(self.scheduler.schedule)),
+            'inference_runs': self.scheduler.runs,
+            'inference_run_ratio': self.scheduler.run_ratio,
             'history_length': len(self.prediction_history)
         }
         
-        if self.model:
-            info['model_input_shape'] = str(self.model.input_shape)
-            info['model_output_shape'] = str(self.model.output_shape)
+        if self.backend:
+            info['model_input_shape'] = str(self.backend.input_shape)
+            info['model_output_shape'] = str(self.backend.output_shape)
         
         if self.class_names:
             info['num_classes'] = len(self.class_names)
@@ -326,7 +395,7 @@ def main():
         # 필터링이 적용된 예측 수행
         result = inference.predict_with_filtering(sensor_data)
         
-        if result and 'error' not in result:
+        if result and 'predicted_class' in result:
             logger.info(f"Step {i+1}: {result['predicted_class']} "
                        f"(confidence: {result['confidence']:.3f}, "
                        f"filter: {result['filtered_result']})")
@@ -0,0 +1,148 @@
+"""
+When to run the model on a full sliding window, and how to filter the results.
+
+Every sample after the window fills used to trigger a full forward pass
+(~33 per second per glove). An ``InferenceScheduler`` decides per sample:
+
+- ``hop``: every ``hop_size`` samples (1 = every sample, the old behaviour);
+- ``time``: when at least ``interval_s`` seconds passed since the last run;
+- ``adaptive``: only when some channel moved more than ``delta_threshold``
+  away from its value at the last run (largest change seen since then, so a
+  quick excursion that returns still counts), and at least every
+  ``max_hop`` samples so a held posture is still re-confirmed.
+
+Deltas are measured in scaler units (standard deviations) when a
+StandardScaler is loaded: on the scaled values stored in the window, or on
+raw values divided by ``delta_scale`` when the scaler is fused into the
+model and the window holds raw samples.
+
+:func:`filter_prediction` is the confidence/stability filter of
+``predict_with_filtering``; it works on whatever (possibly sparse) stream of
+predictions a schedule produces.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional
+
+import numpy as np
+
+SCHEDULE_MODES = ('hop', 'time', 'adaptive')
+
+
+@dataclass
+class InferenceSchedule:
+    mode: str = 'hop'
+    hop_size: int = 1               # hop: run every k samples
+    interval_s: float = 0.1         # time: minimum seconds between runs
+    delta_threshold: float = 0.5    # adaptive: max |change| of any channel since the last run
+    max_hop: int = 30               # adaptive: run at least every N samples (0 = never forced)
+
+    def __post_init__(self):
+        if self.mode not in SCHEDULE_MODES:
+            raise ValueError(f"unknown schedule mode {self.mode!r} (choose from {', '.join(SCHEDULE_MODES)})")
+        if self.hop_size < 1:
+            raise ValueError("hop_size must be >= 1")
+
+
+class InferenceScheduler:
+    """Per-stream state for an ``InferenceSchedule``."""
+
+    def __init__(self, schedule: Optional[InferenceSchedule] = None, delta_scale: Optional[np.ndarray] = None):
+        self.schedule = schedule or InferenceSchedule()
+        self.delta_scale = delta_scale  # 채널별 나눗수 (원시 샘플을 스케일러 단위로)
+        self._ref: Optional[np.ndarray] = None   # 마지막 실행 시점의 샘플
+        self._diff: Optional[np.ndarray] = None
+        self.reset()
+
+    def reset(self):
+        self._since_run = 0
+        self._last_run_time: Optional[float] = None
+        self._max_delta = 0.0
+        self._has_ref = False
+        self.samples = 0
+        self.runs = 0
+
+    def observe(self, latest: np.ndarray, now: float) -> bool:
+        """Account for one new sample (``latest``) of a full window; True if the model should run now."""
+        self.samples += 1
+        self._since_run += 1
+        schedule = self.schedule
+        if schedule.mode == 'hop':
+            run = self._last_run_time is None or self._since_run >= schedule.hop_size
+        elif schedule.mode == 'time':
+            run = self._last_run_time is None or now - self._last_run_time >= schedule.interval_s
+        else:
+            run = self._adaptive(latest)
+        if run:
+            self._mark_run(latest, now)
+        return run
+
+    def _adaptive(self, latest: np.ndarray) -> bool:
+        if not self._has_ref:
+            return True
+        np.subtract(latest, self._ref, out=self._diff)
+        np.abs(self._diff, out=self._diff)
+        if self.delta_scale is not None:
+            np.divide(self._diff, self.delta_scale, out=self._diff)
+        delta = float(self._diff.max())
+        if delta > self._max_delta:
+            self._max_delta = delta
+        schedule = self.schedule
+        return (self._max_delta > schedule.delta_threshold
+                or (schedule.max_hop > 0 and self._since_run >= schedule.max_hop))
+
+    def _mark_run(self, latest: np.ndarray, now: float):
+        if self._ref is None or self._ref.shape != latest.shape:
+            self._ref = np.empty(latest.shape, dtype=np.float64)
+            self._diff = np.empty(latest.shape, dtype=np.float64)
+        self._ref[:] = latest
+        self._has_ref = True
+        self._since_run = 0
+        self._max_delta = 0.0
+        self._last_run_time = now
+        self.runs += 1
+
+    @property
+    def run_ratio(self) -> float:
+        """Fraction of full-window samples that triggered a run."""
+        return self.runs / self.samples if self.samples else 0.0
+
+
+def filter_prediction(prediction: Dict, history: Deque[Dict], confidence_threshold: float,
+                      stability_threshold: int) -> Dict:
+    """Annotate ``prediction`` with ``filtered_result`` using the recent ``history``.
+
+    Low-confidence predictions are marked and not recorded; otherwise the
+    prediction is appended to ``history`` and is ``stable`` once the last
+    ``stability_threshold`` recorded predictions agree.
+    """
+    # 신뢰도 임계값 체크
+    if prediction['confidence'] < confidence_threshold:
+        prediction['filtered_result'] = 'low_confidence'
+        return prediction
+
+    # 예측 히스토리에 추가
+    history.append({
+        'class': prediction['predicted_class'],
+        'confidence': prediction['confidence']
+    })
+
+    # 안정성 체크 (최근 N개의 예측이 같은지 확인)
+    if len(history) >= stability_threshold:
+        recent_predictions = list(history)[-stability_threshold:]
+        recent_classes = [p['class'] for p in recent_predictions]
+
+        # 모두 같은 클래스인지 확인
+        if len(set(recent_classes)) == 1:
+            prediction['filtered_result'] = 'stable'
+            prediction['stable_class'] = recent_classes[0]
+            avg_confidence = np.mean([p['confidence'] for p in recent_predictions])
+            prediction['stable_confidence'] = float(avg_confidence)
+        else:
+            prediction['filtered_result'] = 'unstable'
+    else:
+        prediction['filtered_result'] = 'insufficient_history'
+
+    return prediction
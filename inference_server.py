@@ -0,0 +1,308 @@
+"""
+Multi-glove inference server with cross-session batching.
+
+``SignGloveInference`` holds one window and one prediction history, so N
+gloves meant N model instances and N separate forward passes. Here each
+connected glove is an :class:`InferenceSession` (its own SlidingWindow,
+InferenceScheduler and prediction history) and all sessions share one
+model through a :class:`BatchingEngine`: windows that become ready within
+``deadline_s`` (5 ms by default) of the first waiting one are stacked and
+run as a single batched forward pass in a worker thread, while the event
+loop keeps reading sensors.
+
+Front end (asyncio, TCP or Unix socket), one connection per glove:
+
+- optional first line ``SESSION <id>`` (default: the peer address); an id
+  that is already connected gets a ``#2``, ``#3``, ... suffix, reported in
+  the ``session`` field of its predictions;
+- then one sample per line: ``yaw,pitch,roll,flex1,flex2,flex3,flex4,flex5[,timestamp]``;
+- every model run is answered with one JSON line (``session``,
+  ``predicted_class``, ``confidence``, ``filtered_result``, ...).
+
+Run: python inference_server.py --model model.h5 --scaler scaler.pkl --config config.json --port 8765
+Benchmark: scripts/bench_inference_server.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from inference_schedule import InferenceSchedule, InferenceScheduler, filter_prediction
+from sliding_window import SENSOR_FIELDS, SlidingWindow
+
+logger = logging.getLogger(__name__)
+
+PredictFn = Callable[[np.ndarray], np.ndarray]
+
+
+class EngineStopped(RuntimeError):
+    """The batching engine was stopped while a window was waiting."""
+
+
+class BatchingEngine:
+    """Collects windows from many sessions and runs them as one batch.
+
+    ``predict_fn`` maps a ``(B, window, features)`` float32 batch of already
+    scaled windows to ``(B, classes)`` probabilities (e.g.
+    ``SignGloveInference.run_model``). It runs on a single worker thread.
+    """
+
+    def __init__(self, predict_fn: PredictFn, window_size: int, n_features: int = len(SENSOR_FIELDS),
+                 max_batch: int = 64, deadline_s: float = 0.005):
+        self.predict_fn = predict_fn
+        self.max_batch = max_batch
+        self.deadline_s = deadline_s
+        self._batch = np.zeros((max_batch, window_size, n_features), dtype=np.float32)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: List[Tuple[np.ndarray, asyncio.Future]] = []
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference-batch")
+        self.batches = 0
+        self.windows = 0
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run(), name="inference-batcher")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # 기다리던 요청들은 예외로 깨워서 연결 핸들러가 정상 종료하게 한다
+        waiting = list(self._inflight)
+        while self._queue is not None and not self._queue.empty():
+            waiting.append(self._queue.get_nowait())
+        for _, future in waiting:
+            if not future.done():
+                future.set_exception(EngineStopped("inference engine stopped"))
+        self._inflight = []
+        self._executor.shutdown(wait=True)
+
+    async def predict(self, window: np.ndarray) -> np.ndarray:
+        """Probabilities for one ``(1, window, features)`` window (copied before returning control)."""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((window.copy(), future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[np.ndarray, asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        pending = [await self._queue.get()]
+        deadline = loop.time() + self.deadline_s
+        while len(pending) < self.max_batch:
+            if not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return pending
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = self._inflight = await self._collect()
+            n = len(pending)
+            batch = self._batch[:n]
+            for i, (window, _) in enumerate(pending):
+                batch[i] = window[0]
+            try:
+                probs = await loop.run_in_executor(self._executor, self.predict_fn, batch)
+            except Exception as e:  # 한 배치의 실패는 그 배치의 요청들에만 전달
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.windows += n
+            for i, (_, future) in enumerate(pending):
+                if not future.done():
+                    future.set_result(probs[i])
+            self._inflight = []
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'batches': self.batches,
+            'windows': self.windows,
+            'mean_batch': self.windows / self.batches if self.batches else 0.0,
+        }
+
+
+class InferenceSession:
+    """Per-glove state: window, schedule and prediction history."""
+
+    def __init__(self, session_id: str, engine: BatchingEngine, window_size: int, scaler=None,
+                 class_names: Sequence[str] = (), schedule: Optional[InferenceSchedule] = None,
+                 confidence_threshold: float = 0.7, stability_threshold: int = 3,
+                 delta_scale: Optional[np.ndarray] = None):
+        self.session_id = session_id
+        self.engine = engine
+        self.window = SlidingWindow(window_size, scaler=scaler)
+        self.scheduler = InferenceScheduler(schedule, delta_scale)
+        self.prediction_history = deque(maxlen=5)
+        self.class_names = list(class_names)
+        self.confidence_threshold = confidence_threshold
+        self.stability_threshold = stability_threshold
+        self.samples = 0
+
+    async def feed(self, values: np.ndarray, timestamp: Optional[float] = None) -> Optional[Dict]:
+        """Add one raw sample (SensorData order); returns a filtered prediction when the model ran."""
+        self.samples += 1
+        self.window.append_array(values)
+        if not self.window.full:
+            return None
+        now = timestamp if timestamp is not None else time.time()
+        if not self.scheduler.observe(self.window.latest(), now):
+            return None
+        probs = await self.engine.predict(self.window.window())
+        idx = int(np.argmax(probs))
+        prediction = {
+            'session': self.session_id,
+            'predicted_class': self.class_names[idx] if self.class_names else str(idx),
+            'predicted_class_idx': idx,
+            'confidence': float(probs[idx]),
+            'timestamp': now,
+        }
+        return filter_prediction(prediction, self.prediction_history,
+                                 self.confidence_threshold, self.stability_threshold)
+
+
+class InferenceServer:
+    """asyncio front end: one connection per glove, one session per connection."""
+
+    def __init__(self, engine: BatchingEngine, window_size: int, scaler=None, class_names: Sequence[str] = (),
+                 schedule: Optional[InferenceSchedule] = None, confidence_threshold: float = 0.7,
+                 stability_threshold: int = 3, delta_scale: Optional[np.ndarray] = None):
+        """``scaler`` is applied to samples as they arrive; leave it None when ``engine`` runs a
+        model with the scaler fused in and pass its ``scale`` as ``delta_scale`` instead."""
+        self.engine = engine
+        self.window_size = window_size
+        self.scaler = scaler
+        self.class_names = list(class_names)
+        self.schedule = schedule
+        self.confidence_threshold = confidence_threshold
+        self.stability_threshold = stability_threshold
+        self.delta_scale = delta_scale
+        self.sessions: Dict[str, InferenceSession] = {}
+        self.bad_lines = 0
+
+    def open_session(self, session_id: str) -> InferenceSession:
+        """New session under ``session_id``, or ``session_id#n`` if that id is already connected."""
+        unique, n = session_id, 1
+        while unique in self.sessions:
+            n += 1
+            unique = f"{session_id}#{n}"
+        session = InferenceSession(unique, self.engine, self.window_size, self.scaler, self.class_names,
+                                   self.schedule, self.confidence_threshold, self.stability_threshold,
+                                   self.delta_scale)
+        self.sessions[unique] = session
+        return session
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = writer.get_extra_info('peername')
+        session_id = f"{peer[0]}:{peer[1]}" if isinstance(peer, tuple) else f"unix-{id(writer):x}"
+        session: Optional[InferenceSession] = None
+        values = np.zeros(len(SENSOR_FIELDS), dtype=np.float64)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if session is None:
+                    if line.startswith(b"SESSION "):
+                        session_id = line[8:].strip().decode('utf-8', 'replace') or session_id
+                        session = self.open_session(session_id)
+                        continue
+                    session = self.open_session(session_id)
+                fields = line.split(b',')
+                try:
+                    if len(fields) < len(SENSOR_FIELDS):
+                        raise ValueError
+                    for i in range(len(SENSOR_FIELDS)):
+                        values[i] = float(fields[i])
+                    timestamp = float(fields[len(SENSOR_FIELDS)]) if len(fields) > len(SENSOR_FIELDS) else None
+                except ValueError:
+                    self.bad_lines += 1
+                    continue
+                result = await session.feed(values, timestamp)
+                if result is not None:
+                    writer.write(json.dumps(result, ensure_ascii=False).encode('utf-8') + b"\n")
+                    await writer.drain()
+        except (ConnectionResetError, BrokenPipeError, EngineStopped):
+            pass
+        finally:
+            if session is not None and self.sessions.get(session.session_id) is session:
+                del self.sessions[session.session_id]
+            writer.close()
+
+    async def serve_tcp(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.base_events.Server:
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def serve_unix(self, path: str) -> asyncio.base_events.Server:
+        return await asyncio.start_unix_server(self.handle_connection, path)
+
+
+async def _serve(args):
+    from inference import SignGloveInference
+
+    inference = SignGloveInference(args.model, args.scaler, args.config, window_size=args.window,
+                                   fuse_scaler=args.fuse_scaler)
+    engine = BatchingEngine(inference.run_model, args.window, max_batch=args.max_batch,
+                            deadline_s=args.deadline_ms / 1000.0)
+    await engine.start()
+    server = InferenceServer(engine, args.window, None if inference.scaler_fused else inference.scaler,
+                             inference.class_names, inference.scheduler.schedule,
+                             inference.confidence_threshold, inference.stability_threshold,
+                             inference.scheduler.delta_scale)
+    if args.unix:
+        listener = await server.serve_unix(args.unix)
+        logger.info(f"추론 서버 시작: unix:{args.unix}")
+    else:
+        listener = await server.serve_tcp(args.host, args.port)
+        logger.info(f"추론 서버 시작: {args.host}:{args.port}")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await engine.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve SignGlove inference to many gloves with batched forward passes.")
+    parser.add_argument("--model", required=True)
+    parser.add_argument("--scaler", default=None)
+    parser.add_argument("--config", default=None)
+    parser.add_argument("--window", type=int, default=30)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="Listen on this Unix socket path instead of TCP.")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--deadline-ms", type=float, default=5.0)
+    parser.add_argument("--fuse-scaler", action="store_true",
+                        help="Apply the scaler inside the batched model call instead of per sample.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -13,43 +13,19 @@ import serial
 import threading
 import numpy as np
 import h5py
-import csv
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Optional
 from collections import defaultdict
-from dataclasses import dataclass, asdict
 import json
 import queue
 import termios
 import tty
 
-
-@dataclass
-class SignGloveSensorReading:
-    """SignGlove 센서 읽기 데이터 구조"""
-    timestamp_ms: int           # 아두이노 millis() 타임스탬프
-    recv_timestamp_ms: int      # PC 수신 타임스탬프
-    
-    # IMU 데이터 (자이로스코프 - 오일러 각도)
-    pitch: float               # Y축 회전 (도)
-    roll: float                # X축 회전 (도) 
-    yaw: float                 # Z축 회전 (도)
-    
-    # 플렉스 센서 데이터 (ADC 값)
-    flex1: int                 # 엄지 (0-1023)
-    flex2: int                 # 검지 (0-1023)
-    flex3: int                 # 중지 (0-1023)
-    flex4: int                 # 약지 (0-1023)
-    flex5: int                 # 소지 (0-1023)
-    
-    # 계산된 Hz (실제 측정 주기)
-    sampling_hz: float
-    
-    # 가속도 데이터 (IMU에서 실제 측정)
-    accel_x: float         # X축 가속도 (g)
-    accel_y: float         # Y축 가속도 (g)
-    accel_z: float         # Z축 가속도 (g)
+# 저장소 루트의 공용 모듈 사용 (python integration/signglove_unified_collector.py 직접 실행 대비)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from sensor_records import EpisodeBuffer, SignGloveSensorReading
+from serial_stream import LineFramer
 
 
 class SignGloveUnifiedCollector:
@@ -110,7 +86,7 @@ class SignGloveUnifiedCollector:
         # 수집 상태 변수
         self.collecting = False
         self.current_class = None
-        self.episode_data = []
+        self.episode_data = EpisodeBuffer(300)  # 에피소드 샘플 (컬럼 배열, 길어지면 2배씩 확장)
         self.episode_start_time = None
         self.sample_count = 0
         
@@ -119,6 +95,7 @@ class SignGloveUnifiedCollector:
         self.serial_thread = None
         self.data_queue = queue.Queue()
         self.stop_event = threading.Event()
+        self.line_framer = LineFramer()  # read(n) 청크 → 라인 배치 분리
         
         # 통계 추적
         self.collection_stats = defaultdict(int)
@@ -247,6 +224,7 @@ class SignGloveUnifiedCollector:
             self.serial_thread.join(timeout=2)
             
         self.stop_event.clear()
+        self.line_framer.reset()
         self.serial_thread = threading.Thread(target=self._data_reception_worker, daemon=True)
         self.serial_thread.start()
         print("📡 데이터 수신 스레드 시작됨")
@@ -260,8 +238,8 @@ class SignGloveUnifiedCollector:
                 if not self.serial_port or not self.serial_port.is_open:
                     break
                     
-                if self.serial_port.in_waiting > 0:
-                    line = self.serial_port.readline().decode('utf-8', errors='ignore').strip()
+                for raw in self.line_framer.read_from(self.serial_port):
+                    line = raw.decode('utf-8', errors='ignore').strip()
                     
                     if not line or line.startswith('#'):
                         continue
@@ -391,7 +369,7 @@ class SignGloveUnifiedCollector:
             return
             
         self.current_class = class_name
-        self.episode_data = []
+        self.episode_data.clear()
         self.collecting = True
         self.episode_start_time = time.time()
         self.sample_count = 0
@@ -456,30 +434,15 @@ class SignGloveUnifiedCollector:
         filename = f"episode_{timestamp}_{self.current_class}.h5"
         save_path = self.data_dir / filename
         
-        # 데이터 변환
-        timestamps = []
-        arduino_timestamps = []
-        sampling_rates = []
-        flex_data = []
-        orientation_data = []
-        accel_data = []
-        
-        for reading in self.episode_data:
-            timestamps.append(reading.recv_timestamp_ms)
-            arduino_timestamps.append(reading.timestamp_ms)
-            sampling_rates.append(reading.sampling_hz)
-            
-            flex_data.append([reading.flex1, reading.flex2, reading.flex3, reading.flex4, reading.flex5])
-            orientation_data.append([reading.pitch, reading.roll, reading.yaw])
-            accel_data.append([reading.accel_x, reading.accel_y, reading.accel_z])
-            
-        # numpy 배열로 변환
-        timestamps = np.array(timestamps, dtype=np.int64)
-        arduino_timestamps = np.array(arduino_timestamps, dtype=np.int64)
-        sampling_rates = np.array(sampling_rates, dtype=np.float32)
-        flex_data = np.array(flex_data, dtype=np.float32)
-        orientation_data = np.array(orientation_data, dtype=np.float32)
-        accel_data = np.array(accel_data, dtype=np.float32)
+        # 데이터 변환 (EpisodeBuffer 컬럼 뷰 → float32)
+        episode = self.episode_data
+        timestamps = episode.timestamps
+        arduino_timestamps = episode.arduino_timestamps
+        sampling_rates = episode.sampling_rates.astype(np.float32)
+        sensor_data = episode.sensor_data.astype(np.float32)
+        flex_data = sensor_data[:, :5]
+        orientation_data = sensor_data[:, 5:]
+        accel_data = episode.accel.astype(np.float32)
         
         # H5 파일 저장 (KLP-SignGlove 호환 형식)
         with h5py.File(save_path, 'w') as f:
@@ -498,7 +461,6 @@ class SignGloveUnifiedCollector:
             f.create_dataset('sampling_rates', data=sampling_rates, compression='gzip')
             
             # 메인 센서 데이터 (8채널: flex5개 + orientation3개)
-            sensor_data = np.concatenate([flex_data, orientation_data], axis=1)
             f.create_dataset('sensor_data', data=sensor_data, compression='gzip')
             
             # 개별 데이터 그룹
@@ -531,7 +493,7 @@ class SignGloveUnifiedCollector:
                 with open(self.progress_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     self.collection_stats = defaultdict(int, data.get('collection_stats', {}))
-                print(f"📊 수집 진행상황 로드 완료")
+                print("📊 수집 진행상황 로드 완료")
             else:
                 self.collection_stats = defaultdict(int)
                 print("📊 새로운 수집 진행상황 시작")
@@ -0,0 +1,18 @@
+"""
+The 34 Korean Sign Language classes collected by SignGlove.
+
+``KSL_CLASSES`` is the label order: ``label_idx`` in episode files, session
+stores and the training/evaluation scripts is an index into it. The
+collector (``ser.py``) builds its class list from ``KSL_CATEGORIES``.
+"""
+
+from typing import Dict, Tuple
+
+KSL_CATEGORIES: Dict[str, Tuple[str, ...]] = {
+    "consonants": ("ㄱ", "ㄴ", "ㄷ", "ㄹ", "ㅁ", "ㅂ", "ㅅ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"),
+    "vowels": ("ㅏ", "ㅑ", "ㅓ", "ㅕ", "ㅗ", "ㅛ", "ㅜ", "ㅠ", "ㅡ", "ㅣ"),
+    "numbers": tuple(str(i) for i in range(10)),
+}
+
+# 자음 14, 모음 10, 숫자 10
+KSL_CLASSES: Tuple[str, ...] = tuple(name for names in KSL_CATEGORIES.values() for name in names)
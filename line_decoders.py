@@ -0,0 +1,225 @@
+"""
+Pluggable decoders for the text line formats the glove firmwares send.
+
+- ``csv`` (default): imu_flex_serial.ino ``printCsvRow`` rows, parsed by
+  ``sensor_records.parse_csv_lines`` (field count must be one of ``layouts``);
+- ``json``: sensor_transmit.ino ``printJsonRow``, one JSON object per line
+  (``timestamp`` in seconds, ``yaw``/``pitch``/``roll``, ``flex1``-``flex5``,
+  optional ``accel_x``/``accel_y``/``accel_z``), parsed with orjson, else
+  simdjson, else the stdlib ``json`` (``JSON_BACKEND``);
+- ``auto``: picks one of the two from the first data lines it sees and
+  switches again only when a whole batch fails to decode (firmware swapped).
+
+Every decoder has the ``parse_csv_lines`` contract:
+``decode(lines, recv_timestamp_ms, last_arduino_ms) -> (records, valid)``
+with ``READING_DTYPE`` records, plus ``matches(line)`` telling whether a
+line looks like its format (used to warn about rows that fail to parse).
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from operator import itemgetter
+from typing import Callable, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from sensor_records import READING_DTYPE, READING_FIELDS, flex_fits, parse_csv_lines, timestamp_hz
+
+DecodeResult = Tuple[np.ndarray, np.ndarray]
+
+# JSON key → READING_FIELDS column ('timestamp' is seconds → timestamp_ms)
+_JSON_KEYS = ('timestamp', 'pitch', 'roll', 'yaw', 'flex1', 'flex2', 'flex3', 'flex4', 'flex5')
+_JSON_ACCEL_KEYS = ('accel_x', 'accel_y', 'accel_z')
+_COLUMN = {name: i for i, name in enumerate(READING_FIELDS)}
+_JSON_COLUMNS = [_COLUMN['timestamp_ms']] + [_COLUMN[key] for key in _JSON_KEYS[1:]]
+_JSON_ACCEL_COLUMNS = [_COLUMN[key] for key in _JSON_ACCEL_KEYS]
+_JSON_FLEX = slice(_JSON_KEYS.index('flex1'), _JSON_KEYS.index('flex5') + 1)
+_json_values = itemgetter(*_JSON_KEYS)
+
+
+def json_backend(name: Optional[str] = None) -> Tuple[str, Callable[[bytes], object]]:
+    """``(name, loads)`` of the requested JSON parser, or the fastest one installed."""
+    if name in (None, 'orjson'):
+        try:
+            import orjson
+            return 'orjson', orjson.loads
+        except ImportError:
+            if name:
+                raise
+    if name in (None, 'simdjson'):
+        try:
+            import simdjson
+            return 'simdjson', simdjson.loads
+        except ImportError:
+            if name:
+                raise
+    if name in (None, 'json'):
+        return 'json', json.loads
+    raise ValueError(f"unknown JSON backend: {name}")
+
+
+JSON_BACKEND = json_backend()[0]
+
+
+def _records_from_table(table: np.ndarray) -> np.ndarray:
+    records = np.empty(len(table), dtype=READING_DTYPE)
+    for name, column in zip(READING_FIELDS, table.T):
+        records[name] = column
+    return records
+
+
+class CsvDecoder:
+    """Comma-separated rows of the given field counts (``CSV_LAYOUTS`` keys)."""
+
+    name = 'csv'
+
+    def __init__(self, layouts: Sequence[int] = (12,)):
+        self.layouts = tuple(layouts)
+
+    def matches(self, line: bytes) -> bool:
+        return line[:1] != b'{' and line.count(b',') + 1 in self.layouts
+
+    def decode(self, lines: Iterable[bytes], recv_timestamp_ms: Optional[int] = None,
+               last_arduino_ms: Optional[int] = None) -> DecodeResult:
+        return parse_csv_lines(lines, recv_timestamp_ms, last_arduino_ms, self.layouts)
+
+
+class JsonDecoder:
+    """JSON Lines from sensor_transmit.ino."""
+
+    name = 'json'
+
+    def __init__(self, backend: Optional[str] = None):
+        self.backend, self._loads = json_backend(backend)
+
+    def matches(self, line: bytes) -> bool:
+        return line[:1] == b'{'
+
+    def _load_objects(self, lines: Sequence[bytes]) -> Tuple[list, list]:
+        """``(objects, indices)`` of the lines that parse to JSON objects."""
+        # 배치를 '[...]' 하나로 묶어 loads 한 번에 파싱해도 dict 생성 비용이 대부분이라 빨라지지 않음
+        loads = self._loads
+        objects, indices = [], []
+        for i, line in enumerate(lines):
+            if line[:1] != b'{':
+                continue
+            try:
+                obj = loads(line)
+            except ValueError:
+                continue
+            if type(obj) is dict:
+                objects.append(obj)
+                indices.append(i)
+        return objects, indices
+
+    def decode(self, lines: Iterable[bytes], recv_timestamp_ms: Optional[int] = None,
+               last_arduino_ms: Optional[int] = None) -> DecodeResult:
+        lines = [line.strip() for line in lines]
+        n = len(lines)
+        table = np.zeros((n, len(READING_FIELDS)), dtype=np.float64)
+        valid = np.zeros(n, dtype=bool)
+        if n == 0:
+            return np.zeros(0, dtype=READING_DTYPE), valid
+
+        if recv_timestamp_ms is None:
+            recv_timestamp_ms = int(time.time() * 1000)
+        table[:, _COLUMN['recv_timestamp_ms']] = recv_timestamp_ms
+
+        objects, idx = self._load_objects(lines)
+        try:
+            rows = list(map(_json_values, objects))
+        except KeyError:
+            keep = [k for k, obj in enumerate(objects) if all(key in obj for key in _JSON_KEYS)]
+            objects, idx = [objects[k] for k in keep], [idx[k] for k in keep]
+            rows = list(map(_json_values, objects))
+
+        columns = _JSON_COLUMNS
+        if any(_JSON_ACCEL_KEYS[0] in obj for obj in objects):
+            rows = [values + (obj.get('accel_x', 0.0), obj.get('accel_y', 0.0), obj.get('accel_z', 0.0))
+                    for values, obj in zip(rows, objects)]
+            columns = _JSON_COLUMNS + _JSON_ACCEL_COLUMNS
+
+        if idx:
+            try:
+                matrix = np.array(rows, dtype=np.float64)
+            except (ValueError, TypeError):
+                # Slow path: drop rows with non-numeric values (e.g. strings), then convert the rest.
+                good = [k for k, values in enumerate(rows) if _is_numeric(values)]
+                idx = [idx[k] for k in good]
+                matrix = np.array([rows[k] for k in good], dtype=np.float64).reshape(len(good), len(columns))
+            # null은 nan으로 변환됨; flex는 CSV와 같이 int16 정수만 허용
+            ok = np.isfinite(matrix).all(axis=1) & flex_fits(matrix[:, _JSON_FLEX])
+            if not ok.all():
+                idx = [i for i, keep in zip(idx, ok) if keep]
+                matrix = matrix[ok]
+            matrix[:, 0] = np.round(matrix[:, 0] * 1000.0)
+            table[np.ix_(idx, columns)] = matrix
+            valid[idx] = True
+
+        table[valid, _COLUMN['sampling_hz']] = timestamp_hz(table[valid, 0], last_arduino_ms)
+        return _records_from_table(table), valid
+
+
+def _is_numeric(values: tuple) -> bool:
+    try:
+        for value in values:
+            float(value)
+    except (ValueError, TypeError):
+        return False
+    return True
+
+
+LineDecoder = Union[CsvDecoder, JsonDecoder, "AutoDecoder"]
+
+
+class AutoDecoder:
+    """Detect CSV or JSON lines from the first data lines and decode with that decoder."""
+
+    name = 'auto'
+
+    def __init__(self, layouts: Sequence[int] = (12,), backend: Optional[str] = None):
+        self.candidates = (CsvDecoder(layouts), JsonDecoder(backend))
+        self.decoder: Optional[LineDecoder] = None
+
+    def matches(self, line: bytes) -> bool:
+        return any(candidate.matches(line) for candidate in self.candidates)
+
+    def detect(self, lines: Sequence[bytes]) -> Optional[LineDecoder]:
+        """The candidate matching most of the non-blank, non-comment lines, if any matches."""
+        data = [line.strip() for line in lines]
+        data = [line for line in data if line and not line.startswith(b'#')]
+        best, best_count = None, 0
+        for candidate in self.candidates:
+            count = sum(map(candidate.matches, data))
+            if count > best_count:
+                best, best_count = candidate, count
+        return best
+
+    def decode(self, lines: Iterable[bytes], recv_timestamp_ms: Optional[int] = None,
+               last_arduino_ms: Optional[int] = None) -> DecodeResult:
+        lines = list(lines)
+        if self.decoder is None:
+            self.decoder = self.detect(lines)
+            if self.decoder is None:
+                return self.candidates[0].decode(lines, recv_timestamp_ms, last_arduino_ms)
+        records, valid = self.decoder.decode(lines, recv_timestamp_ms, last_arduino_ms)
+        if lines and not valid.any():
+            other = self.detect(lines)
+            if other is not None and other is not self.decoder:
+                self.decoder = other
+                records, valid = other.decode(lines, recv_timestamp_ms, last_arduino_ms)
+        return records, valid
+
+
+def make_line_decoder(fmt: str = 'csv', layouts: Sequence[int] = (12,),
+                      backend: Optional[str] = None) -> LineDecoder:
+    """Decoder for ``'csv'``, ``'json'`` or ``'auto'``."""
+    if fmt == 'csv':
+        return CsvDecoder(layouts)
+    if fmt == 'json':
+        return JsonDecoder(backend)
+    if fmt == 'auto':
+        return AutoDecoder(layouts, backend)
+    raise ValueError(f"unknown line format: {fmt}")
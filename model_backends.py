@@ -0,0 +1,185 @@
+"""
+Inference backends for SignGloveInference.
+
+Loading the trained model through ``tf.keras.models.load_model`` pulls in
+all of TensorFlow and pays Keras per-call overhead. A backend wraps one
+exported model file behind the same call, ``backend(batch) -> probs`` for a
+scaled ``(B, window, 8)`` float32 batch:
+
+- ``keras``: the Keras model behind a tf.function with a fixed input
+  signature (``.h5`` / ``.keras`` / SavedModel directory);
+- ``tflite``: a ``.tflite`` file on ``tflite_runtime`` (or ``tf.lite`` when
+  only TensorFlow is installed), float32/float16/int8-quantized weights;
+- ``onnx``: a ``.onnx`` file on ONNX Runtime (CPU).
+
+Each runtime is imported only when its backend is loaded. Produce the
+files with ``model_export.py``.
+
+With :meth:`set_input_affine` a backend also takes over the StandardScaler:
+it is given raw windows and applies ``(x - mean) / scale`` itself, inside
+the tf.function for Keras and as one vectorized op on the whole batch for
+TFLite/ONNX (whose files can instead carry it as a layer, see
+``model_export.py --fuse-scaler``).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+BACKENDS = ('keras', 'tflite', 'onnx')
+
+Affine = Tuple[np.ndarray, np.ndarray]
+
+
+class _InputAffine:
+    """Optional per-feature ``(x - mean) / scale`` applied to every batch before the model."""
+
+    _mean: Optional[np.ndarray] = None
+    _inv_scale: Optional[np.ndarray] = None
+
+    @property
+    def input_affine(self) -> Optional[Affine]:
+        if self._mean is None:
+            return None
+        return self._mean, 1.0 / self._inv_scale
+
+    def set_input_affine(self, affine: Optional[Affine]):
+        """Scale raw batches with ``affine = (mean, scale)`` from now on (None: batches are already scaled)."""
+        if affine is None:
+            self._mean = self._inv_scale = None
+        else:
+            mean, scale = affine
+            self._mean = np.asarray(mean, dtype=np.float32)
+            self._inv_scale = (1.0 / np.asarray(scale, dtype=np.float64)).astype(np.float32)
+
+    def _scale_input(self, batch: np.ndarray) -> np.ndarray:
+        if self._mean is None:
+            return batch
+        out = np.subtract(batch, self._mean, dtype=np.float32)
+        out *= self._inv_scale
+        return out
+
+
+class KerasBackend(_InputAffine):
+    name = 'keras'
+
+    def __init__(self, model_path: str, compiled: bool = True):
+        import tensorflow as tf
+
+        self._tf = tf
+        self.model = tf.keras.models.load_model(model_path)
+        self.input_shape: Tuple = tuple(self.model.input_shape)
+        self.output_shape: Tuple = tuple(self.model.output_shape)
+        self._compiled = compiled
+        self._forward = None
+        if compiled:
+            self._build_forward()
+
+    def _build_forward(self):
+        # 배치 차원만 None으로 열어 둔 고정 시그니처: 한 번만 트레이스
+        tf = self._tf
+        model = self.model
+        spec = tf.TensorSpec(shape=(None,) + self.input_shape[1:], dtype=tf.float32)
+        if self._mean is None:
+            @tf.function(input_signature=[spec])
+            def forward(x):
+                return model(x, training=False)
+        else:
+            # 스케일러를 그래프 상수로 접어 넣어 원시 윈도우 → 확률을 한 번에 계산
+            mean = tf.constant(self._mean)
+            inv_scale = tf.constant(self._inv_scale)
+
+            @tf.function(input_signature=[spec])
+            def forward(x):
+                return model((x - mean) * inv_scale, training=False)
+
+        self._forward = forward
+
+    def set_input_affine(self, affine: Optional[Affine]):
+        super().set_input_affine(affine)
+        if self._compiled:
+            self._build_forward()
+
+    @property
+    def compiled(self) -> bool:
+        return self._forward is not None
+
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        if self._forward is None:
+            return self.model.predict(self._scale_input(batch), verbose=0)
+        return self._forward(self._tf.convert_to_tensor(batch, dtype=self._tf.float32)).numpy()
+
+
+class TFLiteBackend(_InputAffine):
+    name = 'tflite'
+
+    def __init__(self, model_path: str, num_threads: Optional[int] = None):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+        self.interpreter = Interpreter(model_path=str(model_path), num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self.input_shape = (None,) + tuple(int(d) for d in self._input['shape'][1:])
+        self.output_shape = (None,) + tuple(int(d) for d in self._output['shape'][1:])
+        self._batch = int(self._input['shape'][0])
+
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        batch = np.ascontiguousarray(self._scale_input(batch), dtype=self._input['dtype'])
+        if len(batch) != self._batch:
+            # 배치 크기가 바뀔 때만 텐서 재할당
+            self.interpreter.resize_tensor_input(self._input['index'], batch.shape)
+            self.interpreter.allocate_tensors()
+            self._batch = len(batch)
+        self.interpreter.set_tensor(self._input['index'], batch)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self._output['index']).copy()
+
+
+class OnnxBackend(_InputAffine):
+    name = 'onnx'
+
+    def __init__(self, model_path: str, num_threads: Optional[int] = None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(str(model_path), options, providers=['CPUExecutionProvider'])
+        inp, out = self.session.get_inputs()[0], self.session.get_outputs()[0]
+        self._input_name, self._output_name = inp.name, out.name
+        self.input_shape = (None,) + tuple(d if isinstance(d, int) else None for d in inp.shape[1:])
+        self.output_shape = (None,) + tuple(d if isinstance(d, int) else None for d in out.shape[1:])
+
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        batch = np.ascontiguousarray(self._scale_input(batch), dtype=np.float32)
+        return self.session.run([self._output_name], {self._input_name: batch})[0]
+
+
+def detect_backend(model_path: str) -> str:
+    suffix = Path(model_path).suffix.lower()
+    if suffix == '.tflite':
+        return 'tflite'
+    if suffix == '.onnx':
+        return 'onnx'
+    return 'keras'
+
+
+def load_backend(model_path: str, backend: str = 'auto', compiled: bool = True,
+                 num_threads: Optional[int] = None):
+    """Load ``model_path`` on ``backend`` ('auto' picks by file extension)."""
+    if backend == 'auto':
+        backend = detect_backend(model_path)
+    if backend == 'keras':
+        return KerasBackend(model_path, compiled=compiled)
+    if backend == 'tflite':
+        return TFLiteBackend(model_path, num_threads=num_threads)
+    if backend == 'onnx':
+        return OnnxBackend(model_path, num_threads=num_threads)
+    raise ValueError(f"unknown backend {backend!r} (choose from auto, {', '.join(BACKENDS)})")
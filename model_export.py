@@ -0,0 +1,223 @@
+"""
+Export the trained Keras model for lightweight CPU inference and check parity.
+
+Formats (``--formats``):
+
+- ``tflite``: float32 TFLite flatbuffer;
+- ``tflite-fp16``: float16 weights (half the size, computed in float32);
+- ``tflite-int8``: full-integer weights/activations with float32 input and
+  output, calibrated on recorded windows (``--calibration`` of them);
+- ``onnx``: ONNX via tf2onnx (``--opset``).
+
+Every exported file is loaded on its model_backends backend and compared
+with the Keras model on held-out windows from the recorded dataset (every
+``--holdout``-th episode, windows built with stride tricks and scaled with
+the model's scaler): max |Δprob| and top-1 agreement must stay within the
+tolerance of the format, otherwise the command exits with status 1.
+
+With ``--fuse-scaler`` the StandardScaler is baked into every exported file
+as a leading Normalization layer (``model_fused*.tflite`` /
+``model_fused.onnx``): those take raw windows, so they are loaded without a
+scaler and checked on raw windows against the Keras model on scaled ones.
+The Keras backend's in-graph fusion (``SignGloveInference(...,
+fuse_scaler=True)``) is checked the same way.
+
+Run: python model_export.py --model model.h5 --scaler scaler.pkl --out-dir exported
+Then: SignGloveInference('exported/model_fp16.tflite', ..., backend='auto')
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from model_backends import KerasBackend, load_backend
+from signglove_dataset import SignGloveDataset
+from sliding_window import SENSOR_DATA_TO_MODEL, scaler_affine
+
+Affine = Tuple[np.ndarray, np.ndarray]
+
+EXPORT_FORMATS = ('tflite', 'tflite-fp16', 'tflite-int8', 'onnx')
+
+# format -> (file name, max |Δprob|, min top-1 agreement)
+FORMAT_TARGETS: Dict[str, Tuple[str, float, float]] = {
+    'tflite': ('model.tflite', 1e-4, 0.999),
+    'tflite-fp16': ('model_fp16.tflite', 1e-2, 0.99),
+    'tflite-int8': ('model_int8.tflite', 1e-1, 0.95),
+    'onnx': ('model.onnx', 1e-4, 0.999),
+}
+
+
+def recorded_windows(root: Path, window: int, scaler=None, stride: int = 1, holdout: int = 5,
+                     held_out: bool = True, limit: Optional[int] = None) -> np.ndarray:
+    """Scaled ``(N, window, 8)`` float32 windows from every ``holdout``-th episode (or all the others)."""
+    affine = scaler_affine(scaler, len(SENSOR_DATA_TO_MODEL))
+    chunks, total, k = [], 0, 0
+    for sensor_batch, _, _ in SignGloveDataset(root, prefetch=0):
+        for sensor in sensor_batch:
+            take = (k % holdout == 0) == held_out
+            k += 1
+            if not take or len(sensor) < window:
+                continue
+            rows = sensor[:, SENSOR_DATA_TO_MODEL].astype(np.float64)
+            if affine is not None:
+                rows = (rows - affine[0]) / affine[1]
+            elif scaler is not None:
+                rows = scaler.transform(rows)
+            windows = np.lib.stride_tricks.sliding_window_view(rows, window, axis=0)[::stride]
+            chunks.append(windows.transpose(0, 2, 1).astype(np.float32))
+            total += len(chunks[-1])
+            if limit and total >= limit:
+                return np.concatenate(chunks)[:limit]
+    if not chunks:
+        return np.zeros((0, window, len(SENSOR_DATA_TO_MODEL)), dtype=np.float32)
+    return np.concatenate(chunks)
+
+
+def fuse_scaler(model, affine: Affine):
+    """Keras model taking raw windows: ``(x - mean) / scale`` as a Normalization layer in front of ``model``."""
+    import tensorflow as tf
+
+    mean, scale = affine
+    inputs = tf.keras.Input(shape=tuple(model.input_shape[1:]), name="raw_window")
+    scaled = tf.keras.layers.Normalization(axis=-1, mean=mean, variance=np.square(scale), name="scaler")(inputs)
+    return tf.keras.Model(inputs, model(scaled), name=f"{model.name}_fused")
+
+
+def export_tflite(model, out_path: Path, quantize: str = 'none',
+                  calibration: Optional[np.ndarray] = None) -> Path:
+    """Convert a Keras model to TFLite; ``quantize`` is 'none', 'float16' or 'int8'."""
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if quantize == 'float16':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantize == 'int8':
+        if calibration is None or not len(calibration):
+            raise ValueError("int8 quantization needs calibration windows")
+
+        def representative() -> Iterator:
+            for window in calibration:
+                yield [window[np.newaxis]]
+
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        # 입출력은 float32 그대로 두어 추론 경로가 양자화 파라미터를 몰라도 되게 한다
+    out_path.write_bytes(converter.convert())
+    return out_path
+
+
+def export_onnx(model, out_path: Path, opset: int = 13) -> Path:
+    import tensorflow as tf
+    import tf2onnx
+
+    spec = (tf.TensorSpec((None,) + tuple(model.input_shape[1:]), tf.float32, name="window"),)
+    tf2onnx.convert.from_keras(model, input_signature=spec, opset=opset, output_path=str(out_path))
+    return out_path
+
+
+def parity(reference: np.ndarray, candidate: np.ndarray) -> Tuple[float, float]:
+    """``(max |Δprob|, top-1 agreement)``."""
+    diff = float(np.abs(reference - candidate).max()) if len(reference) else 0.0
+    agree = float((reference.argmax(axis=1) == candidate.argmax(axis=1)).mean()) if len(reference) else 1.0
+    return diff, agree
+
+
+def run_batches(backend, windows: np.ndarray, batch_size: int = 256) -> np.ndarray:
+    return np.concatenate([backend(windows[i:i + batch_size]) for i in range(0, len(windows), batch_size)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the SignGlove model to TFLite/ONNX and check parity.")
+    parser.add_argument("--model", required=True)
+    parser.add_argument("--scaler", default=None)
+    parser.add_argument("--out-dir", type=Path, default=Path("exported"))
+    parser.add_argument("--formats", nargs="+", default=list(EXPORT_FORMATS), choices=EXPORT_FORMATS)
+    parser.add_argument("--data-dir", type=Path, default=Path("datasets/unified"))
+    parser.add_argument("--holdout", type=int, default=5, help="Every N-th episode is held out for the parity check.")
+    parser.add_argument("--max-windows", type=int, default=5000)
+    parser.add_argument("--calibration", type=int, default=500, help="Windows for int8 calibration.")
+    parser.add_argument("--opset", type=int, default=13)
+    parser.add_argument("--fuse-scaler", action="store_true",
+                        help="Bake the scaler into the exported models (they then take raw windows).")
+    args = parser.parse_args()
+
+    keras = KerasBackend(args.model)
+    window = int(keras.input_shape[1])
+    scaler = None
+    if args.scaler:
+        import joblib
+        scaler = joblib.load(args.scaler)
+    affine = scaler_affine(scaler, len(SENSOR_DATA_TO_MODEL)) if args.fuse_scaler else None
+    if args.fuse_scaler and affine is None:
+        print("❌ --fuse-scaler needs a StandardScaler (--scaler) with mean_/scale_")
+        sys.exit(1)
+
+    held_out = recorded_windows(args.data_dir, window, scaler, stride=1, holdout=args.holdout,
+                                limit=args.max_windows)
+    if not len(held_out):
+        print(f"❌ no windows of length {window} under {args.data_dir}")
+        sys.exit(1)
+    reference = run_batches(keras, held_out)
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    inputs, export_model = held_out, keras.model
+    if affine is not None:
+        # 같은 창들의 원시 값
+        inputs = recorded_windows(args.data_dir, window, None, stride=1, holdout=args.holdout,
+                                  limit=args.max_windows)
+        export_model = fuse_scaler(keras.model, affine)
+
+    print(f"model: {args.model}  window: {window}  held-out windows: {len(held_out)}"
+          f"{'  (scaler fused, raw inputs)' if affine is not None else ''}")
+    print(f"{'format':<13}{'file':<20}{'KiB':>8}{'max |Δp|':>11}{'top-1':>8}{'ms/batch':>10}  result")
+    failed = False
+    if affine is not None:
+        keras.set_input_affine(affine)
+        diff, agree = parity(reference, run_batches(keras, inputs))
+        keras.set_input_affine(None)
+        ok = diff <= 1e-4 and agree >= 0.999
+        failed |= not ok
+        print(f"{'keras-fused':<13}{'(tf.function)':<20}{'':>8}{diff:>11.2e}{agree:>8.3f}{'':>10}"
+              f"  {'✅' if ok else '❌ (limits 0.0001, 0.999)'}")
+    for fmt in args.formats:
+        name, max_diff, min_agree = FORMAT_TARGETS[fmt]
+        if affine is not None:
+            name = name.replace('model', 'model_fused', 1)
+        path = args.out_dir / name
+        try:
+            if fmt == 'onnx':
+                export_onnx(export_model, path, args.opset)
+            else:
+                calibration = None
+                if fmt == 'tflite-int8':
+                    calibration = recorded_windows(args.data_dir, window, None if affine is not None else scaler,
+                                                   stride=7, holdout=args.holdout, held_out=False,
+                                                   limit=args.calibration)
+                export_tflite(export_model, path, {'tflite': 'none', 'tflite-fp16': 'float16',
+                                                  'tflite-int8': 'int8'}[fmt], calibration)
+            backend = load_backend(str(path))
+            t0 = time.perf_counter()
+            probs = run_batches(backend, inputs)
+            ms_per_batch = (time.perf_counter() - t0) * 1000 / max(1, -(-len(inputs) // 256))
+        except Exception as e:  # 변환기/런타임 미설치 등
+            print(f"{fmt:<13}{name:<20}{'':>8}{'':>11}{'':>8}{'':>10}  ❌ {type(e).__name__}: {e}")
+            failed = True
+            continue
+        diff, agree = parity(reference, probs)
+        ok = diff <= max_diff and agree >= min_agree
+        failed |= not ok
+        print(f"{fmt:<13}{name:<20}{path.stat().st_size / 1024:>8.0f}{diff:>11.2e}{agree:>8.3f}{ms_per_batch:>10.2f}"
+              f"  {'✅' if ok else f'❌ (limits {max_diff:g}, {min_agree:g})'}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
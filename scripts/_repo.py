@@ -0,0 +1,15 @@
+"""
+Shared setup for the scripts in this directory.
+
+Scripts run as ``python scripts/<name>.py`` have ``scripts/`` on
+``sys.path`` but not the repository root, where the collector modules
+live. ``from _repo import REPO_ROOT`` puts the root on the path once.
+"""
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
@@ -0,0 +1,141 @@
+"""
+Benchmark sensor_records.parse_csv_lines against the per-line parser.
+
+The per-line path is the one the collectors used in _data_reception_worker:
+decode, split(','), float()/int() per field and one SignGloveSensorReading
+dataclass per row. The batch path parses the same lines into one structured
+array. Lines come from a recorded capture (--csv, 9 or 12 fields) or are
+synthesised as 12-field rows.
+
+Run: python scripts/bench_batch_parser.py --rows 20000
+     python scripts/bench_batch_parser.py --csv imu_flex_20250813_145850.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+import _repo  # noqa: F401  (저장소 루트를 sys.path에 추가)
+
+from sensor_records import CSV_LAYOUTS, parse_csv_lines  # noqa: E402
+
+
+@dataclass
+class SignGloveSensorReading:
+    timestamp_ms: int
+    recv_timestamp_ms: int
+    pitch: float
+    roll: float
+    yaw: float
+    flex1: int
+    flex2: int
+    flex3: int
+    flex4: int
+    flex5: int
+    sampling_hz: float
+    accel_x: float = 0.0
+    accel_y: float = 0.0
+    accel_z: float = 0.0
+
+
+def parse_per_line(lines: List[bytes], recv_ms: int) -> List[SignGloveSensorReading]:
+    out = []
+    last = None
+    for raw in lines:
+        line = raw.decode('utf-8', errors='ignore').strip()
+        if not line or line.startswith('#'):
+            continue
+        parts = line.split(',')
+        try:
+            ts = int(float(parts[0]))
+            hz = 0.0
+            if last is not None:
+                hz = 1000.0 / max(1, ts - last)
+            last = ts
+            if len(parts) == 12:
+                out.append(SignGloveSensorReading(
+                    ts, recv_ms, float(parts[1]), float(parts[2]), float(parts[3]),
+                    int(parts[7]), int(parts[8]), int(parts[9]), int(parts[10]), int(parts[11]),
+                    hz, float(parts[4]), float(parts[5]), float(parts[6])))
+            elif len(parts) == 9:
+                out.append(SignGloveSensorReading(
+                    ts, recv_ms, float(parts[1]), float(parts[2]), float(parts[3]),
+                    int(parts[4]), int(parts[5]), int(parts[6]), int(parts[7]), int(parts[8]), hz))
+        except (ValueError, IndexError):
+            continue
+    return out
+
+
+def synth_lines(n: int, seed: int) -> List[bytes]:
+    rng = np.random.default_rng(seed)
+    ang = rng.uniform(-180, 180, size=(n, 3))
+    acc = rng.uniform(-2, 2, size=(n, 3))
+    flex = rng.integers(0, 1024, size=(n, 5))
+    return [
+        (f"{20 * i},{a[0]:.2f},{a[1]:.2f},{a[2]:.2f},{c[0]:.3f},{c[1]:.3f},{c[2]:.3f},"
+         f"{f[0]},{f[1]},{f[2]},{f[3]},{f[4]}").encode()
+        for i, (a, c, f) in enumerate(zip(ang, acc, flex))
+    ]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000, help="Synthetic rows (ignored with --csv).")
+    parser.add_argument("--csv", type=Path, default=None, help="Recorded capture to replay instead.")
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 16, 256, 4096])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    args = parse_args()
+    if args.csv is not None:
+        lines = args.csv.read_bytes().splitlines()[1:]  # 헤더 제외
+    else:
+        lines = synth_lines(args.rows, args.seed)
+    layouts = tuple(CSV_LAYOUTS)
+    n = len(lines)
+
+    # 정합성: 두 경로가 같은 값을 내는지 확인
+    legacy = parse_per_line(lines, 0)
+    records, valid = parse_csv_lines(lines, recv_timestamp_ms=0, layouts=layouts)
+    batch_rows = [SignGloveSensorReading(*v) for v in records[valid].tolist()]
+    if batch_rows != legacy:
+        print("❌ batch parser output differs from the per-line parser")
+        sys.exit(1)
+
+    t_line = best_of(lambda: parse_per_line(lines, 0), args.repeat)
+    print(f"rows: {n}  (valid {int(valid.sum())})")
+    print(f"{'path':<22}{'total ms':>10}{'us/row':>10}{'speedup':>10}")
+    print(f"{'per-line':<22}{t_line * 1000:>10.1f}{t_line / n * 1e6:>10.2f}{1.0:>10.1f}")
+    for size in args.batch:
+        def run():
+            last = None
+            for i in range(0, n, size):
+                rec, ok = parse_csv_lines(lines[i:i + size], recv_timestamp_ms=0,
+                                          last_arduino_ms=last, layouts=layouts)
+                if ok.any():
+                    last = int(rec['timestamp_ms'][ok][-1])
+        t = best_of(run, args.repeat)
+        print(f"{f'batch (size {size})':<22}{t * 1000:>10.1f}{t / n * 1e6:>10.2f}{t_line / t:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Offline scoring throughput: per-sample streaming vs evaluate_model.score.
+
+Scores every window of the recorded episodes (--data-dir) twice with the
+same model:
+
+- ``streaming``: each episode fed sample by sample through a SlidingWindow
+  and one model call per full window, the way predict_sequence would score
+  them,
+- ``batched``: ``evaluate_model.score``, all windows of an episode as one
+  stride-tricks view packed into --batch-size batches,
+
+and reports windows/sec for both. Both must produce the same confusion
+matrix.
+
+The model is a numpy stand-in (nearest class centroid of the flattened
+window, fitted on the same data) with a fixed --call-overhead-ms per call
+emulating the framework dispatch cost of a real forward pass, so this runs
+without tensorflow; its accuracy numbers are only a sanity check.
+
+Run: python scripts/bench_batch_scoring.py --max-windows 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from _repo import REPO_ROOT  # 저장소 루트를 sys.path에 추가
+
+from evaluate_model import episode_windows, score  # noqa: E402
+from signglove_dataset import SignGloveDataset  # noqa: E402
+from sliding_window import SENSOR_DATA_TO_MODEL, SlidingWindow  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=REPO_ROOT / "datasets" / "unified")
+    parser.add_argument("--window", type=int, default=30)
+    parser.add_argument("--stride", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--max-windows", type=int, default=20000)
+    parser.add_argument("--call-overhead-ms", type=float, default=0.5)
+    return parser.parse_args()
+
+
+class CentroidModel:
+    """Softmax over negative distances to per-class mean windows, plus a fixed per-call cost."""
+
+    def __init__(self, dataset: SignGloveDataset, window: int, overhead_s: float):
+        n_classes = len(dataset.classes)
+        sums = np.zeros((n_classes, window * len(SENSOR_DATA_TO_MODEL)))
+        counts = np.zeros(n_classes)
+        for sensor_batch, label_idx, _ in dataset:
+            for sensor, label in zip(sensor_batch, label_idx):
+                windows = episode_windows(sensor, window, stride=window)
+                sums[label] += windows.sum(axis=0).reshape(-1)
+                counts[label] += len(windows)
+        self.centroids = (sums / np.maximum(counts, 1)[:, None]).astype(np.float32)
+        self.scale = np.float32(1.0 / max(float(self.centroids.std()), 1e-6))
+        self.overhead_s = overhead_s
+
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        time.sleep(self.overhead_s)  # 프레임워크 호출 고정 비용 흉내
+        flat = batch.reshape(len(batch), -1)
+        logits = -np.sqrt(((flat[:, None, :] - self.centroids[None]) ** 2).sum(axis=2)) * self.scale
+        logits -= logits.max(axis=1, keepdims=True)
+        e = np.exp(logits)
+        return e / e.sum(axis=1, keepdims=True)
+
+
+def stream(model, dataset: SignGloveDataset, window: int, stride: int, max_windows: int):
+    n_classes = len(dataset.classes)
+    confusion = np.zeros((n_classes, n_classes), dtype=np.int64)
+    t0 = time.perf_counter()
+    buffer = SlidingWindow(window)
+    for sensor_batch, label_idx, _ in dataset:
+        for sensor, label in zip(sensor_batch, label_idx):
+            buffer.clear()
+            k = 0
+            for row in sensor[:, SENSOR_DATA_TO_MODEL]:
+                buffer.append_array(row)
+                if not buffer.full:
+                    continue
+                if k % stride == 0 and confusion.sum() < max_windows:
+                    confusion[label, int(model(buffer.window()).argmax())] += 1
+                k += 1
+        if confusion.sum() >= max_windows:
+            break
+    return confusion, time.perf_counter() - t0
+
+
+def main():
+    args = parse_args()
+    dataset = SignGloveDataset(args.data_dir, prefetch=0)
+    model = CentroidModel(dataset, args.window, args.call_overhead_ms / 1000.0)
+    print(f"{dataset.num_episodes} episodes, window {args.window}, stride {args.stride}, "
+          f"call overhead {args.call_overhead_ms} ms, up to {args.max_windows} windows")
+
+    confusion, stream_s = stream(model, SignGloveDataset(args.data_dir, prefetch=0), args.window,
+                                 args.stride, args.max_windows)
+    report = score(model, SignGloveDataset(args.data_dir), args.window, args.stride, args.batch_size,
+                   args.max_windows)
+    n = int(confusion.sum())
+    print(f"{'path':<11}{'windows':>9}{'seconds':>9}{'windows/s':>11}{'accuracy':>10}")
+    print(f"{'streaming':<11}{n:>9}{stream_s:>9.2f}{n / stream_s:>11.0f}{np.trace(confusion) / n:>10.3f}")
+    print(f"{'batched':<11}{report.windows:>9}{report.total_seconds:>9.2f}"
+          f"{report.windows / report.total_seconds:>11.0f}{report.accuracy:>10.3f}"
+          f"   (model calls alone: {report.windows / report.model_seconds:.0f}/s, "
+          f"episode accuracy {report.episode_accuracy:.3f})")
+    print(f"speedup: {stream_s / report.total_seconds:.1f}x")
+    if not np.array_equal(confusion, report.confusion):
+        print("❌ batched scoring disagrees with per-sample streaming")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
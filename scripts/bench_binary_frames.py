@@ -0,0 +1,195 @@
+"""
+Binary sensor frames: decoder check against a synthetic generator, and cost vs CSV.
+
+Check: generates --samples random-walk glove samples at the firmware's
+resolution, encodes them as frames (binary_frames.encode_frames, the same
+layout as imu_flex_serial.ino sendBinaryFrame) and corrupts the stream the
+way a real link does - ``# ...`` text lines between frames, dropped frames
+(--drop) and frames with one flipped bit (--flip) - then feeds it to
+FrameDecoder in random 1..--max-chunk byte chunks. The decoded records must
+equal the surviving samples exactly, and ``lost_frames`` must equal the
+dropped + corrupted frames.
+
+Benchmark: the same clean samples as
+- ``csv``: printCsvRow text through LineFramer + parse_csv_lines,
+- ``struct``: frames decoded one at a time with struct.unpack_from + crc16,
+- ``frombuffer``: FrameDecoder + frames_to_records over --read-size chunks,
+reporting bytes per sample, the sample rate a 115200 baud link can carry
+and host decode cost. CSV and frames must decode to the same values.
+
+Run: python scripts/bench_binary_frames.py --samples 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import struct
+import sys
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+import _repo  # noqa: F401  (저장소 루트를 sys.path에 추가)
+
+from binary_frames import (FRAME_SIZE, FRAME_SYNC, FrameDecoder, crc16, encode_frames,  # noqa: E402
+                           frames_to_records)
+from sensor_records import READING_DTYPE, parse_csv_lines, timestamp_hz  # noqa: E402
+from serial_stream import LineFramer  # noqa: E402
+
+COMPARED = [name for name in READING_DTYPE.names if name != 'recv_timestamp_ms']
+FRAME_STRUCT = struct.Struct('<2sHI6h5HH')
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=200000)
+    parser.add_argument("--interval-ms", type=int, default=20)
+    parser.add_argument("--drop", type=float, default=0.01)
+    parser.add_argument("--flip", type=float, default=0.01)
+    parser.add_argument("--text", type=float, default=0.005, help="Fraction of frames followed by a '# ...' line.")
+    parser.add_argument("--max-chunk", type=int, default=256)
+    parser.add_argument("--read-size", type=int, default=4096)
+    parser.add_argument("--baud", type=int, default=115200)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def synthetic_records(n: int, interval_ms: int, rng: np.random.Generator) -> np.ndarray:
+    """Random-walk samples already quantized to the firmware's print precision."""
+    records = np.zeros(n, dtype=READING_DTYPE)
+    records['timestamp_ms'] = 1000 + interval_ms * np.arange(n) + rng.integers(-1, 2, n)
+    for name in ('pitch', 'roll', 'yaw'):
+        walk = np.cumsum(rng.normal(0, 0.8, n))
+        records[name] = np.round((walk + 180.0) % 360.0 - 180.0, 2)
+    for name in ('accel_x', 'accel_y', 'accel_z'):
+        records[name] = np.round(np.clip(rng.normal(0, 0.7, n), -4, 4), 3)
+    for i in range(5):
+        records[f'flex{i + 1}'] = np.clip(780 + np.cumsum(rng.integers(-3, 4, n)) % 200, 0, 1023)
+    records['sampling_hz'] = timestamp_hz(records['timestamp_ms'])
+    return records
+
+
+def csv_bytes(records: np.ndarray) -> bytes:
+    """The samples as imu_flex_serial.ino printCsvRow lines."""
+    return b"".join(
+        f"{r[0]},{r[2]:.2f},{r[3]:.2f},{r[4]:.2f},{r[11]:.3f},{r[12]:.3f},{r[13]:.3f},"
+        f"{r[5]},{r[6]},{r[7]},{r[8]},{r[9]}\r\n".encode()
+        for r in records.tolist())
+
+
+def faulty_stream(records: np.ndarray, args, rng: np.random.Generator) -> Tuple[bytes, np.ndarray, dict]:
+    """Frames of ``records`` with text lines, drops and bit flips; returns what must survive."""
+    frames = encode_frames(records)
+    n = len(records)
+    dropped = rng.random(n) < args.drop
+    flipped = (rng.random(n) < args.flip) & ~dropped
+    dropped[[0, -1]] = flipped[[0, -1]] = False  # 처음/마지막 프레임의 손실은 seq로 알 수 없음
+    parts: List[bytes] = []
+    for i in range(n):
+        if dropped[i]:
+            continue
+        frame = bytearray(frames[i * FRAME_SIZE:(i + 1) * FRAME_SIZE])
+        if flipped[i]:
+            bit = int(rng.integers(16, FRAME_SIZE * 8))  # sync 이후 (seq..crc)
+            frame[bit // 8] ^= 1 << (bit % 8)
+        parts.append(bytes(frame))
+        if rng.random() < args.text:
+            parts.append(b"# interval(ms) set to 20\r\n")
+    survivors = records[~dropped & ~flipped].copy()
+    survivors['sampling_hz'] = timestamp_hz(survivors['timestamp_ms'])
+    return b"".join(parts), survivors, {'dropped': int(dropped.sum()), 'flipped': int(flipped.sum())}
+
+
+def check(records: np.ndarray, args, rng: np.random.Generator) -> bool:
+    stream, expected, injected = faulty_stream(records, args, rng)
+    decoder = FrameDecoder()
+    decoded = []
+    last_ms = None
+    pos = 0
+    while pos < len(stream):
+        size = int(rng.integers(1, args.max_chunk + 1))
+        frames = decoder.feed(stream[pos:pos + size])
+        pos += size
+        if len(frames):
+            decoded.append(frames_to_records(frames, last_arduino_ms=last_ms))
+            last_ms = int(decoded[-1]['timestamp_ms'][-1])
+    got = np.concatenate(decoded) if decoded else np.zeros(0, dtype=READING_DTYPE)
+    stats = decoder.stats()
+    same = len(got) == len(expected) and all(np.array_equal(got[name], expected[name]) for name in COMPARED)
+    lost_ok = stats['lost_frames'] == injected['dropped'] + injected['flipped']
+    print(f"check: {len(records)} frames, {injected['dropped']} dropped, {injected['flipped']} bit-flipped, "
+          f"chunks of 1..{args.max_chunk} B")
+    print(f"  decoded {len(got)} (expected {len(expected)}), values identical: {'✅' if same else '❌'}")
+    print(f"  lost_frames {stats['lost_frames']} (expected {injected['dropped'] + injected['flipped']}) "
+          f"{'✅' if lost_ok else '❌'}, crc_errors {stats['crc_errors']}, discarded {stats['discarded_bytes']} B")
+    return same and lost_ok
+
+
+def decode_csv(data: bytes, read_size: int) -> np.ndarray:
+    framer = LineFramer()
+    out = []
+    last_ms = None
+    for pos in range(0, len(data), read_size):
+        records, valid = parse_csv_lines(framer.feed(data[pos:pos + read_size]), last_arduino_ms=last_ms)
+        records = records[valid]
+        if len(records):
+            out.append(records)
+            last_ms = int(records['timestamp_ms'][-1])
+    return np.concatenate(out)
+
+
+def decode_struct(data: bytes) -> int:
+    n = 0
+    unpack = FRAME_STRUCT.unpack_from
+    for pos in range(0, len(data) - FRAME_SIZE + 1, FRAME_SIZE):
+        fields = unpack(data, pos)
+        if fields[0] == FRAME_SYNC and crc16(data[pos + 2:pos + FRAME_SIZE - 2]) == fields[-1]:
+            n += 1
+    return n
+
+
+def decode_frames(data: bytes, read_size: int) -> np.ndarray:
+    decoder = FrameDecoder()
+    out = []
+    last_ms = None
+    for pos in range(0, len(data), read_size):
+        frames = decoder.feed(data[pos:pos + read_size])
+        if len(frames):
+            out.append(frames_to_records(frames, last_arduino_ms=last_ms))
+            last_ms = int(out[-1]['timestamp_ms'][-1])
+    return np.concatenate(out)
+
+
+def main():
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+    records = synthetic_records(args.samples, args.interval_ms, rng)
+    ok = check(records, args, rng)
+
+    text, binary = csv_bytes(records), encode_frames(records)
+    t0 = time.perf_counter()
+    from_csv = decode_csv(text, args.read_size)
+    t1 = time.perf_counter()
+    n_struct = decode_struct(binary)
+    t2 = time.perf_counter()
+    from_frames = decode_frames(binary, args.read_size)
+    t3 = time.perf_counter()
+
+    n = args.samples
+    link = args.baud / 10  # 8N1: 10 bits per byte
+    print(f"\nbenchmark: {n} samples, {args.read_size} B reads, {args.baud} baud")
+    print(f"{'path':<12}{'B/sample':>10}{'max Hz @ link':>15}{'decode µs/sample':>18}{'samples':>9}")
+    for name, size, seconds, count in (("csv", len(text), t1 - t0, len(from_csv)),
+                                       ("struct", len(binary), t2 - t1, n_struct),
+                                       ("frombuffer", len(binary), t3 - t2, len(from_frames))):
+        print(f"{name:<12}{size / n:>10.1f}{link / (size / n):>15.0f}{seconds / n * 1e6:>18.2f}{count:>9}")
+    same = len(from_csv) == len(from_frames) == n and all(
+        np.array_equal(from_csv[name], from_frames[name]) for name in COMPARED)
+    print(f"csv and frames decode to identical values: {'✅' if same else '❌'}")
+    if not (ok and same and n_struct == n):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
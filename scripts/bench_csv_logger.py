@@ -0,0 +1,133 @@
+"""
+Raw capture logging cost: per-row writerow + flush + print vs BufferedLineWriter.
+
+Feeds --rows synthetic 12-field rows (the csv_uart.py format) through
+
+- ``per-row``: the old csv_uart.py loop body (``csv.writer.writerow``,
+  ``file.flush()``, a debug print and a "saved" print per line),
+- ``buffered``: the new one (LineFramer over --chunk-rows rows per serial
+  read, 12-field check, ``BufferedLineWriter`` with --flush-kib /
+  --flush-ms, debug printing disabled),
+
+with stdout redirected to /dev/null, and reports CPU time and write
+syscalls (``syscw`` from /proc/self/io) per 1000 rows. Both files must
+hold identical bytes.
+
+Without pacing the time threshold never fires, so ``buffered`` shows the
+size-threshold case. A real capture at a few hundred rows/s hits the
+--flush-ms threshold first: one write per --flush-ms instead of one per row
+(e.g. 20 rows/s at a 50 ms interval: 4 writes/s instead of 20).
+
+Run: python scripts/bench_csv_logger.py --rows 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import _repo  # noqa: F401  (저장소 루트를 sys.path에 추가)
+
+from capture_log import BufferedLineWriter, RateLimitedPrinter  # noqa: E402
+from serial_stream import LineFramer  # noqa: E402
+
+HEADER = ['timestamp(ms)', 'pitch(°)', 'roll(°)', 'yaw(°)', 'accel_x(g)', 'accel_y(g)', 'accel_z(g)',
+          'flex1', 'flex2', 'flex3', 'flex4', 'flex5']
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--chunk-rows", type=int, default=8, help="Rows per serial read in the buffered loop.")
+    parser.add_argument("--flush-kib", type=float, default=4.0)
+    parser.add_argument("--flush-ms", type=float, default=250.0)
+    return parser.parse_args()
+
+
+def make_lines(n: int):
+    return [f"{20 * i},{-3.36 + i % 7:.2f},-1.71,3.72,0.012,-0.981,0.034,{770 + i % 9},{782 - i % 5},770,808,805\r\n"
+            .encode() for i in range(n)]
+
+
+def write_syscalls() -> int:
+    try:
+        with open('/proc/self/io') as f:
+            return next(int(line.split()[1]) for line in f if line.startswith('syscw'))
+    except (OSError, StopIteration):
+        return -1
+
+
+def measure(fn):
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        w0, c0 = write_syscalls(), time.process_time()
+        fn()
+        return time.process_time() - c0, write_syscalls() - w0
+
+
+def per_row(path: Path, lines):
+    with open(path, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(HEADER)
+        for raw in lines:
+            line = raw.decode('utf-8').strip()
+            if not line:
+                continue
+            print(f"[DEBUG] Received: {line}")
+            row = line.split(',')
+            if len(row) == 12:
+                writer.writerow(row)
+                file.flush()
+                print("✔️ Data saved:", row)
+
+
+def buffered(path: Path, lines, args):
+    chunks = [b"".join(lines[i:i + args.chunk_rows]) for i in range(0, len(lines), args.chunk_rows)]
+    debug_print = RateLimitedPrinter(1.0, enabled=False)
+    framer = LineFramer()
+    with BufferedLineWriter(path, ','.join(HEADER), int(args.flush_kib * 1024), args.flush_ms / 1000.0,
+                            newline=b'\r\n') as writer:
+        for chunk in chunks:
+            rows = []
+            for line in framer.feed(chunk):
+                line = line.strip()
+                if not line:
+                    continue
+                debug_print(f"Received: {line.decode('utf-8', 'replace')}")
+                if line.count(b',') == 11:
+                    rows.append(line)
+            writer.write_lines(rows)
+            writer.poll()
+        return writer.stats()
+
+
+def main():
+    args = parse_args()
+    lines = make_lines(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        old_path, new_path = Path(tmp) / "per_row.csv", Path(tmp) / "buffered.csv"
+        old_cpu, old_sys = measure(lambda: per_row(old_path, lines))
+        stats = {}
+        new_cpu, new_sys = measure(lambda: stats.update(buffered(new_path, lines, args)))
+        same = old_path.read_bytes() == new_path.read_bytes()
+
+    k = args.rows / 1000
+    print(f"{args.rows} rows, {args.chunk_rows} rows per read, flush at {args.flush_kib:g} KiB / {args.flush_ms:g} ms")
+    print(f"{'path':<10}{'CPU s':>8}{'µs/row':>9}{'writes/1k rows':>16}")
+    print(f"{'per-row':<10}{old_cpu:>8.2f}{old_cpu / args.rows * 1e6:>9.2f}{old_sys / k:>16.1f}")
+    print(f"{'buffered':<10}{new_cpu:>8.2f}{new_cpu / args.rows * 1e6:>9.2f}{new_sys / k:>16.1f}"
+          f"   ({stats['flushes']} file writes, {stats['lines_per_flush']:.0f} rows each)")
+    print(f"CPU {old_cpu / max(new_cpu, 1e-9):.1f}x lower, write syscalls {old_sys / max(new_sys, 1):.0f}x fewer")
+    if not same:
+        print("❌ buffered file differs from the per-row csv.writer output")
+        sys.exit(1)
+    print("✅ identical files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Per-episode H5 tree vs consolidated EpisodeStore: files, bytes and load time.
+
+Reads the per-episode files under --data-dir (<class>/<type>/episode_*.h5),
+appends them to one EpisodeStore in a temporary directory and then times
+loading every episode's columns both ways (cold-ish: files are reopened each
+repeat, the OS page cache is not dropped). The store's content is checked
+against the source files.
+
+Run: python scripts/bench_episode_store.py --data-dir datasets/unified
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import h5py
+import numpy as np
+
+from _repo import REPO_ROOT  # 저장소 루트를 sys.path에 추가
+
+from episode_store import COLUMNS, EpisodeStore  # noqa: E402
+
+# 에피소드 파일 내 경로 → 저장소 컬럼 이름
+FILE_COLUMNS = {
+    'timestamps': 'timestamps',
+    'arduino_timestamps': 'arduino_timestamps',
+    'sampling_rates': 'sampling_rates',
+    'sensor_data': 'sensor_data',
+    'acceleration': 'sensors/acceleration',
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=REPO_ROOT / "datasets" / "unified")
+    parser.add_argument("--limit", type=int, default=0, help="Use only the first N episode files (0 = all).")
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args()
+
+
+def read_episode_file(path: Path) -> Dict[str, np.ndarray]:
+    with h5py.File(path, 'r') as f:
+        return {name: f[src][:] for name, src in FILE_COLUMNS.items()}
+
+
+def load_tree(files: List[Path]) -> int:
+    return sum(len(read_episode_file(p)['timestamps']) for p in files)
+
+
+def load_store(path: Path) -> int:
+    with EpisodeStore(path, mode='r') as store:
+        return len(store.load_all()['timestamps'])
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    args = parse_args()
+    files = sorted(args.data_dir.glob("*/*/episode_*.h5"))
+    if args.limit:
+        files = files[:args.limit]
+    if not files:
+        print(f"no episode files under {args.data_dir}")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store_path = Path(tmp) / "session_bench.h5"
+        t0 = time.perf_counter()
+        with EpisodeStore(store_path) as store:
+            for path in files:
+                with h5py.File(path, 'r') as f:
+                    class_name = str(f.attrs.get('class_name', path.parent.parent.name))
+                    episode_type = str(f.attrs.get('episode_type', path.parent.name))
+                    label_idx = int(f.attrs.get('label_idx', -1))
+                    duration = float(f.attrs.get('episode_duration', 0.0))
+                store.append_columns(read_episode_file(path), class_name, episode_type, label_idx, duration)
+            store.flush()
+        build_s = time.perf_counter() - t0
+
+        # 정합성: 저장소의 각 에피소드가 원본 파일과 같은지 확인
+        with EpisodeStore(store_path, mode='r') as store:
+            for (row, columns), path in zip(store.iter_episodes(), files):
+                source = read_episode_file(path)
+                if any(not np.array_equal(columns[name], source[name]) for name in COLUMNS):
+                    print(f"❌ store content differs from {path}")
+                    sys.exit(1)
+
+        tree_bytes = sum(p.stat().st_size for p in files)
+        store_bytes = store_path.stat().st_size
+        t_tree = best_of(lambda: load_tree(files), args.repeat)
+        t_store = best_of(lambda: load_store(store_path), args.repeat)
+        n_samples = load_store(store_path)
+
+    print(f"episodes: {len(files)}  samples: {n_samples}  (store built in {build_s:.2f}s)")
+    print(f"{'layout':<16}{'files':>8}{'KiB':>10}{'load ms':>10}{'speedup':>9}")
+    print(f"{'per-episode H5':<16}{len(files):>8}{tree_bytes / 1024:>10.0f}{t_tree * 1000:>10.1f}{1.0:>9.1f}")
+    print(f"{'EpisodeStore':<16}{1:>8}{store_bytes / 1024:>10.0f}{t_store * 1000:>10.1f}{t_tree / t_store:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+How long stop_episode holds the calling (serial reception) thread.
+
+Runs ser.SignGloveUnifiedCollector in a temporary directory, fills an episode
+with synthetic readings and ends it through
+
+- ``sync``: the previous behaviour, persisting H5 + CSV + progress JSON on the
+  caller (``_persist_episode`` + ``_on_episode_durable`` inline),
+- ``async``: ``stop_episode`` handing the episode to the EpisodeWriter thread,
+
+then reports the caller-side stall per episode (p50/max), the writer's
+backpressure metrics and checks that every episode ended up on disk and in
+collection_progress.json after ``flush``.
+
+Run: python scripts/bench_episode_writer.py --episodes 50
+     python scripts/bench_episode_writer.py --episodes 50 --gap 0   # backpressure
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+
+import _repo  # noqa: F401  (저장소 루트를 sys.path에 추가)
+
+import ser  # noqa: E402
+from episode_store import count_store_episodes  # noqa: E402
+from episode_writer import EpisodeJob  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--episodes", type=int, default=50)
+    parser.add_argument("--samples", type=int, default=80, help="Samples per episode.")
+    parser.add_argument("--gap", type=float, default=0.05,
+                        help="Seconds between episodes (real sessions: >= 2.4s); 0 = back-to-back to exercise backpressure.")
+    parser.add_argument("--storage", choices=["store", "files"], default=ser.EPISODE_STORAGE,
+                        help="ser.EPISODE_STORAGE: consolidated session store or per-episode H5 + CSV.")
+    return parser.parse_args()
+
+
+def fill_episode(collector: ser.SignGloveUnifiedCollector, n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    collector.current_class = collector.all_classes[seed % len(collector.all_classes)]
+    # 클래스/유형 조합이 겹치지 않게 해서 같은 초에 저장돼도 파일명이 충돌하지 않도록
+    collector.current_episode_type = str(seed // len(collector.all_classes) % 5 + 1)
+    collector.episode_start_time = time.time() - n / 33.0
+    collector.collecting = True
+    collector.episode_data.clear()
+    for i in range(n):
+        p, r, y = rng.uniform(-90, 90, 3)
+        flex = rng.integers(0, 1024, 5)
+        collector.episode_data.append(ser.SignGloveSensorReading(30 * i, 30 * i, p, r, y, *map(int, flex), 33.3))
+
+
+def run(mode: str, episodes: int, samples: int, gap: float) -> List[int]:
+    stalls = []
+    collector = ser.SignGloveUnifiedCollector()
+    for k in range(episodes):
+        fill_episode(collector, samples, k)
+        t0 = time.perf_counter()
+        if mode == "sync":
+            collector.collecting = False
+            job = EpisodeJob(collector.episode_data, collector.current_class, collector.current_episode_type,
+                             1.0, f"sync_{k:04d}")
+            job.result = collector._persist_episode(job)
+            collector._on_episode_durable(job)
+        else:
+            collector.stop_episode()
+        stalls.append(time.perf_counter() - t0)
+        time.sleep(gap)
+    t_flush = time.perf_counter()
+    collector.episode_writer.flush()
+    flush_s = time.perf_counter() - t_flush
+    stats = collector.episode_writer.stats()
+    collector.episode_writer.close()
+    collector.close_episode_store()
+
+    progress = json.loads(collector.progress_file.read_text(encoding="utf-8"))
+    n_h5 = len([p for p in collector.data_dir.rglob("*.h5") if p.parent != collector.store_dir])
+    n_h5 += sum(count_store_episodes(collector.store_dir).values())
+    stalls_ms = np.array(stalls) * 1000.0
+    print(f"{mode:<6}{np.percentile(stalls_ms, 50):>10.2f}{stalls_ms.max():>10.2f}"
+          f"{flush_s * 1000:>10.1f}{n_h5:>6}{progress['total_episodes']:>8}"
+          f"{stats['max_depth']:>8}{stats['blocked_submits']:>8}")
+    return [n_h5, progress["total_episodes"]]
+
+
+def main():
+    args = parse_args()
+    ser.EPISODE_STORAGE = args.storage
+    cwd = os.getcwd()
+    results = {}
+    header = f"{'mode':<6}{'p50 ms':>10}{'max ms':>10}{'flush ms':>10}{'h5':>6}{'prog':>8}{'depth':>8}{'blocked':>8}"
+    lines = []
+    for mode in ("sync", "async"):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            out = io.StringIO()
+            try:
+                # 수집기 자체 출력은 숨기고 결과 행만 모은다
+                with contextlib.redirect_stdout(out):
+                    results[mode] = run(mode, args.episodes, args.samples, args.gap)
+            finally:
+                os.chdir(cwd)
+            lines.append(out.getvalue().strip().splitlines()[-1])
+    print(f"episodes: {args.episodes} x {args.samples} samples, storage: {args.storage}  (caller-side stall per episode)")
+    print(header)
+    for line in lines:
+        print(line)
+    bad = [m for m, (n_h5, total) in results.items() if n_h5 != args.episodes or total != args.episodes]
+    if bad:
+        print(f"❌ episodes missing on disk or in progress for: {', '.join(bad)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Import-time budget for the collector and inference entry points.
+
+Imports each entry-point module in a fresh interpreter under
+``python -X importtime`` and reports the total import time (best of
+--repeat), the number of modules loaded and the module's slowest direct
+imports by cumulative time. Exits with status 1 when
+
+- a heavy optional dependency (tensorflow, sklearn, joblib, matplotlib,
+  ONNX/TFLite runtimes, ...) is loaded by merely importing a module; those
+  must be imported by the feature that needs them (model loading, scaler
+  loading, PNG saving), or
+- a module's import time exceeds ``--max-ms`` (when given).
+
+Run: python scripts/bench_import_time.py --max-ms 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+from _repo import REPO_ROOT
+
+ENTRY_POINTS = ('ser', 'server', 'New_server', 'inference', 'test_inference', 'inference_server',
+                'model_export', 'signglove_dataset')
+HEAVY_MODULES = ('tensorflow', 'keras', 'sklearn', 'joblib', 'matplotlib', 'scipy', 'pandas',
+                 'tflite_runtime', 'onnxruntime', 'tf2onnx')
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=list(ENTRY_POINTS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=3, help="Slowest direct imports to list per module.")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if a module takes longer to import.")
+    return parser.parse_args()
+
+
+def import_profile(module: str) -> Tuple[float, Dict[str, float], List[Tuple[str, float]]]:
+    """``(ms, {loaded module: cumulative ms}, [(direct import, cumulative ms)])`` for one fresh ``import module``."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=REPO_ROOT, capture_output=True, text=True,
+                          env={**os.environ, "PYTHONPATH": str(REPO_ROOT)})
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+    loaded: Dict[str, float] = {}
+    children: List[Tuple[str, float]] = []
+    direct: List[Tuple[str, float]] = []
+    total = 0.0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # 헤더 줄
+        ms = int(cumulative) / 1000.0
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        loaded[name.strip()] = ms
+        # 자식 import가 부모보다 먼저 출력되므로 깊이 1 항목을 모아 두었다가 최상위 줄에서 정리
+        if depth == 1:
+            children.append((name.strip(), ms))
+        elif depth == 0:
+            if name.strip() == module:
+                total, direct = ms, children
+            children = []
+    return total, loaded, direct
+
+
+def main():
+    args = parse_args()
+    print(f"python {sys.version.split()[0]}, best of {args.repeat} fresh interpreters")
+    print(f"{'module':<20}{'import ms':>10}{'modules':>9}  slowest direct imports (ms)")
+    failed = False
+    for module in args.modules:
+        try:
+            runs = [import_profile(module) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{module:<20}{'':>10}{'':>9}  ❌ {e}")
+            failed = True
+            continue
+        total, loaded, direct = min(runs, key=lambda run: run[0])
+        slowest = ", ".join(f"{name} {ms:.0f}" for name, ms in sorted(direct, key=lambda t: -t[1])[:args.top])
+        print(f"{module:<20}{total:>10.1f}{len(loaded):>9}  {slowest}")
+        heavy = sorted({name.split('.')[0] for name in loaded} & set(HEAVY_MODULES))
+        if heavy:
+            print(f"{'':<20}❌ heavy dependencies imported at module import time: {', '.join(heavy)}")
+            failed = True
+        if args.max_ms is not None and total > args.max_ms:
+            print(f"{'':<20}❌ import takes {total:.0f} ms (budget {args.max_ms:g} ms)")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Per-sample inference latency: Keras model.predict vs the compiled fast path.
+
+Streams recorded episodes (--data-dir) sample by sample through
+SignGloveInference.predict_sequence with ``compiled=False`` (model.predict
+per call, the previous behaviour), with the tf.function fast path, and —
+when a scaler is loaded — with the scaler fused into that tf.function
+(``fuse_scaler=True``), and reports p50/p99/mean latency per inference on
+CPU. All paths must return the same probabilities. predict_batch
+throughput (windows/sec, raw windows in) is reported for the compiled and
+fused paths.
+
+Without --model a small stand-in Conv1D classifier with the usual
+(window, 8) → 34 classes shape is built (untrained; only its cost matters).
+Requires tensorflow; a StandardScaler is fitted on the recorded samples when
+scikit-learn/joblib are installed.
+
+Run: python scripts/bench_inference_latency.py --samples 600
+     python scripts/bench_inference_latency.py --model model.h5 --scaler scaler.pkl --config config.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from _repo import REPO_ROOT  # 저장소 루트를 sys.path에 추가
+
+from ksl_classes import KSL_CLASSES  # noqa: E402
+from signglove_dataset import SignGloveDataset  # noqa: E402
+
+# H5 sensor_data (flex1-5, pitch, roll, yaw) → SensorData.to_array (yaw, pitch, roll, flex1-5)
+MODEL_ORDER = [7, 5, 6, 0, 1, 2, 3, 4]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=REPO_ROOT / "datasets" / "unified")
+    parser.add_argument("--model", type=Path, default=None)
+    parser.add_argument("--scaler", type=Path, default=None)
+    parser.add_argument("--config", type=Path, default=None)
+    parser.add_argument("--window", type=int, default=30)
+    parser.add_argument("--samples", type=int, default=600, help="Timed samples per path.")
+    parser.add_argument("--batch-windows", type=int, default=2048)
+    return parser.parse_args()
+
+
+def recorded_samples(data_dir: Path, n: int) -> np.ndarray:
+    """``(n, 8)`` rows in model input order, episodes back to back."""
+    rows: List[np.ndarray] = []
+    total = 0
+    for sensor_batch, _, _ in SignGloveDataset(data_dir, prefetch=0):
+        for sensor in sensor_batch:
+            rows.append(sensor[:, MODEL_ORDER])
+            total += len(sensor)
+        if total >= n:
+            break
+    return np.concatenate(rows)[:n].astype(np.float64)
+
+
+def build_standin(tmp: Path, window: int, samples: np.ndarray) -> tuple:
+    import tensorflow as tf
+
+    model = tf.keras.Sequential([
+        tf.keras.layers.Input(shape=(window, 8)),
+        tf.keras.layers.Conv1D(64, 5, activation='relu', padding='same'),
+        tf.keras.layers.Conv1D(64, 5, activation='relu', padding='same'),
+        tf.keras.layers.GlobalAveragePooling1D(),
+        tf.keras.layers.Dense(64, activation='relu'),
+        tf.keras.layers.Dense(len(KSL_CLASSES), activation='softmax'),
+    ])
+    model_path = tmp / "standin.keras"
+    model.save(model_path)
+
+    scaler_path: Optional[Path] = None
+    try:
+        import joblib
+        from sklearn.preprocessing import StandardScaler
+        scaler_path = tmp / "scaler.pkl"
+        joblib.dump(StandardScaler().fit(samples), scaler_path)
+    except ImportError:
+        print("scikit-learn/joblib not installed: running without a scaler")
+
+    config_path = tmp / "config.json"
+    config_path.write_text(json.dumps({'class_names': list(KSL_CLASSES)}, ensure_ascii=False), encoding='utf-8')
+    return model_path, scaler_path, config_path
+
+
+def stream_latencies(inference, samples: np.ndarray, window: int):
+    from inference import SensorData
+
+    latencies, probs = [], []
+    for row in samples:
+        data = SensorData(*row.tolist())
+        t0 = time.perf_counter()
+        result = inference.predict_sequence(data)
+        elapsed = time.perf_counter() - t0
+        if result is not None:
+            if 'error' in result:
+                raise RuntimeError(result['error'])
+            latencies.append(elapsed)
+            probs.append(result['all_probabilities'])
+    return np.array(latencies[3:]) * 1000, np.array(probs)  # 첫 호출(트레이스/워밍업) 제외
+
+
+def main():
+    args = parse_args()
+    try:
+        import tensorflow  # noqa: F401
+    except ImportError:
+        print("this benchmark requires tensorflow (pip install tensorflow)")
+        sys.exit(1)
+    from inference import SignGloveInference
+
+    logging.getLogger("inference").setLevel(logging.WARNING)
+    samples = recorded_samples(args.data_dir, args.samples + args.window)
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.model is None:
+            model_path, scaler_path, config_path = build_standin(Path(tmp), args.window, samples)
+        else:
+            model_path, scaler_path, config_path = args.model, args.scaler, args.config
+
+        paths = [("model.predict", False, False), ("compiled", True, False)]
+        if scaler_path:
+            paths.append(("compiled+fused", True, True))
+        windows = np.lib.stride_tricks.sliding_window_view(samples, args.window, axis=0).transpose(0, 2, 1)
+        windows = np.resize(windows, (args.batch_windows,) + windows.shape[1:])
+        results, batch_rates = {}, {}
+        for name, compiled, fuse in paths:
+            inference = SignGloveInference(str(model_path), scaler_path and str(scaler_path),
+                                           config_path and str(config_path), window_size=args.window,
+                                           compiled=compiled, fuse_scaler=fuse)
+            results[name] = stream_latencies(inference, samples, args.window)
+            if compiled:
+                inference.predict_batch(windows[:inference.batch_size])  # 워밍업
+                t0 = time.perf_counter()
+                batch_probs = inference.predict_batch(windows)
+                batch_rates[name] = len(batch_probs) / (time.perf_counter() - t0)
+
+    print(f"samples: {args.samples} (recorded), window: {args.window}, model: {args.model or 'stand-in Conv1D'}")
+    print(f"{'path':<15}{'p50 ms':>9}{'p99 ms':>9}{'mean ms':>9}")
+    for name, (lat, _) in results.items():
+        print(f"{name:<15}{np.percentile(lat, 50):>9.2f}{np.percentile(lat, 99):>9.2f}{lat.mean():>9.2f}")
+    for name, rate in batch_rates.items():
+        print(f"predict_batch ({name}): {args.batch_windows} windows, {rate:.0f} windows/s")
+
+    failed = False
+    for name in results:
+        diff = np.abs(results["model.predict"][1] - results[name][1]).max()
+        print(f"max |Δprob| {name} vs model.predict: {diff:.2e}")
+        if diff > 1e-4:
+            print(f"❌ {name} path disagrees with model.predict")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Model runs per second under each inference schedule.
+
+Replays recorded episodes (--data-dir) back to back at the recorded rate
+through the same SlidingWindow + InferenceScheduler pair that
+SignGloveInference.predict_sequence uses, and counts how many samples would
+trigger a forward pass for each schedule: every sample (the previous
+behaviour), fixed hops, a time trigger and the adaptive delta threshold.
+A synthetic static hold (one recorded posture plus sensor noise) shows the
+idle case where the adaptive mode saves the most.
+
+The model itself is not run, so this needs no tensorflow: CPU spent on
+inference scales with the run count.
+
+Run: python scripts/bench_inference_schedule.py
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+from _repo import REPO_ROOT  # 저장소 루트를 sys.path에 추가
+
+from inference_schedule import InferenceSchedule, InferenceScheduler  # noqa: E402
+from signglove_dataset import SignGloveDataset  # noqa: E402
+from sliding_window import SlidingWindow  # noqa: E402
+
+# H5 sensor_data (flex1-5, pitch, roll, yaw) → SensorData.to_array (yaw, pitch, roll, flex1-5)
+MODEL_ORDER = [7, 5, 6, 0, 1, 2, 3, 4]
+
+SCHEDULES = {
+    'every sample': InferenceSchedule(),
+    'hop 3': InferenceSchedule(hop_size=3),
+    'hop 10': InferenceSchedule(hop_size=10),
+    'time 100 ms': InferenceSchedule('time', interval_s=0.1),
+    'time 250 ms': InferenceSchedule('time', interval_s=0.25),
+    'adaptive 0.25': InferenceSchedule('adaptive', delta_threshold=0.25),
+    'adaptive 0.5': InferenceSchedule('adaptive', delta_threshold=0.5),
+    'adaptive 1.0': InferenceSchedule('adaptive', delta_threshold=1.0),
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=REPO_ROOT / "datasets" / "unified")
+    parser.add_argument("--window", type=int, default=30)
+    parser.add_argument("--hz", type=float, default=33.3, help="Replay rate (samples per second).")
+    parser.add_argument("--static-seconds", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def replay(samples: np.ndarray, scaler, schedule: InferenceSchedule, window: int, hz: float) -> InferenceScheduler:
+    buffer = SlidingWindow(window, scaler=scaler)
+    scheduler = InferenceScheduler(schedule)
+    for i, row in enumerate(samples):
+        buffer.append_array(row)
+        if buffer.full:
+            scheduler.observe(buffer.latest(), i / hz)
+    return scheduler
+
+
+def main():
+    args = parse_args()
+    recorded = np.concatenate([sensor[:, MODEL_ORDER] for batch, _, _ in SignGloveDataset(args.data_dir, prefetch=0)
+                               for sensor in batch]).astype(np.float64)
+    scale = recorded.std(axis=0)
+    scale[scale == 0] = 1.0
+    scaler = SimpleNamespace(mean_=recorded.mean(axis=0), scale_=scale)  # StandardScaler와 같은 속성
+
+    rng = np.random.default_rng(args.seed)
+    n_static = int(args.static_seconds * args.hz)
+    noise = np.r_[[0.3] * 3, [2.0] * 5]  # IMU 각도 ±0.3°, 플렉스 ±2 ADC
+    static = recorded[len(recorded) // 2] + rng.normal(0, 1, size=(n_static, 8)) * noise
+
+    print(f"recorded: {len(recorded)} samples ({len(recorded) / args.hz:.0f} s at {args.hz} Hz), "
+          f"static hold: {n_static} samples, window: {args.window}")
+    print(f"{'schedule':<15}{'recorded runs/s':>17}{'saved':>8}{'static runs/s':>15}{'saved':>8}")
+    for name, schedule in SCHEDULES.items():
+        row = f"{name:<15}"
+        for samples in (recorded, static):
+            scheduler = replay(samples, scaler, schedule, args.window, args.hz)
+            ratio = scheduler.run_ratio
+            row += f"{ratio * args.hz:>{17 if samples is recorded else 15}.1f}{1 / max(ratio, 1e-9):>7.1f}x"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Inference server throughput vs number of concurrent glove sessions.
+
+Starts inference_server.InferenceServer on a local TCP port and connects N
+synthetic gloves, each streaming SensorData-ordered samples
+(yaw,pitch,roll,flex1-5,timestamp) at --hz over its own connection, with
+every sample scheduled for inference (hop 1). For each N it runs the server
+twice:
+
+- ``unbatched``: max_batch=1, i.e. one forward pass per window, as with one
+  SignGloveInference per glove,
+- ``batched``: windows ready within --deadline-ms are run as one batch,
+
+and reports predictions/sec (offered = N x hz), mean batch size and the
+sample→prediction latency p50/p99 seen by the clients.
+
+The model is a numpy stand-in (dense 240→256→34 softmax) with a fixed
+--call-overhead-ms per call emulating the framework dispatch cost of a real
+forward pass, so this runs without tensorflow. Clients share the server's
+event loop.
+
+Run: python scripts/bench_inference_server.py --sessions 1 8 32 64 --seconds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+import numpy as np
+
+import _repo  # noqa: F401  (저장소 루트를 sys.path에 추가)
+
+from inference_server import BatchingEngine, InferenceServer  # noqa: E402
+from ksl_classes import KSL_CLASSES  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--hz", type=float, default=33.3)
+    parser.add_argument("--window", type=int, default=30)
+    parser.add_argument("--deadline-ms", type=float, default=5.0)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--call-overhead-ms", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+class StandinModel:
+    """Dense classifier over the flattened window plus a fixed per-call cost."""
+
+    def __init__(self, window: int, n_classes: int, overhead_s: float, seed: int):
+        rng = np.random.default_rng(seed)
+        self.w1 = rng.normal(0, 0.05, size=(window * 8, 256)).astype(np.float32)
+        self.w2 = rng.normal(0, 0.05, size=(256, n_classes)).astype(np.float32)
+        self.overhead_s = overhead_s
+        self.calls = 0
+
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        self.calls += 1
+        time.sleep(self.overhead_s)  # 프레임워크 호출 고정 비용 흉내
+        h = np.maximum(batch.reshape(len(batch), -1) @ self.w1, 0)
+        logits = h @ self.w2
+        logits -= logits.max(axis=1, keepdims=True)
+        e = np.exp(logits)
+        return e / e.sum(axis=1, keepdims=True)
+
+
+async def glove(port: int, k: int, hz: float, seconds: float, seed: int, latencies: List[float], counts: List[int]):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"SESSION glove{k}\n".encode())
+    rng = np.random.default_rng(seed + k)
+    state = np.r_[rng.uniform(-30, 30, 3), rng.uniform(600, 900, 5)]
+    step = np.r_[[0.5] * 3, [3.0] * 5]
+
+    async def receive():
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            sent = float(line.split(b'"timestamp": ', 1)[1].split(b',', 1)[0].rstrip(b'}\n'))
+            latencies.append(time.perf_counter() - sent)
+            counts[k] += 1
+
+    receiver = asyncio.create_task(receive())
+    start = time.perf_counter()
+    n = 0
+    while (now := time.perf_counter()) - start < seconds:
+        state += rng.normal(0, 1, 8) * step
+        writer.write((",".join(f"{v:.2f}" for v in state) + f",{now:.6f}\n").encode())
+        n += 1
+        await asyncio.sleep(max(0.0, start + n / hz - time.perf_counter()))
+    await asyncio.sleep(0.2)  # 마지막 응답 대기
+    writer.close()
+    await receiver
+
+
+async def run_case(n_sessions: int, batched: bool, args) -> dict:
+    model = StandinModel(args.window, len(KSL_CLASSES), args.call_overhead_ms / 1000.0, args.seed)
+    engine = BatchingEngine(model, args.window, max_batch=args.max_batch if batched else 1,
+                            deadline_s=args.deadline_ms / 1000.0 if batched else 0.0)
+    await engine.start()
+    server = InferenceServer(engine, args.window, class_names=KSL_CLASSES, confidence_threshold=0.0)
+    listener = await server.serve_tcp("127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    latencies: List[float] = []
+    counts = [0] * n_sessions
+    t0 = time.perf_counter()
+    await asyncio.gather(*(glove(port, k, args.hz, args.seconds, args.seed, latencies, counts)
+                           for k in range(n_sessions)))
+    elapsed = time.perf_counter() - t0
+    listener.close()
+    await listener.wait_closed()
+    await engine.stop()
+    active = max(elapsed - args.window / args.hz, 1e-9)  # 윈도우가 차기 전 구간 제외
+    lat = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        'rate': sum(counts) / active,
+        'batch': engine.stats()['mean_batch'],
+        'p50': float(np.percentile(lat, 50)),
+        'p99': float(np.percentile(lat, 99)),
+    }
+
+
+def main():
+    args = parse_args()
+    print(f"stand-in model, call overhead {args.call_overhead_ms} ms, {args.hz} Hz per glove, "
+          f"deadline {args.deadline_ms} ms, max batch {args.max_batch}")
+    print(f"{'sessions':>9}{'offered/s':>11} | {'unbatched/s':>12}{'p50 ms':>8}{'p99 ms':>8} | "
+          f"{'batched/s':>10}{'batch':>7}{'p50 ms':>8}{'p99 ms':>8}")
+    for n in args.sessions:
+        unbatched = asyncio.run(run_case(n, False, args))
+        batched = asyncio.run(run_case(n, True, args))
+        print(f"{n:>9}{n * args.hz:>11.0f} | {unbatched['rate']:>12.0f}{unbatched['p50']:>8.1f}{unbatched['p99']:>8.1f} | "
+              f"{batched['rate']:>10.0f}{batched['batch']:>7.1f}{batched['p50']:>8.1f}{batched['p99']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
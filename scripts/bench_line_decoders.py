@@ -0,0 +1,113 @@
+"""
+Line decoder cost: CSV (imu_flex_serial.ino) vs JSON Lines (sensor_transmit.ino).
+
+Encodes --samples synthetic glove samples the way each firmware prints
+them (printCsvRow, 12 fields, and ArduinoJson's printJsonRow, timestamp in
+seconds, no acceleration), then decodes them the way the collector does -
+LineFramer over --read-size chunks, then the line decoder - with
+
+- ``csv``: line_decoders.CsvDecoder (parse_csv_lines),
+- ``json/<backend>``: JsonDecoder with each installed JSON parser,
+- ``auto``: AutoDecoder on the JSON stream (detection + JSON),
+
+reporting bytes per sample, the sample rate a 115200 baud link carries and
+host decode µs/sample. All JSON paths must agree with the CSV path on the
+shared fields (timestamp, pitch, roll, yaw, flex1-5), and auto detection
+must pick the right decoder for both streams.
+
+Run: python scripts/bench_line_decoders.py --samples 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+import _repo  # noqa: F401  (저장소 루트를 sys.path에 추가)
+
+from bench_binary_frames import csv_bytes, synthetic_records  # noqa: E402
+from line_decoders import AutoDecoder, CsvDecoder, JsonDecoder, json_backend  # noqa: E402
+from serial_stream import LineFramer  # noqa: E402
+
+SHARED = ['timestamp_ms', 'pitch', 'roll', 'yaw', 'flex1', 'flex2', 'flex3', 'flex4', 'flex5', 'sampling_hz']
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=200000)
+    parser.add_argument("--interval-ms", type=int, default=20)
+    parser.add_argument("--read-size", type=int, default=4096)
+    parser.add_argument("--baud", type=int, default=115200)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def json_bytes(records: np.ndarray) -> bytes:
+    """The samples as sensor_transmit.ino printJsonRow lines (ArduinoJson prints the shortest repr)."""
+    return b"".join(
+        f'{{"timestamp":{r[0] / 1000.0!r},"yaw":{r[4]!r},"pitch":{r[2]!r},"roll":{r[3]!r},'
+        f'"flex1":{r[5]},"flex2":{r[6]},"flex3":{r[7]},"flex4":{r[8]},"flex5":{r[9]}}}\r\n'.encode()
+        for r in records.tolist())
+
+
+def decode(decoder, data: bytes, read_size: int):
+    framer = LineFramer()
+    out = []
+    last_ms = None
+    t0 = time.perf_counter()
+    for pos in range(0, len(data), read_size):
+        records, valid = decoder.decode(framer.feed(data[pos:pos + read_size]), last_arduino_ms=last_ms)
+        records = records[valid]
+        if len(records):
+            out.append(records)
+            last_ms = int(records['timestamp_ms'][-1])
+    return np.concatenate(out), time.perf_counter() - t0
+
+
+def main():
+    args = parse_args()
+    records = synthetic_records(args.samples, args.interval_ms, np.random.default_rng(args.seed))
+    text = {'csv': csv_bytes(records), 'json': json_bytes(records)}
+
+    cases = [("csv", CsvDecoder(), 'csv')]
+    for backend in ('orjson', 'simdjson', 'json'):
+        try:
+            json_backend(backend)
+        except ImportError:
+            continue
+        cases.append((f"json/{backend}", JsonDecoder(backend), 'json'))
+    auto = AutoDecoder()
+    cases.append(("auto (json)", auto, 'json'))
+
+    n = args.samples
+    link = args.baud / 10  # 8N1
+    print(f"{n} samples, {args.read_size} B reads, {args.baud} baud")
+    print(f"{'decoder':<16}{'B/sample':>10}{'max Hz @ link':>15}{'decode µs/sample':>18}{'samples':>9}")
+    reference = None
+    ok = True
+    for name, decoder, fmt in cases:
+        decoded, seconds = decode(decoder, text[fmt], args.read_size)
+        size = len(text[fmt]) / n
+        print(f"{name:<16}{size:>10.1f}{link / size:>15.0f}{seconds / n * 1e6:>18.2f}{len(decoded):>9}")
+        if reference is None:
+            reference = decoded
+        same = len(decoded) == n and all(np.array_equal(decoded[f], reference[f]) for f in SHARED)
+        if not same:
+            print(f"❌ {name} disagrees with the CSV path")
+            ok = False
+    detected = {fmt: AutoDecoder() for fmt in text}
+    for fmt, decoder in detected.items():
+        decoder.decode(LineFramer().feed(text[fmt][:4096]))
+    detection_ok = all(detected[fmt].decoder.name == fmt for fmt in text)
+    print(f"auto detection: csv → {detected['csv'].decoder.name}, json → {detected['json'].decoder.name} "
+          f"{'✅' if detection_ok else '❌'}")
+    if not (ok and detection_ok):
+        sys.exit(1)
+    print("✅ all decoders agree on the shared fields")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Drain a buffered serial backlog with readline() vs serial_stream.LineFramer.
+
+A pty stands in for the Arduino. The master end writes a burst of CSV rows
+(as if the host had stalled), then each strategy drains the slave end and the
+script reports port.read() calls and wall time. A second pass feeds a stream
+with injected garbage through the framer in random chunk sizes and checks that
+every good row is recovered and the garbage is reported as discarded bytes.
+
+POSIX only (needs the pty module).
+
+Run: python scripts/bench_line_framer.py --lines 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pty
+import random
+import sys
+import time
+
+import serial
+
+import _repo  # noqa: F401  (저장소 루트를 sys.path에 추가)
+
+from serial_stream import LineFramer  # noqa: E402
+
+ROW = "{seq},1.00,2.00,3.00,0.010,0.020,0.980,500,510,520,530,540\n"
+
+
+class CountingSerial(serial.Serial):
+    """pyserial port that counts read() calls (readline() goes through read(1))."""
+
+    read_calls = 0
+
+    def read(self, size=1):
+        self.read_calls += 1
+        return super().read(size)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=2000, help="Rows in the buffered burst.")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def write_burst(master_fd: int, n: int):
+    payload = "".join(ROW.format(seq=i) for i in range(n)).encode()
+    view = memoryview(payload)
+    while view:
+        written = os.write(master_fd, view)
+        view = view[written:]
+
+
+def drain(port: CountingSerial, n: int, strategy: str) -> float:
+    framer = LineFramer()
+    got = 0
+    t0 = time.perf_counter()
+    while got < n:
+        if strategy == "readline":
+            if port.in_waiting > 0:
+                port.readline()
+                got += 1
+        else:
+            got += len(framer.read_from(port))
+    return time.perf_counter() - t0
+
+
+def bench_pty(n: int):
+    print(f"\n[pty burst] {n} rows, {len(ROW.format(seq=0)) * n / 1024:.1f} KiB")
+    print(f"{'strategy':<10}{'read() calls':>14}{'time ms':>12}")
+    for strategy in ("readline", "framer"):
+        master_fd, slave_fd = pty.openpty()
+        port = CountingSerial(os.ttyname(slave_fd), 115200, timeout=1)
+        # pty 버퍼(수 KiB)를 넘지 않도록 나눠 쓰고 그때마다 비운다
+        total_time = 0.0
+        sent = 0
+        while sent < n:
+            step = min(40, n - sent)
+            write_burst(master_fd, step)
+            total_time += drain(port, step, strategy)
+            sent += step
+        print(f"{strategy:<10}{port.read_calls:>14}{total_time * 1000:>12.2f}")
+        port.close()
+        os.close(master_fd)
+        os.close(slave_fd)
+
+
+def check_malformed(n: int, seed: int):
+    rng = random.Random(seed)
+    good = [ROW.format(seq=i).encode() for i in range(n)]
+    garbage = b"\xff" * 700  # max_line_length(512)보다 긴 개행 없는 쓰레기
+    stream = b"".join(good[: n // 2]) + garbage + b"\n" + b"".join(good[n // 2:])
+
+    framer = LineFramer()
+    out = []
+    pos = 0
+    while pos < len(stream):
+        step = rng.randint(1, 300)
+        out.extend(framer.feed(stream[pos:pos + step]))
+        pos += step
+
+    expected = [g.rstrip(b"\n") for g in good]
+    ok = out == expected
+    print(f"\n[malformed] recovered {len(out)}/{n} rows, "
+          f"discarded {framer.discarded_bytes} bytes in {framer.discarded_lines} line(s) -> {'OK' if ok else 'MISMATCH'}")
+    if not ok or framer.discarded_bytes < len(garbage):
+        sys.exit(1)
+
+
+def main():
+    args = parse_args()
+    bench_pty(args.lines)
+    check_malformed(args.lines, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Startup progress loading: directory rescan vs the SQLite episode manifest.
+
+Builds a synthetic datasets/unified tree in a temporary directory with N
+per-episode H5 + CSV pairs (empty files; the rescan only globs names), then
+for each N times
+
+- ``rescan``: the previous load_collection_progress strategy (glob every
+  <class>/<type> directory), via episode_manifest.scan_dataset,
+- ``manifest``: ``SignGloveUnifiedCollector.load_collection_progress`` with
+  an initialised manifest (reads the counts table only).
+
+Finally it deletes a few files and runs the background verification pass
+synchronously to show that the drift is reported and reconciled.
+
+Run: python scripts/bench_manifest_startup.py --episodes 1000 10000 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import _repo  # noqa: F401  (저장소 루트를 sys.path에 추가)
+
+import ser  # noqa: E402
+from episode_manifest import count_records, scan_dataset  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--episodes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args()
+
+
+def make_tree(data_dir: Path, classes, types, n: int):
+    for k in range(n):
+        class_name = classes[k % len(classes)]
+        episode_type = types[(k // len(classes)) % len(types)]
+        type_dir = data_dir / class_name / episode_type
+        type_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"episode_20250101_{k:06d}_{class_name}_{episode_type}"
+        (type_dir / f"{stem}.h5").touch()
+        (type_dir / f"{stem}.csv").touch()
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    args = parse_args()
+    ser.MANIFEST_VERIFY = "off"  # 검증은 마지막에 직접 동기 실행
+    cwd = os.getcwd()
+    print(f"{'episodes':>10}{'rescan ms':>12}{'manifest ms':>14}")
+    for n in args.episodes:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    collector = ser.SignGloveUnifiedCollector()  # 빈 디렉토리 → 빈 매니페스트
+                    classes, types = collector.all_classes, list(collector.episode_types)
+                    make_tree(collector.data_dir, classes, types, n)
+                    collector.manifest.rebuild(collector.scan_saved_episodes())
+
+                    t_scan = best_of(lambda: scan_dataset(collector.data_dir, classes, types, collector.store_dir),
+                                     args.repeat)
+                    t_manifest = best_of(collector.load_collection_progress, args.repeat)
+                    loaded = sum(sum(v.values()) for v in collector.collection_stats.values())
+                print(f"{n:>10}{t_scan * 1000:>12.1f}{t_manifest * 1000:>14.2f}")
+                if loaded != n:
+                    print(f"❌ manifest reported {loaded} episodes, expected {n}")
+                    sys.exit(1)
+
+                if n == args.episodes[-1]:
+                    victims = sorted(collector.data_dir.glob(f"{classes[0]}/{types[0]}/*"))[:6]
+                    for path in victims:
+                        path.unlink()
+                    out = io.StringIO()
+                    with contextlib.redirect_stdout(out):
+                        collector.verify_manifest()
+                    print("\n[verification after deleting 3 episodes (H5 + CSV)]")
+                    print(out.getvalue().strip())
+                    disk = count_records(collector.scan_saved_episodes())
+                    if collector.manifest.counts() != disk:
+                        print("❌ manifest was not reconciled")
+                        sys.exit(1)
+            finally:
+                os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
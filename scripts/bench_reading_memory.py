@@ -0,0 +1,124 @@
+"""
+Per-sample memory footprint and GC pressure of the episode sample store.
+
+Simulates a long collection session by creating one reading per sample (as
+the reception worker does) and keeping it in
+
+- ``dict-list``: the previous plain ``@dataclass`` objects in a Python list,
+- ``slots-list``: the slotted ``SignGloveSensorReading`` in a Python list,
+- ``columns``: ``EpisodeBuffer`` preallocated NumPy columns (the reading
+  object is dropped after ``append``, only its column values are retained).
+
+For each store the script reports retained bytes per sample (tracemalloc),
+the number of cyclic-GC collections triggered per generation and the total
+time spent in them.
+
+Run: python scripts/bench_reading_memory.py --samples 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+import _repo  # noqa: F401  (저장소 루트를 sys.path에 추가)
+
+from sensor_records import EpisodeBuffer, SignGloveSensorReading  # noqa: E402
+
+
+@dataclass
+class LegacyReading:
+    """The pre-slots layout (one __dict__ per sample)."""
+    timestamp_ms: int
+    recv_timestamp_ms: int
+    pitch: float
+    roll: float
+    yaw: float
+    flex1: int
+    flex2: int
+    flex3: int
+    flex4: int
+    flex5: int
+    sampling_hz: float
+    accel_x: float = 0.0
+    accel_y: float = 0.0
+    accel_z: float = 0.0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=200000, help="Samples kept in the store (~100 min @33Hz).")
+    return parser.parse_args()
+
+
+class GCMonitor:
+    """Count and time cyclic-GC runs per generation via gc.callbacks."""
+
+    def __init__(self):
+        self.collections = [0, 0, 0]
+        self.seconds = 0.0
+        self._t0 = 0.0
+
+    def __call__(self, phase: str, info: Dict[str, int]):
+        if phase == "start":
+            self._t0 = time.perf_counter()
+        else:
+            self.seconds += time.perf_counter() - self._t0
+            self.collections[info["generation"]] += 1
+
+
+def make_values(i: int):
+    # 실제 스트림처럼 샘플마다 새 float/int 객체가 생기도록 i로부터 값을 만든다
+    return (30 * i, 1_700_000_000_000 + 30 * i, i * 0.01, -i * 0.02, i * 0.03,
+            i % 1024, (i + 1) % 1024, (i + 2) % 1024, (i + 3) % 1024, (i + 4) % 1024,
+            33.3 + (i % 7) * 0.1, 0.01 * (i % 5), 0.02 * (i % 3), 0.98 + 0.001 * (i % 11))
+
+
+def run(n: int, make_store: Callable, make_reading: Callable) -> Dict[str, float]:
+    gc.collect()
+    monitor = GCMonitor()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    gc.callbacks.append(monitor)
+    t0 = time.perf_counter()
+    try:
+        store = make_store(n)
+        for i in range(n):
+            store.append(make_reading(*make_values(i)))
+        elapsed = time.perf_counter() - t0
+        retained = tracemalloc.get_traced_memory()[0] - base
+    finally:
+        gc.callbacks.remove(monitor)
+        tracemalloc.stop()
+    assert len(store) == n
+    return {
+        "bytes_per_sample": retained / n,
+        "gc": monitor.collections,
+        "gc_ms": monitor.seconds * 1000.0,
+        "elapsed_s": elapsed,
+    }
+
+
+def main():
+    args = parse_args()
+    n = args.samples
+    stores = {
+        "dict-list": (lambda _: [], LegacyReading),
+        "slots-list": (lambda _: [], SignGloveSensorReading),
+        "columns": (EpisodeBuffer, SignGloveSensorReading),
+    }
+    print(f"samples: {n}")
+    print(f"{'store':<12}{'B/sample':>10}{'gen0':>8}{'gen1':>7}{'gen2':>7}{'gc ms':>10}{'append s':>10}")
+    for name, (make_store, make_reading) in stores.items():
+        r = run(n, make_store, make_reading)
+        g0, g1, g2 = r["gc"]
+        print(f"{name:<12}{r['bytes_per_sample']:>10.1f}{g0:>8}{g1:>7}{g2:>7}"
+              f"{r['gc_ms']:>10.1f}{r['elapsed_s']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Per-episode H5 tree vs the memory-mapped sensor corpus: load time and sharing.
+
+Exports --data-dir with sensor_corpus.export_corpus into a temporary
+directory, checks every episode view against the source, then times one full
+pass over all episodes (per-episode mean, so every row is touched):
+
+- ``h5 tree``: SignGloveDataset, which opens each file and copies it,
+- ``corpus``: SensorCorpus, where each episode is a view into one mapping.
+
+Finally --procs worker processes each walk the whole corpus at once and
+report their private vs proportional (shared) resident memory from
+/proc/self/smaps_rollup (Linux), showing that the pages are shared through
+the page cache instead of being copied into each process.
+
+Run: python scripts/bench_sensor_corpus.py --procs 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+from _repo import REPO_ROOT  # 저장소 루트를 sys.path에 추가
+
+from sensor_corpus import SensorCorpus, export_corpus  # noqa: E402
+from signglove_dataset import SignGloveDataset  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=REPO_ROOT / "datasets" / "unified")
+    parser.add_argument("--procs", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args()
+
+
+def pass_tree(data_dir: Path) -> float:
+    total = 0.0
+    for sensor_batch, _, _ in SignGloveDataset(data_dir, prefetch=0):
+        for sensor in sensor_batch:
+            total += float(sensor.mean())
+    return total
+
+
+def pass_corpus(path: Path) -> float:
+    corpus = SensorCorpus(path)
+    return sum(float(corpus[i].mean()) for i in range(len(corpus)))
+
+
+def smaps_rollup() -> Dict[str, int]:
+    out = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    out[parts[0].rstrip(':')] = int(parts[1])
+    except OSError:
+        pass
+    return out
+
+
+def worker(path: str, barrier, results):
+    corpus = SensorCorpus(Path(path))
+    before = smaps_rollup()
+    checksum = float(np.asarray(corpus.sensor_data).sum(dtype=np.float64))
+    barrier.wait()  # 모든 프로세스가 매핑을 잡고 있는 상태에서 측정
+    after = smaps_rollup()
+    results.put({key: after.get(key, 0) - before.get(key, 0) for key in ('Rss', 'Pss', 'Private_Clean',
+                                                                           'Private_Dirty')} | {'sum': checksum})
+    barrier.wait()
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    args = parse_args()
+    dataset = SignGloveDataset(args.data_dir)
+    if not dataset.num_episodes:
+        print(f"no episode files under {args.data_dir}")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "corpus"
+        t0 = time.perf_counter()
+        meta = export_corpus(dataset, path)
+        export_s = time.perf_counter() - t0
+
+        corpus = SensorCorpus(path)
+        for k, (sensor_batch, label_batch, type_batch) in enumerate(SignGloveDataset(args.data_dir, batch_size=1)):
+            view, label, episode_type = corpus.episode(k)
+            if not (np.array_equal(view, sensor_batch[0]) and label == label_batch[0]
+                    and episode_type == type_batch[0]):
+                print(f"❌ corpus episode {k} differs from the source")
+                sys.exit(1)
+        if not isinstance(corpus[0], np.memmap) or corpus[0].base is None:
+            print("❌ episode access is not a view into the mapping")
+            sys.exit(1)
+
+        t_tree = best_of(lambda: pass_tree(args.data_dir), args.repeat)
+        t_corpus = best_of(lambda: pass_corpus(path), args.repeat)
+        data_kib = (path / "sensor_data.npy").stat().st_size / 1024
+
+        print(f"episodes: {meta['num_episodes']}  samples: {meta['num_samples']}  "
+              f"sensor_data.npy: {data_kib:.0f} KiB  (exported in {export_s:.2f}s, verified)")
+        print(f"{'source':<10}{'full pass ms':>14}{'speedup':>9}")
+        print(f"{'h5 tree':<10}{t_tree * 1000:>14.1f}{1.0:>9.1f}")
+        print(f"{'corpus':<10}{t_corpus * 1000:>14.1f}{t_tree / t_corpus:>9.1f}")
+
+        if args.procs > 0:
+            ctx = mp.get_context("spawn")
+            barrier, results = ctx.Barrier(args.procs), ctx.Queue()
+            procs = [ctx.Process(target=worker, args=(str(path), barrier, results)) for _ in range(args.procs)]
+            for p in procs:
+                p.start()
+            stats = [results.get() for _ in procs]
+            for p in procs:
+                p.join()
+            if len({s['sum'] for s in stats}) != 1:
+                print("❌ workers saw different data")
+                sys.exit(1)
+            print(f"\n{args.procs} processes reading the whole corpus concurrently (KiB per process, "
+                  f"corpus = {data_kib:.0f} KiB):")
+            print(f"{'proc':>5}{'Rss':>8}{'Pss':>8}{'Private':>9}")
+            for k, s in enumerate(stats):
+                print(f"{k:>5}{s['Rss']:>8}{s['Pss']:>8}{s['Private_Clean'] + s['Private_Dirty']:>9}")
+
+
+if __name__ == "__main__":
+    main()
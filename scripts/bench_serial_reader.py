@@ -0,0 +1,145 @@
+"""
+Compare the polling and event-driven serial reception workers of ser.py.
+
+A pseudo-terminal (pty) stands in for the Arduino: the master end replays
+12-field CSV rows at the glove's rate while the collector reads the slave end
+through pyserial. For each reader mode the script reports
+
+- CPU time burned by the process while the port is idle,
+- line-arrival -> data_queue latency (p50/p99/max),
+- how many rows made it into the queue.
+
+POSIX only (needs the pty module).
+
+Run: python scripts/bench_serial_reader.py --seconds 5 --rate 33
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pty
+import queue
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+import numpy as np
+import serial
+
+import _repo  # noqa: F401  (저장소 루트를 sys.path에 추가)
+
+import ser  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0, help="Streaming duration per mode.")
+    parser.add_argument("--idle", type=float, default=2.0, help="Idle window used for the CPU measurement.")
+    parser.add_argument("--rate", type=float, default=33.0, help="Rows per second written to the pty.")
+    parser.add_argument("--modes", nargs="+", default=["poll", "event"], choices=["poll", "event"])
+    return parser.parse_args()
+
+
+def make_collector(mode: str) -> ser.SignGloveUnifiedCollector:
+    # 빈 임시 디렉토리에서 생성해 datasets/unified 스캔을 피한다 (백그라운드 검증도 끔)
+    ser.MANIFEST_VERIFY = "off"
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            collector = ser.SignGloveUnifiedCollector()
+        finally:
+            os.chdir(cwd)
+    collector.reader_mode = mode
+    return collector
+
+
+def run_mode(mode: str, seconds: float, idle: float, rate: float) -> Dict[str, float]:
+    master_fd, slave_fd = pty.openpty()
+    port = serial.Serial(os.ttyname(slave_fd), 115200, timeout=1)
+    collector = make_collector(mode)
+    collector.serial_port = port
+
+    sent_at: Dict[int, float] = {}
+    latencies: List[float] = []
+    received = 0
+    done = threading.Event()
+
+    def consume():
+        nonlocal received
+        while not done.is_set():
+            try:
+                reading = collector.data_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            t = time.perf_counter()
+            seq = reading.timestamp_ms
+            if seq in sent_at:
+                latencies.append(t - sent_at[seq])
+            received += 1
+
+    consumer = threading.Thread(target=consume, daemon=True)
+    consumer.start()
+    collector.start_data_reception()
+
+    # 1) idle CPU: 포트에 아무것도 쓰지 않는 동안 프로세스 CPU 시간 측정
+    time.sleep(0.2)
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    time.sleep(idle)
+    idle_cpu = (time.process_time() - cpu0) / (time.perf_counter() - wall0)
+
+    # 2) streaming latency
+    interval = 1.0 / rate
+    n_rows = int(seconds * rate)
+    next_t = time.perf_counter()
+    for seq in range(1, n_rows + 1):
+        row = f"{seq},1.00,2.00,3.00,0.010,0.020,0.980,500,510,520,530,540\n".encode()
+        sent_at[seq] = time.perf_counter()
+        os.write(master_fd, row)
+        next_t += interval
+        time.sleep(max(0.0, next_t - time.perf_counter()))
+    time.sleep(0.5)
+
+    done.set()
+    collector.stop_event.set()
+    collector.serial_thread.join(timeout=2)
+    consumer.join(timeout=1)
+    port.close()
+    os.close(master_fd)
+    os.close(slave_fd)
+
+    lat_ms = np.array(latencies) * 1000.0 if latencies else np.array([np.nan])
+    return {
+        "idle_cpu_pct": idle_cpu * 100.0,
+        "sent": n_rows,
+        "received": received,
+        "lat_p50_ms": float(np.percentile(lat_ms, 50)),
+        "lat_p99_ms": float(np.percentile(lat_ms, 99)),
+        "lat_max_ms": float(np.max(lat_ms)),
+    }
+
+
+def main():
+    args = parse_args()
+    results = {mode: run_mode(mode, args.seconds, args.idle, args.rate) for mode in args.modes}
+
+    print("\n" + "=" * 72)
+    print(f"{'mode':<8}{'idle CPU %':>12}{'rows':>12}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for mode, r in results.items():
+        print(
+            f"{mode:<8}{r['idle_cpu_pct']:>12.2f}{r['received']:>6}/{r['sent']:<5}"
+            f"{r['lat_p50_ms']:>10.3f}{r['lat_p99_ms']:>10.3f}{r['lat_max_ms']:>10.3f}"
+        )
+    print("=" * 72)
+
+    missing = [m for m, r in results.items() if r["received"] != r["sent"]]
+    if missing:
+        print(f"❌ rows lost in mode(s): {', '.join(missing)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
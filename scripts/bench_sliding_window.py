@@ -0,0 +1,153 @@
+"""
+Per-sample window preparation: deque rebuild + transform vs SlidingWindow.
+
+Feeds recorded samples (--data-dir, in SensorData order) one by one and
+prepares the model input for every full window, the way predict_sequence
+does before the model call:
+
+- ``deque``: the previous code (``np.array(list(deque))``, ``scaler.transform``
+  over the whole window, reshape),
+- ``ring``: sliding_window.SlidingWindow (scale once on arrival, contiguous
+  view of a doubled buffer).
+
+Reports µs per sample, the peak of traced allocations (tracemalloc) over a
+whole run (for ``ring`` that is the one-time buffer and views; the steady
+state allocates nothing per sample), and checks that both produce the same windows. The
+scaler is an sklearn StandardScaler when scikit-learn is installed,
+otherwise an equivalent per-feature affine map fitted on the same samples.
+
+Run: python scripts/bench_sliding_window.py --samples 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+from _repo import REPO_ROOT  # 저장소 루트를 sys.path에 추가
+
+from signglove_dataset import SignGloveDataset  # noqa: E402
+from sliding_window import SlidingWindow  # noqa: E402
+
+# H5 sensor_data (flex1-5, pitch, roll, yaw) → SensorData.to_array (yaw, pitch, roll, flex1-5)
+MODEL_ORDER = [7, 5, 6, 0, 1, 2, 3, 4]
+
+
+class AffineScaler:
+    """StandardScaler.transform without scikit-learn (same mean_/scale_ attributes)."""
+
+    def __init__(self, samples: np.ndarray):
+        self.mean_ = samples.mean(axis=0)
+        self.scale_ = samples.std(axis=0)
+        self.scale_[self.scale_ == 0] = 1.0
+
+    def transform(self, x: np.ndarray) -> np.ndarray:
+        return (np.asarray(x, dtype=np.float64) - self.mean_) / self.scale_
+
+
+class Sample:
+    """Attribute access like inference.SensorData (which needs tensorflow to import)."""
+    __slots__ = ('yaw', 'pitch', 'roll', 'flex1', 'flex2', 'flex3', 'flex4', 'flex5')
+
+    def __init__(self, row):
+        (self.yaw, self.pitch, self.roll, self.flex1, self.flex2,
+         self.flex3, self.flex4, self.flex5) = row
+
+    def to_array(self) -> np.ndarray:
+        return np.array([self.yaw, self.pitch, self.roll, self.flex1, self.flex2,
+                         self.flex3, self.flex4, self.flex5])
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=REPO_ROOT / "datasets" / "unified")
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--window", type=int, default=30)
+    return parser.parse_args()
+
+
+def recorded_samples(data_dir: Path, n: int) -> np.ndarray:
+    rows, total = [], 0
+    for sensor_batch, _, _ in SignGloveDataset(data_dir, prefetch=0):
+        for sensor in sensor_batch:
+            rows.append(sensor[:, MODEL_ORDER])
+            total += len(sensor)
+        if total >= n:
+            break
+    return np.concatenate(rows)[:n].astype(np.float64)
+
+
+def run_deque(samples, scaler, window: int, keep: bool):
+    buffer = deque(maxlen=window)
+    out = []
+    for sample in samples:
+        buffer.append(sample.to_array())
+        if len(buffer) < window:
+            continue
+        sequence_data = np.array(list(buffer))
+        sequence_data = scaler.transform(sequence_data)
+        sequence_data = sequence_data.reshape(1, window, -1)
+        if keep:
+            out.append(sequence_data.astype(np.float32))
+    return out
+
+
+def run_ring(samples, scaler, window: int, keep: bool):
+    buffer = SlidingWindow(window, scaler=scaler)
+    out = []
+    for sample in samples:
+        buffer.append(sample)
+        if not buffer.full:
+            continue
+        sequence_data = buffer.window()
+        if keep:
+            out.append(sequence_data.copy())
+    return out
+
+
+def measure(fn, samples, scaler, window: int):
+    fn(samples[:window * 2], scaler, window, False)  # 워밍업
+    t0 = time.perf_counter()
+    fn(samples, scaler, window, False)
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    fn(samples, scaler, window, False)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed / len(samples) * 1e6, peak - base
+
+
+def main():
+    args = parse_args()
+    raw = recorded_samples(args.data_dir, args.samples)
+    try:
+        from sklearn.preprocessing import StandardScaler
+        scaler, scaler_name = StandardScaler().fit(raw), "sklearn StandardScaler"
+    except ImportError:
+        scaler, scaler_name = AffineScaler(raw), "affine (scikit-learn not installed)"
+    samples = [Sample(row) for row in raw.tolist()]
+
+    old = run_deque(samples[:2000], scaler, args.window, True)
+    new = run_ring(samples[:2000], scaler, args.window, True)
+    if len(old) != len(new) or not all(np.allclose(a, b, atol=1e-5) for a, b in zip(old, new)):
+        print("❌ SlidingWindow windows differ from the deque path")
+        sys.exit(1)
+
+    print(f"samples: {len(samples)}, window: {args.window}, scaler: {scaler_name} (windows verified)")
+    print(f"{'path':<8}{'µs/sample':>11}{'peak alloc B':>14}")
+    results = {name: measure(fn, samples, scaler, args.window)
+               for name, fn in (("deque", run_deque), ("ring", run_ring))}
+    for name, (us, peak) in results.items():
+        print(f"{name:<8}{us:>11.2f}{peak:>14}")
+    print(f"speedup: {results['deque'][0] / results['ring'][0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
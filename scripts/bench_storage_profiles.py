@@ -0,0 +1,148 @@
+"""
+Write throughput and size on disk for each H5 storage profile.
+
+For every profile in storage_profiles.STORAGE_PROFILES the script writes the
+same episodes twice in a temporary directory:
+
+- ``files``: one H5 per episode through ser.SignGloveUnifiedCollector.save_episode_data,
+- ``store``: appended to one EpisodeStore (flushed after every episode, as
+  the collector does),
+
+and reports episodes/sec and bytes on disk (KiB and bytes per sample).
+Episodes are taken from the recorded dataset (--data-dir) when available,
+otherwise synthesised. fsync is skipped unless --fsync is given, since on
+most disks it dominates and hides the difference between profiles.
+
+Run: python scripts/bench_storage_profiles.py --episodes 300
+     python scripts/bench_storage_profiles.py --profiles none lzf gzip4 --fsync
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import h5py
+import numpy as np
+
+from _repo import REPO_ROOT  # 저장소 루트를 sys.path에 추가
+
+import episode_store  # noqa: E402
+import ser  # noqa: E402
+from episode_writer import EpisodeJob  # noqa: E402
+from sensor_records import EpisodeBuffer, SignGloveSensorReading  # noqa: E402
+from storage_profiles import STORAGE_PROFILES  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--episodes", type=int, default=300)
+    parser.add_argument("--profiles", nargs="+", default=list(STORAGE_PROFILES), choices=list(STORAGE_PROFILES))
+    parser.add_argument("--data-dir", type=Path, default=REPO_ROOT / "datasets" / "unified")
+    parser.add_argument("--fsync", action="store_true", help="Keep the per-episode fsync of the real write path.")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def recorded_episodes(data_dir: Path, n: int) -> List[Tuple[str, str, EpisodeBuffer]]:
+    episodes = []
+    for path in sorted(data_dir.glob("*/*/episode_*.h5"))[:n]:
+        with h5py.File(path, 'r') as f:
+            sensor = f['sensor_data'][:]
+            accel = f['sensors/acceleration'][:]
+            ts = f['timestamps'][:]
+            ats = f['arduino_timestamps'][:]
+            hz = f['sampling_rates'][:]
+        buf = EpisodeBuffer(len(ts))
+        for i in range(len(ts)):
+            fl, ori = sensor[i, :5], sensor[i, 5:]
+            buf.append(SignGloveSensorReading(int(ats[i]), int(ts[i]), float(ori[0]), float(ori[1]), float(ori[2]),
+                                              *map(int, fl), float(hz[i]), *map(float, accel[i])))
+        episodes.append((path.parent.parent.name, path.parent.name, buf))
+    return episodes
+
+
+def synthetic_episodes(n: int, seed: int, classes: List[str]) -> List[Tuple[str, str, EpisodeBuffer]]:
+    rng = np.random.default_rng(seed)
+    episodes = []
+    for k in range(n):
+        buf = EpisodeBuffer(80)
+        ang = np.cumsum(rng.normal(0, 0.5, size=(80, 3)), axis=0)
+        flex = np.clip(600 + np.cumsum(rng.normal(0, 3, size=(80, 5)), axis=0), 0, 1023).astype(int)
+        for i in range(80):
+            buf.append(SignGloveSensorReading(30 * i, 1_700_000_000_000 + 30 * i, *ang[i], *flex[i].tolist(), 33.3,
+                                              0.01, 0.02, 0.98))
+        episodes.append((classes[k % len(classes)], str(k % 5 + 1), buf))
+    return episodes
+
+
+def dir_bytes(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def run_profile(name: str, episodes, collector: ser.SignGloveUnifiedCollector, tmp: Path) -> Dict[str, Dict[str, float]]:
+    ser.STORAGE_PROFILE = name
+    n_samples = sum(len(buf) for _, _, buf in episodes)
+    out = {}
+
+    # files: 에피소드마다 H5 하나 (수집기 저장 경로 그대로)
+    collector.data_dir = tmp / f"files_{name}"
+    t0 = time.perf_counter()
+    for k, (class_name, episode_type, buf) in enumerate(episodes):
+        collector.save_episode_data(EpisodeJob(buf, class_name, episode_type, 2.4, f"{k:06d}"))
+    elapsed = time.perf_counter() - t0
+    size = dir_bytes(collector.data_dir)
+    out['files'] = {'eps': len(episodes) / elapsed, 'bytes': size, 'bps': size / n_samples}
+
+    # store: 세션 통합 저장소에 추가
+    path = tmp / f"store_{name}" / "session_bench.h5"
+    t0 = time.perf_counter()
+    with episode_store.EpisodeStore(path, profile=name) as store:
+        for class_name, episode_type, buf in episodes:
+            store.append(buf, class_name, episode_type)
+            store.flush()
+    elapsed = time.perf_counter() - t0
+    size = path.stat().st_size
+    out['store'] = {'eps': len(episodes) / elapsed, 'bytes': size, 'bps': size / n_samples}
+    return out
+
+
+def main():
+    args = parse_args()
+    if not args.fsync:
+        # 압축 비용만 비교하기 위해 fsync를 끈다 (실제 수집 경로는 항상 fsync)
+        ser.fsync_file = episode_store.fsync_file = lambda path: None
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            ser.MANIFEST_VERIFY = "off"
+            with contextlib.redirect_stdout(io.StringIO()):
+                collector = ser.SignGloveUnifiedCollector()
+            episodes = recorded_episodes(args.data_dir, args.episodes)
+            source = f"recorded ({args.data_dir})"
+            if len(episodes) < args.episodes:
+                episodes = synthetic_episodes(args.episodes, args.seed, collector.all_classes)
+                source = "synthetic"
+            n_samples = sum(len(buf) for _, _, buf in episodes)
+            results = {name: run_profile(name, episodes, collector, Path(tmp)) for name in args.profiles}
+        finally:
+            os.chdir(cwd)
+
+    print(f"episodes: {len(episodes)} ({source}), samples: {n_samples}, fsync: {'on' if args.fsync else 'off'}")
+    print(f"{'profile':<15}{'files ep/s':>12}{'KiB':>9}{'B/sample':>10}{'store ep/s':>13}{'KiB':>9}{'B/sample':>10}")
+    for name, r in results.items():
+        f, s = r['files'], r['store']
+        print(f"{name:<15}{f['eps']:>12.0f}{f['bytes'] / 1024:>9.0f}{f['bps']:>10.1f}"
+              f"{s['eps']:>13.0f}{s['bytes'] / 1024:>9.0f}{s['bps']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Wi-Fi ingestion throughput vs number of concurrent glove connections.
+
+Starts wifi_ingest.IngestServer on a local TCP port (writing into a
+temporary directory) and, from a separate client process, connects N
+gloves that each send ``GLOVE glove<k>`` and then stream 12-field CSV rows
+as fast as the server takes them (--rows-per-write rows per socket write)
+for --seconds. For each N it reports the sustained rows/sec accepted by the
+server and checks that every glove's CSV holds exactly the rows its client
+sent.
+
+For reference, ``per-row`` opens one connection per row (the old
+csv_wifi.py client model) from --legacy-clients concurrent clients.
+
+Run: python scripts/bench_wifi_ingest.py --gloves 1 8 64 256 --seconds 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import _repo  # noqa: F401  (저장소 루트를 sys.path에 추가)
+
+from wifi_ingest import IngestServer  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--gloves", type=int, nargs="+", default=[1, 8, 64, 256])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--rows-per-write", type=int, default=8)
+    parser.add_argument("--legacy-clients", type=int, default=8)
+    return parser.parse_args()
+
+
+def make_rows(k: int, start_ms: int, n: int) -> bytes:
+    return b"".join(
+        f"{start_ms + 20 * i},{-3.36 + k % 7:.2f},{-1.71:.2f},{3.72:.2f},0.012,-0.981,0.034,"
+        f"{770 + i % 9},{782 - i % 5},770,808,805\n".encode()
+        for i in range(n))
+
+
+async def persistent_glove(port: int, k: int, end: float, rows_per_write: int, sent: Dict[str, int]):
+    _, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GLOVE glove{k}\n".encode())
+    n = 0
+    while time.perf_counter() < end:
+        writer.write(make_rows(k, 20 * n, rows_per_write))
+        n += rows_per_write
+        await writer.drain()
+        await asyncio.sleep(0)  # drain이 바로 돌아와도 다른 장갑에 차례를 넘김
+    writer.close()
+    await writer.wait_closed()
+    sent[f"glove{k}"] = n
+
+
+async def per_row_client(port: int, k: int, end: float, counter: List[int]):
+    n = 0
+    while time.perf_counter() < end:
+        _, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(make_rows(k, 20 * n, 1).rstrip(b"\n"))  # 예전 클라이언트: 줄바꿈 없이 한 행, 연결 종료
+        writer.close()
+        await writer.wait_closed()
+        n += 1
+    counter[0] += n
+
+
+def client_process(port: int, mode: str, n: int, seconds: float, rows_per_write: int, out: mp.Queue):
+    async def run():
+        sent: Dict[str, int] = {}
+        end = time.perf_counter() + seconds
+        if mode == "persistent":
+            await asyncio.gather(*(persistent_glove(port, k, end, rows_per_write, sent) for k in range(n)))
+        else:
+            counter = [0]
+            await asyncio.gather(*(per_row_client(port, k, end, counter) for k in range(n)))
+            sent["127.0.0.1"] = counter[0]
+        return sent
+
+    out.put(asyncio.run(run()))
+
+
+async def run_case(mode: str, n: int, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        server = IngestServer(Path(tmp))
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        results: mp.Queue = mp.Queue()
+        client = mp.Process(target=client_process, args=(port, mode, n, args.seconds, args.rows_per_write, results))
+        t0 = time.perf_counter()
+        client.start()
+        while client.is_alive() or server.active:
+            await asyncio.sleep(0.05)
+        elapsed = time.perf_counter() - t0
+        sent = results.get()
+        client.join()
+        listener.close()
+        await listener.wait_closed()
+        await server.close()
+        stored = {glove: sum(1 for _ in open(sink.path, 'rb')) - 1 for glove, sink in server.sinks.items()}
+        stats = server.stats()
+    return {
+        'rate': stats['rows'] / max(elapsed - 0.1, 1e-9),   # 클라이언트 프로세스 기동 시간 보정
+        'rows': stats['rows'],
+        'bad': stats['bad_rows'],
+        'flushes': stats['flushes'],
+        'ok': stored == sent and stats['bad_rows'] == 0,
+    }
+
+
+def main():
+    args = parse_args()
+    print(f"{args.seconds:g} s per case, 12-field rows, {args.rows_per_write} rows per client write")
+    print(f"{'mode':<12}{'gloves':>7}{'rows':>10}{'rows/s':>10}{'flushes':>9}  stored == sent")
+    failed = False
+    cases = [("per-row", args.legacy_clients)] + [("persistent", n) for n in args.gloves]
+    for mode, n in cases:
+        result = asyncio.run(run_case(mode, n, args))
+        failed |= not result['ok']
+        print(f"{mode:<12}{n:>7}{result['rows']:>10}{result['rate']:>10.0f}{result['flushes']:>9}  "
+              f"{'✅' if result['ok'] else '❌'}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
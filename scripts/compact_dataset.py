@@ -0,0 +1,284 @@
+"""
+Compact the per-episode H5/CSV tree into one columnar archive.
+
+Walks --data-dir (<class>/<type>/episode_*.h5|csv; an H5 and its twin CSV
+are one episode and the H5 wins, as in ``episode_manifest.episode_files``)
+and reads every episode in a process pool: the ``sensor_data``,
+``sensors/acceleration``, timestamp and sampling-rate columns plus the file
+attrs (CSV-only episodes are read from their columns). The results are
+appended in order to one HDF5 archive with the EpisodeStore layout, i.e.
+concatenated column datasets with an ``episodes`` offset index, so
+EpisodeStore and SignGloveDataset can read it. A ``sources`` table next to
+the index records each episode's relative path, size/mtime, the SHA-256 of
+the source file and the SHA-256 of its column bytes.
+
+- Resumable: the archive is flushed (fsync) every --batch episodes. A rerun
+  reconciles the index with the ``sources`` table, drops anything
+  half-written and only reads the files not archived yet. A source whose
+  size/mtime changed is re-hashed; if its content changed the run stops and
+  asks for --rebuild.
+- Verified: after compaction every archived episode is read back and its
+  column checksum compared with the one computed from the source file.
+- Finally the full-dataset load time is compared: opening every file vs one
+  bulk read of the archive.
+
+Run: python scripts/compact_dataset.py --data-dir datasets/unified --out datasets/unified_archive.h5
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import h5py
+import numpy as np
+
+from _repo import REPO_ROOT  # 저장소 루트를 sys.path에 추가
+
+from episode_manifest import episode_files  # noqa: E402
+from episode_store import COLUMNS, EpisodeStore  # noqa: E402
+from ksl_classes import KSL_CLASSES  # noqa: E402
+from sensor_records import ACCEL_FIELDS, SENSOR_DATA_FIELDS  # noqa: E402
+from storage_profiles import STORAGE_PROFILES  # noqa: E402
+
+SOURCES_DTYPE = np.dtype([
+    ('path', 'S192'),             # UTF-8, relative to the data directory
+    ('size', np.int64),
+    ('mtime_ns', np.int64),
+    ('file_sha256', 'S64'),       # hex digest of the source file
+    ('content_sha256', 'S64'),    # hex digest of the archived column bytes
+    ('collection_date', 'S32'),
+    ('device_id', 'S32'),
+])
+
+# 에피소드 H5 내 경로 → 아카이브 컬럼 이름
+FILE_COLUMNS = {
+    'timestamps': 'timestamps',
+    'arduino_timestamps': 'arduino_timestamps',
+    'sampling_rates': 'sampling_rates',
+    'sensor_data': 'sensor_data',
+    'acceleration': 'sensors/acceleration',
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=REPO_ROOT / "datasets" / "unified")
+    parser.add_argument("--out", type=Path, default=REPO_ROOT / "datasets" / "unified_archive.h5")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch", type=int, default=256, help="Episodes appended between durable flushes.")
+    parser.add_argument("--profile", default="gzip4", choices=list(STORAGE_PROFILES))
+    parser.add_argument("--rebuild", action="store_true", help="Discard an existing archive and start over.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeats for the load-time comparison (0 = skip).")
+    return parser.parse_args()
+
+
+def list_sources(data_dir: Path) -> List[str]:
+    # 수집기 진행률 스캔과 같은 H5/CSV 짝짓기 (1초 차이로 저장된 쌍도 한 에피소드)
+    return sorted(path.relative_to(data_dir).as_posix()
+                  for type_dir in sorted(data_dir.glob("*/*")) if type_dir.is_dir()
+                  for path in episode_files(type_dir))
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def content_sha256(columns: Dict[str, np.ndarray]) -> str:
+    digest = hashlib.sha256()
+    for name, (_, dtype) in COLUMNS.items():
+        digest.update(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+    return digest.hexdigest()
+
+
+def read_csv_columns(path: Path) -> Dict[str, np.ndarray]:
+    with open(path, encoding='utf-8') as f:
+        header = f.readline().strip().split(',')
+    table = np.loadtxt(path, delimiter=',', skiprows=1, ndmin=2)
+    col = {name: table[:, i] for i, name in enumerate(header)}
+    return {
+        'timestamps': col['recv_timestamp_ms'],
+        'arduino_timestamps': col['timestamp_ms'],
+        'sampling_rates': col['sampling_hz'],
+        'sensor_data': np.column_stack([col[name] for name in SENSOR_DATA_FIELDS]),
+        'acceleration': np.column_stack([col[name] for name in ACCEL_FIELDS]),
+    }
+
+
+def read_source(job: Tuple[str, str]) -> dict:
+    """Worker: one episode's columns, metadata and checksums."""
+    data_dir, rel = job
+    path = Path(data_dir) / rel
+    class_name, episode_type = path.parent.parent.name, path.parent.name
+    meta = {'label_idx': KSL_CLASSES.index(class_name) if class_name in KSL_CLASSES else -1,
+            'duration': 0.0, 'collection_date': '', 'device_id': ''}
+    if path.suffix == '.h5':
+        with h5py.File(path, 'r') as f:
+            columns = {name: f[src][:] for name, src in FILE_COLUMNS.items()}
+            attrs = f.attrs
+            class_name = str(attrs.get('class_name', class_name))
+            episode_type = str(attrs.get('episode_type', episode_type))
+            meta['label_idx'] = int(attrs.get('label_idx', meta['label_idx']))
+            meta['duration'] = float(attrs.get('episode_duration', 0.0))
+            meta['collection_date'] = str(attrs.get('collection_date', ''))
+            meta['device_id'] = str(attrs.get('device_id', ''))
+    else:
+        columns = read_csv_columns(path)
+        if len(columns['timestamps']):
+            meta['duration'] = float(columns['timestamps'][-1] - columns['timestamps'][0]) / 1000.0
+    stat = path.stat()
+    return {
+        'rel': rel, 'columns': columns, 'class_name': class_name, 'episode_type': episode_type,
+        'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+        'file_sha256': file_sha256(path), 'content_sha256': content_sha256(columns), **meta,
+    }
+
+
+def open_archive(path: Path, profile: str) -> Tuple[EpisodeStore, h5py.Dataset]:
+    """Open (or create) the archive and drop anything a previous run left half-written."""
+    store = EpisodeStore(path, profile=profile)
+    f = store.file
+    if 'sources' not in f:
+        f.create_dataset('sources', shape=(0,), maxshape=(None,), dtype=SOURCES_DTYPE, chunks=(256,))
+        f.attrs['archive'] = 'signglove-compacted'
+    sources = f['sources']
+    complete = min(len(store), sources.shape[0])
+    store.truncate(complete)
+    sources.resize(complete, axis=0)
+    return store, sources
+
+
+def check_archived(data_dir: Path, sources: np.ndarray) -> List[str]:
+    """Archived sources whose content changed since they were compacted."""
+    changed = []
+    for row in sources:
+        rel = row['path'].decode('utf-8')
+        path = data_dir / rel
+        if not path.exists():
+            continue  # 원본이 지워져도 아카이브는 그대로 유효
+        stat = path.stat()
+        if stat.st_size == row['size'] and stat.st_mtime_ns == row['mtime_ns']:
+            continue
+        if file_sha256(path) != row['file_sha256'].decode('ascii'):
+            changed.append(rel)
+    return changed
+
+
+def append_result(store: EpisodeStore, sources: h5py.Dataset, result: dict):
+    store.append_columns(result['columns'], result['class_name'], result['episode_type'],
+                         result['label_idx'], result['duration'])
+    row = np.zeros(1, dtype=SOURCES_DTYPE)
+    row['path'] = result['rel'].encode('utf-8')
+    for key in ('size', 'mtime_ns'):
+        row[key] = result[key]
+    for key in ('file_sha256', 'content_sha256', 'collection_date', 'device_id'):
+        row[key] = result[key].encode('utf-8')[:SOURCES_DTYPE[key].itemsize]
+    n = sources.shape[0]
+    sources.resize(n + 1, axis=0)
+    sources[n] = row[0]
+
+
+def verify_archive(path: Path) -> int:
+    """Read every archived episode back and compare its column checksum; returns the number of mismatches."""
+    with EpisodeStore(path, mode='r') as store:
+        expected = store.file['sources']['content_sha256']
+        bad = 0
+        for (_, columns), digest in zip(store.iter_episodes(), expected):
+            if content_sha256(columns) != digest.decode('ascii'):
+                bad += 1
+    return bad
+
+
+def load_tree(data_dir: Path, rels: List[str]) -> int:
+    n = 0
+    for rel in rels:
+        path = data_dir / rel
+        if path.suffix == '.h5':
+            with h5py.File(path, 'r') as f:
+                n += len({name: f[src][:] for name, src in FILE_COLUMNS.items()}['timestamps'])
+        else:
+            n += len(read_csv_columns(path)['timestamps'])
+    return n
+
+
+def load_archive(path: Path) -> int:
+    with EpisodeStore(path, mode='r') as store:
+        return len(store.load_all()['timestamps'])
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    args = parse_args()
+    rels = list_sources(args.data_dir)
+    if not rels:
+        print(f"no episode files under {args.data_dir}")
+        sys.exit(1)
+    if args.rebuild and args.out.exists():
+        args.out.unlink()
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:  # 저장소를 열기 전에 워커를 띄운다
+        store, sources = open_archive(args.out, args.profile)
+        try:
+            archived = sources[:]
+            changed = check_archived(args.data_dir, archived)
+            if changed:
+                print(f"❌ {len(changed)} source file(s) changed since they were archived, e.g. {changed[0]}")
+                print("   rerun with --rebuild")
+                sys.exit(1)
+            done = {row.decode('utf-8') for row in archived['path']}
+            pending = [rel for rel in rels if rel not in done]
+            print(f"sources: {len(rels)}  already archived: {len(done)}  to compact: {len(pending)}"
+                  f"  workers: {args.workers}")
+
+            t0 = time.perf_counter()
+            jobs = [(str(args.data_dir), rel) for rel in pending]
+            for k, result in enumerate(pool.map(read_source, jobs, chunksize=16), 1):
+                append_result(store, sources, result)
+                if k % args.batch == 0:
+                    store.flush()
+                    print(f"  {k}/{len(pending)} episodes")
+            store.flush()
+            elapsed = time.perf_counter() - t0
+            total = len(store)
+        finally:
+            store.close()
+    if pending:
+        print(f"compacted {len(pending)} episodes in {elapsed:.2f}s ({len(pending) / elapsed:.0f} episodes/s)")
+
+    bad = verify_archive(args.out)
+    print(f"verified {total} archived episodes: {'OK' if not bad else f'{bad} checksum mismatch(es)'}")
+    if bad:
+        sys.exit(1)
+
+    if args.repeat > 0:
+        tree_bytes = sum((args.data_dir / rel).stat().st_size for rel in rels)
+        t_tree = best_of(lambda: load_tree(args.data_dir, rels), args.repeat)
+        t_archive = best_of(lambda: load_archive(args.out), args.repeat)
+        n_samples = load_archive(args.out)
+        print(f"\nfull-dataset load ({n_samples} samples, best of {args.repeat})")
+        print(f"{'layout':<16}{'files':>8}{'KiB':>10}{'load ms':>10}{'speedup':>9}")
+        print(f"{'per-episode':<16}{len(rels):>8}{tree_bytes / 1024:>10.0f}{t_tree * 1000:>10.1f}{1.0:>9.1f}")
+        print(f"{'archive':<16}{1:>8}{args.out.stat().st_size / 1024:>10.0f}{t_archive * 1000:>10.1f}"
+              f"{t_tree / t_archive:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
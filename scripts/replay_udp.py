@@ -0,0 +1,161 @@
+"""
+Replay a recorded glove CSV as sequence-numbered UDP datagrams.
+
+Reads the data rows of a capture (9- or 12-field, e.g.
+imu_flex_20250813_145850.csv), groups --rows-per-datagram rows into one
+wifi_ingest datagram each (``#SG <device> <seq> <send_ms>`` + rows) and
+sends them to localhost, paced by the rows' own timestamps (--speed x real
+time, 0 = as fast as possible). Faults can be injected: --drop, --reorder
+(swap with the next datagram) and --duplicate, each a fraction of
+datagrams (seeded).
+
+With --port the datagrams go to an already running receiver
+(``python csv_wifi.py --udp`` or ser.py with UDP_PORT). Without it the
+script starts wifi_ingest.IngestServer in UDP mode itself and checks that
+the receiver's per-device counters match the injected faults exactly, that
+every row of a delivered datagram became one SignGloveSensorReading, and
+that the glove's CSV holds exactly those rows.
+
+Run: python scripts/replay_udp.py --drop 0.05 --reorder 0.05 --duplicate 0.02
+     python scripts/replay_udp.py --port 5000 --speed 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+from _repo import REPO_ROOT  # 저장소 루트를 sys.path에 추가
+
+from sensor_records import SignGloveSensorReading  # noqa: E402
+from wifi_ingest import IngestServer, encode_datagram  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--csv", type=Path, default=REPO_ROOT / "imu_flex_20250813_145850.csv")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="Send to a running receiver instead of self-testing.")
+    parser.add_argument("--device", default="glove1")
+    parser.add_argument("--rows-per-datagram", type=int, default=5)
+    parser.add_argument("--speed", type=float, default=20.0, help="Replay speed (x real time, 0 = unpaced).")
+    parser.add_argument("--drop", type=float, default=0.05)
+    parser.add_argument("--reorder", type=float, default=0.05)
+    parser.add_argument("--duplicate", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def data_rows(path: Path) -> List[bytes]:
+    """Numeric rows of a capture (header and comment lines skipped)."""
+    rows = []
+    with open(path, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if line and (line[:1].isdigit() or line[:1] == b'-'):
+                rows.append(line)
+    return rows
+
+
+def plan(n: int, args) -> Tuple[List[int], dict]:
+    """Send order of datagram indices with the injected faults, and what was injected."""
+    rng = np.random.default_rng(args.seed)
+    dropped = set(np.flatnonzero(rng.random(n) < args.drop).tolist()) - {0, n - 1}  # 처음/마지막은 손실을 알 수 없음
+    order = [i for i in range(n) if i not in dropped]
+    swaps = 0
+    k = 0
+    while k < len(order) - 1:
+        if rng.random() < args.reorder:
+            order[k], order[k + 1] = order[k + 1], order[k]
+            swaps += 1
+            k += 2
+        else:
+            k += 1
+    duplicated = [i for i in order if rng.random() < args.duplicate]
+    for i in duplicated:
+        order.insert(order.index(i) + 1, i)
+    return order, {'datagrams': n, 'dropped': len(dropped), 'reordered': swaps, 'duplicates': len(duplicated),
+                   'delivered': sorted(set(order))}
+
+
+def send(host: str, port: int, device: str, groups: List[List[bytes]], order: List[int], speed: float):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    first_ts = [int(group[0].split(b',', 1)[0]) for group in groups]
+    start = time.monotonic()
+    for i in order:
+        if speed > 0:
+            due = start + (first_ts[i] - first_ts[0]) / 1000.0 / speed
+            time.sleep(max(0.0, due - time.monotonic()))
+        sock.sendto(encode_datagram(device, i, int(time.monotonic() * 1000), groups[i]), (host, port))
+    sock.close()
+
+
+async def self_test(groups: List[List[bytes]], order: List[int], injected: dict, args) -> bool:
+    readings: List[SignGloveSensorReading] = []
+
+    def on_records(_, records: np.ndarray):
+        readings.extend(SignGloveSensorReading(*values) for values in records.tolist())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = IngestServer(Path(tmp), on_records=on_records)
+        transport = await server.start_udp("127.0.0.1", 0)
+        port = transport.get_extra_info('sockname')[1]
+        sender = threading.Thread(target=send, args=("127.0.0.1", port, args.device, groups, order, args.speed))
+        t0 = time.perf_counter()
+        sender.start()
+        while sender.is_alive():
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(0.2)
+        elapsed = time.perf_counter() - t0
+        await server.close()
+        stats = server.datagrams.stats().get(args.device, {})
+        sink = server.sinks.get(args.device)
+        stored = sum(1 for _ in open(sink.path, 'rb')) - 1 if sink else 0
+
+    expected_rows = sum(len(groups[i]) for i in injected['delivered'])
+    checks = [
+        ("datagrams received", stats.get('received'), len(injected['delivered'])),
+        ("lost", stats.get('lost'), injected['dropped']),
+        ("reordered", stats.get('reordered'), injected['reordered']),
+        ("duplicates", stats.get('duplicates'), injected['duplicates']),
+        ("readings", len(readings), expected_rows),
+        ("CSV rows", stored, expected_rows),
+    ]
+    print(f"sent {len(order)} datagrams ({sum(len(g) for g in groups)} rows) in {elapsed:.2f} s, "
+          f"jitter {stats.get('jitter_ms', 0.0):.2f} ms, loss rate {stats.get('loss_rate', 0.0) * 100:.2f}%")
+    ok = True
+    for name, got, want in checks:
+        ok &= got == want
+        print(f"  {name:<20}{got!s:>8}  (expected {want})  {'✅' if got == want else '❌'}")
+    return ok
+
+
+def main():
+    args = parse_args()
+    rows = data_rows(args.csv)
+    if not rows:
+        print(f"❌ no data rows in {args.csv}")
+        sys.exit(1)
+    groups = [rows[i:i + args.rows_per_datagram] for i in range(0, len(rows), args.rows_per_datagram)]
+    order, injected = plan(len(groups), args)
+    print(f"{args.csv.name}: {len(rows)} rows → {len(groups)} datagrams of {args.rows_per_datagram}; injected: "
+          f"{injected['dropped']} dropped, {injected['reordered']} reordered, {injected['duplicates']} duplicated")
+    if args.port is not None:
+        send(args.host, args.port, args.device, groups, order, args.speed)
+        print(f"✅ sent to {args.host}:{args.port}")
+        return
+    if not asyncio.run(self_test(groups, order, injected, args)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Flat, memory-mappable export of every episode's ``sensor_data``.
+
+Reading the dataset for training or analysis otherwise means opening
+thousands of H5 files and copying each into fresh arrays. ``export_corpus``
+streams the episodes once (through :class:`SignGloveDataset`) into a
+directory of plain ``.npy`` files:
+
+- ``sensor_data.npy``: ``(total_samples, 8)`` float32, all episodes
+  back to back (flex1-5, pitch, roll, yaw);
+- ``offsets.npy``: ``(num_episodes + 1,)`` int64; episode ``i`` is rows
+  ``offsets[i]:offsets[i + 1]``;
+- ``label_idx.npy`` (int16), ``episode_type.npy`` and ``class_name.npy``
+  (UTF-8 bytes) per episode;
+- ``corpus.json``: format, counts and the class list.
+
+:class:`SensorCorpus` opens these with ``np.load(mmap_mode='r')``, so
+``corpus[i]`` is a view into the mapping with no copy and any number of
+processes share the same pages through the OS page cache.
+
+Run ``python sensor_corpus.py export --root datasets/unified --out datasets/corpus``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from episode_writer import atomic_write_text, fsync_dir, fsync_file
+from signglove_dataset import SignGloveDataset
+
+CORPUS_FORMAT = "signglove-sensor-corpus"
+CORPUS_VERSION = 1
+SENSOR_DTYPE = np.dtype('<f4')
+NUM_CHANNELS = 8
+
+
+def _save_npy(path: Path, array: np.ndarray):
+    with open(path, 'wb') as f:
+        np.save(f, array)
+    fsync_file(path)
+
+
+def export_corpus(dataset: SignGloveDataset, out_dir: Path) -> dict:
+    """Write ``dataset`` (in its iteration order) as a corpus directory; returns the corpus metadata.
+
+    The export is assembled in ``<out_dir>.partial`` and renamed into place,
+    so readers never see a half-written corpus.
+    """
+    out_dir = Path(out_dir)
+    tmp_dir = out_dir.with_name(out_dir.name + ".partial")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+
+    lengths: List[int] = []
+    labels: List[int] = []
+    episode_types: List[str] = []
+    raw_path = tmp_dir / "sensor_data.raw"
+    with open(raw_path, 'wb') as raw:
+        for sensor_batch, label_batch, type_batch in dataset:
+            for sensor in sensor_batch:
+                raw.write(np.ascontiguousarray(sensor, dtype=SENSOR_DTYPE).tobytes())
+                lengths.append(len(sensor))
+            labels.extend(int(label) for label in label_batch)
+            episode_types.extend(type_batch)
+    class_names = [dataset.classes[label] for label in labels]
+
+    # The sample count is only known now: write the .npy header, then the rows.
+    total = int(sum(lengths))
+    data_path = tmp_dir / "sensor_data.npy"
+    with open(data_path, 'wb') as out, open(raw_path, 'rb') as raw:
+        np.lib.format.write_array_header_1_0(
+            out, {'descr': np.lib.format.dtype_to_descr(SENSOR_DTYPE), 'fortran_order': False,
+                  'shape': (total, NUM_CHANNELS)})
+        shutil.copyfileobj(raw, out, 1 << 20)
+    raw_path.unlink()
+    fsync_file(data_path)
+
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    _save_npy(tmp_dir / "offsets.npy", offsets)
+    _save_npy(tmp_dir / "label_idx.npy", np.asarray(labels, dtype=np.int16))
+    _save_npy(tmp_dir / "episode_type.npy", np.array([t.encode('utf-8') for t in episode_types], dtype='S8'))
+    _save_npy(tmp_dir / "class_name.npy", np.array([c.encode('utf-8') for c in class_names], dtype='S16'))
+
+    meta = {
+        'format': CORPUS_FORMAT,
+        'version': CORPUS_VERSION,
+        'num_episodes': len(lengths),
+        'num_samples': total,
+        'channels': ['flex1', 'flex2', 'flex3', 'flex4', 'flex5', 'pitch', 'roll', 'yaw'],
+        'classes': list(dataset.classes),
+        'source': str(dataset.root),
+        'created': time.time(),
+    }
+    atomic_write_text(tmp_dir / "corpus.json", json.dumps(meta, ensure_ascii=False, indent=2))
+    fsync_dir(tmp_dir)
+
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    os.replace(tmp_dir, out_dir)
+    fsync_dir(out_dir.parent)
+    return meta
+
+
+class SensorCorpus:
+    """Read-only, memory-mapped view of an exported corpus."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "corpus.json").read_text(encoding='utf-8'))
+        if self.meta.get('format') != CORPUS_FORMAT:
+            raise ValueError(f"{self.path} is not a sensor corpus")
+        self.sensor_data: np.memmap = np.load(self.path / "sensor_data.npy", mmap_mode='r')
+        self.offsets: np.ndarray = np.load(self.path / "offsets.npy")
+        self.label_idx: np.ndarray = np.load(self.path / "label_idx.npy")
+        self.episode_type: np.ndarray = np.load(self.path / "episode_type.npy")
+        self.class_name: np.ndarray = np.load(self.path / "class_name.npy")
+
+    @property
+    def classes(self) -> List[str]:
+        return self.meta['classes']
+
+    @property
+    def num_samples(self) -> int:
+        return int(self.offsets[-1])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        """``(N, 8)`` view of episode ``i``; nothing is read until it is touched."""
+        if i < 0:
+            i += len(self)
+        return self.sensor_data[self.offsets[i]:self.offsets[i + 1]]
+
+    def episode(self, i: int) -> Tuple[np.ndarray, int, str]:
+        """``(sensor_data view, label_idx, episode_type)`` for episode ``i``."""
+        return self[i], int(self.label_idx[i]), self.episode_type[i].decode('utf-8')
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, int, str]]:
+        for i in range(len(self)):
+            yield self.episode(i)
+
+    def select(self, class_name: Optional[str] = None, episode_type: Optional[str] = None) -> np.ndarray:
+        """Episode numbers matching the given class and/or type."""
+        mask = np.ones(len(self), dtype=bool)
+        if class_name is not None:
+            mask &= self.class_name == class_name.encode('utf-8')
+        if episode_type is not None:
+            mask &= self.episode_type == str(episode_type).encode('utf-8')
+        return np.flatnonzero(mask)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or inspect a memory-mapped sensor corpus.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="Stream a dataset into a corpus directory.")
+    export.add_argument("--root", type=Path, default=Path("datasets/unified"))
+    export.add_argument("--manifest", type=Path, default=None)
+    export.add_argument("--out", type=Path, default=Path("datasets/corpus"))
+    info = sub.add_parser("info", help="Summarise an exported corpus.")
+    info.add_argument("path", type=Path)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        t0 = time.perf_counter()
+        meta = export_corpus(SignGloveDataset(args.root, manifest=args.manifest), args.out)
+        print(f"✅ {meta['num_episodes']} episodes, {meta['num_samples']} samples → {args.out}"
+              f" ({time.perf_counter() - t0:.2f}s)")
+    else:
+        corpus = SensorCorpus(args.path)
+        size = (args.path / "sensor_data.npy").stat().st_size
+        print(f"{args.path}: {len(corpus)} episodes, {corpus.num_samples} samples, {size / 1024:.0f} KiB")
+        labels, counts = np.unique(corpus.label_idx, return_counts=True)
+        print("episodes per class: " + ", ".join(f"{corpus.classes[l]}={n}" for l, n in zip(labels, counts)))
+
+
+if __name__ == '__main__':
+    main()
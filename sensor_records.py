@@ -0,0 +1,376 @@
+"""
+SignGlove sensor reading types shared by the collectors.
+
+``SignGloveSensorReading`` is the per-sample record handed through queues and
+posture checks; it is a slotted dataclass so a long session does not pay a
+``__dict__`` per sample. ``READING_DTYPE`` mirrors its fields so batches of
+readings can live in one NumPy structured array instead: ``parse_csv_lines``
+turns raw serial lines into such an array and ``EpisodeBuffer`` keeps an
+episode's samples in preallocated columns that savers and plots slice.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass(slots=True)
+class SignGloveSensorReading:
+    """SignGlove 센서 읽기 데이터 구조"""
+    timestamp_ms: int           # 아두이노 millis() 타임스탬프
+    recv_timestamp_ms: int      # PC 수신 타임스탬프
+
+    # IMU 데이터 (오일러 각)
+    pitch: float               # Y축 회전 (도)
+    roll: float                # X축 회전 (도)
+    yaw: float                 # Z축 회전 (도)
+
+    # 플렉스 센서 데이터 (ADC 값)
+    flex1: int                 # 엄지 (0-1023)
+    flex2: int                 # 검지 (0-1023)
+    flex3: int                 # 중지 (0-1023)
+    flex4: int                 # 약지 (0-1023)
+    flex5: int                 # 소지 (0-1023)
+
+    # 계산된 Hz (실제 측정 주기)
+    sampling_hz: float
+
+    # 가속도 데이터 (IMU에서 실제 측정) - 아두이노에서 전송되는 경우 사용
+    accel_x: float = 0.0
+    accel_y: float = 0.0
+    accel_z: float = 0.0
+
+
+READING_FIELDS: Tuple[str, ...] = (
+    'timestamp_ms', 'recv_timestamp_ms',
+    'pitch', 'roll', 'yaw',
+    'flex1', 'flex2', 'flex3', 'flex4', 'flex5',
+    'sampling_hz',
+    'accel_x', 'accel_y', 'accel_z',
+)
+
+# float64 so values round-trip exactly to the Python floats the per-line parser produced
+READING_DTYPE = np.dtype([
+    ('timestamp_ms', np.int64),
+    ('recv_timestamp_ms', np.int64),
+    ('pitch', np.float64),
+    ('roll', np.float64),
+    ('yaw', np.float64),
+    ('flex1', np.int16),
+    ('flex2', np.int16),
+    ('flex3', np.int16),
+    ('flex4', np.int16),
+    ('flex5', np.int16),
+    ('sampling_hz', np.float64),
+    ('accel_x', np.float64),
+    ('accel_y', np.float64),
+    ('accel_z', np.float64),
+])
+
+# Column order of the firmware CSV rows, keyed by field count.
+CSV_LAYOUTS: Dict[int, Tuple[str, ...]] = {
+    # imu_flex_serial.ino printCsvRow
+    12: ('timestamp_ms', 'pitch', 'roll', 'yaw', 'accel_x', 'accel_y', 'accel_z',
+         'flex1', 'flex2', 'flex3', 'flex4', 'flex5'),
+    # older 9-field captures (imu_flex_*.csv) without acceleration
+    9: ('timestamp_ms', 'pitch', 'roll', 'yaw', 'flex1', 'flex2', 'flex3', 'flex4', 'flex5'),
+    # Wi-Fi IMU rows (csv_wifi.py): acceleration and orientation, no flex
+    7: ('timestamp_ms', 'accel_x', 'accel_y', 'accel_z', 'pitch', 'roll', 'yaw'),
+}
+
+
+# Below this many rows loadtxt's fixed setup cost outweighs per-field float().
+_LOADTXT_MIN_ROWS = 16
+
+_COLUMN = {name: i for i, name in enumerate(READING_FIELDS)}
+_LAYOUT_COLUMNS = {width: [_COLUMN[name] for name in names] for width, names in CSV_LAYOUTS.items()}
+_LAYOUT_FLEX = {width: [k for k, name in enumerate(names) if name.startswith('flex')]
+                for width, names in CSV_LAYOUTS.items()}
+_FLEX_MIN, _FLEX_MAX = np.iinfo(np.int16).min, np.iinfo(np.int16).max
+
+
+def flex_fits(flex: np.ndarray) -> np.ndarray:
+    """Per row of an ``(n, k)`` float matrix: all flex values are integers that fit ``int16``.
+
+    The per-line parser used ``int()`` for flex, so fractional text was rejected;
+    storing into ``READING_DTYPE`` would otherwise truncate or wrap silently.
+    """
+    return ((flex == np.trunc(flex)) & (flex >= _FLEX_MIN) & (flex <= _FLEX_MAX)).all(axis=1)
+
+
+def _is_numeric_row(row: bytes) -> bool:
+    try:
+        for field in row.split(b','):
+            float(field)
+    except ValueError:
+        return False
+    return True
+
+
+def _to_float_matrix(rows: Sequence[bytes], width: int) -> Optional[np.ndarray]:
+    """Convert comma-separated rows to an (n, width) float64 matrix in one pass; None if any field is bad."""
+    try:
+        if len(rows) < _LOADTXT_MIN_ROWS:
+            values = [float(field) for field in b','.join(rows).split(b',')]
+            return np.array(values, dtype=np.float64).reshape(len(rows), width)
+        # numpy's C tokenizer (numpy >= 1.23); comments=None keeps row i == input line i
+        return np.loadtxt(rows, delimiter=',', dtype=np.float64, comments=None, ndmin=2)
+    except ValueError:
+        return None
+
+
+def timestamp_hz(timestamps_ms: np.ndarray, last_arduino_ms: Optional[int] = None) -> np.ndarray:
+    """Sampling rate from each Arduino timestamp's gap to the previous one.
+
+    ``last_arduino_ms`` is the timestamp preceding the batch; without it the
+    first rate is 0.0.
+    """
+    ts = np.asarray(timestamps_ms, dtype=np.float64)
+    hz = np.zeros(len(ts), dtype=np.float64)
+    if not len(ts):
+        return hz
+    prev = np.empty_like(ts)
+    prev[1:] = ts[:-1]
+    if last_arduino_ms is not None:
+        prev[0] = last_arduino_ms
+        has_prev = slice(0, None)
+    else:
+        has_prev = slice(1, None)
+    hz[has_prev] = 1000.0 / np.maximum(1, np.trunc(ts[has_prev]) - np.trunc(prev[has_prev]))
+    return hz
+
+
+def parse_csv_lines(
+    lines: Iterable[bytes],
+    recv_timestamp_ms: Optional[int] = None,
+    last_arduino_ms: Optional[int] = None,
+    layouts: Sequence[int] = (12,),
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse a batch of raw CSV lines into one ``READING_DTYPE`` array.
+
+    Args:
+        lines: raw lines (bytes, with or without line endings).
+        recv_timestamp_ms: host receive time stamped on every row (default: now).
+        last_arduino_ms: Arduino timestamp of the row preceding this batch, used
+            for the first row's ``sampling_hz`` (0.0 when unknown, as before).
+        layouts: accepted field counts (keys of ``CSV_LAYOUTS``).
+
+    Returns:
+        ``(records, valid)`` — both of length ``len(lines)``. Rows that are
+        blank, comments, have an unexpected field count, fail to parse or
+        carry a flex value that is not an ``int16`` integer are zero-filled and marked ``False`` in ``valid``. ``sampling_hz`` is
+        computed across valid rows only, in order.
+    """
+    lines = [line.strip() for line in lines]
+    n = len(lines)
+    table = np.zeros((n, len(READING_FIELDS)), dtype=np.float64)
+    valid = np.zeros(n, dtype=bool)
+    if n == 0:
+        return np.zeros(0, dtype=READING_DTYPE), valid
+
+    if recv_timestamp_ms is None:
+        recv_timestamp_ms = int(time.time() * 1000)
+    table[:, _COLUMN['recv_timestamp_ms']] = recv_timestamp_ms
+
+    counts = [line.count(b',') for line in lines]
+    for width in layouts:
+        idx = [i for i, c in enumerate(counts) if c == width - 1]
+        if not idx:
+            continue
+        rows = [lines[i] for i in idx]
+        matrix = _to_float_matrix(rows, width)
+        if matrix is None:
+            # Slow path: find the unparsable rows in Python, then convert the rest in one go again.
+            good = [k for k, row in enumerate(rows) if _is_numeric_row(row)]
+            idx = [idx[k] for k in good]
+            if not idx:
+                continue
+            matrix = _to_float_matrix([rows[k] for k in good], width)
+
+        fits = flex_fits(matrix[:, _LAYOUT_FLEX[width]])
+        if not fits.all():
+            idx = [i for i, ok in zip(idx, fits) if ok]
+            matrix = matrix[fits]
+            if not idx:
+                continue
+
+        columns = _LAYOUT_COLUMNS[width]
+        if len(idx) == n:
+            table[:, columns] = matrix
+            valid[:] = True
+        else:
+            table[np.ix_(idx, columns)] = matrix
+            valid[idx] = True
+
+    table[valid, _COLUMN['sampling_hz']] = timestamp_hz(table[valid, 0], last_arduino_ms)
+
+    records = np.empty(n, dtype=READING_DTYPE)
+    for name, column in zip(READING_FIELDS, table.T):
+        records[name] = column
+    return records, valid
+
+
+# H5 ``sensor_data`` column order (KLP-SignGlove format): flex1-5, then orientation.
+SENSOR_DATA_FIELDS: Tuple[str, ...] = ('flex1', 'flex2', 'flex3', 'flex4', 'flex5', 'pitch', 'roll', 'yaw')
+ACCEL_FIELDS: Tuple[str, ...] = ('accel_x', 'accel_y', 'accel_z')
+
+_sensor_values = attrgetter(*SENSOR_DATA_FIELDS)
+_accel_values = attrgetter(*ACCEL_FIELDS)
+
+
+def sensor_vector(reading: SignGloveSensorReading) -> np.ndarray:
+    """One reading as a float64 row in ``sensor_data`` column order (flex1-5, pitch, roll, yaw)."""
+    return np.array(_sensor_values(reading), dtype=np.float64)
+
+
+class EpisodeBuffer:
+    """Preallocated columnar storage for one episode's readings.
+
+    Columns are NumPy arrays sized for ``capacity`` samples up front and
+    doubled when an episode runs longer. Flex and orientation share one
+    ``(capacity, 8)`` block in the H5 ``sensor_data`` column order, so
+    :attr:`sensor_data`, :attr:`flex`, :attr:`orientation`, :attr:`accel`
+    and the timestamp columns are zero-copy views of the filled rows; saving
+    and plotting slice them instead of walking per-sample objects. Views are
+    only valid until the next append that grows the buffer or :meth:`clear`.
+
+    Indexing and iteration still yield ``SignGloveSensorReading`` objects so
+    code written against ``List[SignGloveSensorReading]`` keeps working.
+    """
+
+    def __init__(self, capacity: int = 80):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._size = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        self._timestamps = np.zeros(capacity, dtype=np.int64)
+        self._arduino_timestamps = np.zeros(capacity, dtype=np.int64)
+        self._sampling_rates = np.zeros(capacity, dtype=np.float64)
+        self._sensor = np.zeros((capacity, len(SENSOR_DATA_FIELDS)), dtype=np.float64)
+        self._accel = np.zeros((capacity, len(ACCEL_FIELDS)), dtype=np.float64)
+
+    def _columns(self):
+        return (self._timestamps, self._arduino_timestamps, self._sampling_rates, self._sensor, self._accel)
+
+    def _reserve(self, needed: int):
+        capacity = self.capacity
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        old = self._columns()
+        self._allocate(capacity)
+        for new, previous in zip(self._columns(), old):
+            new[:self._size] = previous[:self._size]
+
+    @property
+    def capacity(self) -> int:
+        return len(self._timestamps)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self._columns())
+
+    def __len__(self) -> int:
+        return self._size
+
+    # ---- zero-copy column views ----
+    @property
+    def timestamps(self) -> np.ndarray:
+        """PC receive timestamps (``recv_timestamp_ms``)."""
+        return self._timestamps[:self._size]
+
+    @property
+    def arduino_timestamps(self) -> np.ndarray:
+        return self._arduino_timestamps[:self._size]
+
+    @property
+    def sampling_rates(self) -> np.ndarray:
+        return self._sampling_rates[:self._size]
+
+    @property
+    def sensor_data(self) -> np.ndarray:
+        """``(N, 8)`` flex1-5, pitch, roll, yaw."""
+        return self._sensor[:self._size]
+
+    @property
+    def flex(self) -> np.ndarray:
+        return self._sensor[:self._size, :5]
+
+    @property
+    def orientation(self) -> np.ndarray:
+        """``(N, 3)`` pitch, roll, yaw."""
+        return self._sensor[:self._size, 5:]
+
+    @property
+    def accel(self) -> np.ndarray:
+        return self._accel[:self._size]
+
+    # ---- filling ----
+    def append(self, reading: SignGloveSensorReading):
+        i = self._size
+        self._reserve(i + 1)
+        self._timestamps[i] = reading.recv_timestamp_ms
+        self._arduino_timestamps[i] = reading.timestamp_ms
+        self._sampling_rates[i] = reading.sampling_hz
+        self._sensor[i] = _sensor_values(reading)
+        self._accel[i] = _accel_values(reading)
+        self._size = i + 1
+
+    def extend(self, records: np.ndarray):
+        """Append a ``READING_DTYPE`` array (e.g. from ``parse_csv_lines``) column by column."""
+        start, end = self._size, self._size + len(records)
+        self._reserve(end)
+        self._timestamps[start:end] = records['recv_timestamp_ms']
+        self._arduino_timestamps[start:end] = records['timestamp_ms']
+        self._sampling_rates[start:end] = records['sampling_hz']
+        for column, name in enumerate(SENSOR_DATA_FIELDS):
+            self._sensor[start:end, column] = records[name]
+        for column, name in enumerate(ACCEL_FIELDS):
+            self._accel[start:end, column] = records[name]
+        self._size = end
+
+    def clear(self):
+        """Forget the samples but keep the allocated columns for the next episode."""
+        self._size = 0
+
+    # ---- per-sample access ----
+    def __getitem__(self, index: int) -> SignGloveSensorReading:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("EpisodeBuffer index out of range")
+        flex1, flex2, flex3, flex4, flex5, pitch, roll, yaw = self._sensor[index].tolist()
+        accel_x, accel_y, accel_z = self._accel[index].tolist()
+        return SignGloveSensorReading(
+            int(self._arduino_timestamps[index]), int(self._timestamps[index]),
+            pitch, roll, yaw,
+            int(flex1), int(flex2), int(flex3), int(flex4), int(flex5),
+            float(self._sampling_rates[index]), accel_x, accel_y, accel_z,
+        )
+
+    def __iter__(self) -> Iterator[SignGloveSensorReading]:
+        for values in self.to_records().tolist():
+            yield SignGloveSensorReading(*values)
+
+    def latest(self) -> Optional[SignGloveSensorReading]:
+        return self[-1] if self._size else None
+
+    def to_records(self) -> np.ndarray:
+        """Return the samples as a new ``READING_DTYPE`` array (e.g. for CSV rows)."""
+        records = np.empty(self._size, dtype=READING_DTYPE)
+        records['timestamp_ms'] = self.arduino_timestamps
+        records['recv_timestamp_ms'] = self.timestamps
+        records['sampling_hz'] = self.sampling_rates
+        for column, name in enumerate(SENSOR_DATA_FIELDS):
+            records[name] = self._sensor[:self._size, column]
+        for column, name in enumerate(ACCEL_FIELDS):
+            records[name] = self._accel[:self._size, column]
+        return records
@@ -18,11 +18,23 @@ import h5py
 import csv
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional
 from collections import defaultdict
-from dataclasses import dataclass, asdict
 import json
+import os
 import queue
+import select
+import socket
+
+from binary_frames import FrameDecoder, frames_to_records
+from episode_manifest import EpisodeManifest, EpisodeRecord, count_drift, count_records, scan_dataset
+from episode_store import EpisodeStore, session_store_path, store_files
+from episode_writer import EpisodeJob, EpisodeWriter, atomic_write_text, fsync_dir, fsync_file
+from ksl_classes import KSL_CATEGORIES
+from line_decoders import CsvDecoder, make_line_decoder
+from sensor_records import READING_FIELDS, EpisodeBuffer, SignGloveSensorReading, sensor_vector
+from serial_stream import LineFramer
+from storage_profiles import get_profile
 
 # ------------------- 디버그/초기화 옵션 -------------------
 RAW_ECHO = False      # True면 아두이노에서 받은 원문 CSV 라인을 그대로 출력
@@ -51,6 +63,26 @@ BUFFER_WARNING_THRESHOLD = 0.8  # 버퍼 사용량 경고 임계값 (80%)
 BUFFER_CRITICAL_THRESHOLD = 0.95  # 버퍼 사용량 위험 임계값 (95%)
 MAX_QUEUE_SIZE = 100  # 데이터 큐 최대 크기 (이전의 1000에서 축소)
 
+# 에피소드 저장 (백그라운드 writer 스레드)
+EPISODE_STORAGE = "files"  # "files": 에피소드마다 H5 + CSV (readh.py, full_analysis.py 등 기존 분석 스크립트가 읽는 형식) / "store": 세션별 통합 H5 하나에 추가 (episode_store.py)
+STORAGE_PROFILE = "gzip4"  # H5 압축/청크 프로필: none, lzf, gzip1, gzip4, gzip9, shuffle-lzf, shuffle-gzip4 (storage_profiles.py)
+EPISODE_WRITER_MAX_PENDING = 4  # 저장 대기 에피소드 최대 수 (가득 차면 stop_episode가 대기)
+
+# 진행상황 매니페스트 (SQLite)
+MANIFEST_VERIFY = "background"  # "background": 시작 후 백그라운드에서 실제 파일과 대조해 차이 보고/보정 / "off": 검증 안 함
+
+# 시리얼 수신 모드
+SERIAL_READER_MODE = "poll"  # "poll": in_waiting 폴링 + sleep (기존 방식) / "event": 블로킹 대기 후 도착한 라인 일괄 처리
+EVENT_READ_TIMEOUT = 0.2     # event 모드에서 stop_event 확인 주기 (초)
+LINE_FORMAT = "csv"  # 텍스트 행 형식: "csv" (imu_flex_serial.ino, 기본) / 선택: "json" (sensor_transmit.ino, 한 줄에 JSON 하나), "auto" (처음 도착한 데이터 라인으로 판별)
+SERIAL_FORMAT = "csv"  # "csv": 텍스트 CSV 행 / "bin": 연결 후 format,bin 전송 → 32바이트 CRC 프레임 (binary_frames.py, 같은 보드레이트에서 약 2배 샘플 여유)
+
+# Wi-Fi(UDP) 수신: 정수 포트를 지정하면 'C' 키가 시리얼 대신 이 포트에서 UDP 데이터그램을 받음
+# (wifi_ingest.py 형식: "#SG <장치> <seq> <send_ms>" + CSV 행들, 손실/재정렬/지터 집계)
+UDP_PORT: Optional[int] = None
+UDP_HOST = "0.0.0.0"
+UDP_LAYOUTS = (12, 9)  # 허용 행 형식(필드 수): 12 = 펌웨어 CSV, 9 = 가속도 없는 예전 캡처 (imu_flex_*.csv 재생)
+
 # OS별 키보드 입력 모듈 임포트
 if sys.platform == 'win32':
     import msvcrt
@@ -59,33 +91,6 @@ else:
     import tty
 
 
-@dataclass
-class SignGloveSensorReading:
-    """SignGlove 센서 읽기 데이터 구조"""
-    timestamp_ms: int           # 아두이노 millis() 타임스탬프
-    recv_timestamp_ms: int      # PC 수신 타임스탬프
-
-    # IMU 데이터 (오일러 각)
-    pitch: float               # Y축 회전 (도)
-    roll: float                # X축 회전 (도)
-    yaw: float                 # Z축 회전 (도)
-
-    # 플렉스 센서 데이터 (ADC 값)
-    flex1: int                 # 엄지 (0-1023)
-    flex2: int                 # 검지 (0-1023)
-    flex3: int                 # 중지 (0-1023)
-    flex4: int                 # 약지 (0-1023)
-    flex5: int                 # 소지 (0-1023)
-
-    # 계산된 Hz (실제 측정 주기)
-    sampling_hz: float
-
-    # 가속도 데이터 (IMU에서 실제 측정) - 아두이노에서 전송되는 경우 사용
-    accel_x: float = 0.0
-    accel_y: float = 0.0
-    accel_z: float = 0.0
-
-
 class SignGloveUnifiedCollector:
     """SignGlove 통합 수어 데이터 수집기"""
 
@@ -109,11 +114,7 @@ class SignGloveUnifiedCollector:
         }
 
         # 34개 한국어 수어 클래스 정의
-        self.ksl_classes = {
-            "consonants": ["ㄱ", "ㄴ", "ㄷ", "ㄹ", "ㅁ", "ㅂ", "ㅅ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"],
-            "vowels": ["ㅏ", "ㅑ", "ㅓ", "ㅕ", "ㅗ", "ㅛ", "ㅜ", "ㅠ", "ㅡ", "ㅣ"],
-            "numbers": [str(i) for i in range(10)],
-        }
+        self.ksl_classes = {category: list(names) for category, names in KSL_CATEGORIES.items()}
 
         # 전체 클래스 리스트
         self.all_classes = []
@@ -146,7 +147,7 @@ class SignGloveUnifiedCollector:
         self.collecting = False
         self.auto_collecting = False
         self.current_class = None
-        self.episode_data: List[SignGloveSensorReading] = []
+        self.episode_data = EpisodeBuffer(self.samples_per_episode)  # 에피소드 샘플 (컬럼 배열, 미리 할당)
         self.episode_start_time = None
         self.sample_count = 0
 
@@ -155,22 +156,48 @@ class SignGloveUnifiedCollector:
         self.serial_thread: Optional[threading.Thread] = None
         self.data_queue: "queue.Queue[SignGloveSensorReading]" = queue.Queue(maxsize=1000)
         self.stop_event = threading.Event()
+        # clear_buffer → 수신 스레드: 입력 버퍼 비우기 + framer/decoder resync 요청 (feed 중인 버퍼를 UI 스레드가 건드리지 않도록)
+        self._flush_request = threading.Event()
+        self._flush_done = threading.Event()
+        self.line_framer = LineFramer()  # read(n) 청크 → 라인 배치 분리
+        self.frame_decoder = FrameDecoder()  # SERIAL_FORMAT="bin": 청크 → 검증된 프레임 배치
+        self.binary_frames = False
+        self.line_decoder = make_line_decoder(LINE_FORMAT)  # 텍스트 라인 배치 → READING_DTYPE (line_decoders.py)
+        self.udp_line_decoder = CsvDecoder(UDP_LAYOUTS)
+        self.udp_socket: Optional[socket.socket] = None
+        self.udp_decoder = None  # wifi_ingest.DatagramDecoder: 장치별 seq 손실/재정렬/지터
+        self._udp_clocks: Dict[str, tuple] = {}  # 장치별 (last_arduino_ms, 수집 시작 ms, 재시작 횟수)
 
         # 통계
         self.collection_stats = defaultdict(lambda: defaultdict(int))
         self.session_stats = defaultdict(int)
+        self._stats_lock = threading.RLock()  # writer 스레드와 UI 스레드가 함께 갱신
+
+        # 에피소드 저장: H5/CSV/진행상황은 writer 스레드에서 기록 (수신 스레드 블로킹 방지)
+        self.episode_writer = EpisodeWriter(
+            self._persist_episode,
+            on_durable=self._on_episode_durable,
+            on_error=self._on_episode_save_error,
+            max_pending=EPISODE_WRITER_MAX_PENDING,
+        )
 
         # 경로/파일
-        self.data_dir = Path("datasets/unified")
+        self.data_dir = Path("datasets/unified").resolve()  # 매니페스트/저장 경로가 이후 chdir에 영향받지 않도록
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.progress_file = self.data_dir / "collection_progress.json"
+        self.store_dir = self.data_dir / "store"  # 통합 저장소 (session_*.h5)
+        self.episode_store: Optional[EpisodeStore] = None  # 첫 저장 시 writer 스레드에서 생성
+        self.manifest = EpisodeManifest(self.data_dir / "manifest.sqlite")  # 저장된 에피소드 목록 + 클래스/유형별 집계
 
         # 기타
         self.class_selection_mode = False
         self.initial_posture_reference: Optional[SignGloveSensorReading] = None
         self.realtime_print_enabled = False
 
+        self.reader_mode = SERIAL_READER_MODE  # "poll" | "event"
         self._prev_reading: Optional[SignGloveSensorReading] = None  # 델타 계산용
+        self._last_arduino_ms: Optional[int] = None  # Hz 계산용
+        self._collection_start_time: Optional[int] = None  # 상대 타임스탬프 기준
         self._last_buffer_debug_ts: float = 0.0
         self._dropped_samples: int = 0
 
@@ -184,7 +211,7 @@ class SignGloveUnifiedCollector:
         print("🤟 SignGlove 통합 수어 데이터 수집기")
         print("=" * 60)
         print("📋 조작 방법:")
-        print("   C: 시리얼 포트 연결/재연결")
+        print("   C: 시리얼 포트 연결/재연결 (UDP_PORT 설정 시 UDP 수신 시작)")
         print("   N: 새 에피소드 시작 (클래스 선택)")
         print("   M: 현재 에피소드 종료")
         print("   I: 현재 자세가 초기 자세와 일치하는지 확인")
@@ -237,6 +264,10 @@ class SignGloveUnifiedCollector:
                 self.serial_port.write(b"zero\n")
                 print("↪️  sent: zero")
                 time.sleep(0.2)
+            self.binary_frames = SERIAL_FORMAT == "bin"
+            if self.binary_frames:
+                self.serial_port.write(b"format,bin\n")
+                print("↪️  sent: format,bin")
 
             print(f"✅ 아두이노 연결 성공: {port}")
             self.start_data_reception()
@@ -283,14 +314,53 @@ class SignGloveUnifiedCollector:
             print(f"⚠️ 통신 테스트 오류: {e}")
             return False
 
-    def start_data_reception(self):
+    def connect_udp(self, port: int = None, host: str = None) -> bool:
+        """UDP 데이터그램 수신 시작 (시리얼 대신, 같은 파싱/큐/에피소드 경로 사용)"""
+        from wifi_ingest import DatagramDecoder  # asyncio 등은 UDP 수신을 쓸 때만 로드
+
+        port = UDP_PORT if port is None else port
+        host = UDP_HOST if host is None else host
+        try:
+            if self.udp_socket is not None:
+                self.udp_socket.close()
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 21)
+            sock.bind((host, port))
+            sock.settimeout(EVENT_READ_TIMEOUT)
+        except OSError as e:
+            print(f"❌ UDP 수신 소켓 생성 실패 ({host}:{port}): {e}")
+            return False
+        self.udp_socket = sock
+        self.udp_decoder = DatagramDecoder(drop_late=True)  # 늦게 온 데이터그램은 버려 에피소드 시간 순서 유지
+        print(f"✅ UDP 수신 대기: {host}:{port}")
+        self.start_data_reception(self._udp_reception_worker)
+        return True
+
+    def source_connected(self) -> bool:
+        """데이터 소스가 활성 상태인지: 시리얼 포트가 열려 있거나, UDP 소켓이 바인딩되어 수신 스레드가 동작 중"""
+        if self.serial_port and self.serial_port.is_open:
+            return True
+        return (self.udp_socket is not None and self.serial_thread is not None
+                and self.serial_thread.is_alive())
+
+    def start_data_reception(self, worker=None):
         if self.serial_thread and self.serial_thread.is_alive():
             self.stop_event.set()
             self.serial_thread.join(timeout=2)
         self.stop_event.clear()
-        self.serial_thread = threading.Thread(target=self._data_reception_worker, daemon=True)
+        self._flush_request.clear()
+        self.line_framer.reset()
+        self.frame_decoder.reset()
+        self.line_decoder = make_line_decoder(LINE_FORMAT)  # "auto"이면 재연결 시 형식을 다시 판별
+        if worker is not None:
+            mode = "udp"
+        elif self.reader_mode == "event":
+            worker, mode = self._event_reception_worker, self.reader_mode
+        else:
+            worker, mode = self._data_reception_worker, self.reader_mode
+        self.serial_thread = threading.Thread(target=worker, daemon=True)
         self.serial_thread.start()
-        print("📡 데이터 수신 스레드 시작됨")
+        print(f"📡 데이터 수신 스레드 시작됨 (모드: {mode})")
 
     def adjust_sampling_rate(self):
         """현재 샘플링 레이트를 체크하고 필요한 경우 조정합니다."""
@@ -379,143 +449,180 @@ class SignGloveUnifiedCollector:
                 f"\n   손실률: {(stats['dropped_samples']/max(1,stats['total_samples'])*100):.2f}%"
                 f"\n   평균 샘플링 속도: {avg_rate:.1f} Hz"
             )
+            writer = self.episode_writer.stats()
+            if writer['submitted']:
+                print(
+                    f"   저장 대기: {writer['pending']}/{self.episode_writer.max_pending}"
+                    f" (최대 {writer['max_depth']}, 대기 발생 {writer['blocked_submits']}회/{writer['blocked_seconds']:.2f}s)"
+                    f" | 저장 {writer['completed']}건, 실패 {writer['failed']}건, 최대 {writer['max_write_ms']:.0f}ms"
+                )
 
             if current_usage >= BUFFER_CRITICAL_THRESHOLD:
                 print("⚠️ 경고: 버퍼가 거의 가득 찼습니다! 데이터 손실 위험이 높습니다.")
             elif current_usage >= BUFFER_WARNING_THRESHOLD:
                 print("⚠️ 주의: 버퍼 사용량이 높습니다.")
 
-    def _data_reception_worker(self):
-        last_arduino_ms = None
+    def _reset_reception_state(self):
+        """수신 워커 시작 시 파싱 상태(Hz 계산/상대 시간/델타 출력 기준)를 초기화합니다."""
+        self._last_arduino_ms = None
+        self._collection_start_time = None
         self._prev_reading = None
-        collection_start_time = None
+        self._udp_clocks.clear()
+
+    def _handle_lines(self, lines: List[bytes], decoder=None):
+        """수신한 라인 배치를 라인 디코더(기본: LINE_FORMAT)로 한 번에 파싱해 유효한 행만 큐/에피소드로 전달합니다."""
+        if not lines:
+            return
+
+        decoder = decoder or self.line_decoder
+        records, valid = decoder.decode(lines, last_arduino_ms=self._last_arduino_ms)
+
+        if RAW_ECHO or not valid.all():
+            for raw, ok in zip(lines, valid):
+                line = raw.decode('utf-8', errors='ignore').strip()
+                if not line or line.startswith('#'):
+                    continue
+                if RAW_ECHO:
+                    print("RAW:", line)
+                # CSV: timestamp,pitch,roll,yaw,accel_x,accel_y,accel_z,flex1..5  (총 12개) / JSON: {"timestamp": ...}
+                # 형식이 다른 줄은 조용히 무시하고, 형식은 맞는데 값 변환에 실패한 줄만 경고
+                if not ok and decoder.matches(raw.strip()):
+                    print(f"⚠️ 데이터 파싱 오류: {line}")
+
+        self._handle_records(records[valid])
+
+    def _handle_frames(self, frames: np.ndarray):
+        """검증된 바이너리 프레임 배치를 READING_DTYPE으로 변환해 전달합니다."""
+        if len(frames):
+            self._handle_records(frames_to_records(frames, last_arduino_ms=self._last_arduino_ms))
+
+    def _handle_records(self, records: np.ndarray):
+        """유효한 READING_DTYPE 행들을 상대 시간으로 바꿔 하나씩 큐/에피소드로 전달합니다."""
+        for values in records.tolist():
+            arduino_ts = values[0]
+            self._last_arduino_ms = arduino_ts
+
+            # 수집 시작 시점 기준 상대 시간으로 변환
+            if self.collecting:
+                if self._collection_start_time is None:
+                    self._collection_start_time = arduino_ts
+                relative_ts = arduino_ts - self._collection_start_time
+            else:
+                relative_ts = arduino_ts
+                self._collection_start_time = None
+
+            self._ingest_reading(SignGloveSensorReading(relative_ts, *values[1:]))
+
+    def _ingest_reading(self, reading: SignGloveSensorReading):
+        """파싱된 센서 값을 실시간 출력 → 데이터 큐 → 에피소드 버퍼 순서로 전달합니다."""
+        sampling_hz = reading.sampling_hz
+
+        # 실시간 출력
+        if self.realtime_print_enabled:
+            if PRINT_DELTAS and self._prev_reading is not None:
+                dP = reading.pitch - self._prev_reading.pitch
+                dR = reading.roll  - self._prev_reading.roll
+                dY = reading.yaw   - self._prev_reading.yaw
+                print(
+                    f"📊 {reading.timestamp_ms}ms | "
+                    f"P:{reading.pitch:.3f} ({dP:+.3f})  "
+                    f"R:{reading.roll:.3f} ({dR:+.3f})  "
+                    f"Y:{reading.yaw:.3f} ({dY:+.3f}) | "
+                    f"AX:{reading.accel_x:.3f}, AY:{reading.accel_y:.3f}, AZ:{reading.accel_z:.3f} | "
+                    f"{sampling_hz:.1f}Hz"
+                )
+            else:
+                print(
+                    f"📊 {reading.timestamp_ms}ms | "
+                    f"P:{reading.pitch:.3f}, R:{reading.roll:.3f}, Y:{reading.yaw:.3f} | "
+                    f"AX:{reading.accel_x:.3f}, AY:{reading.accel_y:.3f}, AZ:{reading.accel_z:.3f} | "
+                    f"{sampling_hz:.1f}Hz"
+                )
+
+        self._prev_reading = reading
+
+        # 큐로 전달
+        if not self.data_queue.full():
+            self.data_queue.put(reading)
+            self.update_buffer_stats(sample_received=True)
+            if self._dropped_samples:
+                if self.buffer_active and BUFFER_DEBUG:
+                    print(f"🐛 [BUFFER] 큐 정상화 - 누락된 샘플 {self._dropped_samples}개")
+                self._dropped_samples = 0
+        else:
+            if self.buffer_active:
+                self._dropped_samples += 1
+                self.update_buffer_stats(sample_received=True, sample_dropped=True)
+                if BUFFER_DEBUG and (self._dropped_samples == 1 or self._dropped_samples % BUFFER_DROP_LOG_INTERVAL == 0):
+                    print(f"⚠️ [BUFFER] 데이터 큐 포화 - 누락 누적 {self._dropped_samples}개")
+
+        # 에피소드 수집 중이면 적재
+        if self.collecting:
+            self.episode_data.append(reading)
+            current_samples = len(self.episode_data)
+            if current_samples % 10 == 0:  # 10개 단위로 진행상황 표시
+                progress = current_samples / self.samples_per_episode * 100
+                progress_bar = "█" * int(progress/5) + "░" * (20 - int(progress/5))
+                print(f"\r⏳ 수집 진행률: {progress_bar} {current_samples}/{self.samples_per_episode} ({progress:.1f}%)", end="")
+            if current_samples >= self.samples_per_episode:
+                print(f"\n✅ {self.current_class} 에피소드 샘플 {self.samples_per_episode}개 수집 완료")
+                self.stop_episode()
+
+    def _print_serial_buffer_debug(self):
+        """수집 중일 때만 시리얼 입력 버퍼/큐 상태를 주기적으로 출력합니다."""
+        if not (BUFFER_DEBUG and self.collecting):
+            return
+        now = time.time()
+        if now - self._last_buffer_debug_ts < BUFFER_DEBUG_INTERVAL:
+            return
+        in_waiting = 0
+        if self.serial_port and self.serial_port.is_open:
+            try:
+                in_waiting = self.serial_port.in_waiting
+            except Exception:
+                in_waiting = -1
+        if self.binary_frames:
+            decoder = self.frame_decoder
+            stream_info = (f"frames pending={decoder.pending}B, crc_errors={decoder.crc_errors}, "
+                           f"lost={decoder.lost_frames}, discarded={decoder.discarded_bytes}B")
+        else:
+            stream_info = f"framer pending={self.line_framer.pending}B, discarded={self.line_framer.discarded_bytes}B"
+        print(
+            f"🐛 [BUFFER] in_waiting={in_waiting} bytes | "
+            f"queue={self.data_queue.qsize()}/{self.data_queue.maxsize} | "
+            f"{stream_info}"
+        )
+        self._last_buffer_debug_ts = now
+
+    def _flush_serial_input(self):
+        """시리얼 입력 버퍼를 비우고, 처음 도착하는 잘린 라인/프레임은 버리도록 framer/decoder를 resync합니다."""
+        self.serial_port.reset_input_buffer()
+        self.line_framer.resync()
+        self.frame_decoder.resync()
+
+    def _service_flush_request(self):
+        """수신 스레드: clear_buffer가 요청한 입력 버퍼 비우기를 다음 read 전에 수행합니다."""
+        if self._flush_request.is_set():
+            self._flush_request.clear()
+            self._flush_serial_input()
+            self._flush_done.set()
+
+    def _data_reception_worker(self):
+        """폴링 수신 워커: in_waiting 확인 → 쌓인 바이트를 read(n)으로 일괄 수신/라인 분리 → 동적 sleep 반복"""
+        self._reset_reception_state()
 
         while not self.stop_event.is_set():
             try:
                 if not self.serial_port or not self.serial_port.is_open:
                     break
 
-                if self.serial_port.in_waiting > 0:
-                    raw = self.serial_port.readline()
-                    try:
-                        line = raw.decode('utf-8', errors='ignore').strip()
-                    except Exception:
-                        continue
-
-                    if not line or line.startswith('#'):
-                        continue
-
-                    if RAW_ECHO:
-                        print("RAW:", line)
-
-                    # CSV: timestamp,pitch,roll,yaw,accel_x,accel_y,accel_z,flex1..5  (총 12개)
-                    parts = line.split(',')
-                    if len(parts) != 12:
-                        # 포맷이 다르면 무시 (필요시 len==9 등 변형도 허용하도록 확장 가능)
-                        continue
-
-                    try:
-                        recv_time_ms = int(time.time() * 1000)
-                        arduino_ts = int(float(parts[0]))
-
-                        sampling_hz = 0.0
-                        if last_arduino_ms is not None:
-                            dt_ms = max(1, arduino_ts - last_arduino_ms)
-                            sampling_hz = 1000.0 / dt_ms
-                        last_arduino_ms = arduino_ts
-
-                        # 수집 시작 시점 기준 상대 시간으로 변환
-                        if self.collecting:
-                            if collection_start_time is None:
-                                collection_start_time = arduino_ts
-                            relative_ts = arduino_ts - collection_start_time
-                        else:
-                            relative_ts = arduino_ts
-                            collection_start_time = None
-
-                        reading = SignGloveSensorReading(
-                            timestamp_ms=relative_ts,
-                            recv_timestamp_ms=recv_time_ms,
-                            pitch=float(parts[1]),
-                            roll=float(parts[2]),
-                            yaw=float(parts[3]),
-                            accel_x=float(parts[4]),
-                            accel_y=float(parts[5]),
-                            accel_z=float(parts[6]),
-                            flex1=int(parts[7]),
-                            flex2=int(parts[8]),
-                            flex3=int(parts[9]),
-                            flex4=int(parts[10]),
-                            flex5=int(parts[11]),
-                            sampling_hz=sampling_hz
-                        )
-
-                        # 실시간 출력
-                        if self.realtime_print_enabled:
-                            if PRINT_DELTAS and self._prev_reading is not None:
-                                dP = reading.pitch - self._prev_reading.pitch
-                                dR = reading.roll  - self._prev_reading.roll
-                                dY = reading.yaw   - self._prev_reading.yaw
-                                print(
-                                    f"📊 {reading.timestamp_ms}ms | "
-                                    f"P:{reading.pitch:.3f} ({dP:+.3f})  "
-                                    f"R:{reading.roll:.3f} ({dR:+.3f})  "
-                                    f"Y:{reading.yaw:.3f} ({dY:+.3f}) | "
-                                    f"AX:{reading.accel_x:.3f}, AY:{reading.accel_y:.3f}, AZ:{reading.accel_z:.3f} | "
-                                    f"{sampling_hz:.1f}Hz"
-                                )
-                            else:
-                                print(
-                                    f"📊 {reading.timestamp_ms}ms | "
-                                    f"P:{reading.pitch:.3f}, R:{reading.roll:.3f}, Y:{reading.yaw:.3f} | "
-                                    f"AX:{reading.accel_x:.3f}, AY:{reading.accel_y:.3f}, AZ:{reading.accel_z:.3f} | "
-                                    f"{sampling_hz:.1f}Hz"
-                                )
-
-                        self._prev_reading = reading
-
-                        # 큐로 전달
-                        if not self.data_queue.full():
-                            self.data_queue.put(reading)
-                            self.update_buffer_stats(sample_received=True)
-                            if self._dropped_samples:
-                                if self.buffer_active and BUFFER_DEBUG:
-                                    print(f"🐛 [BUFFER] 큐 정상화 - 누락된 샘플 {self._dropped_samples}개")
-                                self._dropped_samples = 0
-                        else:
-                            if self.buffer_active:
-                                self._dropped_samples += 1
-                                self.update_buffer_stats(sample_received=True, sample_dropped=True)
-                                if BUFFER_DEBUG and (self._dropped_samples == 1 or self._dropped_samples % BUFFER_DROP_LOG_INTERVAL == 0):
-                                    print(f"⚠️ [BUFFER] 데이터 큐 포화 - 누락 누적 {self._dropped_samples}개")                        # 에피소드 수집 중이면 적재
-                        if self.collecting:
-                            self.episode_data.append(reading)
-                            current_samples = len(self.episode_data)
-                            if current_samples % 10 == 0:  # 10개 단위로 진행상황 표시
-                                progress = current_samples / self.samples_per_episode * 100
-                                progress_bar = "█" * int(progress/5) + "░" * (20 - int(progress/5))
-                                print(f"\r⏳ 수집 진행률: {progress_bar} {current_samples}/{self.samples_per_episode} ({progress:.1f}%)", end="")
-                            if current_samples >= self.samples_per_episode:
-                                print(f"\n✅ {self.current_class} 에피소드 샘플 {self.samples_per_episode}개 수집 완료")
-                                self.stop_episode()
-
-                    except (ValueError, IndexError) as e:
-                        print(f"⚠️ 데이터 파싱 오류: {line} → {e}")
-
-                if BUFFER_DEBUG and self.collecting:  # 수집 중일 때만 버퍼 디버그 정보 출력
-                    now = time.time()
-                    if now - self._last_buffer_debug_ts >= BUFFER_DEBUG_INTERVAL:
-                        in_waiting = 0
-                        if self.serial_port and self.serial_port.is_open:
-                            try:
-                                in_waiting = self.serial_port.in_waiting
-                            except Exception:
-                                in_waiting = -1
-                        print(
-                            f"🐛 [BUFFER] in_waiting={in_waiting} bytes | "
-                            f"queue={self.data_queue.qsize()}/{self.data_queue.maxsize}"
-                        )
-                        self._last_buffer_debug_ts = now
+                self._service_flush_request()
+                if self.binary_frames:
+                    self._handle_frames(self.frame_decoder.read_from(self.serial_port))
+                else:
+                    self._handle_lines(self.line_framer.read_from(self.serial_port))
+
+                self._print_serial_buffer_debug()
 
                 # 샘플링 레이트 제어를 위한 동적 대기
                 self.adjust_sampling_rate()
@@ -525,6 +632,103 @@ class SignGloveUnifiedCollector:
                 print(f"❌ 데이터 수신 오류: {e}")
                 break
 
+    def _wait_serial_chunk(self) -> bytes:
+        """데이터가 도착할 때까지 블로킹 대기 후, 입력 버퍼에 쌓인 바이트를 한 번에 읽습니다.
+
+        POSIX에서는 포트 fd에 select()를 걸어 EVENT_READ_TIMEOUT마다 stop_event를 확인하고,
+        fd가 없는 플랫폼(Windows)에서는 포트 timeout을 가진 블로킹 read(1)로 대기합니다.
+        """
+        port = self.serial_port
+        try:
+            fd = port.fileno()
+        except Exception:
+            fd = None
+
+        if fd is not None:
+            ready, _, _ = select.select([fd], [], [], EVENT_READ_TIMEOUT)
+            if not ready:
+                return b''
+            return port.read(max(1, port.in_waiting))
+
+        data = port.read(1)
+        if data:
+            waiting = port.in_waiting
+            if waiting:
+                data += port.read(waiting)
+        return data
+
+    def _event_reception_worker(self):
+        """이벤트 수신 워커: 포트에서 블로킹 대기하다가 도착한 완성 라인을 모두 한 번에 처리 (idle CPU ≈ 0)"""
+        self._reset_reception_state()
+
+        while not self.stop_event.is_set():
+            try:
+                if not self.serial_port or not self.serial_port.is_open:
+                    break
+
+                self._service_flush_request()
+                chunk = self._wait_serial_chunk()
+                if self.binary_frames:
+                    self._handle_frames(self.frame_decoder.feed(chunk))
+                else:
+                    self._handle_lines(self.line_framer.feed(chunk))
+
+                self._print_serial_buffer_debug()
+
+            except Exception as e:
+                print(f"❌ 데이터 수신 오류: {e}")
+                break
+
+    def _udp_reception_worker(self):
+        """UDP 수신 워커: 데이터그램 하나(여러 행)를 받을 때마다 seq를 확인하고 행 배치를 그대로 처리"""
+        self._reset_reception_state()
+        sock = self.udp_socket
+
+        while not self.stop_event.is_set():
+            try:
+                data, addr = sock.recvfrom(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            try:
+                decoded = self.udp_decoder.decode(data, addr)
+                if decoded is not None:
+                    self._handle_udp_lines(*decoded)
+                self._print_udp_debug()
+            except Exception as e:
+                print(f"❌ 데이터 수신 오류: {e}")
+                break
+
+    def _handle_udp_lines(self, device: str, lines: List[bytes]):
+        """장치마다 따로 둔 시계(직전 아두이노 ms, 수집 시작 ms)로 한 데이터그램의 행들을 처리합니다.
+
+        장치가 재시작하면 millis()가 0부터 다시 시작하므로 그 장치의 시계를 초기화합니다.
+        """
+        stats = self.udp_decoder.devices.get(device)
+        restarts = stats.restarts if stats is not None else 0
+        clock = self._udp_clocks.get(device)
+        if clock is None or clock[2] != restarts:
+            clock = (None, None, restarts)
+        self._last_arduino_ms, self._collection_start_time = clock[0], clock[1]
+        self._handle_lines(lines, self.udp_line_decoder)
+        self._udp_clocks[device] = (self._last_arduino_ms, self._collection_start_time, restarts)
+
+    def _print_udp_debug(self):
+        """수집 중일 때만 장치별 UDP 손실/재정렬/지터를 주기적으로 출력합니다."""
+        if not (BUFFER_DEBUG and self.collecting):
+            return
+        now = time.time()
+        if now - self._last_buffer_debug_ts < BUFFER_DEBUG_INTERVAL:
+            return
+        for device, stats in self.udp_decoder.stats().items():
+            print(
+                f"🐛 [UDP] {device}: 수신 {stats['received']} | 손실 {stats['lost']} ({stats['loss_rate']*100:.2f}%) | "
+                f"재정렬 {stats['reordered']} (늦게 도착해 버림 {stats['late_dropped']}) | 중복 {stats['duplicates']} | "
+                f"재시작 {stats['restarts']} | 지터 {stats['jitter_ms']:.1f}ms"
+            )
+        self._last_buffer_debug_ts = now
+
     # ------------------- UI: 클래스 선택/진행 표시 -------------------
     def start_auto_collection(self, class_name: str):
         """선택한 클래스의 모든 남은 유형을 자동으로 수집합니다."""
@@ -537,6 +741,9 @@ class SignGloveUnifiedCollector:
         
         try:
             while self.auto_collecting:
+                # 이전 에피소드 저장이 끝나야 진행률(남은 유형)이 정확함
+                self.flush_episode_writer()
+
                 # 남은 유형 확인
                 remaining_types = []
                 for key, value in self.episode_types.items():
@@ -669,7 +876,7 @@ class SignGloveUnifiedCollector:
         if self.collecting:
             self.stop_episode()
 
-        if not self.serial_port or not self.serial_port.is_open:
+        if not self.source_connected():
             print("❌ 아두이노가 연결되지 않았습니다. 'C' 키로 연결하세요.")
             return
             
@@ -737,7 +944,7 @@ class SignGloveUnifiedCollector:
 
         self.current_episode_type = choice
         self.current_class = class_name
-        self.episode_data = []
+        self.episode_data.clear()
         self.collecting = True
         self.episode_start_time = time.time()
         self.sample_count = 0
@@ -762,9 +969,16 @@ class SignGloveUnifiedCollector:
         self.buffer_active = False  # 버퍼 비활성화
         
 
-        # 시리얼 입력 버퍼 비우기
+        # 시리얼 입력 버퍼 비우기: 수신 스레드가 돌고 있으면 그 스레드가 다음 read 전에 수행하도록 요청하고 대기
         if self.serial_port and self.serial_port.is_open:
-            self.serial_port.reset_input_buffer()
+            reader = self.serial_thread
+            if reader is not None and reader.is_alive() and reader is not threading.current_thread():
+                self._flush_done.clear()
+                self._flush_request.set()
+                if not self._flush_done.wait(timeout=EVENT_READ_TIMEOUT + 1.0):
+                    print("⚠️ 수신 스레드가 입력 버퍼 비우기 요청에 응답하지 않습니다.")
+            else:
+                self._flush_serial_input()
             
         # 큐 완전 비우기
         while not self.data_queue.empty():
@@ -800,114 +1014,161 @@ class SignGloveUnifiedCollector:
             print("⚠️ 수집된 데이터가 없습니다.")
             return False  # 실패 상태 반환
 
-        duration = time.time() - self.episode_start_time
-        h5_save_path = self.save_episode_data()
-        csv_save_path = self.save_episode_data_csv()
-
-        if h5_save_path and csv_save_path:  # 파일 저장이 성공한 경우에만
-            self.collection_stats[self.current_class][self.current_episode_type] += 1
-            self.session_stats[self.current_class] += 1
+        # 버퍼 소유권을 저장 작업에 넘기고 다음 에피소드는 새 버퍼에 수집
+        job = EpisodeJob(
+            data=self.episode_data,
+            class_name=self.current_class,
+            episode_type=self.current_episode_type,
+            duration=time.time() - self.episode_start_time,
+            timestamp=datetime.now().strftime('%Y%m%d_%H%M%S'),
+        )
+        self.episode_data = EpisodeBuffer(self.samples_per_episode)
+        self.episode_writer.submit(job)  # 대기열이 가득 차면 여기서 대기 (backpressure)
+        print(f"\n💾 에피소드 저장 대기열에 추가: '{job.class_name}' ({len(job.data)}개 샘플, 대기 {self.episode_writer.pending}개)")
+        return True  # 성공 상태 반환 (진행률은 저장 완료 후 반영)
+
+    def _persist_episode(self, job: EpisodeJob):
+        """writer 스레드: 에피소드를 기록하고 fsync까지 마친 뒤 ((표시 이름, 위치) 목록, 매니페스트 레코드)를 반환합니다."""
+        data = job.data
+        record = EpisodeRecord(
+            job.class_name, job.episode_type, path="",
+            num_samples=len(data),
+            start_ms=int(data.timestamps[0]) if len(data) else None,
+            end_ms=int(data.timestamps[-1]) if len(data) else None,
+            duration=job.duration,
+            saved_at=time.time(),
+        )
+        if EPISODE_STORAGE == "store":
+            episode_id = self.append_episode_to_store(job)
+            record.path = self.episode_store.path.relative_to(self.data_dir).as_posix()
+            record.store_index = episode_id
+            return [("통합 저장소", f"{self.episode_store.path} #{episode_id}")], record
+
+        h5_save_path = self.save_episode_data(job)
+        csv_save_path = self.save_episode_data_csv(job)
+        if not (h5_save_path and csv_save_path):
+            raise RuntimeError("H5/CSV 파일 저장 실패")
+        fsync_dir(h5_save_path.parent)
+        record.path = h5_save_path.relative_to(self.data_dir).as_posix()
+        return [("H5", h5_save_path), ("CSV", csv_save_path)], record
+
+    def append_episode_to_store(self, job: EpisodeJob) -> int:
+        """세션 통합 저장소에 에피소드를 한 번에 추가하고 fsync한 뒤 인덱스 행 번호를 반환합니다."""
+        if self.episode_store is None:
+            self.episode_store = EpisodeStore(session_store_path(self.store_dir), profile=STORAGE_PROFILE)
+            fsync_dir(self.store_dir)
+        episode_id = self.episode_store.append(
+            job.data, job.class_name, job.episode_type,
+            label_idx=self.all_classes.index(job.class_name), duration=job.duration,
+        )
+        self.episode_store.flush()
+        return episode_id
+
+    def close_episode_store(self):
+        if self.episode_store is not None:
+            self.episode_store.close()
+            self.episode_store = None
+
+    def _on_episode_durable(self, job: EpisodeJob):
+        """writer 스레드: 파일이 디스크에 기록된 뒤에만 매니페스트와 진행률을 올립니다."""
+        locations, record = job.result
+        with self._stats_lock:
+            self.manifest.add_episode(record)  # 에피소드 행 + 집계를 한 트랜잭션으로
+            self.collection_stats[job.class_name][job.episode_type] += 1
+            self.session_stats[job.class_name] += 1
             self.save_collection_progress()
+            current = sum(self.collection_stats[job.class_name].values())
 
-            target_info = self.collection_targets.get(self.current_class, {})
-            current = sum(self.collection_stats[self.current_class].values())
-            target = self.episodes_per_type * len(self.episode_types)
-            remaining = max(0, target - current)
-            progress = min(100, (current / target * 100)) if target > 0 else 0
+        target = self.episodes_per_type * len(self.episode_types)
+        remaining = max(0, target - current)
+        progress = min(100, (current / target * 100)) if target > 0 else 0
 
-            print(f"\n✅ 에피소드 완료: '{self.current_class}' - 유형: {self.episode_types[self.current_episode_type]}")
-            print(f"⏱️ 수집 시간: {duration:.1f}초")
-            print(f"📊 데이터 샘플: {len(self.episode_data)}개")
-            print(f"💾 H5 저장: {h5_save_path}")
-            print(f"💾 CSV 저장: {csv_save_path}")
-            print(f"📈 진행률: {current}/{target} ({progress:.1f}%) - {remaining}개 남음")
-            
-            if current >= target:
-                print(f"🎉 '{self.current_class}' 클래스 목표 달성!")
-                
-            return True  # 성공 상태 반환
-        else:
-            print("❌ 에피소드 저장 실패")
-            return False  # 실패 상태 반환
+        print(f"\n✅ 에피소드 완료: '{job.class_name}' - 유형: {self.episode_types[job.episode_type]}")
+        print(f"⏱️ 수집 시간: {job.duration:.1f}초")
+        print(f"📊 데이터 샘플: {len(job.data)}개")
+        for label, location in locations:
+            print(f"💾 {label} 저장: {location}")
+        print(f"📈 진행률: {current}/{target} ({progress:.1f}%) - {remaining}개 남음")
+
+        if current >= target:
+            print(f"🎉 '{job.class_name}' 클래스 목표 달성!")
 
-    def save_episode_data_csv(self) -> Optional[Path]:
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    def _on_episode_save_error(self, job: EpisodeJob, error: BaseException):
+        print(f"❌ 에피소드 저장 실패: '{job.class_name}' ({job.episode_type}) → {error}")
+
+    def flush_episode_writer(self):
+        """대기 중인 에피소드 저장이 모두 끝날 때까지 기다립니다."""
+        pending = self.episode_writer.pending
+        if pending:
+            print(f"⏳ 저장 대기 중인 에피소드 {pending}개 기록 중...")
+        self.episode_writer.flush()
+
+    def save_episode_data_csv(self, job: EpisodeJob) -> Optional[Path]:
         # Create new directory structure
-        save_dir = self.data_dir / self.current_class / self.current_episode_type
+        save_dir = self.data_dir / job.class_name / job.episode_type
         save_dir.mkdir(parents=True, exist_ok=True)
         
-        filename = f"episode_{timestamp}_{self.current_class}_{self.current_episode_type}.csv"
+        filename = f"episode_{job.timestamp}_{job.class_name}_{job.episode_type}.csv"
         save_path = save_dir / filename
         try:
             with open(save_path, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
-                if not self.episode_data:
+                if not job.data:
                     return None
-                header = list(asdict(self.episode_data[0]).keys())
-                writer.writerow(header)
-                for reading in self.episode_data:
-                    writer.writerow(asdict(reading).values())
+                writer.writerow(READING_FIELDS)
+                writer.writerows(job.data.to_records().tolist())
+                f.flush()
+                os.fsync(f.fileno())
             return save_path
         except Exception as e:
             print(f"❌ CSV 저장 실패: {e}")
             return None
 
-    def save_episode_data(self) -> Path:
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    def save_episode_data(self, job: EpisodeJob) -> Path:
         # Create new directory structure
-        save_dir = self.data_dir / self.current_class / self.current_episode_type
+        save_dir = self.data_dir / job.class_name / job.episode_type
         save_dir.mkdir(parents=True, exist_ok=True)
 
-        filename = f"episode_{timestamp}_{self.current_class}_{self.current_episode_type}.h5"
+        filename = f"episode_{job.timestamp}_{job.class_name}_{job.episode_type}.h5"
         save_path = save_dir / filename
 
-        timestamps = []
-        arduino_timestamps = []
-        sampling_rates = []
-        flex_data = []
-        orientation_data = []
-        accel_data = []
-
-        for reading in self.episode_data:
-            timestamps.append(reading.recv_timestamp_ms)
-            arduino_timestamps.append(reading.timestamp_ms)
-            sampling_rates.append(reading.sampling_hz)
-            flex_data.append([reading.flex1, reading.flex2, reading.flex3, reading.flex4, reading.flex5])
-            orientation_data.append([reading.pitch, reading.roll, reading.yaw])
-            accel_data.append([reading.accel_x, reading.accel_y, reading.accel_z])
-
-        timestamps = np.array(timestamps, dtype=np.int64)
-        arduino_timestamps = np.array(arduino_timestamps, dtype=np.int64)
-        sampling_rates = np.array(sampling_rates, dtype=np.float32)
-        flex_data = np.array(flex_data, dtype=np.float32)
-        orientation_data = np.array(orientation_data, dtype=np.float32)
-        accel_data = np.array(accel_data, dtype=np.float32)
-
+        episode = job.data
+        timestamps = episode.timestamps
+        arduino_timestamps = episode.arduino_timestamps
+        sampling_rates = episode.sampling_rates.astype(np.float32)
+        sensor_data = episode.sensor_data.astype(np.float32)  # (N, 8)
+        flex_data = sensor_data[:, :5]
+        orientation_data = sensor_data[:, 5:]
+        accel_data = episode.accel.astype(np.float32)
+
+        profile = get_profile(STORAGE_PROFILE)
+        options = profile.dataset_kwargs()
         with h5py.File(save_path, 'w') as f:
-            f.attrs['class_name'] = self.current_class
-            f.attrs['episode_type'] = self.current_episode_type
-            f.attrs['class_category'] = self.get_class_category(self.current_class)
-            f.attrs['episode_duration'] = time.time() - self.episode_start_time
-            f.attrs['num_samples'] = len(self.episode_data)
+            f.attrs.update(profile.attrs())
+            f.attrs['class_name'] = job.class_name
+            f.attrs['episode_type'] = job.episode_type
+            f.attrs['class_category'] = self.get_class_category(job.class_name)
+            f.attrs['episode_duration'] = job.duration
+            f.attrs['num_samples'] = len(episode)
             f.attrs['avg_sampling_rate'] = float(np.mean(sampling_rates)) if len(sampling_rates) else 0.0
             f.attrs['device_id'] = "SIGNGLOVE_UNIFIED_001"
             f.attrs['collection_date'] = datetime.now().isoformat()
 
-            f.create_dataset('timestamps', data=timestamps, compression='gzip')
-            f.create_dataset('arduino_timestamps', data=arduino_timestamps, compression='gzip')
-            f.create_dataset('sampling_rates', data=sampling_rates, compression='gzip')
+            f.create_dataset('timestamps', data=timestamps, **options)
+            f.create_dataset('arduino_timestamps', data=arduino_timestamps, **options)
+            f.create_dataset('sampling_rates', data=sampling_rates, **options)
 
-            sensor_data = np.concatenate([flex_data, orientation_data], axis=1)  # (N, 8)
-            f.create_dataset('sensor_data', data=sensor_data, compression='gzip')
+            f.create_dataset('sensor_data', data=sensor_data, **options)
 
             sensor_group = f.create_group('sensors')
-            sensor_group.create_dataset('flex', data=flex_data, compression='gzip')
-            sensor_group.create_dataset('orientation', data=orientation_data, compression='gzip')
-            sensor_group.create_dataset('acceleration', data=accel_data, compression='gzip')
+            sensor_group.create_dataset('flex', data=flex_data, **options)
+            sensor_group.create_dataset('orientation', data=orientation_data, **options)
+            sensor_group.create_dataset('acceleration', data=accel_data, **options)
 
-            f.attrs['label'] = self.current_class
-            f.attrs['label_idx'] = self.all_classes.index(self.current_class)
+            f.attrs['label'] = job.class_name
+            f.attrs['label_idx'] = self.all_classes.index(job.class_name)
 
+        fsync_file(save_path)
         return save_path
 
     # ------------------- 자세 기준/검증 -------------------
@@ -1000,24 +1261,21 @@ class SignGloveUnifiedCollector:
 
         POSTURE_TOLERANCE_IMU = 5.0
         POSTURE_TOLERANCE_FLEX = 20
+        # sensor_data 열 순서: flex1-5, pitch, roll, yaw (yaw는 검사하지 않음)
+        tolerances = np.array([POSTURE_TOLERANCE_FLEX] * 5 + [POSTURE_TOLERANCE_IMU] * 2 + [np.inf])
 
-        is_initial_posture = True
+        cur = sensor_vector(reading)
+        ref = sensor_vector(self.initial_posture_reference)
+        off = np.abs(cur - ref) > tolerances
+        is_initial_posture = not off.any()
         feedback = []
 
-        if abs(reading.pitch - self.initial_posture_reference.pitch) > POSTURE_TOLERANCE_IMU:
-            is_initial_posture = False
-            feedback.append(f"  - 손목 Pitch가 기준과 다릅니다 (현재: {reading.pitch:.1f}, 기준: {self.initial_posture_reference.pitch:.1f})")
-        if abs(reading.roll - self.initial_posture_reference.roll) > POSTURE_TOLERANCE_IMU:
-            is_initial_posture = False
-            feedback.append(f"  - 손목 Roll이 기준과 다릅니다 (현재: {reading.roll:.1f}, 기준: {self.initial_posture_reference.roll:.1f})")
-
-        for i in range(1, 6):
-            flex_key = f'flex{i}'
-            cur = getattr(reading, flex_key)
-            ref = getattr(self.initial_posture_reference, flex_key)
-            if abs(cur - ref) > POSTURE_TOLERANCE_FLEX:
-                is_initial_posture = False
-                feedback.append(f"  - {i}번 손가락 Flex가 기준과 다릅니다 (현재: {cur}, 기준: {ref})")
+        if off[5]:
+            feedback.append(f"  - 손목 Pitch가 기준과 다릅니다 (현재: {cur[5]:.1f}, 기준: {ref[5]:.1f})")
+        if off[6]:
+            feedback.append(f"  - 손목 Roll이 기준과 다릅니다 (현재: {cur[6]:.1f}, 기준: {ref[6]:.1f})")
+        for i in np.flatnonzero(off[:5]):
+            feedback.append(f"  - {i + 1}번 손가락 Flex가 기준과 다릅니다 (현재: {cur[i]:.0f}, 기준: {ref[i]:.0f})")
 
         if is_initial_posture:
             print("✅ 현재 자세가 초기 자세 기준과 일치합니다.")
@@ -1040,70 +1298,88 @@ class SignGloveUnifiedCollector:
 
     # ------------------- 진행상황 저장/로드/리셋 -------------------
     def load_collection_progress(self):
-        """진행상황 파일(JSON)과 실제 디렉토리의 파일들을 스캔하여 실제 데이터 기준으로 진행상황을 동기화합니다."""
+        """매니페스트(SQLite)의 클래스/유형별 집계로 진행상황을 복원합니다.
+
+        매니페스트가 없을 때만 실제 데이터 파일을 한 번 스캔해 만들고, 이후 시작은
+        데이터셋 크기와 무관하게 집계 테이블만 읽습니다. 실제 파일과의 대조는
+        MANIFEST_VERIFY 설정에 따라 백그라운드에서 수행합니다.
+        """
         try:
-            # 1. 우선 progress.json 파일 로드 시도
-            if self.progress_file.exists():
-                with open(self.progress_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.collection_stats = defaultdict(lambda: defaultdict(int))
-                    for class_name, episode_stats in data.get('collection_stats', {}).items():
-                        self.collection_stats[class_name] = defaultdict(int, episode_stats)
-                print("📊 기존 진행상황 파일 로드됨")
+            if self.manifest.is_initialized():
+                counts = self.manifest.counts()
+                print(f"📒 매니페스트에서 진행상황 로드됨 (총 {sum(counts.values())}개 에피소드)")
             else:
-                self.collection_stats = defaultdict(lambda: defaultdict(int))
-                print("📊 새로운 진행상황 시작")
-
-            # 2. 실제 디렉토리 스캔하여 파일 수 기준으로 진행상황 동기화
-            print("🔍 실제 데이터 파일 스캔 중...")
-            real_stats = defaultdict(lambda: defaultdict(int))
-            total_files = 0
+                print("🔍 매니페스트가 없어 실제 데이터 파일 스캔 중...")
+                records = self.scan_saved_episodes()
+                self.manifest.rebuild(records)
+                counts = count_records(records)
+                print(f"✅ 매니페스트 생성 완료 (총 {len(records)}개 에피소드 확인됨)")
+            with self._stats_lock:
+                self.collection_stats = self._stats_from_counts(counts)
+            if not self.progress_file.exists():
+                self.save_collection_progress()
 
-            for class_name in self.all_classes:
-                class_dir = self.data_dir / class_name
-                if not class_dir.exists():
-                    continue
-                
-                for episode_type in self.episode_types.keys():
-                    type_dir = class_dir / episode_type
-                    if not type_dir.exists():
-                        continue
-                    
-                    # H5와 CSV 파일 수 중 더 큰 값 사용 (일부만 저장된 경우 대비)
-                    h5_count = len(list(type_dir.glob("*.h5")))
-                    csv_count = len(list(type_dir.glob("*.csv")))
-                    real_count = max(h5_count, csv_count)
-                    
-                    if real_count > 0:
-                        real_stats[class_name][episode_type] = real_count
-                        total_files += real_count
-
-            # 3. 실제 파일 수와 JSON의 통계가 다르면 실제 값으로 동기화
-            if real_stats != self.collection_stats:
-                print("⚠️ 진행상황 불일치 감지됨 - 실제 파일 기준으로 동기화합니다")
-                self.collection_stats = real_stats
-                self.save_collection_progress()  # 동기화된 상태 저장
-            
-            print(f"✅ 진행상황 동기화 완료 (총 {total_files}개 파일 확인됨)")
+            if MANIFEST_VERIFY == "background":
+                threading.Thread(target=self.verify_manifest, name="manifest-verify", daemon=True).start()
 
         except Exception as e:
             print(f"⚠️ 진행상황 로드/동기화 실패: {e}")
             self.collection_stats = defaultdict(lambda: defaultdict(int))
 
+    @staticmethod
+    def _stats_from_counts(counts) -> defaultdict:
+        stats = defaultdict(lambda: defaultdict(int))
+        for (class_name, episode_type), count in counts.items():
+            stats[class_name][episode_type] = count
+        return stats
+
+    def scan_saved_episodes(self) -> List[EpisodeRecord]:
+        """실제 디렉토리(에피소드별 H5/CSV)와 통합 저장소 인덱스를 스캔합니다."""
+        return scan_dataset(self.data_dir, self.all_classes, self.episode_types.keys(), self.store_dir)
+
+    def verify_manifest(self):
+        """실제 파일을 스캔해 매니페스트와 비교하고, 차이(drift)가 있으면 보고한 뒤 실제 파일 기준으로 보정합니다."""
+        try:
+            if self.episode_writer.pending:
+                print("ℹ️ 저장 중인 에피소드가 있어 매니페스트 검증을 건너뜁니다.")
+                return
+            last_id = self.manifest.last_id()
+            t0 = time.time()
+            records = self.scan_saved_episodes()
+            disk_counts = count_records(records)
+
+            with self._stats_lock:
+                # 스캔 도중 저장이 일어났으면 스캔 결과가 이미 낡았으므로 보정하지 않는다
+                if self.episode_writer.pending or self.manifest.last_id() != last_id:
+                    print("ℹ️ 검증 중 새 에피소드가 저장되어 매니페스트 검증을 건너뜁니다.")
+                    return
+                drift = count_drift(self.manifest.counts(), disk_counts)
+                if not drift:
+                    return
+                print(f"\n⚠️ 매니페스트 불일치 {len(drift)}건 감지 (스캔 {time.time() - t0:.1f}초) - 실제 파일 기준으로 보정합니다")
+                for (class_name, episode_type), (in_manifest, on_disk) in drift.items():
+                    print(f"   - {class_name}/{episode_type}: 매니페스트 {in_manifest}개 → 실제 {on_disk}개")
+                self.manifest.rebuild(records)
+                self.collection_stats = self._stats_from_counts(disk_counts)
+                self.save_collection_progress()
+        except Exception as e:
+            print(f"⚠️ 매니페스트 검증 실패: {e}")
+
     def save_collection_progress(self):
         try:
-            # Convert defaultdict to dict for JSON serialization
-            collection_stats_dict = {k: dict(v) for k, v in self.collection_stats.items()}
-            total_episodes = sum(sum(v.values()) for v in self.collection_stats.values())
-
-            data = {
-                "last_updated": datetime.now().isoformat(),
-                "collection_stats": collection_stats_dict,
-                "session_stats": dict(self.session_stats),
-                "total_episodes": total_episodes
-            }
-            with open(self.progress_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with self._stats_lock:
+                # Convert defaultdict to dict for JSON serialization
+                collection_stats_dict = {k: dict(v) for k, v in self.collection_stats.items()}
+                total_episodes = sum(sum(v.values()) for v in self.collection_stats.values())
+
+                data = {
+                    "last_updated": datetime.now().isoformat(),
+                    "collection_stats": collection_stats_dict,
+                    "session_stats": dict(self.session_stats),
+                    "total_episodes": total_episodes
+                }
+                # 임시 파일에 쓰고 fsync 후 교체 (중간에 종료돼도 이전 내용 유지)
+                atomic_write_text(self.progress_file, json.dumps(data, indent=2, ensure_ascii=False))
         except Exception as e:
             print(f"⚠️ 진행상황 저장 실패: {e}")
 
@@ -1121,6 +1397,7 @@ class SignGloveUnifiedCollector:
                 if confirm_key not in ('y', 'n'):
                     print('y 또는 n을 입력해주세요.')
             if confirm_key == 'y':
+                self.flush_episode_writer()  # 저장 중인 파일이 삭제 후에 생기지 않도록
                 print("\n🔄 진행 상황 초기화 중...")
                 deleted_files_count = 0
                 for file_path in self.data_dir.glob('*.h5'):
@@ -1129,13 +1406,31 @@ class SignGloveUnifiedCollector:
                 for file_path in self.data_dir.glob('*.csv'):
                     file_path.unlink()
                     deleted_files_count += 1
+                # 에피소드별 파일 (<클래스>/<유형>/*.h5, *.csv): 남겨 두면 매니페스트 재구성 시 다시 집계됨
+                for class_name in self.all_classes:
+                    for episode_type in self.episode_types:
+                        type_dir = self.data_dir / class_name / episode_type
+                        for file_path in list(type_dir.glob('*.h5')) + list(type_dir.glob('*.csv')):
+                            file_path.unlink()
+                            deleted_files_count += 1
+                self.close_episode_store()
+                for file_path in store_files(self.store_dir):
+                    file_path.unlink()
+                    deleted_files_count += 1
                 if deleted_files_count > 0:
                     print(f"🗑️ {deleted_files_count}개의 데이터 파일(H5, CSV)을 삭제했습니다.")
                 else:
                     print("🗑️ 삭제할 데이터 파일이 없습니다.")
-                self.collection_stats = defaultdict(int)
-                self.session_stats = defaultdict(int)
+                # 진행률은 삭제 후 실제로 남은 파일을 스캔한 집계로 맞춤 (매니페스트와 항상 일치)
+                records = self.scan_saved_episodes()
+                self.manifest.rebuild(records)
+                counts = count_records(records)
+                with self._stats_lock:
+                    self.collection_stats = self._stats_from_counts(counts)
+                    self.session_stats = defaultdict(int)
                 self.save_collection_progress()
+                if counts:
+                    print(f"⚠️ 삭제되지 않은 에피소드 {sum(counts.values())}개가 남아 진행률에 반영되었습니다.")
                 print("📊 collection_progress.json 파일이 초기화되었습니다.")
                 print("✅ 모든 진행 상황이 성공적으로 초기화되었습니다.")
             else:
@@ -1184,6 +1479,10 @@ class SignGloveUnifiedCollector:
             sys.exit(0)
 
         elif key == 'c':
+            if UDP_PORT is not None:
+                if self.connect_udp():
+                    print("✅ UDP 수신 시작! 'N' 키로 수집을 시작하세요.")
+                return
             print("🔌 아두이노 연결 중...")
             if self.connect_arduino():
                 print("✅ 연결 완료! 'N' 키로 수집을 시작하세요.")
@@ -1247,8 +1546,13 @@ class SignGloveUnifiedCollector:
                 self.stop_episode()
             print("\n👋 프로그램을 종료합니다.")
         finally:
+            self.flush_episode_writer()
+            self.episode_writer.close()
+            self.close_episode_store()
             if self.serial_port and self.serial_port.is_open:
                 self.serial_port.close()
+            if self.udp_socket is not None:
+                self.udp_socket.close()
 
 
 def main():
@@ -0,0 +1,148 @@
+"""
+Incremental line framing for the glove's serial stream.
+
+pyserial's ``readline()`` pulls one byte per ``read(1)`` until it sees a
+newline, so draining a backlog (after ``reset_input_buffer`` or a host stall)
+costs hundreds of syscalls. ``LineFramer`` instead reads whatever is waiting
+in one large ``read(n)``, keeps the trailing partial line between calls and
+hands out every complete line as a batch.
+"""
+
+from __future__ import annotations
+
+from typing import List
+
+
+class LineFramer:
+    """Split a byte stream into newline-terminated lines across arbitrary chunk boundaries.
+
+    Lines are returned without the trailing ``\\n`` (a ``\\r`` before it is
+    left in place; callers already ``strip()`` after decoding). Bytes that can
+    never form a valid row are dropped and accounted in ``discarded_bytes``:
+
+    - a line longer than ``max_line_length`` (runaway data / missing newline),
+    - the fragment before the first newline after :meth:`resync`, which is the
+      tail of a line whose beginning was thrown away by ``reset_input_buffer``.
+    """
+
+    def __init__(self, max_line_length: int = 512, max_read: int = 1 << 16):
+        self.max_line_length = max_line_length
+        self.max_read = max_read
+        self._buffer = bytearray()
+        self._resync = False
+        self._overflowed = False
+
+        # counters
+        self.reads = 0
+        self.bytes_read = 0
+        self.lines = 0
+        self.discarded_bytes = 0
+        self.discarded_lines = 0
+
+    @property
+    def pending(self) -> int:
+        """Bytes of an incomplete line currently held back."""
+        return len(self._buffer)
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Append a chunk read from the stream and return all lines completed by it."""
+        if not data:
+            return []
+        self.reads += 1
+        self.bytes_read += len(data)
+        buf = self._buffer
+        buf += data
+
+        end = buf.rfind(b'\n')
+        if end < 0:
+            self._check_overflow()
+            return []
+
+        lines = bytes(buf[:end]).split(b'\n')
+        del buf[:end + 1]
+
+        if self._resync:
+            self._resync = False
+            self._discard(len(lines[0]) + 1, lines=0 if self._overflowed else 1)
+            self._overflowed = False
+            lines = lines[1:]
+        self._check_overflow()
+
+        limit = self.max_line_length
+        if any(len(line) > limit for line in lines):
+            kept = []
+            for line in lines:
+                if len(line) > limit:
+                    self._discard(len(line) + 1, lines=1)
+                else:
+                    kept.append(line)
+            lines = kept
+
+        self.lines += len(lines)
+        return lines
+
+    def read_from(self, port) -> List[bytes]:
+        """Read everything already waiting on ``port`` with one ``read(n)`` and return complete lines.
+
+        Only ``in_waiting`` bytes are requested so the call never blocks on the
+        port's read timeout.
+        """
+        waiting = port.in_waiting
+        if waiting <= 0:
+            return []
+        return self.feed(port.read(min(waiting, self.max_read)))
+
+    def finish(self) -> List[bytes]:
+        """End of stream: return the held partial line (an unterminated last row), if any."""
+        if not self._buffer:
+            return []
+        line = bytes(self._buffer)
+        self._buffer.clear()
+        if self._resync:
+            self._discard(len(line), lines=0 if self._overflowed else 1)
+            self._resync = self._overflowed = False
+            return []
+        self.lines += 1
+        return [line]
+
+    def resync(self):
+        """Drop the held partial line and skip the next (truncated) fragment.
+
+        Call right after ``serial_port.reset_input_buffer()``.
+        """
+        if self._buffer:
+            self._discard(len(self._buffer), lines=1)
+            self._buffer.clear()
+        self._resync = True
+
+    def reset(self):
+        """Forget buffered bytes and counters (e.g. on reconnect)."""
+        self._buffer.clear()
+        self._resync = False
+        self._overflowed = False
+        self.reads = self.bytes_read = self.lines = 0
+        self.discarded_bytes = self.discarded_lines = 0
+
+    def stats(self) -> dict:
+        return {
+            'reads': self.reads,
+            'bytes_read': self.bytes_read,
+            'lines': self.lines,
+            'pending_bytes': self.pending,
+            'discarded_bytes': self.discarded_bytes,
+            'discarded_lines': self.discarded_lines,
+        }
+
+    def _check_overflow(self):
+        # An unterminated run longer than any valid row: drop it and everything up to the next newline.
+        buf = self._buffer
+        if len(buf) <= self.max_line_length:
+            return
+        self._discard(len(buf), lines=0 if self._overflowed else 1)
+        buf.clear()
+        self._resync = True
+        self._overflowed = True
+
+    def _discard(self, nbytes: int, lines: int = 0):
+        self.discarded_bytes += nbytes
+        self.discarded_lines += lines
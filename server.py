@@ -11,15 +11,6 @@ from pathlib import Path
 from typing import Optional
 from collections import defaultdict
 from datetime import datetime
-import time
-import sys
-
-try:
-    import matplotlib
-    matplotlib.use("Agg")
-    import matplotlib.pyplot as plt  # type: ignore
-except Exception:
-    plt = None  # type: ignore
 
 import numpy as np
 
@@ -28,6 +19,23 @@ from integration.signglove_unified_collector import (
 )
 
 
+_plt = None
+
+
+def _pyplot():
+    """matplotlib.pyplot on the Agg backend, imported on the first PNG save (None if unavailable)."""
+    global _plt
+    if _plt is None:
+        try:
+            import matplotlib
+            matplotlib.use("Agg")
+            import matplotlib.pyplot as plt  # type: ignore
+        except Exception:
+            return None
+        _plt = plt
+    return _plt
+
+
 class Collector(BaseCollector):
     def reset_all_progress(self) -> None:
         print("\n" + "=" * 60)
@@ -96,6 +104,7 @@ class Collector(BaseCollector):
             print(f"❌ 초기화 오류 발생: {e}")
 
     def save_progress_png(self, out_dir: Optional[Path] = None, session_view: bool = True) -> Optional[Path]:
+        plt = _pyplot()
         if plt is None:
             return None
         try:
@@ -180,25 +189,25 @@ class Collector(BaseCollector):
             return None
 
     def save_current_episode_png(self, out_dir: Optional[Path] = None, window_seconds: Optional[int] = 10) -> Optional[Path]:
+        plt = _pyplot()
         if plt is None:
             return None
         if not getattr(self, 'episode_data', None):
             return None
         try:
-            times_ms = [r.recv_timestamp_ms for r in self.episode_data]
-            t_last = max(times_ms)
-            t_min = t_last - int(window_seconds * 1000) if window_seconds is not None else min(times_ms)
-            sel = [i for i, t in enumerate(times_ms) if t >= t_min]
-            if not sel:
-                sel = list(range(len(self.episode_data)))
-
-            ts = np.array([self.episode_data[i].recv_timestamp_ms for i in sel], dtype=np.int64)
+            episode = self.episode_data
+            times_ms = episode.timestamps
+            t_last = times_ms.max()
+            t_min = t_last - int(window_seconds * 1000) if window_seconds is not None else times_ms.min()
+            sel = times_ms >= t_min
+            if not sel.any():
+                sel = slice(None)
+
+            ts = times_ms[sel]
             t0 = ts[0]
             tt = (ts - t0) / 1000.0
-            pitch = np.array([self.episode_data[i].pitch for i in sel], dtype=np.float32)
-            roll  = np.array([self.episode_data[i].roll  for i in sel], dtype=np.float32)
-            yaw   = np.array([self.episode_data[i].yaw   for i in sel], dtype=np.float32)
-            flex = np.array([[self.episode_data[i].flex1, self.episode_data[i].flex2, self.episode_data[i].flex3, self.episode_data[i].flex4, self.episode_data[i].flex5] for i in sel], dtype=np.float32)
+            pitch, roll, yaw = episode.orientation[sel].T
+            flex = episode.flex[sel]
 
             if out_dir is None:
                 out_dir = Path('viz') / 'snapshots'
@@ -0,0 +1,299 @@
+"""
+Streaming loader for the collected SignGlove dataset.
+
+``SignGloveDataset`` enumerates episodes without reading them, either from
+the ``datasets/unified/<class>/<type>/episode_*.h5`` tree (plus the rows of
+any consolidated session stores under ``store/``) or from the SQLite
+manifest, and then streams batches of
+``(sensor_data[N, 8], label_idx, episode_type)`` from the existing H5
+layout:
+
+- files are opened lazily and kept in a bounded LRU of open handles, so a
+  session store serving hundreds of episodes is opened once;
+- episode order can be reshuffled every epoch (seeded);
+- a background thread keeps up to ``prefetch`` batches ready while the
+  consumer (e.g. a training step) works on the current one.
+
+Only the batches in flight are held in memory.
+
+Example::
+
+    dataset = SignGloveDataset("datasets/unified", batch_size=32, shuffle=True, seed=0)
+    for sensor_data, label_idx, episode_type in dataset:
+        ...  # sensor_data: list of (N_i, 8) float32 arrays, label_idx: (B,) int64
+
+Run ``python signglove_dataset.py --root datasets/unified`` for a quick
+throughput check.
+"""
+
+from __future__ import annotations
+
+import argparse
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import h5py
+import numpy as np
+
+from episode_manifest import EpisodeManifest
+from episode_store import store_files
+from ksl_classes import KSL_CLASSES
+
+Batch = Tuple[List[np.ndarray], np.ndarray, List[str]]
+
+
+@dataclass(frozen=True)
+class EpisodeRef:
+    """Where one episode's samples live."""
+    path: Path
+    class_name: str
+    episode_type: str
+    label_idx: int
+    offset: Optional[int] = None    # row range in a session store (None: whole per-episode file)
+    length: Optional[int] = None
+
+
+class _HandleCache:
+    """Bounded LRU of open read-only h5py files."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = max(1, maxsize)
+        self._files: "OrderedDict[Path, h5py.File]" = OrderedDict()
+        self.opens = 0
+
+    def get(self, path: Path) -> h5py.File:
+        f = self._files.get(path)
+        if f is not None:
+            self._files.move_to_end(path)
+            return f
+        if len(self._files) >= self.maxsize:
+            _, oldest = self._files.popitem(last=False)
+            oldest.close()
+        f = h5py.File(path, 'r')
+        self.opens += 1
+        self._files[path] = f
+        return f
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+
+class SignGloveDataset:
+    """Iterable over batches of ``(sensor_data list, label_idx array, episode_type list)``."""
+
+    def __init__(
+        self,
+        root: Path = Path("datasets/unified"),
+        batch_size: int = 32,
+        shuffle: bool = False,
+        seed: Optional[int] = None,
+        prefetch: int = 2,
+        max_open_files: int = 16,
+        classes: Sequence[str] = KSL_CLASSES,
+        episode_types: Optional[Sequence[str]] = None,
+        manifest: Optional[Path] = None,
+        drop_last: bool = False,
+    ):
+        """
+        Args:
+            root: dataset directory (``datasets/unified``).
+            batch_size: episodes per batch.
+            shuffle: reshuffle the episode order every epoch.
+            seed: seed for the shuffle (epoch ``k`` uses ``seed + k``).
+            prefetch: batches prepared ahead by a background thread (0 = read inline).
+            max_open_files: size of the LRU of open H5 handles.
+            classes: label order; ``label_idx`` is the index into this list.
+            episode_types: only use these episode types (default: all).
+            manifest: enumerate from this SQLite manifest instead of scanning ``root``.
+            drop_last: skip a final batch smaller than ``batch_size``.
+        """
+        self.root = Path(root)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.seed = seed
+        self.prefetch = prefetch
+        self.max_open_files = max_open_files
+        self.classes = list(classes)
+        self.drop_last = drop_last
+        self._label = {name: i for i, name in enumerate(self.classes)}
+        self._epoch = 0
+
+        if manifest is not None:
+            episodes = self._from_manifest(Path(manifest))
+        else:
+            episodes = self._from_tree()
+        if episode_types is not None:
+            wanted = {str(t) for t in episode_types}
+            episodes = [e for e in episodes if e.episode_type in wanted]
+        self.episodes: List[EpisodeRef] = episodes
+
+    # ---- enumeration ----
+    def _ref(self, path: Path, class_name: str, episode_type: str,
+             offset: Optional[int] = None, length: Optional[int] = None) -> Optional[EpisodeRef]:
+        label_idx = self._label.get(class_name)
+        if label_idx is None:
+            return None
+        return EpisodeRef(path, class_name, episode_type, label_idx, offset, length)
+
+    def _store_refs(self, path: Path) -> List[EpisodeRef]:
+        with h5py.File(path, 'r') as f:
+            index = f['episodes'][:]
+        refs = []
+        for row in index:
+            ref = self._ref(path, row['class_name'].decode('utf-8'), row['episode_type'].decode('utf-8'),
+                            int(row['offset']), int(row['length']))
+            if ref is not None:
+                refs.append(ref)
+        return refs
+
+    def _from_tree(self) -> List[EpisodeRef]:
+        refs = []
+        for path in sorted(self.root.glob("*/*/*.h5")):
+            ref = self._ref(path, path.parent.parent.name, path.parent.name)
+            if ref is not None:
+                refs.append(ref)
+        for path in store_files(self.root / "store"):
+            refs.extend(self._store_refs(path))
+        return refs
+
+    def _from_manifest(self, manifest_path: Path) -> List[EpisodeRef]:
+        refs = []
+        store_index = {}
+        for record in EpisodeManifest(manifest_path, read_only=True).episodes():
+            path = self.root / record.path
+            if record.store_index is None:
+                if path.suffix == '.h5':
+                    ref = self._ref(path, record.class_name, record.episode_type)
+                    if ref is not None:
+                        refs.append(ref)
+                continue
+            # 저장소 행의 offset/length는 저장소 인덱스에서 한 번만 읽는다
+            if path not in store_index:
+                store_index[path] = {i: ref for i, ref in enumerate(self._store_refs(path))}
+            ref = store_index[path].get(record.store_index)
+            if ref is not None:
+                refs.append(ref)
+        return refs
+
+    # ---- iteration ----
+    @property
+    def num_episodes(self) -> int:
+        return len(self.episodes)
+
+    def __len__(self) -> int:
+        """Batches per epoch."""
+        full, rest = divmod(len(self.episodes), self.batch_size)
+        return full if (self.drop_last or rest == 0) else full + 1
+
+    def _epoch_order(self) -> np.ndarray:
+        order = np.arange(len(self.episodes))
+        if self.shuffle:
+            seed = None if self.seed is None else self.seed + self._epoch
+            np.random.default_rng(seed).shuffle(order)
+        self._epoch += 1
+        return order
+
+    @staticmethod
+    def _read(handles: _HandleCache, ref: EpisodeRef) -> np.ndarray:
+        dataset = handles.get(ref.path)['sensor_data']
+        if ref.offset is None:
+            return dataset[:]
+        return dataset[ref.offset:ref.offset + ref.length]
+
+    def _batches(self, order: np.ndarray, handles: _HandleCache) -> Iterator[Batch]:
+        for start in range(0, len(order), self.batch_size):
+            chunk = order[start:start + self.batch_size]
+            if self.drop_last and len(chunk) < self.batch_size:
+                return
+            refs = [self.episodes[i] for i in chunk]
+            yield (
+                [self._read(handles, ref) for ref in refs],
+                np.array([ref.label_idx for ref in refs], dtype=np.int64),
+                [ref.episode_type for ref in refs],
+            )
+
+    def __iter__(self) -> Iterator[Batch]:
+        order = self._epoch_order()
+        handles = _HandleCache(self.max_open_files)
+        if self.prefetch <= 0:
+            try:
+                yield from self._batches(order, handles)
+            finally:
+                handles.close()
+            return
+
+        ready: "queue.Queue" = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        done = object()
+
+        def produce():
+            try:
+                for batch in self._batches(order, handles):
+                    while not stop.is_set():
+                        try:
+                            ready.put(batch, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop.is_set():
+                        return
+                ready.put(done)
+            except BaseException as e:  # 소비자 쪽에서 다시 발생시킨다
+                ready.put(e)
+            finally:
+                handles.close()
+
+        worker = threading.Thread(target=produce, name="signglove-dataset-prefetch", daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = ready.get()
+                if item is done:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            while worker.is_alive():
+                try:
+                    ready.get_nowait()
+                except queue.Empty:
+                    worker.join(timeout=0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream the SignGlove dataset once and report throughput.")
+    parser.add_argument("--root", type=Path, default=Path("datasets/unified"))
+    parser.add_argument("--manifest", type=Path, default=None)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--prefetch", type=int, default=2)
+    parser.add_argument("--max-open-files", type=int, default=16)
+    parser.add_argument("--shuffle", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    dataset = SignGloveDataset(args.root, batch_size=args.batch_size, shuffle=args.shuffle, seed=args.seed,
+                               prefetch=args.prefetch, max_open_files=args.max_open_files, manifest=args.manifest)
+    t0 = time.perf_counter()
+    n_samples = 0
+    label_counts = np.zeros(len(dataset.classes), dtype=np.int64)
+    for sensor_data, label_idx, _ in dataset:
+        n_samples += sum(len(x) for x in sensor_data)
+        np.add.at(label_counts, label_idx, 1)
+    elapsed = time.perf_counter() - t0
+    print(f"episodes: {dataset.num_episodes}, batches: {len(dataset)}, samples: {n_samples}")
+    print(f"classes present: {int((label_counts > 0).sum())}/{len(dataset.classes)}")
+    print(f"elapsed: {elapsed:.2f}s  ({dataset.num_episodes / max(elapsed, 1e-9):.0f} episodes/s, "
+          f"{n_samples / max(elapsed, 1e-9):.0f} samples/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Preallocated sliding window of scaled samples for per-sample inference.
+
+``SignGloveInference.predict_sequence`` used to rebuild the whole window on
+every sample (``np.array(list(deque))``), rescale all ``window x 8`` values
+with ``scaler.transform`` and reshape it, although only one row changed.
+
+``SlidingWindow`` keeps a doubled ring buffer of ``2 * window`` rows: each
+sample is scaled once on arrival and written at ``pos`` and ``pos + window``,
+so ``buf[pos + 1 : pos + 1 + window]`` is always the last ``window`` samples,
+oldest first, as one contiguous block. The ``(1, window, features)`` views
+for every position are created up front, so a steady-state append + read
+allocates no arrays.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+# SensorData.to_array order
+SENSOR_FIELDS: Tuple[str, ...] = ('yaw', 'pitch', 'roll', 'flex1', 'flex2', 'flex3', 'flex4', 'flex5')
+
+# Column indices that turn recorded ``sensor_data`` rows (flex1-5, pitch, roll, yaw) into SENSOR_FIELDS order
+SENSOR_DATA_TO_MODEL: Tuple[int, ...] = (7, 5, 6, 0, 1, 2, 3, 4)
+
+
+def scaler_affine(scaler, n_features: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """``(mean, scale)`` such that ``scaler.transform(x) == (x - mean) / scale``, or None.
+
+    Works for a fitted sklearn ``StandardScaler`` (honouring ``with_mean`` /
+    ``with_std``); returns None for scalers that are not a per-feature affine
+    map, which are then applied through ``transform`` one row at a time.
+    """
+    if scaler is None or not (hasattr(scaler, 'mean_') or hasattr(scaler, 'scale_')):
+        return None
+    mean = getattr(scaler, 'mean_', None)
+    scale = getattr(scaler, 'scale_', None)
+    mean = np.zeros(n_features) if mean is None or not getattr(scaler, 'with_mean', True) else np.asarray(mean)
+    scale = np.ones(n_features) if scale is None or not getattr(scaler, 'with_std', True) else np.asarray(scale)
+    if mean.shape != (n_features,) or scale.shape != (n_features,):
+        return None
+    return mean.astype(np.float64), scale.astype(np.float64)
+
+
+class SlidingWindow:
+    """Last ``window_size`` samples, scaled once on arrival, as a contiguous model-ready view."""
+
+    def __init__(self, window_size: int, n_features: int = len(SENSOR_FIELDS), scaler=None,
+                 dtype=np.float32):
+        """
+        Args:
+            window_size: samples per model input.
+            n_features: values per sample.
+            scaler: fitted scaler applied on arrival (None: keep raw values).
+            dtype: dtype of the model input.
+        """
+        if window_size <= 0:
+            raise ValueError("window_size must be positive")
+        self.window_size = window_size
+        self.n_features = n_features
+        self._buf = np.zeros((2 * window_size, n_features), dtype=dtype)
+        self._row = np.zeros(n_features, dtype=np.float64)  # 도착한 샘플의 작업 공간
+        # _views[k]: 다음 기록 위치가 k일 때의 [1, window, features] 창 (가장 오래된 샘플이 먼저)
+        self._views = [self._buf[k:k + window_size][np.newaxis] for k in range(window_size)]
+        self._pos = 0
+        self._count = 0
+        self.set_scaler(scaler)
+
+    def set_scaler(self, scaler):
+        """Use ``scaler`` for samples appended from now on."""
+        self._scaler = scaler
+        affine = scaler_affine(scaler, self.n_features)
+        self._mean, self._scale = affine if affine is not None else (None, None)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def full(self) -> bool:
+        return self._count == self.window_size
+
+    def append(self, sensor_data):
+        """Append one ``SensorData`` (fields read in ``SENSOR_FIELDS`` order)."""
+        row = self._row
+        row[0] = sensor_data.yaw
+        row[1] = sensor_data.pitch
+        row[2] = sensor_data.roll
+        row[3] = sensor_data.flex1
+        row[4] = sensor_data.flex2
+        row[5] = sensor_data.flex3
+        row[6] = sensor_data.flex4
+        row[7] = sensor_data.flex5
+        self._push()
+
+    def append_array(self, values: np.ndarray):
+        """Append one raw sample given as ``n_features`` values."""
+        self._row[:] = values
+        self._push()
+
+    def _push(self):
+        row = self._row
+        if self._mean is not None:
+            np.subtract(row, self._mean, out=row)
+            np.divide(row, self._scale, out=row)
+        elif self._scaler is not None:
+            row[:] = self._scaler.transform(row.reshape(1, -1))[0]
+        pos = self._pos
+        self._buf[pos] = row
+        self._buf[pos + self.window_size] = row
+        pos += 1
+        self._pos = 0 if pos == self.window_size else pos
+        if self._count < self.window_size:
+            self._count += 1
+
+    def window(self) -> np.ndarray:
+        """``(1, window_size, n_features)`` view, oldest sample first; valid until the next append."""
+        if self._count < self.window_size:
+            raise ValueError(f"window not full ({self._count}/{self.window_size})")
+        return self._views[self._pos]
+
+    def latest(self) -> np.ndarray:
+        """The most recent scaled sample (view)."""
+        return self._buf[self._pos - 1 + (self.window_size if self._pos == 0 else 0)]
+
+    def clear(self):
+        self._pos = 0
+        self._count = 0
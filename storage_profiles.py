@@ -0,0 +1,79 @@
+"""
+HDF5 compression/chunking profiles for episode files and session stores.
+
+Every dataset used to be written with ``compression='gzip'`` (level 4). For
+a per-episode file that is six tiny datasets, where filter setup and chunk
+overhead cost more than they save; the consolidated store appends into
+large chunks where compression pays off. A ``StorageProfile`` bundles the
+filter choice and the chunk length used for appended (resizable) datasets,
+and is recorded in the file attrs so readers can tell how a file was written.
+
+Compare profiles on your machine with ``scripts/bench_storage_profiles.py``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class StorageProfile:
+    name: str
+    compression: Optional[str] = None       # None | 'lzf' | 'gzip'
+    compression_opts: Optional[int] = None  # gzip level 0-9
+    shuffle: bool = False                   # byte-shuffle filter before compression
+    chunk_rows: int = 1024                  # rows per chunk for appended datasets
+
+    def dataset_kwargs(self, chunks: Optional[Tuple[int, ...]] = None) -> Dict[str, Any]:
+        """Keyword arguments for ``create_dataset``.
+
+        ``chunks=None`` leaves fixed-size datasets contiguous when no filter is
+        used (filters require chunking; h5py then picks the chunk shape).
+        """
+        kwargs: Dict[str, Any] = {}
+        if self.compression is not None:
+            kwargs['compression'] = self.compression
+            if self.compression_opts is not None:
+                kwargs['compression_opts'] = self.compression_opts
+        if self.shuffle:
+            kwargs['shuffle'] = True
+        if chunks is not None:
+            kwargs['chunks'] = chunks
+        return kwargs
+
+    def appended_chunks(self, sample_shape: Tuple[int, ...] = ()) -> Tuple[int, ...]:
+        """Chunk shape for a dataset that grows along axis 0."""
+        return (self.chunk_rows,) + tuple(sample_shape)
+
+    def attrs(self) -> Dict[str, Any]:
+        return {
+            'storage_profile': self.name,
+            'storage_compression': self.compression or 'none',
+            'storage_compression_opts': -1 if self.compression_opts is None else self.compression_opts,
+            'storage_shuffle': self.shuffle,
+            'storage_chunk_rows': self.chunk_rows,
+        }
+
+
+STORAGE_PROFILES: Dict[str, StorageProfile] = {
+    profile.name: profile
+    for profile in (
+        StorageProfile('none'),
+        StorageProfile('lzf', 'lzf'),
+        StorageProfile('gzip1', 'gzip', 1),
+        StorageProfile('gzip4', 'gzip', 4),   # h5py's compression='gzip' default (previous behaviour)
+        StorageProfile('gzip9', 'gzip', 9),
+        StorageProfile('shuffle-lzf', 'lzf', shuffle=True),
+        StorageProfile('shuffle-gzip4', 'gzip', 4, shuffle=True),
+    )
+}
+
+DEFAULT_STORAGE_PROFILE = 'gzip4'
+
+
+def get_profile(name: str) -> StorageProfile:
+    try:
+        return STORAGE_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"unknown storage profile {name!r} (choose from {', '.join(STORAGE_PROFILES)})") from None
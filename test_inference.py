@@ -1,10 +1,7 @@
 import numpy as np
-import tensorflow as tf
-from sklearn.preprocessing import StandardScaler
-import joblib
 import json
 import time
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Optional
 from dataclasses import dataclass
 from collections import deque
 import logging
@@ -84,12 +81,14 @@ class SignGloveInference:
         try:
             # 모델 로드
             logger.info(f"모델 로드 중: {self.model_path}")
+            import tensorflow as tf  # 무거운 의존성은 모델을 실제로 불러올 때만 로드
             self.model = tf.keras.models.load_model(self.model_path)
             logger.info("모델 로드 완료")
             
             # 스케일러 로드 (있는 경우)
             if self.scaler_path:
                 logger.info(f"스케일러 로드 중: {self.scaler_path}")
+                import joblib
                 self.scaler = joblib.load(self.scaler_path)
                 logger.info("스케일러 로드 완료")
             
@@ -0,0 +1,19 @@
+import pytest
+
+
+@pytest.fixture
+def collector(tmp_path, monkeypatch):
+    """A ser.py collector working in an empty temporary data directory, without hardware."""
+    ser = pytest.importorskip("ser")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ser, "MANIFEST_VERIFY", "off")
+    monkeypatch.setattr(ser, "BUFFER_DEBUG", False)
+    collector = ser.SignGloveUnifiedCollector()
+    yield collector
+    collector.stop_event.set()
+    if collector.serial_thread is not None:
+        collector.serial_thread.join(timeout=2)
+    if collector.udp_socket is not None:
+        collector.udp_socket.close()
+    collector.episode_writer.close()
+    collector.close_episode_store()
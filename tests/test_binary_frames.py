@@ -0,0 +1,50 @@
+import numpy as np
+
+from binary_frames import FRAME_SIZE, FrameDecoder, crc16, encode_frames, frame_crcs, frames_to_records
+from sensor_records import parse_csv_lines
+
+
+def _records(n: int, start_ms: int = 1000):
+    rows = [f"{start_ms + 30 * i},{i * 0.25:.2f},-1.50,{i:.2f},0.012,-0.034,0.981,{500 + i},501,502,503,504".encode()
+            for i in range(n)]
+    records, valid = parse_csv_lines(rows, recv_timestamp_ms=0)
+    assert valid.all()
+    return records
+
+
+def test_vectorized_crc_matches_bytewise_crc():
+    data = encode_frames(_records(8))
+    frames = np.frombuffer(data, dtype=np.uint8).reshape(8, FRAME_SIZE)
+    expected = [crc16(bytes(frame[2:FRAME_SIZE - 2])) for frame in frames]
+    decoded = FrameDecoder().feed(data)
+    assert frame_crcs(decoded).tolist() == expected
+
+
+def test_frames_round_trip_to_csv_values():
+    records = _records(20)
+    frames = FrameDecoder().feed(encode_frames(records))
+    decoded = frames_to_records(frames, recv_timestamp_ms=0)
+    np.testing.assert_array_equal(decoded, records)
+
+
+def test_decoder_handles_chunking_text_and_corruption():
+    data = bytearray(encode_frames(_records(10)))
+    data[5 * FRAME_SIZE + 10] ^= 0xFF  # corrupt frame 5
+    stream = b"# ack format,bin\n" + bytes(data[:3 * FRAME_SIZE]) + b"noise" + bytes(data[3 * FRAME_SIZE:])
+    decoder = FrameDecoder()
+    frames = [decoder.feed(stream[i:i + 7]) for i in range(0, len(stream), 7)]
+    seq = np.concatenate(frames)['seq'].tolist()
+    assert seq == [0, 1, 2, 3, 4, 6, 7, 8, 9]
+    assert decoder.crc_errors >= 1
+    assert decoder.lost_frames == 1
+    assert decoder.pending < FRAME_SIZE
+
+
+def test_resync_is_safe_between_feeds():
+    data = encode_frames(_records(4))
+    decoder = FrameDecoder()
+    decoder.feed(data[:FRAME_SIZE + 5])
+    decoder.resync()
+    assert decoder.pending == 0
+    assert decoder.feed(data[2 * FRAME_SIZE:])['seq'].tolist() == [2, 3]
+    assert decoder.lost_frames == 0
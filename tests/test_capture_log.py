@@ -0,0 +1,38 @@
+import csv
+import time
+
+import pytest
+
+from capture_log import BufferedLineWriter
+
+HEADER = 'timestamp(ms),pitch(°),roll(°),yaw(°),accel_x(g),accel_y(g),accel_z(g),flex1,flex2,flex3,flex4,flex5'
+ROWS = [b"1000,1.25,-2.50,30.75,0.012,-0.034,0.981,510,520,530,540,550",
+        b"1030,1.30,-2.40,30.80,0.010,-0.030,0.980,511,521,531,541,551"]
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "cp949"])
+def test_output_matches_csv_writer_in_text_mode(tmp_path, encoding):
+    expected = tmp_path / "expected.csv"
+    with open(expected, 'w', newline='', encoding=encoding) as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER.split(','))
+        for row in ROWS:
+            writer.writerow(row.decode().split(','))
+
+    actual = tmp_path / "actual.csv"
+    writer = BufferedLineWriter(actual, HEADER, flush_bytes=64, newline=b'\r\n', encoding=encoding)
+    writer.write_lines(ROWS[:1])
+    writer.write_line(ROWS[1])
+    writer.close()
+    assert actual.read_bytes() == expected.read_bytes()
+    assert writer.lines == 2
+
+
+def test_poll_flushes_by_age(tmp_path):
+    path = tmp_path / "log.csv"
+    writer = BufferedLineWriter(path, None, flush_bytes=1 << 20, flush_interval_s=10.0)
+    writer.write_line(b"1,2,3")
+    assert path.read_bytes() == b""
+    writer.poll(now=time.monotonic() + 10.0)
+    assert path.read_bytes() == b"1,2,3\n"
+    writer.close()
@@ -0,0 +1,145 @@
+import csv
+import os
+import sys
+from pathlib import Path
+
+import h5py
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import compact_dataset  # noqa: E402
+from episode_store import EpisodeStore  # noqa: E402
+from sensor_records import READING_FIELDS  # noqa: E402
+
+
+def _write_h5(path: Path, value: float, samples: int = 5):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with h5py.File(path, 'w') as f:
+        f.create_dataset('timestamps', data=np.arange(samples, dtype=np.int64) * 20 + 5000)
+        f.create_dataset('arduino_timestamps', data=np.arange(samples, dtype=np.int64) * 20)
+        f.create_dataset('sampling_rates', data=np.full(samples, 50.0, dtype=np.float32))
+        f.create_dataset('sensor_data', data=np.full((samples, 8), value, dtype=np.float32))
+        f.create_dataset('sensors/acceleration', data=np.full((samples, 3), 0.5, dtype=np.float32))
+        f.attrs['class_name'] = path.parent.parent.name
+        f.attrs['episode_type'] = path.parent.name
+        f.attrs['episode_duration'] = 1.5
+
+
+def _write_csv(path: Path, flex: int, samples: int = 4):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(READING_FIELDS)
+        for i in range(samples):
+            row = dict.fromkeys(READING_FIELDS, 0.0)
+            row.update(timestamp_ms=20 * i, recv_timestamp_ms=5000 + 20 * i, sampling_hz=50.0)
+            row.update({f'flex{k}': flex for k in range(1, 6)})
+            writer.writerow(row.values())
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    root = tmp_path / "unified"
+    _write_h5(root / "ㄱ" / "1" / "episode_20251001_120000_ㄱ_1.h5", 1.0)
+    _write_csv(root / "ㄱ" / "1" / "episode_20251001_120000_ㄱ_1.csv", 1)      # same-stem twin
+    _write_h5(root / "ㅡ" / "3" / "episode_20251001_184130_ㅡ_3.h5", 2.0)
+    _write_csv(root / "ㅡ" / "3" / "episode_20251001_184131_ㅡ_3.csv", 2)      # twin a second later
+    _write_csv(root / "ㄴ" / "2" / "episode_20251001_120500_ㄴ_2.csv", 3)      # CSV only
+    return root
+
+
+def _run(data_dir: Path, out: Path, *extra: str):
+    argv = ["compact_dataset.py", "--data-dir", str(data_dir), "--out", str(out),
+            "--workers", "1", "--repeat", "0", *extra]
+    old = sys.argv
+    sys.argv = argv
+    try:
+        compact_dataset.main()
+    finally:
+        sys.argv = old
+
+
+def _archived(out: Path):
+    with EpisodeStore(out, mode='r') as store:
+        return [p.decode('utf-8') for p in store.file['sources']['path']], len(store), store.num_samples
+
+
+def _sources(out: Path) -> np.ndarray:
+    with h5py.File(out, 'r') as f:
+        return f['sources'][:]
+
+
+def test_list_sources_pairs_twins_like_the_manifest_scan(data_dir):
+    assert compact_dataset.list_sources(data_dir) == [
+        "ㄱ/1/episode_20251001_120000_ㄱ_1.h5",
+        "ㄴ/2/episode_20251001_120500_ㄴ_2.csv",
+        "ㅡ/3/episode_20251001_184130_ㅡ_3.h5",
+    ]
+
+
+def test_compaction_resumes_with_only_new_sources(data_dir, tmp_path, capsys):
+    out = tmp_path / "archive.h5"
+    _run(data_dir, out)
+    assert "to compact: 3" in capsys.readouterr().out
+    paths, episodes, samples = _archived(out)
+    assert episodes == 3 and samples == 5 + 4 + 5
+    assert paths == compact_dataset.list_sources(data_dir)
+
+    _write_h5(data_dir / "ㄴ" / "2" / "episode_20251001_121000_ㄴ_2.h5", 4.0)
+    _run(data_dir, out)
+    log = capsys.readouterr().out
+    assert "already archived: 3  to compact: 1" in log and "verified 4 archived episodes: OK" in log
+    paths, episodes, _ = _archived(out)
+    assert episodes == 4 and paths[-1] == "ㄴ/2/episode_20251001_121000_ㄴ_2.h5"
+
+    with EpisodeStore(out, mode='r') as store:
+        csv_only = store.read_episode(1)
+        assert csv_only['sensor_data'][:, :5].tolist() == [[3.0] * 5] * 4
+        assert csv_only['arduino_timestamps'].tolist() == [0, 20, 40, 60]
+
+
+def test_half_written_batch_is_truncated_on_reopen(data_dir, tmp_path, capsys):
+    out = tmp_path / "archive.h5"
+    _run(data_dir, out)
+    # a crash after the columns/index of one more episode were written but before its sources row
+    with EpisodeStore(out) as store:
+        result = compact_dataset.read_source((str(data_dir), "ㄱ/1/episode_20251001_120000_ㄱ_1.h5"))
+        store.append_columns(result['columns'], "ㄱ", "1")
+        timestamps = store.file['timestamps']
+        timestamps.resize(timestamps.shape[0] + 7, axis=0)   # and stray unindexed samples
+    with EpisodeStore(out, mode='r') as store:
+        assert len(store) == 4 and store.file['sources'].shape[0] == 3
+
+    store, sources = compact_dataset.open_archive(out, "gzip4")
+    try:
+        assert len(store) == sources.shape[0] == 3
+        assert store.file['timestamps'].shape[0] == store.num_samples == 14
+    finally:
+        store.close()
+    assert compact_dataset.verify_archive(out) == 0
+
+
+def test_changed_source_stops_the_run(data_dir, tmp_path, capsys):
+    out = tmp_path / "archive.h5"
+    _run(data_dir, out)
+    csv_path = data_dir / "ㄴ" / "2" / "episode_20251001_120500_ㄴ_2.csv"
+
+    stat = csv_path.stat()   # touched but identical content: re-hashed and accepted
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    _run(data_dir, out)
+    assert "already archived: 3  to compact: 0" in capsys.readouterr().out
+
+    _write_csv(csv_path, 7)   # same size, different content
+    assert csv_path.stat().st_size == stat.st_size
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert compact_dataset.check_archived(data_dir, _sources(out)) == ["ㄴ/2/episode_20251001_120500_ㄴ_2.csv"]
+    with pytest.raises(SystemExit) as exit_info:
+        _run(data_dir, out)
+    assert exit_info.value.code == 1
+    assert "changed since they were archived" in capsys.readouterr().out
+
+    _run(data_dir, out, "--rebuild")
+    with EpisodeStore(out, mode='r') as store:
+        assert store.read_episode(1)['sensor_data'][0, 0] == 7.0
@@ -0,0 +1,56 @@
+from episode_manifest import EpisodeManifest, EpisodeRecord, count_drift, count_records, episode_files, scan_dataset
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"")
+
+
+def test_scan_counts_h5_and_csv_twins_once(tmp_path):
+    _touch(tmp_path / "ㄱ" / "1" / "episode_a_ㄱ_1.h5")
+    _touch(tmp_path / "ㄱ" / "1" / "episode_a_ㄱ_1.csv")
+    _touch(tmp_path / "ㄱ" / "1" / "episode_b_ㄱ_1.csv")
+    _touch(tmp_path / "ㄴ" / "3" / "episode_c_ㄴ_3.h5")
+    _touch(tmp_path / "unknown" / "1" / "episode_d.h5")
+    records = scan_dataset(tmp_path, ["ㄱ", "ㄴ"], ["1", "3"])
+    assert count_records(records) == {("ㄱ", "1"): 2, ("ㄴ", "3"): 1}
+    assert {r.path for r in records} >= {"ㄱ/1/episode_a_ㄱ_1.h5"}
+
+
+def test_twins_written_a_second_apart_count_once(tmp_path):
+    type_dir = tmp_path / "ㅡ" / "3"
+    _touch(type_dir / "episode_20251001_184130_ㅡ_3.h5")
+    _touch(type_dir / "episode_20251001_184131_ㅡ_3.csv")   # CSV stamped after the H5 finished
+    _touch(type_dir / "episode_20251001_184200_ㅡ_3.h5")
+    _touch(type_dir / "episode_20251001_184200_ㅡ_3.csv")
+    assert [p.name for p in episode_files(type_dir)] == [
+        "episode_20251001_184130_ㅡ_3.h5", "episode_20251001_184200_ㅡ_3.h5"]
+    assert count_records(scan_dataset(tmp_path, ["ㅡ"], ["3"])) == {("ㅡ", "3"): 2}
+
+    _touch(type_dir / "episode_20251001_184300_ㅡ_3.csv")   # CSV-only episode (no H5 at all)
+    assert [p.name for p in episode_files(type_dir)][-1] == "episode_20251001_184300_ㅡ_3.csv"
+    assert count_records(scan_dataset(tmp_path, ["ㅡ"], ["3"])) == {("ㅡ", "3"): 3}
+
+
+def test_manifest_counts_and_rebuild(tmp_path):
+    manifest = EpisodeManifest(tmp_path / "manifest.sqlite")
+    assert not manifest.is_initialized()
+    manifest.rebuild([])
+    assert manifest.is_initialized() and manifest.counts() == {}
+
+    manifest.add_episode(EpisodeRecord("ㄱ", "1", "ㄱ/1/a.h5", num_samples=80))
+    manifest.add_episodes([EpisodeRecord("ㄱ", "1", "ㄱ/1/b.h5"), EpisodeRecord("ㄴ", "2", "ㄴ/2/c.h5")])
+    assert manifest.counts() == {("ㄱ", "1"): 2, ("ㄴ", "2"): 1}
+    assert len(manifest) == 3 and manifest.last_id() == 3
+    assert [r.path for r in manifest.episodes()] == ["ㄱ/1/a.h5", "ㄱ/1/b.h5", "ㄴ/2/c.h5"]
+
+    reopened = EpisodeManifest(tmp_path / "manifest.sqlite")
+    assert reopened.counts() == manifest.counts()
+
+    manifest.rebuild([EpisodeRecord("ㄴ", "2", "ㄴ/2/c.h5")])
+    assert manifest.counts() == {("ㄴ", "2"): 1}
+
+
+def test_count_drift_reports_disagreeing_keys():
+    drift = count_drift({("ㄱ", "1"): 2, ("ㄴ", "2"): 1}, {("ㄱ", "1"): 2, ("ㄷ", "3"): 4})
+    assert drift == {("ㄴ", "2"): (1, 0), ("ㄷ", "3"): (0, 4)}
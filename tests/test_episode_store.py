@@ -0,0 +1,78 @@
+import h5py
+import numpy as np
+import pytest
+
+from episode_store import COLUMNS, EpisodeStore, count_store_episodes, session_store_path
+from sensor_records import EpisodeBuffer, SignGloveSensorReading
+
+
+def _episode(start: int, samples: int = 4) -> EpisodeBuffer:
+    data = EpisodeBuffer(samples)
+    for i in range(samples):
+        t = start + 30 * i
+        data.append(SignGloveSensorReading(t, t + 5, 1.0 + i, 2.0, 3.0, 500 + i, 510, 520, 530, 540,
+                                           33.0, 0.1, 0.2, 0.9))
+    return data
+
+
+def test_append_and_read_back(tmp_path):
+    path = session_store_path(tmp_path / "store")
+    episodes = [_episode(0), _episode(1000, 6), _episode(2000, 2)]
+    with EpisodeStore(path) as store:
+        for k, data in enumerate(episodes):
+            assert store.append(data, "ㄱ" if k < 2 else "1", "2", label_idx=k, duration=1.5) == k
+        store.flush()
+
+    with EpisodeStore(path, mode='r') as store:
+        assert len(store) == 3 and store.num_samples == 12
+        index = store.index()
+        assert index['offset'].tolist() == [0, 4, 10]
+        assert index['length'].tolist() == [4, 6, 2]
+        assert index['start_ms'].tolist() == [5, 1005, 2005]
+        assert store.counts() == {("ㄱ", "2"): 2, ("1", "2"): 1}
+        second = store.read_episode(1)
+        np.testing.assert_array_equal(second['timestamps'], episodes[1].timestamps)
+        np.testing.assert_array_equal(second['sensor_data'], episodes[1].sensor_data.astype(np.float32))
+        bulk = [columns['arduino_timestamps'].tolist() for _, columns in store.iter_episodes()]
+        assert bulk == [data.arduino_timestamps.tolist() for data in episodes]
+    assert count_store_episodes(tmp_path / "store") == {("ㄱ", "2"): 2, ("1", "2"): 1}
+
+
+def test_reopen_for_append_truncates_an_interrupted_append(tmp_path):
+    path = tmp_path / "session_test.h5"
+    with EpisodeStore(path) as store:
+        store.append(_episode(0), "ㄱ", "1")
+    with h5py.File(path, 'a') as f:   # columns extended, index row never written
+        for name in COLUMNS:
+            f[name].resize(f[name].shape[0] + 3, axis=0)
+
+    with EpisodeStore(path, mode='r') as store:
+        assert store.file['timestamps'].shape[0] == 7   # read-only open leaves the file alone
+        assert store.num_samples == 4
+    with EpisodeStore(path) as store:
+        assert all(store.file[name].shape[0] == 4 for name in COLUMNS)
+        assert store.append(_episode(500), "ㄱ", "1") == 1
+        assert store.index()['offset'].tolist() == [0, 4]
+        assert store.read_episode(1)['timestamps'].tolist() == _episode(500).timestamps.tolist()
+
+
+def test_truncate_drops_episodes_and_their_samples(tmp_path):
+    with EpisodeStore(tmp_path / "session_test.h5") as store:
+        for k in range(3):
+            store.append(_episode(1000 * k), "ㄴ", "3")
+        store.truncate(1)
+        assert len(store) == 1 and store.num_samples == 4
+        assert all(store.file[name].shape[0] == 4 for name in COLUMNS)
+        store.truncate(5)   # beyond the end: no-op
+        assert len(store) == 1
+
+
+def test_read_only_open_cannot_write(tmp_path):
+    path = tmp_path / "session_test.h5"
+    with EpisodeStore(path) as store:
+        store.append(_episode(0), "ㄱ", "1")
+    with EpisodeStore(path, mode='r') as store:
+        with pytest.raises((OSError, ValueError, RuntimeError)):
+            store.append(_episode(100), "ㄱ", "1")
+    with EpisodeStore(path, mode='r') as store:
+        assert len(store) == 1
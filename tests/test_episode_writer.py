@@ -0,0 +1,137 @@
+import threading
+import time
+
+import pytest
+
+import episode_writer
+from episode_writer import EpisodeJob, EpisodeWriter
+from sensor_records import EpisodeBuffer, SignGloveSensorReading
+
+
+def _job(name: str = "ㄱ", samples: int = 3) -> EpisodeJob:
+    data = EpisodeBuffer(samples)
+    for i in range(samples):
+        data.append(SignGloveSensorReading(30 * i, 30 * i, 1.0, 2.0, 3.0, 500, 510, 520, 530, 540, 33.3))
+    return EpisodeJob(data=data, class_name=name, episode_type="1", duration=1.0, timestamp="20251001_120000")
+
+
+class _GatedPersist:
+    """persist() that blocks until released, recording which jobs reached it."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Semaphore(0)
+        self.persisted = []
+
+    def __call__(self, job):
+        self.started.release()
+        assert self.release.wait(5)
+        self.persisted.append(job.class_name)
+        return job.class_name
+
+
+def test_on_durable_runs_only_after_persist_returns():
+    persist = _GatedPersist()
+    durable = []
+    writer = EpisodeWriter(persist, on_durable=lambda job: durable.append(job.result))
+    try:
+        writer.submit(_job())
+        assert persist.started.acquire(timeout=2)
+        time.sleep(0.05)
+        assert durable == [] and writer.pending == 1
+        persist.release.set()
+        writer.flush()
+        assert durable == ["ㄱ"] and writer.pending == 0
+    finally:
+        persist.release.set()
+        writer.close()
+
+
+def test_full_queue_blocks_submit_instead_of_dropping():
+    persist = _GatedPersist()
+    writer = EpisodeWriter(persist, max_pending=1)
+    try:
+        writer.submit(_job("a"))
+        assert persist.started.acquire(timeout=2)   # "a" is being written, the queue is empty again
+        writer.submit(_job("b"))                    # fills the queue
+        third = threading.Thread(target=writer.submit, args=(_job("c"),))
+        third.start()
+        third.join(timeout=0.2)
+        assert third.is_alive()                     # waits for room rather than dropping "c"
+
+        persist.release.set()
+        third.join(timeout=2)
+        writer.flush()
+        assert persist.persisted == ["a", "b", "c"]
+        stats = writer.stats()
+        assert stats["completed"] == 3 and stats["failed"] == 0
+        assert stats["blocked_submits"] == 1 and stats["blocked_seconds"] > 0.1
+    finally:
+        persist.release.set()
+        writer.close()
+
+
+def test_close_writes_pending_jobs_and_is_registered_with_atexit(monkeypatch):
+    registered = []
+    monkeypatch.setattr(episode_writer.atexit, "register", registered.append)
+    persist = _GatedPersist()
+    writer = EpisodeWriter(persist, max_pending=4)
+    for name in "abc":
+        writer.submit(_job(name))
+    assert registered == [writer.close]
+
+    threading.Timer(0.05, persist.release.set).start()
+    writer.close()
+    assert persist.persisted == ["a", "b", "c"]
+    writer.close()   # idempotent, as the atexit hook runs it again
+    with pytest.raises(RuntimeError):
+        writer.submit(_job())
+
+
+def test_failed_persist_does_not_count_as_durable():
+    errors, durable = [], []
+
+    def persist(job):
+        raise OSError("disk full")
+
+    writer = EpisodeWriter(persist, on_durable=durable.append, on_error=lambda job, e: errors.append(str(e)))
+    writer.submit(_job())
+    writer.close()
+    assert durable == [] and errors == ["disk full"]
+    assert writer.stats()["failed"] == 1
+
+
+def test_collector_counts_an_episode_only_after_fsync(collector, monkeypatch):
+    import ser
+
+    monkeypatch.setattr(ser, "EPISODE_STORAGE", "files")
+    release = threading.Event()
+    synced = []
+    real_fsync_file = ser.fsync_file
+
+    def slow_fsync_file(path):
+        assert release.wait(5)
+        real_fsync_file(path)
+        synced.append(path.suffix)
+
+    monkeypatch.setattr(ser, "fsync_file", slow_fsync_file)
+
+    progress_before = collector.progress_file.read_text(encoding="utf-8")
+    collector.collecting = True
+    collector.current_class, collector.current_episode_type = "ㄱ", "1"
+    collector.episode_start_time = time.time()
+    collector.episode_data = _job().data
+    assert collector.stop_episode()
+
+    time.sleep(0.1)   # the writer thread is now stuck in fsync
+    assert synced == []
+    assert collector.manifest.counts() == {}
+    assert collector.collection_stats["ㄱ"]["1"] == 0
+    assert collector.progress_file.read_text(encoding="utf-8") == progress_before
+
+    release.set()
+    collector.flush_episode_writer()
+    assert synced == [".h5"]
+    assert collector.manifest.counts() == {("ㄱ", "1"): 1}
+    assert collector.collection_stats["ㄱ"]["1"] == 1
+    assert collector.progress_file.read_text(encoding="utf-8") != progress_before
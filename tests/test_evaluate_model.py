@@ -0,0 +1,77 @@
+import h5py
+import numpy as np
+import pytest
+
+from evaluate_model import episode_windows, format_confusion, score
+from signglove_dataset import SignGloveDataset
+from sliding_window import SENSOR_DATA_TO_MODEL
+
+CLASSES = ["a", "b", "c", "d"]
+WINDOW = 3
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    # every row is filled with the class the fake model will predict for a window ending on it
+    episodes = [
+        ("a", "1", [0, 0, 0, 1, 0]),   # windows predict a, b, a -> episode a (right)
+        ("b", "1", [1, 1, 2, 2]),      # windows predict c, c    -> episode c (wrong)
+        ("c", "1", [2, 2]),            # shorter than the window: skipped
+        ("c", "2", [2, 2, 2]),         # one window predicts c   -> episode c (right)
+    ]
+    for k, (class_name, episode_type, rows) in enumerate(episodes):
+        path = tmp_path / class_name / episode_type / f"episode_20251001_12000{k}_{class_name}_{episode_type}.h5"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with h5py.File(path, 'w') as f:
+            f.create_dataset('sensor_data', data=np.repeat(np.array(rows, dtype=np.float32)[:, None], 8, axis=1))
+    return SignGloveDataset(tmp_path, batch_size=2, prefetch=0, classes=CLASSES)
+
+
+def _predict(batch):
+    """0.7 on the class stored in each window's last row, 0.1 on the rest."""
+    probs = np.full((len(batch), len(CLASSES)), 0.1, dtype=np.float32)
+    probs[np.arange(len(batch)), batch[:, -1, 0].astype(int)] = 0.7
+    return probs
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 1024])
+def test_confusion_and_episode_accuracy(dataset, batch_size):
+    report = score(_predict, dataset, WINDOW, batch_size=batch_size)
+    np.testing.assert_array_equal(report.confusion, [[2, 1, 0, 0],
+                                                     [0, 0, 2, 0],
+                                                     [0, 0, 1, 0],
+                                                     [0, 0, 0, 0]])
+    assert report.windows == 6 and report.accuracy == pytest.approx(3 / 6)
+    assert (report.episodes, report.episode_correct, report.skipped_episodes) == (3, 2, 1)
+    assert report.episode_accuracy == pytest.approx(2 / 3)
+    assert report.per_class() == {'a': {'windows': 3, 'accuracy': pytest.approx(2 / 3)},
+                                  'b': {'windows': 2, 'accuracy': 0.0},
+                                  'c': {'windows': 1, 'accuracy': 1.0}}
+    summary = report.to_dict()
+    assert summary['confusion'] == report.confusion.tolist() and summary['episode_accuracy'] == report.episode_accuracy
+
+
+def test_stride_and_max_windows(dataset):
+    strided = score(_predict, dataset, WINDOW, stride=2)
+    np.testing.assert_array_equal(strided.confusion[:3, :3], [[2, 0, 0], [0, 0, 1], [0, 0, 1]])
+    assert strided.episode_correct == 2
+
+    limited = score(_predict, dataset, WINDOW, batch_size=2, max_windows=4)
+    assert limited.windows == 4 and limited.episodes == 2
+    np.testing.assert_array_equal(limited.confusion[:2, :3], [[2, 1, 0], [0, 0, 1]])
+
+
+def test_episode_windows_match_slicing():
+    sensor = np.arange(7 * 8, dtype=np.float32).reshape(7, 8)
+    rows = sensor[:, SENSOR_DATA_TO_MODEL]
+    for stride in (1, 2, 3):
+        expected = np.stack([rows[i:i + WINDOW] for i in range(0, len(rows) - WINDOW + 1, stride)])
+        np.testing.assert_array_equal(episode_windows(sensor, WINDOW, stride), expected)
+    assert episode_windows(sensor[:2], WINDOW).shape == (0, WINDOW, 8)
+
+
+def test_format_confusion_hides_absent_classes():
+    confusion = np.array([[3, 1, 0, 0], [0, 0, 0, 0], [0, 0, 12, 0], [0, 0, 0, 0]])
+    lines = format_confusion(confusion, CLASSES).splitlines()
+    assert lines[0].split() == ["true\\pred", "a", "b", "c"]
+    assert [line.split() for line in lines[1:]] == [["a", "3", "1", "0"], ["b", "0", "0", "0"], ["c", "0", "0", "12"]]
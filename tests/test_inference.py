@@ -0,0 +1,57 @@
+import numpy as np
+
+import inference
+from inference import SensorData, SignGloveInference
+
+
+class _SequenceBackend:
+    """Stand-in for a compiled backend with a fixed (None, window, 8) signature."""
+
+    name = 'fake'
+
+    def __init__(self, window: int, n_classes: int = 3):
+        self.input_shape = (None, window, 8)
+        self.output_shape = (None, n_classes)
+        self.calls = 0
+
+    def __call__(self, batch):
+        if batch.ndim != 3 or batch.shape[1:] != self.input_shape[1:]:
+            raise ValueError(f"bad input shape {batch.shape}")
+        self.calls += 1
+        probs = np.zeros((len(batch), self.output_shape[1]), dtype=np.float32)
+        probs[:, 1] = 0.9
+        probs[:, 0] = 0.1
+        return probs
+
+
+def _model(monkeypatch, window=4):
+    backend = _SequenceBackend(window)
+    monkeypatch.setattr(inference, 'load_backend', lambda *args, **kwargs: backend)
+    return SignGloveInference('model.tflite', window_size=window), backend
+
+
+def _sample(i: int) -> SensorData:
+    return SensorData(0.0, 1.0, 2.0, 500 + i, 500, 500, 500, 500, timestamp=float(i))
+
+
+def test_sequence_model_warms_up_without_calling_the_model(monkeypatch):
+    model, backend = _model(monkeypatch, window=4)
+    assert model.sequence_model
+
+    results = [model.predict_with_filtering(_sample(i)) for i in range(3)]
+    assert [r['filtered_result'] for r in results] == ['warming_up'] * 3
+    assert [r['buffer_length'] for r in results] == [1, 2, 3]
+    assert all('error' not in r for r in results)
+    assert backend.calls == 0
+    assert len(model.prediction_history) == 0
+
+    result = model.predict_with_filtering(_sample(3))
+    assert backend.calls == 1
+    assert result['predicted_class_idx'] == 1
+    assert result['filtered_result'] == 'insufficient_history'
+
+
+def test_predict_single_does_not_feed_one_sample_to_a_sequence_model(monkeypatch):
+    model, backend = _model(monkeypatch)
+    assert model.predict_single(_sample(0))['filtered_result'] == 'warming_up'
+    assert backend.calls == 0
@@ -0,0 +1,110 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from inference_schedule import InferenceSchedule, InferenceScheduler, filter_prediction
+
+
+def _fires(scheduler, samples, times=None):
+    times = times if times is not None else [0.03 * k for k in range(len(samples))]
+    return [scheduler.observe(np.asarray(s, dtype=float), t) for s, t in zip(samples, times)]
+
+
+def test_hop_runs_on_the_first_full_window_then_every_k_samples():
+    scheduler = InferenceScheduler(InferenceSchedule('hop', hop_size=3))
+    fired = _fires(scheduler, [[0.0]] * 10)
+    assert [k for k, run in enumerate(fired) if run] == [0, 3, 6, 9]
+    assert scheduler.runs == 4 and scheduler.run_ratio == pytest.approx(0.4)
+
+    assert _fires(InferenceScheduler(), [[0.0]] * 5) == [True] * 5   # default: every sample, as before
+
+
+def test_time_runs_once_the_interval_has_passed():
+    scheduler = InferenceScheduler(InferenceSchedule('time', interval_s=0.25))
+    times = [0.0, 0.125, 0.2, 0.25, 0.375, 0.625, 0.75, 0.875]
+    fired = _fires(scheduler, [[0.0]] * len(times), times)
+    assert [t for t, run in zip(times, fired) if run] == [0.0, 0.25, 0.625, 0.875]
+
+
+def test_adaptive_runs_on_movement_and_at_least_every_max_hop():
+    scheduler = InferenceScheduler(InferenceSchedule('adaptive', delta_threshold=0.5, max_hop=5))
+    samples = [
+        [0.0, 0.0],   # 0: first full window always runs
+        [0.2, 0.0],
+        [0.4, 0.1],
+        [0.6, 0.0],   # 3: moved 0.6 > 0.5 from the last run
+        [0.6, 0.0],
+        [0.6, 0.0],
+        [0.6, 0.0],
+        [0.6, 0.0],
+        [0.6, 0.0],   # 8: held still, forced by max_hop
+        [0.6, 0.3],
+        [0.6, -0.3],  # 10: 0.3 from the last run's value, although 0.6 from the previous sample
+    ]
+    fired = _fires(scheduler, samples)
+    assert [k for k, run in enumerate(fired) if run] == [0, 3, 8]
+
+    scheduler.reset()
+    assert _fires(scheduler, [[0.0, 0.0], [0.0, -0.7], [0.0, 0.0]]) == [True, True, True]
+
+
+def test_adaptive_delta_scale_measures_raw_samples_in_scaler_units():
+    schedule = InferenceSchedule('adaptive', delta_threshold=0.5, max_hop=0)
+    raw = [[500.0, 10.0], [540.0, 10.0], [560.0, 10.0], [560.0, 12.0]]
+    assert _fires(InferenceScheduler(schedule), raw) == [True, True, True, True]   # raw units: every sample
+    scaled = InferenceScheduler(schedule, delta_scale=np.array([100.0, 2.0]))
+    # 0.4 and 0.6 std from the first run, then 1 std on the second channel
+    assert _fires(scaled, raw) == [True, False, True, True]
+
+
+def test_reset_forgets_the_last_run():
+    scheduler = InferenceScheduler(InferenceSchedule('hop', hop_size=10))
+    assert _fires(scheduler, [[0.0]] * 3) == [True, False, False]
+    scheduler.reset()
+    assert scheduler.samples == scheduler.runs == 0
+    assert _fires(scheduler, [[0.0]]) == [True]
+
+
+def test_schedule_validation():
+    with pytest.raises(ValueError, match="unknown schedule mode"):
+        InferenceSchedule('sometimes')
+    with pytest.raises(ValueError):
+        InferenceSchedule('hop', hop_size=0)
+
+
+def test_filter_prediction_confidence_and_stability():
+    history = deque(maxlen=5)
+
+    def step(cls, confidence):
+        return filter_prediction({'predicted_class': cls, 'confidence': confidence}, history, 0.7, 3)
+
+    assert step('ㄱ', 0.5)['filtered_result'] == 'low_confidence' and len(history) == 0
+    assert step('ㄱ', 0.8)['filtered_result'] == 'insufficient_history'
+    assert step('ㄱ', 0.9)['filtered_result'] == 'insufficient_history'
+    stable = step('ㄱ', 1.0)
+    assert stable['filtered_result'] == 'stable' and stable['stable_class'] == 'ㄱ'
+    assert stable['stable_confidence'] == pytest.approx(0.9)
+    assert step('ㄴ', 0.9)['filtered_result'] == 'unstable'
+
+
+def test_sign_glove_inference_calls_the_model_only_on_scheduled_samples(monkeypatch):
+    import inference
+
+    calls = []
+
+    class Backend:
+        name, input_shape, output_shape = 'fake', (None, 4, 8), (None, 2)
+
+        def __call__(self, batch):
+            calls.append(batch.shape)
+            return np.array([[0.2, 0.8]], dtype=np.float32)
+
+    monkeypatch.setattr(inference, 'load_backend', lambda *args, **kwargs: Backend())
+    model = inference.SignGloveInference('model.tflite', window_size=4, schedule=InferenceSchedule('hop', hop_size=2))
+    results = [model.predict_sequence(inference.SensorData(0.0, 0.0, 0.0, 500, 500, 500, 500, 500, timestamp=k))
+               for k in range(9)]
+    assert [k for k, r in enumerate(results) if r is not None] == [3, 5, 7]
+    assert calls == [(1, 4, 8)] * 3
+    info = model.get_model_info()
+    assert info['inference_runs'] == 3 and info['inference_run_ratio'] == pytest.approx(3 / 6)
@@ -0,0 +1,178 @@
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from inference_server import BatchingEngine, EngineStopped, InferenceServer
+
+WINDOW, CLASSES = 3, 4
+
+
+class _Model:
+    """Batched predict_fn: one-hot on the class stored in each window's first value; records batch sizes."""
+
+    def __init__(self, fail_on=None, delay_s=0.0):
+        self.batches = []
+        self.fail_on = fail_on
+        self.delay_s = delay_s
+
+    def __call__(self, batch):
+        time.sleep(self.delay_s)
+        self.batches.append(len(batch))
+        classes = batch[:, 0, 0].astype(int)
+        if self.fail_on is not None and self.fail_on in classes:
+            raise RuntimeError(f"bad window {self.fail_on}")
+        probs = np.zeros((len(batch), CLASSES), dtype=np.float32)
+        probs[np.arange(len(batch)), classes % CLASSES] = 1.0
+        return probs
+
+
+def _window(cls):
+    return np.full((1, WINDOW, 8), cls, dtype=np.float32)
+
+
+def _run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+
+async def _engine(model, **kwargs):
+    engine = BatchingEngine(model, WINDOW, **kwargs)
+    await engine.start()
+    return engine
+
+
+def test_windows_within_the_deadline_share_one_batch():
+    async def main():
+        model = _Model()
+        engine = await _engine(model, deadline_s=0.05)
+        try:
+            async def later(cls, delay):
+                await asyncio.sleep(delay)
+                return await engine.predict(_window(cls))
+
+            first = await asyncio.gather(later(1, 0), later(2, 0.01), later(3, 0.02))
+            second = await later(0, 0.0)
+        finally:
+            await engine.stop()
+        return model, engine, first, second
+
+    model, engine, first, second = _run(main())
+    assert model.batches == [3, 1]
+    assert [int(np.argmax(p)) for p in first] == [1, 2, 3] and int(np.argmax(second)) == 0
+    assert engine.stats() == {'batches': 2, 'windows': 4, 'mean_batch': 2.0}
+
+
+def test_max_batch_splits_a_burst():
+    async def main():
+        model = _Model()
+        engine = await _engine(model, max_batch=4, deadline_s=0.05)
+        try:
+            probs = await asyncio.gather(*(engine.predict(_window(k)) for k in range(10)))
+        finally:
+            await engine.stop()
+        return model, probs
+
+    model, probs = _run(main())
+    assert model.batches == [4, 4, 2]
+    assert [int(np.argmax(p)) for p in probs] == [k % CLASSES for k in range(10)]
+
+
+def test_window_is_copied_before_the_caller_reuses_it():
+    async def main():
+        engine = await _engine(_Model(), deadline_s=0.02)
+        window = _window(2)
+        try:
+            pending = asyncio.ensure_future(engine.predict(window))
+            await asyncio.sleep(0)
+            window[:] = 3   # the next sample overwrites the caller's view
+            return await pending
+        finally:
+            await engine.stop()
+
+    assert int(np.argmax(_run(main()))) == 2
+
+
+def test_a_failing_batch_only_fails_its_own_requests():
+    async def main():
+        model = _Model(fail_on=3)
+        engine = await _engine(model, max_batch=2, deadline_s=0.05)
+        try:
+            results = await asyncio.gather(*(engine.predict(_window(k)) for k in (1, 3, 2, 0)),
+                                           return_exceptions=True)
+            after = await engine.predict(_window(1))
+        finally:
+            await engine.stop()
+        return results, after
+
+    results, after = _run(main())
+    assert [type(r) for r in results[:2]] == [RuntimeError, RuntimeError]
+    assert "bad window 3" in str(results[0])
+    assert [int(np.argmax(r)) for r in results[2:]] == [2, 0]
+    assert int(np.argmax(after)) == 1   # the engine keeps serving
+
+
+def test_stop_wakes_waiting_requests():
+    async def main():
+        engine = await _engine(_Model(delay_s=0.2), max_batch=1, deadline_s=0.0)
+        pending = [asyncio.ensure_future(engine.predict(_window(k))) for k in range(3)]
+        await asyncio.sleep(0.05)   # first batch is running in the worker thread
+        await engine.stop()
+        return await asyncio.gather(*pending, return_exceptions=True)
+
+    results = _run(main())
+    assert all(isinstance(r, EngineStopped) for r in results)
+
+
+def _sample_line(cls, t):
+    return f"{cls},0,0,0,0,0,0,0,{t}\n".encode()
+
+
+def test_duplicate_session_ids_get_distinct_sessions():
+    async def main():
+        engine = await _engine(_Model(), deadline_s=0.0)
+        server = InferenceServer(engine, WINDOW, class_names=["a", "b", "c", "d"], confidence_threshold=0.0)
+        listener = await server.serve_tcp("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            r1, w1 = await asyncio.open_connection("127.0.0.1", port)
+            r2, w2 = await asyncio.open_connection("127.0.0.1", port)
+            w1.write(b"SESSION glove\n" + b"".join(_sample_line(1, t) for t in range(WINDOW)))
+            first = json.loads(await r1.readline())
+            w2.write(b"SESSION glove\n" + b"".join(_sample_line(2, t) for t in range(WINDOW)))
+            second = json.loads(await r2.readline())
+            assert sorted(server.sessions) == ["glove", "glove#2"]
+
+            w1.close()   # the first glove leaves; the second keeps its session and window
+            await w1.wait_closed()
+            for _ in range(50):
+                if "glove" not in server.sessions:
+                    break
+                await asyncio.sleep(0.01)
+            sessions_after_close = sorted(server.sessions)
+
+            w2.write(_sample_line(2, WINDOW))
+            third = json.loads(await r2.readline())
+            w2.close()
+            await w2.wait_closed()
+        finally:
+            listener.close()
+            await listener.wait_closed()
+            await engine.stop()
+        return first, second, sessions_after_close, third
+
+    first, second, sessions_after_close, third = _run(main())
+    assert (first['session'], first['predicted_class']) == ("glove", "b")
+    assert (second['session'], second['predicted_class']) == ("glove#2", "c")
+    assert sessions_after_close == ["glove#2"]
+    assert third['session'] == "glove#2" and third['filtered_result'] == 'insufficient_history'
+
+
+def test_open_session_numbers_duplicate_ids():
+    server = InferenceServer(BatchingEngine(_Model(), WINDOW), WINDOW)
+    a = server.open_session("x")
+    b = server.open_session("x")
+    c = server.open_session("x")
+    assert [s.session_id for s in (a, b, c)] == ["x", "x#2", "x#3"]
+    del server.sessions["x"]
+    assert server.open_session("x").session_id == "x"   # free again once its connection is gone
@@ -0,0 +1,66 @@
+import json
+
+import numpy as np
+import pytest
+
+from line_decoders import AutoDecoder, CsvDecoder, JsonDecoder, make_line_decoder
+
+CSV_ROW = b"1000,1.25,-2.5,30.75,0.012,-0.034,0.981,510,520,530,540,550"
+
+
+def _json_row(t: float, **extra) -> bytes:
+    obj = {"timestamp": t, "yaw": 30.75, "pitch": 1.25, "roll": -2.5,
+           "flex1": 510, "flex2": 520, "flex3": 530, "flex4": 540, "flex5": 550, **extra}
+    return json.dumps(obj).encode()
+
+
+@pytest.mark.parametrize("backend", ["json", None])
+def test_json_decoder_matches_csv_values(backend):
+    json_records, valid = JsonDecoder(backend).decode(
+        [_json_row(1.0, accel_x=0.012, accel_y=-0.034, accel_z=0.981)], recv_timestamp_ms=0)
+    csv_records, _ = CsvDecoder().decode([CSV_ROW], recv_timestamp_ms=0)
+    assert valid.tolist() == [True]
+    np.testing.assert_array_equal(json_records, csv_records)
+
+
+def test_json_decoder_rejects_bad_lines():
+    lines = [_json_row(1.0), b"{broken", b"[1, 2]", b'{"timestamp": 1.03}', _json_row(1.06, flex3=None),
+             _json_row(1.09, flex1="x"), CSV_ROW, _json_row(1.12)]
+    records, valid = JsonDecoder("json").decode(lines, recv_timestamp_ms=0)
+    assert valid.tolist() == [True, False, False, False, False, False, False, True]
+    assert records["timestamp_ms"][valid].tolist() == [1000, 1120]
+    assert records["accel_x"][valid].tolist() == [0.0, 0.0]
+
+
+def test_json_decoder_rejects_flex_that_csv_rejects():
+    lines = [_json_row(1.0, flex2=520.5), _json_row(1.03, flex4=40000), _json_row(1.06, flex5=-32768)]
+    _, valid = JsonDecoder("json").decode(lines, recv_timestamp_ms=0)
+    assert valid.tolist() == [False, False, True]
+    csv_rows = [b"1000,1.25,-2.5,30.75,0.012,-0.034,0.981,510,520.5,530,540,550",
+                b"1030,1.25,-2.5,30.75,0.012,-0.034,0.981,510,520,530,40000,550",
+                b"1060,1.25,-2.5,30.75,0.012,-0.034,0.981,510,520,530,540,-32768"]
+    assert CsvDecoder().decode(csv_rows, recv_timestamp_ms=0)[1].tolist() == valid.tolist()
+
+
+def test_auto_decoder_detects_and_switches_format():
+    decoder = AutoDecoder()
+    _, valid = decoder.decode([b"# boot", _json_row(1.0)], recv_timestamp_ms=0)
+    assert decoder.decoder.name == "json" and valid.tolist() == [False, True]
+    _, valid = decoder.decode([CSV_ROW, CSV_ROW], recv_timestamp_ms=0)
+    assert decoder.decoder.name == "csv" and valid.all()
+
+
+def test_make_line_decoder_names():
+    assert make_line_decoder().name == "csv"
+    assert make_line_decoder("csv", layouts=(12, 9)).layouts == (12, 9)
+    assert make_line_decoder("json").name == "json"
+    with pytest.raises(ValueError):
+        make_line_decoder("xml")
+
+
+def test_collector_decodes_csv_by_default(collector):
+    import ser
+
+    assert ser.LINE_FORMAT == "csv" and collector.line_decoder.name == "csv"
+    _, valid = collector.line_decoder.decode([_json_row(1.0)], recv_timestamp_ms=0)
+    assert not valid.any()   # JSON Lines are opt-in through LINE_FORMAT
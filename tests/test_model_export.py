@@ -0,0 +1,159 @@
+import h5py
+import numpy as np
+import pytest
+
+import model_backends
+from model_backends import detect_backend, load_backend
+from model_export import FORMAT_TARGETS, parity, recorded_windows, run_batches
+from sliding_window import SENSOR_DATA_TO_MODEL
+
+WINDOW = 4
+
+
+class _Scaler:
+    def __init__(self, mean, scale):
+        self.mean_, self.scale_ = np.asarray(mean, dtype=float), np.asarray(scale, dtype=float)
+
+    def transform(self, x):
+        return (np.asarray(x) - self.mean_) / self.scale_
+
+
+SCALER = _Scaler(np.linspace(-5, 5, 8), np.linspace(1, 8, 8))
+
+
+@pytest.fixture
+def root(tmp_path):
+    # six episodes of 6, 3 (too short), 6, 6, 6, 6 samples; values encode (episode, row, column)
+    for k, length in enumerate([6, 3, 6, 6, 6, 6]):
+        path = tmp_path / "ㄱ" / "1" / f"episode_20251001_12000{k}_ㄱ_1.h5"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        rows = 100 * k + 10 * np.arange(length)[:, None] + np.arange(8)[None, :]
+        with h5py.File(path, 'w') as f:
+            f.create_dataset('sensor_data', data=rows.astype(np.float32))
+    return tmp_path
+
+
+def _naive(root_rows, scaler=None):
+    rows = root_rows[:, SENSOR_DATA_TO_MODEL].astype(np.float64)
+    if scaler is not None:
+        rows = scaler.transform(rows)
+    return np.stack([rows[i:i + WINDOW] for i in range(len(rows) - WINDOW + 1)]).astype(np.float32)
+
+
+def _episode_rows(k, length=6):
+    return 100 * k + 10 * np.arange(length)[:, None] + np.arange(8)[None, :]
+
+
+def test_recorded_windows_split_scale_and_limit(root):
+    held_out = recorded_windows(root, WINDOW, holdout=2)          # episodes 0, 2, 4
+    assert held_out.shape == (3 * 3, WINDOW, 8) and held_out.dtype == np.float32
+    np.testing.assert_array_equal(held_out, np.concatenate([_naive(_episode_rows(k)) for k in (0, 2, 4)]))
+
+    train = recorded_windows(root, WINDOW, holdout=2, held_out=False)   # 1 (too short), 3, 5
+    np.testing.assert_array_equal(train, np.concatenate([_naive(_episode_rows(k)) for k in (3, 5)]))
+
+    scaled = recorded_windows(root, WINDOW, SCALER, holdout=2)
+    np.testing.assert_allclose(scaled, np.concatenate([_naive(_episode_rows(k), SCALER) for k in (0, 2, 4)]),
+                               rtol=1e-6)
+
+    strided = recorded_windows(root, WINDOW, holdout=2, stride=2, limit=3)
+    np.testing.assert_array_equal(strided, np.concatenate([_naive(_episode_rows(k))[::2] for k in (0, 2)])[:3])
+    assert recorded_windows(root, 50).shape == (0, 50, 8)
+
+
+def test_parity_reports_max_difference_and_top1_agreement():
+    reference = np.array([[0.9, 0.1], [0.4, 0.6], [0.2, 0.8]])
+    candidate = np.array([[0.85, 0.15], [0.6, 0.4], [0.2, 0.8]])
+    diff, agree = parity(reference, candidate)
+    assert diff == pytest.approx(0.2) and agree == pytest.approx(2 / 3)
+    assert parity(np.zeros((0, 2)), np.zeros((0, 2))) == (0.0, 1.0)
+
+
+def test_run_batches_concatenates_in_order():
+    calls = []
+
+    def backend(batch):
+        calls.append(len(batch))
+        return batch[:, 0, :2] * 2
+
+    windows = np.arange(7 * WINDOW * 8, dtype=np.float32).reshape(7, WINDOW, 8)
+    out = run_batches(backend, windows, batch_size=3)
+    assert calls == [3, 3, 1]
+    np.testing.assert_array_equal(out, windows[:, 0, :2] * 2)
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("model.tflite", 'tflite'), ("exported/model_fp16.TFLITE", 'tflite'), ("model.onnx", 'onnx'),
+    ("model.h5", 'keras'), ("model.keras", 'keras'), ("saved_model_dir", 'keras'),
+])
+def test_load_backend_dispatches_on_suffix(monkeypatch, path, expected):
+    loaded = []
+    for name, cls in (('keras', 'KerasBackend'), ('tflite', 'TFLiteBackend'), ('onnx', 'OnnxBackend')):
+        monkeypatch.setattr(model_backends, cls, lambda p, *a, _name=name, **kw: loaded.append((_name, p)) or _name)
+    assert detect_backend(path) == expected
+    assert load_backend(path) == expected and loaded == [(expected, path)]
+    assert load_backend(path, backend='onnx') == 'onnx'   # an explicit backend wins over the suffix
+    with pytest.raises(ValueError, match="unknown backend"):
+        load_backend(path, backend='torch')
+
+
+def test_input_affine_scales_raw_batches():
+    class Identity(model_backends._InputAffine):
+        def __call__(self, batch):
+            return self._scale_input(batch)
+
+    backend = Identity()
+    raw = np.random.default_rng(0).normal(0, 50, (5, WINDOW, 8)).astype(np.float32)
+    assert backend(raw) is raw and backend.input_affine is None
+    backend.set_input_affine((SCALER.mean_, SCALER.scale_))
+    np.testing.assert_allclose(backend(raw), SCALER.transform(raw), rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(backend.input_affine[1], SCALER.scale_)
+    backend.set_input_affine(None)
+    assert backend(raw) is raw
+
+
+# ---- real exports (need TensorFlow, and tf2onnx + onnxruntime for ONNX) ----
+
+@pytest.fixture
+def keras_model():
+    tf = pytest.importorskip("tensorflow")
+    tf.keras.utils.set_random_seed(0)
+    return tf.keras.Sequential([
+        tf.keras.Input(shape=(WINDOW, 8)),
+        tf.keras.layers.Flatten(),
+        tf.keras.layers.Dense(16, activation='relu'),
+        tf.keras.layers.Dense(5, activation='softmax'),
+    ])
+
+
+@pytest.fixture
+def windows():
+    return np.random.default_rng(1).normal(0, 1, (64, WINDOW, 8)).astype(np.float32)
+
+
+def test_fuse_scaler_matches_the_model_on_scaled_windows(keras_model, windows):
+    from model_export import fuse_scaler
+
+    raw = windows * SCALER.scale_.astype(np.float32) + SCALER.mean_.astype(np.float32)
+    fused = fuse_scaler(keras_model, (SCALER.mean_, SCALER.scale_))
+    diff, agree = parity(keras_model.predict(windows, verbose=0), fused.predict(raw, verbose=0))
+    assert diff <= 1e-4 and agree == 1.0
+
+
+@pytest.mark.parametrize("fmt", ['tflite', 'tflite-fp16', 'tflite-int8', 'onnx'])
+def test_exported_formats_meet_their_parity_targets(keras_model, windows, tmp_path, fmt):
+    from model_export import export_onnx, export_tflite
+
+    name, max_diff, min_agree = FORMAT_TARGETS[fmt]
+    path = tmp_path / name
+    if fmt == 'onnx':
+        pytest.importorskip("tf2onnx")
+        pytest.importorskip("onnxruntime")
+        export_onnx(keras_model, path)
+    else:
+        quantize = {'tflite': 'none', 'tflite-fp16': 'float16', 'tflite-int8': 'int8'}[fmt]
+        export_tflite(keras_model, path, quantize, calibration=windows)
+    backend = load_backend(str(path))
+    assert backend.name == fmt.split('-')[0]
+    diff, agree = parity(keras_model.predict(windows, verbose=0), run_batches(backend, windows, batch_size=16))
+    assert diff <= max_diff and agree >= min_agree
@@ -0,0 +1,110 @@
+import sys
+import types
+
+import numpy as np
+import pytest
+
+import inference
+import model_backends
+from inference import SensorData, SignGloveInference
+from inference_schedule import InferenceSchedule
+
+WINDOW, CLASSES = 5, 4
+RNG = np.random.default_rng(3)
+WEIGHTS = RNG.normal(0, 1, (WINDOW * 8, CLASSES))
+
+
+class _LinearBackend(model_backends._InputAffine):
+    """softmax(flatten(window) @ WEIGHTS) on the (possibly backend-scaled) input; keeps what it was given."""
+
+    name = 'fake'
+    input_shape = (None, WINDOW, 8)
+    output_shape = (None, CLASSES)
+
+    def __init__(self):
+        self.inputs = []
+
+    def __call__(self, batch):
+        self.inputs.append(np.array(batch))
+        x = self._scale_input(batch).astype(np.float64).reshape(len(batch), -1)
+        logits = x @ WEIGHTS
+        e = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return (e / e.sum(axis=1, keepdims=True)).astype(np.float32)
+
+
+class _Scaler:
+    def __init__(self, mean, scale):
+        self.mean_, self.scale_ = np.asarray(mean, dtype=float), np.asarray(scale, dtype=float)
+
+    def transform(self, x):
+        return (np.asarray(x) - self.mean_) / self.scale_
+
+
+class _RankScaler:
+    """Not a per-feature affine map, so it cannot be fused."""
+
+    def transform(self, x):
+        return np.tanh(np.asarray(x, dtype=float) / 500.0)
+
+
+SCALER = _Scaler([0, 0, 0, 500, 480, 460, 440, 420], [90, 45, 45, 120, 110, 100, 90, 80])
+
+
+def _load(monkeypatch, scaler, fuse, schedule=None):
+    backend = _LinearBackend()
+    monkeypatch.setattr(inference, 'load_backend', lambda *args, **kwargs: backend)
+    # the scaler file is read with joblib.load; hand back the test scaler instead of unpickling one
+    monkeypatch.setitem(sys.modules, 'joblib', types.SimpleNamespace(load=lambda path: scaler))
+    model = SignGloveInference('model.tflite', scaler_path='scaler.pkl', window_size=WINDOW,
+                               fuse_scaler=fuse, schedule=schedule)
+    return model, backend
+
+
+def _samples(n, step=1.0):
+    """Random walk whose per-sample step is ``step`` standard deviations of SCALER."""
+    rows = SCALER.mean_ + np.cumsum(RNG.normal(0, step, (n, 8)), axis=0) * SCALER.scale_
+    return [SensorData(*row, timestamp=0.03 * k) for k, row in enumerate(rows)]
+
+
+def test_fused_and_unfused_scaler_give_the_same_predictions(monkeypatch):
+    samples = _samples(20)
+    plain, plain_backend = _load(monkeypatch, SCALER, fuse=False)
+    fused, fused_backend = _load(monkeypatch, SCALER, fuse=True)
+    assert not plain.scaler_fused and fused.scaler_fused
+
+    for sample in samples:
+        a, b = plain.predict_sequence(sample), fused.predict_sequence(sample)
+        assert (a is None) == (b is None)
+        if a is not None:
+            np.testing.assert_allclose(a['all_probabilities'], b['all_probabilities'], rtol=1e-5, atol=1e-6)
+            assert a['predicted_class_idx'] == b['predicted_class_idx']
+
+    # the fused window holds raw samples, the plain one scaled samples
+    np.testing.assert_allclose(fused_backend.inputs[-1][0, -1], samples[-1].to_array(), rtol=1e-6)
+    np.testing.assert_allclose(plain_backend.inputs[-1][0, -1], SCALER.transform(samples[-1].to_array()),
+                               rtol=1e-5, atol=1e-6)
+
+    windows = np.stack([[s.to_array() for s in samples[i:i + WINDOW]] for i in range(10)])
+    np.testing.assert_allclose(plain.predict_batch(windows), fused.predict_batch(windows), rtol=1e-5, atol=1e-6)
+
+
+def test_adaptive_schedule_fires_on_the_same_samples_when_fused(monkeypatch):
+    schedule = InferenceSchedule('adaptive', delta_threshold=0.8, max_hop=0)
+    samples = _samples(40, step=0.3)
+    plain, _ = _load(monkeypatch, SCALER, fuse=False, schedule=schedule)
+    fused, _ = _load(monkeypatch, SCALER, fuse=True, schedule=schedule)
+    np.testing.assert_allclose(fused.scheduler.delta_scale, SCALER.scale_)
+    fired_plain = [plain.predict_sequence(s) is not None for s in samples]
+    fired_fused = [fused.predict_sequence(s) is not None for s in samples]
+    assert fired_plain == fired_fused and 1 < sum(fired_plain) < len(samples) - WINDOW + 1
+
+
+def test_non_affine_scaler_is_not_fused(monkeypatch):
+    samples = _samples(8)
+    plain, _ = _load(monkeypatch, _RankScaler(), fuse=False)
+    fallback, backend = _load(monkeypatch, _RankScaler(), fuse=True)
+    assert not fallback.scaler_fused and backend.input_affine is None
+    for sample in samples:
+        a, b = plain.predict_sequence(sample), fallback.predict_sequence(sample)
+        if a is not None:
+            assert a['all_probabilities'] == pytest.approx(b['all_probabilities'])
@@ -0,0 +1,74 @@
+import h5py
+import numpy as np
+import pytest
+
+from episode_store import EpisodeStore
+from ksl_classes import KSL_CLASSES
+from sensor_corpus import SensorCorpus, export_corpus
+from sensor_records import EpisodeBuffer, SignGloveSensorReading
+from signglove_dataset import SignGloveDataset
+
+
+def _write_file(root, class_name, episode_type, samples, seed):
+    path = root / class_name / episode_type / f"episode_20251001_12000{seed}_{class_name}_{episode_type}.h5"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = np.random.default_rng(seed).normal(size=(samples, 8)).astype(np.float32)
+    with h5py.File(path, 'w') as f:
+        f.create_dataset('sensor_data', data=data)
+    return data
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    root = tmp_path / "unified"
+    expected = [
+        ("ㄱ", "1", _write_file(root, "ㄱ", "1", 5, 0)),
+        ("ㄱ", "2", _write_file(root, "ㄱ", "2", 0, 1)),   # empty episode keeps its slot
+        ("ㅏ", "1", _write_file(root, "ㅏ", "1", 7, 2)),
+    ]
+    store_data = EpisodeBuffer(3)
+    for i in range(3):
+        store_data.append(SignGloveSensorReading(i, i, 0.5 * i, 1.0, 2.0, 100 + i, 200, 300, 400, 500, 50.0))
+    with EpisodeStore(root / "store" / "session_20251001_130000.h5") as store:
+        store.append(store_data, "9", "4")
+    expected.append(("9", "4", store_data.sensor_data.astype(np.float32)))
+    return SignGloveDataset(root, batch_size=2, prefetch=0), expected
+
+
+def test_export_round_trips_every_episode(dataset, tmp_path):
+    dataset, expected = dataset
+    meta = export_corpus(dataset, tmp_path / "corpus")
+    assert meta['num_episodes'] == 4 and meta['num_samples'] == 5 + 0 + 7 + 3
+    assert not (tmp_path / "corpus.partial").exists()
+
+    corpus = SensorCorpus(tmp_path / "corpus")
+    assert len(corpus) == 4 and corpus.num_samples == 15
+    assert corpus.offsets.tolist() == [0, 5, 5, 12, 15]
+    assert corpus.classes == list(KSL_CLASSES)
+    assert isinstance(corpus.sensor_data, np.memmap) and corpus.sensor_data.dtype == np.float32
+    for i, (class_name, episode_type, data) in enumerate(expected):
+        sensor, label, ety = corpus.episode(i)
+        np.testing.assert_array_equal(sensor, data)
+        assert sensor.base is not None and not sensor.flags.writeable   # a view into the mapping
+        assert corpus.classes[label] == class_name and ety == episode_type
+    np.testing.assert_array_equal(corpus[-1], expected[-1][2])
+    assert corpus.select(class_name="ㄱ").tolist() == [0, 1]
+    assert corpus.select(episode_type=1).tolist() == [0, 2]
+    assert corpus.select(class_name="ㄱ", episode_type="2").tolist() == [1]
+
+
+def test_reexport_replaces_the_previous_corpus(dataset, tmp_path):
+    dataset, _ = dataset
+    export_corpus(dataset, tmp_path / "corpus")
+    (tmp_path / "corpus.partial").mkdir()   # leftover from an interrupted export
+    dataset.episodes = dataset.episodes[:1]
+    meta = export_corpus(dataset, tmp_path / "corpus")
+    assert meta['num_episodes'] == 1
+    assert len(SensorCorpus(tmp_path / "corpus")) == 1
+    assert not (tmp_path / "corpus.partial").exists()
+
+
+def test_rejects_a_directory_that_is_not_a_corpus(tmp_path):
+    (tmp_path / "corpus.json").write_text('{"format": "other"}', encoding='utf-8')
+    with pytest.raises(ValueError, match="not a sensor corpus"):
+        SensorCorpus(tmp_path)
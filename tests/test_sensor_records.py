@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from sensor_records import EpisodeBuffer, SignGloveSensorReading, parse_csv_lines, timestamp_hz
+
+ROW_12 = b"1000,1.25,-2.5,30.75,0.012,-0.034,0.981,510,520,530,540,550"
+ROW_9 = b"1000,1.25,-2.5,30.75,510,520,530,540,550"
+
+
+def test_parse_csv_lines_maps_12_field_rows():
+    records, valid = parse_csv_lines([ROW_12], recv_timestamp_ms=5)
+    assert valid.tolist() == [True]
+    r = records[0]
+    assert r['timestamp_ms'] == 1000 and r['recv_timestamp_ms'] == 5
+    assert (r['pitch'], r['roll'], r['yaw']) == (1.25, -2.5, 30.75)
+    assert (r['accel_x'], r['accel_y'], r['accel_z']) == (0.012, -0.034, 0.981)
+    assert [r[f'flex{i}'] for i in range(1, 6)] == [510, 520, 530, 540, 550]
+
+
+def test_parse_csv_lines_marks_bad_rows_invalid():
+    lines = [ROW_12, b"", b"# comment", b"timestamp,pitch", b"1,a,2,3,4,5,6,7,8,9,10,11", ROW_9, b"1030" + ROW_12[4:]]
+    records, valid = parse_csv_lines(lines, recv_timestamp_ms=0)
+    assert valid.tolist() == [True, False, False, False, False, False, True]
+    assert records['timestamp_ms'][valid].tolist() == [1000, 1030]
+    assert records['timestamp_ms'][~valid].tolist() == [0] * 5
+
+
+def test_parse_csv_lines_accepts_configured_layouts():
+    _, valid = parse_csv_lines([ROW_12, ROW_9], recv_timestamp_ms=0, layouts=(12, 9))
+    assert valid.all()
+
+
+def test_parse_csv_lines_fast_and_slow_paths_agree():
+    rows = [f"{1000 + 30 * i},{i}.5,0,0,0,0,1,1,2,3,4,5".encode() for i in range(40)]
+    records, valid = parse_csv_lines(rows, recv_timestamp_ms=0)
+    bad = rows[:20] + [b"x,1,2,3,4,5,6,7,8,9,10,11"] + rows[20:]
+    records_bad, valid_bad = parse_csv_lines(bad, recv_timestamp_ms=0)
+    assert valid.all() and valid_bad.sum() == 40
+    np.testing.assert_array_equal(records, records_bad[valid_bad])
+
+
+def test_sampling_hz_uses_previous_batch_timestamp():
+    rows = [b"1030" + ROW_12[4:], b"1050" + ROW_12[4:]]
+    records, _ = parse_csv_lines(rows, recv_timestamp_ms=0, last_arduino_ms=1000)
+    assert records['sampling_hz'].tolist() == pytest.approx([1000 / 30, 1000 / 20])
+    assert timestamp_hz(np.array([10, 20]))[0] == 0.0
+
+
+
+@pytest.mark.parametrize("rows", [1, 20])   # per-field float() and loadtxt paths
+def test_parse_csv_lines_rejects_non_integer_or_out_of_range_flex(rows):
+    bad = [ROW_12[:-3] + b"5.5", ROW_12[:-3] + b"32768", ROW_12[:-3] + b"-40000", ROW_12[:-3] + b"nan"]
+    lines = [ROW_12] * rows + bad + [ROW_12[:-3] + b"32767"]
+    records, valid = parse_csv_lines(lines, recv_timestamp_ms=0)
+    assert valid.tolist() == [True] * rows + [False] * 4 + [True]
+    assert records['flex5'][valid].tolist() == [550] * rows + [32767]
+
+
+def test_episode_buffer_grows_and_round_trips():
+    buf = EpisodeBuffer(capacity=2)
+    readings = [SignGloveSensorReading(i, 100 + i, 1.0, 2.0, 3.0, 1, 2, 3, 4, 5, 33.0, 0.1, 0.2, 0.3)
+                for i in range(5)]
+    for reading in readings:
+        buf.append(reading)
+    assert len(buf) == 5 and buf.capacity >= 5
+    assert list(buf) == readings
+    assert buf[-1] == readings[-1]
+    assert buf.sensor_data.shape == (5, 8)
+
+    again = EpisodeBuffer(capacity=1)
+    again.extend(buf.to_records())
+    assert list(again) == readings
@@ -0,0 +1,40 @@
+from episode_manifest import EpisodeRecord, count_drift, count_records
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"")
+
+
+def test_reset_all_progress_leaves_manifest_and_counts_in_agreement(collector, monkeypatch):
+    data_dir = collector.data_dir
+    for stem in ("episode_a_ㄱ_1", "episode_b_ㄱ_1"):
+        _touch(data_dir / "ㄱ" / "1" / f"{stem}.h5")
+        _touch(data_dir / "ㄱ" / "1" / f"{stem}.csv")
+    _touch(data_dir / "ㄴ" / "3" / "episode_c_ㄴ_3.csv")
+    _touch(data_dir / "old_capture.csv")
+    collector.manifest.rebuild(collector.scan_saved_episodes())
+    collector.load_collection_progress()
+    assert collector.collection_stats["ㄱ"]["1"] == 2
+
+    monkeypatch.setattr("builtins.input", lambda prompt="": "y")
+    collector.reset_all_progress()
+
+    assert not any(p.is_file() and p.suffix in (".h5", ".csv") for p in data_dir.rglob("*"))
+    disk_counts = count_records(collector.scan_saved_episodes())
+    assert count_drift(collector.manifest.counts(), disk_counts) == {}
+    assert sum(sum(v.values()) for v in collector.collection_stats.values()) == 0
+
+    collector.load_collection_progress()   # the next start must not bring old counts back
+    assert sum(sum(v.values()) for v in collector.collection_stats.values()) == 0
+
+
+def test_reset_keeps_counts_of_files_it_does_not_own(collector, monkeypatch):
+    # a class directory outside all_classes is not deleted and not counted either way
+    _touch(collector.data_dir / "custom" / "1" / "episode_x.h5")
+    collector.manifest.add_episode(EpisodeRecord("ㄱ", "1", "ㄱ/1/gone.h5"))
+    monkeypatch.setattr("builtins.input", lambda prompt="": "y")
+    collector.reset_all_progress()
+    assert (collector.data_dir / "custom" / "1" / "episode_x.h5").exists()
+    assert collector.manifest.counts() == {}
+    assert count_drift(collector.manifest.counts(), count_records(collector.scan_saved_episodes())) == {}
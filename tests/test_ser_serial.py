@@ -0,0 +1,91 @@
+import threading
+import time
+
+
+class _FakePort:
+    """In-memory serial port: the test appends bytes, the reception thread reads them."""
+
+    is_open = True
+
+    def __init__(self):
+        self._data = bytearray()
+        self._lock = threading.Lock()
+        self.flush_threads = []
+
+    def push(self, data: bytes):
+        with self._lock:
+            self._data += data
+
+    @property
+    def in_waiting(self):
+        with self._lock:
+            return len(self._data)
+
+    def read(self, n=1):
+        with self._lock:
+            chunk = bytes(self._data[:n])
+            del self._data[:n]
+            return chunk
+
+    def reset_input_buffer(self):
+        with self._lock:
+            self._data.clear()
+        self.flush_threads.append(threading.current_thread())
+
+    def close(self):
+        self.is_open = False
+
+
+def _row(ms: int) -> bytes:
+    return f"{ms},1.00,2.00,3.00,0.010,0.020,0.980,500,501,502,503,504\n".encode()
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+def _start(collector, mode):
+    port = _FakePort()
+    collector.serial_port = port
+    collector.reader_mode = mode
+    collector.start_data_reception()
+    return port
+
+
+def _check_resync_runs_on_reception_thread(collector, port):
+    resync_threads = []
+    original = collector.line_framer.resync
+    collector.line_framer.resync = lambda: (resync_threads.append(threading.current_thread()), original())[1]
+
+    port.push(_row(1000) + b"1030,1.00,2.0")   # partial line held in the framer
+    assert _wait_for(lambda: collector.line_framer.pending > 0)
+
+    collector.clear_buffer()
+    assert resync_threads == [collector.serial_thread]
+    assert port.flush_threads == [collector.serial_thread]
+    assert collector.data_queue.empty()
+
+    port.push(b"0,0.980,500,501,502,503,504\n" + _row(1090))   # tail of a line cut by the flush, then a full row
+    assert _wait_for(lambda: not collector.data_queue.empty())
+    assert collector.data_queue.get_nowait().timestamp_ms == 1090
+    assert collector.data_queue.empty()
+
+
+def test_clear_buffer_resyncs_on_the_poll_reader_thread(collector):
+    port = _start(collector, "poll")
+    _check_resync_runs_on_reception_thread(collector, port)
+
+
+def test_clear_buffer_resyncs_on_the_event_reader_thread(collector):
+    port = _start(collector, "event")   # no fileno(): the event reader falls back to read(1) + in_waiting
+    _check_resync_runs_on_reception_thread(collector, port)
+
+
+def test_clear_buffer_without_reader_thread_flushes_inline(collector):
+    port = _FakePort()
+    collector.serial_port = port
+    collector.clear_buffer()
+    assert port.flush_threads == [threading.current_thread()]
@@ -0,0 +1,87 @@
+from wifi_ingest import DatagramDecoder, encode_datagram
+
+
+def _row(arduino_ms: int, flex: int = 500) -> bytes:
+    return f"{arduino_ms},1.00,2.00,3.00,0.010,0.020,0.980,{flex},{flex},{flex},{flex},{flex}".encode()
+
+
+def _feed(collector, device: str, seq: int, send_ms: int, rows):
+    decoded = collector.udp_decoder.decode(encode_datagram(device, seq, send_ms, rows), ("127.0.0.1", 1))
+    if decoded is not None:
+        collector._handle_udp_lines(*decoded)
+
+
+def _drain(collector):
+    readings = []
+    while not collector.data_queue.empty():
+        readings.append(collector.data_queue.get_nowait())
+    return readings
+
+
+def test_late_datagrams_are_dropped_and_devices_keep_their_own_clock(collector):
+    collector.udp_decoder = DatagramDecoder(drop_late=True)
+    _feed(collector, "a", 0, 1000, [_row(1000), _row(1030)])
+    _feed(collector, "b", 0, 50_000, [_row(50_000)])
+    _feed(collector, "a", 2, 1120, [_row(1120), _row(1150)])
+    _feed(collector, "a", 1, 1060, [_row(1060), _row(1090)])   # late: already past seq 2
+    _feed(collector, "b", 1, 50_030, [_row(50_030)])
+
+    readings = _drain(collector)
+    a = [r for r in readings if r.timestamp_ms < 10_000]
+    b = [r for r in readings if r.timestamp_ms >= 10_000]
+    assert [r.timestamp_ms for r in a] == [1000, 1030, 1120, 1150]
+    assert [r.timestamp_ms for r in b] == [50_000, 50_030]
+    # sampling rate from each device's own previous row, never from the other device's clock
+    assert [round(r.sampling_hz, 1) for r in a[1:]] == [33.3, 11.1, 33.3]
+    assert round(b[1].sampling_hz, 1) == 33.3
+    assert collector.udp_decoder.stats()["a"]["late_dropped"] == 1
+
+
+def test_device_restart_resets_its_clock(collector):
+    collector.udp_decoder = DatagramDecoder(drop_late=True)
+    _feed(collector, "a", 0, 90_000, [_row(90_000)])
+    _feed(collector, "a", 1, 90_030, [_row(90_030)])
+    _feed(collector, "a", 0, 2_000, [_row(2_000), _row(2_030)])   # rebooted
+    readings = _drain(collector)
+    assert [r.timestamp_ms for r in readings] == [90_000, 90_030, 2_000, 2_030]
+    assert readings[2].sampling_hz == 0.0   # no backwards delta to the pre-restart row
+
+
+def test_episode_fed_only_by_udp_datagrams(collector, monkeypatch):
+    import csv
+    import socket
+    import time
+
+    import ser
+
+    monkeypatch.setattr(ser, "EPISODE_STORAGE", "files")
+    monkeypatch.setattr("builtins.input", lambda prompt="": "1")
+    collector.samples_per_episode = 10
+
+    collector.start_episode("ㄱ")
+    assert not collector.collecting   # no source yet
+
+    assert collector.connect_udp(port=0, host="127.0.0.1")
+    port = collector.udp_socket.getsockname()[1]
+    collector.start_episode("ㄱ")
+    assert collector.collecting
+
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        for seq in range(5):
+            t = 40_000 + seq * 60
+            sender.sendto(encode_datagram("glove", seq, t, [_row(t), _row(t + 30)]), ("127.0.0.1", port))
+        deadline = time.time() + 5
+        while collector.collecting and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        sender.close()
+    assert not collector.collecting   # stopped itself after samples_per_episode rows
+
+    collector.flush_episode_writer()
+    assert collector.manifest.counts() == {("ㄱ", "1"): 1}
+    assert collector.collection_stats["ㄱ"]["1"] == 1
+    [path] = (collector.data_dir / "ㄱ" / "1").glob("*.csv")
+    with open(path, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [int(r["timestamp_ms"]) for r in rows] == [30 * i for i in range(10)]
@@ -0,0 +1,80 @@
+import os
+import select
+import time
+
+import pytest
+
+serial = pytest.importorskip("serial")
+pty = pytest.importorskip("pty")
+
+import ser  # noqa: E402
+
+
+def _row(seq: int) -> bytes:
+    return f"{seq},1.00,2.00,3.00,0.010,0.020,0.980,500,510,520,530,540\n".encode()
+
+
+@pytest.fixture
+def pty_port():
+    master_fd, slave_fd = pty.openpty()
+    port = serial.Serial(os.ttyname(slave_fd), 115200, timeout=1)
+    yield master_fd, port
+    port.close()
+    os.close(master_fd)
+    os.close(slave_fd)
+
+
+def _collect(collector, n, timeout):
+    readings, deadline = [], time.perf_counter() + timeout
+    while len(readings) < n and time.perf_counter() < deadline:
+        try:
+            readings.append((collector.data_queue.get(timeout=0.05), time.perf_counter()))
+        except Exception:
+            continue
+    return readings
+
+
+def test_event_reader_blocks_in_select_and_delivers_bursts(collector, pty_port, monkeypatch):
+    master_fd, port = pty_port
+    selects = []
+    real_select = select.select
+    monkeypatch.setattr(ser.select, "select", lambda *a: (selects.append(a[0]), real_select(*a))[1])
+
+    collector.serial_port = port
+    collector.reader_mode = "event"
+    collector.start_data_reception()
+
+    time.sleep(0.5)   # idle: the reader waits in select() with a timeout, it does not spin
+    idle_selects = len(selects)
+    assert 1 <= idle_selects <= int(0.5 / ser.EVENT_READ_TIMEOUT) + 2
+    assert selects[0] == [port.fileno()]
+
+    sent_at = time.perf_counter()
+    os.write(master_fd, _row(1))   # first row after idle
+    [(first, first_t)] = _collect(collector, 1, timeout=1.0)
+    assert first.timestamp_ms == 1
+    assert first_t - sent_at < 0.1
+
+    sent_at = time.perf_counter()
+    os.write(master_fd, b"".join(_row(seq) for seq in range(2, 202)))   # burst
+    burst = _collect(collector, 200, timeout=2.0)
+    assert [r.timestamp_ms for r, _ in burst] == list(range(2, 202))
+    assert burst[-1][1] - sent_at < 0.5
+
+    stop_at = time.perf_counter()
+    collector.stop_event.set()
+    collector.serial_thread.join(timeout=2)
+    assert not collector.serial_thread.is_alive()
+    assert time.perf_counter() - stop_at < ser.EVENT_READ_TIMEOUT + 0.2
+
+
+def test_poll_reader_delivers_the_same_rows(collector, pty_port):
+    master_fd, port = pty_port
+    collector.serial_port = port
+    collector.reader_mode = "poll"
+    collector.start_data_reception()
+    os.write(master_fd, b"".join(_row(seq) for seq in range(1, 51)))
+    assert [r.timestamp_ms for r, _ in _collect(collector, 50, timeout=2.0)] == list(range(1, 51))
+    collector.stop_event.set()
+    collector.serial_thread.join(timeout=2)
+    assert not collector.serial_thread.is_alive()
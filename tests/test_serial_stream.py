@@ -0,0 +1,74 @@
+import random
+
+from serial_stream import LineFramer
+
+
+def test_feed_reassembles_lines_across_chunks():
+    framer = LineFramer()
+    assert framer.feed(b"1,2,") == []
+    assert framer.feed(b"3\n4,5") == [b"1,2,3"]
+    assert framer.pending == 3
+    assert framer.feed(b",6\r\n7\n") == [b"4,5,6\r", b"7"]
+    assert framer.pending == 0
+
+
+def test_random_chunking_recovers_every_line():
+    lines = [f"{i},{i * 2},{i * 3}".encode() for i in range(500)]
+    stream = b"".join(line + b"\n" for line in lines)
+    rng = random.Random(0)
+    framer = LineFramer()
+    out, pos = [], 0
+    while pos < len(stream):
+        step = rng.randint(1, 97)
+        out += framer.feed(stream[pos:pos + step])
+        pos += step
+    assert out == lines
+
+
+def test_resync_drops_truncated_fragment():
+    framer = LineFramer()
+    framer.feed(b"partial")
+    framer.resync()
+    assert framer.pending == 0
+    assert framer.feed(b"ail of old line\n1,2\n") == [b"1,2"]
+    assert framer.discarded_lines == 2
+
+
+def test_overlong_lines_are_discarded():
+    framer = LineFramer(max_line_length=16)
+    assert framer.feed(b"x" * 40) == []
+    assert framer.pending == 0
+    assert framer.feed(b"yyyy\nok\n") == [b"ok"]
+    assert framer.feed(b"z" * 20 + b"\nfine\n") == [b"fine"]
+    assert framer.discarded_lines == 2
+
+
+def test_finish_returns_unterminated_last_line():
+    framer = LineFramer()
+    assert framer.feed(b"a\nb") == [b"a"]
+    assert framer.finish() == [b"b"]
+    assert framer.finish() == []
+
+
+class _FakePort:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.reads = 0
+
+    @property
+    def in_waiting(self):
+        return len(self.data)
+
+    def read(self, n):
+        self.reads += 1
+        chunk, self.data = self.data[:n], self.data[n:]
+        return chunk
+
+
+def test_read_from_takes_waiting_bytes_in_one_read():
+    port = _FakePort(b"1\n2\n3\n")
+    framer = LineFramer()
+    assert framer.read_from(port) == [b"1", b"2", b"3"]
+    assert port.reads == 1
+    assert framer.read_from(port) == []
+    assert port.reads == 1
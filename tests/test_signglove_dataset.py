@@ -0,0 +1,126 @@
+import sqlite3
+
+import h5py
+import numpy as np
+import pytest
+
+from episode_manifest import EpisodeManifest, scan_dataset
+from episode_store import EpisodeStore
+from ksl_classes import KSL_CLASSES
+from sensor_records import EpisodeBuffer, SignGloveSensorReading
+from signglove_dataset import SignGloveDataset, _HandleCache
+
+
+def _write_file(root, class_name, episode_type, name, value, samples=3):
+    path = root / class_name / episode_type / f"episode_{name}_{class_name}_{episode_type}.h5"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with h5py.File(path, 'w') as f:
+        f.create_dataset('sensor_data', data=np.full((samples, 8), value, dtype=np.float32))
+    return path
+
+
+def _episode(value, samples=4):
+    data = EpisodeBuffer(samples)
+    for i in range(samples):
+        data.append(SignGloveSensorReading(i, i, value, value, value, *[int(value)] * 5, 50.0))
+    return data
+
+
+@pytest.fixture
+def root(tmp_path):
+    _write_file(tmp_path, "ㄴ", "1", "20251001_120000", 1.0)
+    _write_file(tmp_path, "ㄱ", "2", "20251001_120000", 2.0)
+    _write_file(tmp_path, "ㄱ", "1", "20251001_120000", 3.0)
+    _write_file(tmp_path, "unknown", "1", "20251001_120000", 9.0)
+    with EpisodeStore(tmp_path / "store" / "session_20251001_130000.h5") as store:
+        store.append(_episode(10.0), "0", "1")
+        store.append(_episode(11.0), "ㅏ", "5")
+        store.append(_episode(12.0), "9", "3")
+    return tmp_path
+
+
+def _values(dataset):
+    return [float(x[0, 0]) for batch, _, _ in dataset for x in batch]
+
+
+def test_tree_order_labels_and_types(root):
+    dataset = SignGloveDataset(root, batch_size=2, prefetch=0)
+    assert dataset.num_episodes == 6 and len(dataset) == 3
+    # per-episode files in path order, then each session store's rows in index order
+    assert _values(dataset) == [3.0, 2.0, 1.0, 10.0, 11.0, 12.0]
+    labels = np.concatenate([label for _, label, _ in dataset])
+    assert labels.tolist() == [KSL_CLASSES.index(c) for c in ["ㄱ", "ㄱ", "ㄴ", "0", "ㅏ", "9"]]
+    assert [t for _, _, types in dataset for t in types] == ["1", "2", "1", "1", "5", "3"]
+
+    filtered = SignGloveDataset(root, batch_size=4, prefetch=0, episode_types=[1], drop_last=True)
+    assert filtered.num_episodes == 3 and len(filtered) == 0 and _values(filtered) == []
+
+
+def test_shuffle_is_seeded_per_epoch(root):
+    a = SignGloveDataset(root, batch_size=4, shuffle=True, seed=7, prefetch=0)
+    b = SignGloveDataset(root, batch_size=4, shuffle=True, seed=7, prefetch=0)
+    first, second = _values(a), _values(a)
+    assert first == _values(b) and second == _values(b)
+    assert sorted(first) == sorted(second) == [1.0, 2.0, 3.0, 10.0, 11.0, 12.0]
+    assert first != second
+
+
+def test_prefetch_yields_the_same_batches(root):
+    inline = list(SignGloveDataset(root, batch_size=4, prefetch=0))
+    for prefetch in (1, 3):
+        prefetched = list(SignGloveDataset(root, batch_size=4, prefetch=prefetch))
+        assert len(prefetched) == len(inline)
+        for (x1, y1, t1), (x2, y2, t2) in zip(inline, prefetched):
+            assert all(np.array_equal(a, b) for a, b in zip(x1, x2))
+            assert y1.tolist() == y2.tolist() and t1 == t2
+
+
+def test_prefetch_reraises_reader_errors_and_stops_early(root):
+    (root / "ㄴ" / "1" / "episode_20251001_120000_ㄴ_1.h5").write_bytes(b"not hdf5")
+    with pytest.raises(OSError):
+        list(SignGloveDataset(root, batch_size=1, prefetch=2))
+
+    dataset = SignGloveDataset(root, batch_size=1, prefetch=1, episode_types=["2", "5", "3"])
+    for _ in dataset:
+        break   # abandoning the iterator must not leave the producer blocked
+
+
+def test_handle_cache_evicts_least_recently_used(root):
+    paths = sorted(root.glob("*/*/*.h5"))[:3]
+    cache = _HandleCache(maxsize=2)
+    a, b, c = (cache.get(p) for p in paths)
+    assert not a.id.valid and b.id.valid and c.id.valid and cache.opens == 3
+    assert cache.get(paths[1]) is b            # hit, b is now most recent
+    cache.get(paths[0])                         # evicts c
+    assert not c.id.valid and b.id.valid and cache.opens == 4
+    cache.close()
+    assert not b.id.valid
+
+
+def test_session_store_is_opened_once(root, monkeypatch):
+    opened = []
+    real_get = _HandleCache.get
+
+    def counting_get(self, path):
+        f = real_get(self, path)
+        opened.append(self.opens)
+        return f
+
+    monkeypatch.setattr(_HandleCache, "get", counting_get)
+    list(SignGloveDataset(root, batch_size=1, prefetch=0, max_open_files=1, episode_types=["3", "5"]))
+    assert opened == [1, 1]   # both store rows are served by one handle
+
+
+def test_manifest_enumeration_opens_read_only(root):
+    manifest_path = root / "manifest.sqlite"
+    EpisodeManifest(manifest_path).rebuild(scan_dataset(root, KSL_CLASSES, ["1", "2", "3", "4", "5"]))
+    before = {p.name: p.read_bytes() for p in root.glob("manifest.sqlite*") if p.suffix != ".sqlite-shm"}
+
+    dataset = SignGloveDataset(root, batch_size=8, prefetch=0, manifest=manifest_path)
+    assert sorted(_values(dataset)) == [1.0, 2.0, 3.0, 10.0, 11.0, 12.0]
+    # the database and its WAL are untouched (-shm only holds reader marks)
+    assert {p.name: p.read_bytes() for p in root.glob("manifest.sqlite*") if p.suffix != ".sqlite-shm"} == before
+
+    with pytest.raises(sqlite3.OperationalError):   # a missing manifest is an error, not a new empty database
+        SignGloveDataset(root, manifest=root / "missing.sqlite")
+    assert not (root / "missing.sqlite").exists()
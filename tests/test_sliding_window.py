@@ -0,0 +1,101 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from sliding_window import SENSOR_FIELDS, SlidingWindow, scaler_affine
+
+
+class _AffineScaler:
+    """Fitted-StandardScaler stand-in: ``(x - mean_) / scale_``."""
+
+    def __init__(self, mean, scale, with_mean=True, with_std=True):
+        self.mean_, self.scale_ = np.asarray(mean, dtype=float), np.asarray(scale, dtype=float)
+        self.with_mean, self.with_std = with_mean, with_std
+
+    def transform(self, x):
+        mean = self.mean_ if self.with_mean else 0.0
+        scale = self.scale_ if self.with_std else 1.0
+        return (np.asarray(x) - mean) / scale
+
+
+class _ClipScaler:
+    """A scaler that is not a per-feature affine map (only ``transform``)."""
+
+    def transform(self, x):
+        return np.clip(np.asarray(x, dtype=float), -1.0, 1.0)
+
+
+class _Sample:
+    def __init__(self, values):
+        for name, value in zip(SENSOR_FIELDS, values):
+            setattr(self, name, value)
+
+
+def _naive_window(history: deque, scaler):
+    window = np.array(history)
+    if scaler is not None:
+        window = scaler.transform(window)
+    return window.reshape(1, len(history), -1)
+
+
+RNG = np.random.default_rng(0)
+MEAN, SCALE = RNG.normal(0, 100, 8), RNG.uniform(0.5, 50, 8)
+
+
+@pytest.mark.parametrize("scaler", [None, _AffineScaler(MEAN, SCALE), _AffineScaler(MEAN, SCALE, with_mean=False),
+                                    _ClipScaler()], ids=["raw", "affine", "no-mean", "transform-only"])
+@pytest.mark.parametrize("window_size", [1, 3, 20])
+def test_matches_naive_deque_window_through_wraparound(scaler, window_size):
+    window = SlidingWindow(window_size, scaler=scaler, dtype=np.float64)
+    history = deque(maxlen=window_size)
+    samples = RNG.normal(0, 200, (3 * window_size + 2, 8))
+    for k, values in enumerate(samples):
+        if k % 2:
+            window.append(_Sample(values))
+        else:
+            window.append_array(values)
+        history.append(values)
+        assert len(window) == len(history)
+        np.testing.assert_allclose(window.latest(), _naive_window(history, scaler)[0, -1])
+        if len(history) < window_size:
+            assert not window.full
+            with pytest.raises(ValueError, match="not full"):
+                window.window()
+        else:
+            assert window.full
+            got = window.window()
+            assert got.shape == (1, window_size, 8) and got.flags.c_contiguous
+            np.testing.assert_allclose(got, _naive_window(history, scaler))
+
+
+def test_float32_window_and_clear():
+    window = SlidingWindow(4, scaler=_AffineScaler(MEAN, SCALE))
+    history = deque(maxlen=4)
+    for values in RNG.normal(0, 200, (9, 8)):
+        window.append_array(values)
+        history.append(values)
+    got = window.window()
+    assert got.dtype == np.float32
+    np.testing.assert_allclose(got, _naive_window(history, _AffineScaler(MEAN, SCALE)), rtol=1e-6)
+
+    window.clear()
+    assert len(window) == 0 and not window.full
+    for values in RNG.normal(0, 200, (4, 8)):
+        window.append_array(values)
+        history.append(values)
+    np.testing.assert_allclose(window.window(), _naive_window(history, _AffineScaler(MEAN, SCALE)), rtol=1e-6)
+
+
+def test_scaler_affine_only_for_per_feature_scalers():
+    mean, scale = scaler_affine(_AffineScaler(MEAN, SCALE, with_std=False), 8)
+    np.testing.assert_array_equal(mean, MEAN)
+    np.testing.assert_array_equal(scale, np.ones(8))
+    assert scaler_affine(_ClipScaler(), 8) is None
+    assert scaler_affine(_AffineScaler(MEAN[:3], SCALE[:3]), 8) is None
+    assert scaler_affine(None, 8) is None
+
+
+def test_rejects_empty_window():
+    with pytest.raises(ValueError):
+        SlidingWindow(0)
@@ -0,0 +1,68 @@
+import h5py
+import numpy as np
+import pytest
+
+from episode_store import EpisodeStore
+from sensor_records import EpisodeBuffer, SignGloveSensorReading
+from storage_profiles import STORAGE_PROFILES, get_profile
+
+
+def _episode(samples: int = 80) -> EpisodeBuffer:
+    rng = np.random.default_rng(0)
+    data = EpisodeBuffer(samples)
+    for i in range(samples):
+        pitch, roll, yaw = rng.normal(0, 30, 3)
+        flex = rng.integers(300, 900, 5)
+        data.append(SignGloveSensorReading(1000 + 20 * i, 5000 + 20 * i, pitch, roll, yaw, *map(int, flex),
+                                           50.0, *rng.normal(0, 1, 3)))
+    return data
+
+
+def _check_filters(dataset: h5py.Dataset, profile):
+    assert dataset.compression == profile.compression
+    if profile.compression == 'gzip':
+        assert dataset.compression_opts == profile.compression_opts
+    assert dataset.shuffle == profile.shuffle
+
+
+@pytest.mark.parametrize("name", list(STORAGE_PROFILES))
+def test_store_round_trips_under_every_profile(tmp_path, name):
+    profile = get_profile(name)
+    data = _episode()
+    with EpisodeStore(tmp_path / "session_test.h5", profile=profile) as store:
+        store.append(data, "ㄱ", "1")
+        store.append(data, "ㄴ", "2")
+        store.flush()
+
+    with EpisodeStore(tmp_path / "session_test.h5", mode='r') as store:
+        assert store.profile_name == name
+        assert store.file.attrs['storage_chunk_rows'] == profile.chunk_rows
+        sensor = store.file['sensor_data']
+        assert sensor.chunks == profile.appended_chunks((8,))
+        _check_filters(sensor, profile)
+        episode = store.read_episode(1)
+        np.testing.assert_array_equal(episode['timestamps'], data.timestamps)
+        np.testing.assert_array_equal(episode['sensor_data'], data.sensor_data.astype(np.float32))
+        np.testing.assert_array_equal(episode['acceleration'], data.accel.astype(np.float32))
+
+
+@pytest.mark.parametrize("name", ["none", "lzf", "shuffle-gzip4"])
+def test_episode_file_round_trips_under_profile(collector, monkeypatch, name):
+    import ser
+    from episode_writer import EpisodeJob
+
+    monkeypatch.setattr(ser, "STORAGE_PROFILE", name)
+    data = _episode()
+    path = collector.save_episode_data(EpisodeJob(data, "ㄱ", "1", 1.6, "20251001_120000"))
+    profile = get_profile(name)
+    with h5py.File(path, 'r') as f:
+        assert f.attrs['storage_profile'] == name
+        _check_filters(f['sensor_data'], profile)
+        np.testing.assert_array_equal(f['arduino_timestamps'][:], data.arduino_timestamps)
+        np.testing.assert_array_equal(f['sensor_data'][:], data.sensor_data.astype(np.float32))
+        np.testing.assert_array_equal(f['sensors/flex'][:], data.sensor_data[:, :5].astype(np.float32))
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError, match="unknown storage profile"):
+        get_profile("zstd")
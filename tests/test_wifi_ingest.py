@@ -0,0 +1,72 @@
+from wifi_ingest import DatagramDecoder, SequenceStats, encode_datagram
+
+
+def test_in_order_stream_has_no_loss():
+    stats = SequenceStats()
+    for seq in range(100):
+        assert stats.update(seq, arrival_ms=seq * 30.0, send_ms=seq * 30.0)
+    assert (stats.received, stats.lost, stats.reordered, stats.duplicates) == (100, 0, 0, 0)
+    assert stats.jitter_ms == 0.0
+
+
+def test_gap_counts_loss_and_late_arrival_takes_it_back():
+    stats = SequenceStats()
+    for seq in (0, 1, 4):
+        stats.update(seq, 0.0)
+    assert stats.lost == 2
+    stats.update(2, 0.0)
+    assert (stats.lost, stats.reordered) == (1, 1)
+    assert stats.loss_rate == 1 / 5
+
+
+def test_duplicates_are_dropped():
+    stats = SequenceStats()
+    assert stats.update(7, 0.0)
+    assert not stats.update(7, 0.0)
+    assert stats.duplicates == 1 and stats.received == 1
+
+
+def test_sequence_wraps_around_uint32():
+    stats = SequenceStats()
+    for seq in (2**32 - 2, 2**32 - 1, 0, 1):
+        stats.update(seq, 0.0)
+    assert (stats.lost, stats.restarts) == (0, 0)
+
+
+def test_datagram_decoder_splits_rows_per_device():
+    decoder = DatagramDecoder()
+    payload = encode_datagram("glove-a", 0, 100, [b"1,2,3", b"4,5,6"])
+    assert decoder.decode(payload, ("10.0.0.2", 5000), arrival_ms=0.0) == ("glove-a", [b"1,2,3", b"4,5,6"])
+    assert decoder.decode(payload, ("10.0.0.2", 5000), arrival_ms=1.0) is None
+    assert decoder.decode(b"7,8,9\n", ("10.0.0.3", 5000)) == ("10.0.0.3", [b"7,8,9"])
+    assert decoder.decode(b"#SG broken\n", ("10.0.0.2", 5000)) is None
+    assert decoder.bad_datagrams == 1
+    assert decoder.stats()["glove-a"]["duplicates"] == 1
+
+
+def test_restart_near_zero_is_not_taken_for_reordering():
+    stats = SequenceStats(window=1024)
+    for seq in range(10):
+        stats.update(seq, arrival_ms=60_000.0 + seq * 30, send_ms=60_000.0 + seq * 30)
+    # the device reboots: seq and its clock start over while highest (9) is still within the window
+    for seq in range(5):
+        assert stats.update(seq, arrival_ms=70_000.0 + seq * 30, send_ms=1_500.0 + seq * 30)
+    assert stats.restarts == 1
+    assert (stats.received, stats.lost, stats.reordered, stats.duplicates) == (15, 0, 0, 0)
+    assert not stats.update(4, arrival_ms=70_200.0, send_ms=1_620.0)  # a real duplicate after the restart
+    assert stats.duplicates == 1
+
+
+def test_far_backwards_seq_still_counts_as_restart_without_send_ms():
+    stats = SequenceStats(window=16)
+    for seq in range(100, 110):
+        stats.update(seq, 0.0)
+    assert stats.update(0, 0.0)
+    assert stats.restarts == 1 and stats.reordered == 0
+
+
+def test_late_datagram_with_slightly_older_clock_is_reordered():
+    stats = SequenceStats()
+    for seq, send in ((0, 10_000.0), (2, 10_060.0), (1, 10_030.0)):
+        stats.update(seq, arrival_ms=send, send_ms=send)
+    assert (stats.restarts, stats.reordered, stats.lost) == (0, 1, 0)
@@ -0,0 +1,449 @@
+"""
+Wi-Fi glove ingestion over persistent TCP connections or UDP datagrams.
+
+``csv_wifi.py`` used to accept one connection at a time, read it to EOF
+with ``buffer += chunk`` and store the whole connection as a single 7-field
+row, so a glove needed one TCP connection per sample. ``IngestServer`` is an
+asyncio server instead:
+
+- connections stay open; every glove streams newline-delimited CSV rows
+  (``CSV_LAYOUTS``: the 7-field Wi-Fi IMU row, or the 9/12-field serial
+  rows), optionally after a ``GLOVE <id>`` first line (default id: the peer
+  IP address);
+- each read returns whatever arrived (up to ``read_size`` bytes), a
+  :class:`~serial_stream.LineFramer` splits it into complete lines and the
+  batch is validated with ``sensor_records.parse_csv_lines`` in one call;
+- valid rows go to the glove's own :class:`GloveSink` (one CSV per glove,
+  header from the first row's layout), which buffers them and writes in one
+  call once ``flush_bytes`` are pending or ``flush_interval_s`` passed;
+- a connection that sends one unterminated row and closes (the old client)
+  still works: the partial line is taken at EOF.
+
+The parsed ``READING_DTYPE`` records of every batch can be handed to
+``on_records(glove_id, records)`` (e.g. live inference).
+
+UDP mode (``--udp``) avoids connection setup and head-of-line blocking on a
+flaky WLAN. A datagram carries several rows after a header line::
+
+    #SG <device_id> <seq> <send_ms>
+    <row>
+    <row>
+
+``seq`` counts datagrams per device (uint32, wrapping) and ``send_ms`` is
+the sender's clock. :class:`DatagramDecoder` keeps :class:`SequenceStats`
+per device: lost datagrams (sequence gaps), late/reordered ones (taken off
+the loss count and still ingested, unless the decoder was made with
+``drop_late``), duplicates (dropped), device restarts (``seq`` starting
+over, noticed from ``send_ms`` jumping back) and the RFC 3550 interarrival
+jitter. Datagrams without the header are taken as
+plain rows from the sender's IP. ``ser.py`` uses the same decoder, with
+``drop_late`` so episodes stay in time order, to feed UDP rows into the
+serial collector's pipeline (``UDP_PORT``).
+
+Run: python csv_wifi.py --port 5000 --out-dir .   (add --udp for datagrams)
+Benchmark: scripts/bench_wifi_ingest.py, scripts/replay_udp.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import re
+import socket
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from capture_log import BufferedLineWriter
+from sensor_records import CSV_LAYOUTS, parse_csv_lines
+from serial_stream import LineFramer
+
+logger = logging.getLogger(__name__)
+
+RecordsCallback = Callable[[str, np.ndarray], None]
+
+# CSV header per row layout (field count)
+CSV_HEADERS: Dict[int, str] = {
+    7: 'timestamp(ms),ax(g),ay(g),az(g),pitch(°),roll(°),yaw(°)',
+    9: 'timestamp,pitch,roll,yaw,flex1,flex2,flex3,flex4,flex5',
+    12: 'timestamp,pitch,roll,yaw,accel_x,accel_y,accel_z,flex1,flex2,flex3,flex4,flex5',
+}
+DEFAULT_LAYOUTS = (7, 9, 12)
+
+DATAGRAM_MAGIC = b"#SG "
+SEQ_MODULO = 1 << 32
+
+
+def encode_datagram(device_id: str, seq: int, send_ms: int, rows: Sequence[bytes]) -> bytes:
+    """One UDP payload: header line plus ``rows`` (without line endings)."""
+    header = DATAGRAM_MAGIC + f"{device_id} {seq % SEQ_MODULO} {send_ms}".encode('utf-8')
+    return b"\n".join([header, *rows]) + b"\n"
+
+
+def _seq_delta(a: int, b: int) -> int:
+    """``a - b`` on the wrapping uint32 sequence space."""
+    delta = (a - b) % SEQ_MODULO
+    return delta - SEQ_MODULO if delta >= SEQ_MODULO // 2 else delta
+
+
+class SequenceStats:
+    """Loss, reordering and jitter of one device's datagram stream."""
+
+    def __init__(self, window: int = 1024, restart_ms: float = 2000.0):
+        self.window = window                 # 늦게 온 데이터그램을 재정렬로 인정하는 범위
+        self.restart_ms = restart_ms         # send_ms가 이만큼 이상 뒤로 가면 장치 재시작으로 판단
+        self.highest: Optional[int] = None
+        self.first: Optional[int] = None     # 이보다 앞선 seq는 손실로 센 적이 없음
+        self.highest_send_ms: Optional[float] = None
+        self.late = False                    # 마지막으로 받아들인 seq가 highest보다 앞섰는지 (늦게 도착)
+        self._seen: Dict[int, None] = {}     # 최근 window개 seq (삽입 순서 유지)
+        self._transit: Optional[float] = None
+        self.received = 0
+        self.lost = 0
+        self.reordered = 0
+        self.duplicates = 0
+        self.late_dropped = 0                # drop_late 디코더가 버린 늦은 데이터그램
+        self.restarts = 0
+        self.jitter_ms = 0.0
+
+    def _restarted(self, delta: int, send_ms: Optional[float]) -> bool:
+        # seq가 처음부터 다시 시작: window보다 크게 뒤로 갔거나, 장치 시계(send_ms)가 크게 뒤로 감.
+        # 재시작 직후 seq는 이전 highest와 window 안에 있을 수 있으므로 중복/재정렬 판단보다 먼저 확인한다
+        if delta < -self.window:
+            return True
+        return (send_ms is not None and self.highest_send_ms is not None
+                and send_ms < self.highest_send_ms - self.restart_ms)
+
+    def update(self, seq: int, arrival_ms: float, send_ms: Optional[float] = None) -> bool:
+        """Account for datagram ``seq``; False if it is a duplicate and should be dropped.
+
+        After a True return :attr:`late` tells whether ``seq`` is older than the
+        highest sequence number accepted before it.
+        """
+        self.late = False
+        if self.highest is not None:
+            delta = _seq_delta(seq, self.highest)
+            if self._restarted(delta, send_ms):
+                self.restarts += 1
+                self._seen.clear()
+                self._transit = None
+                self.highest = self.first = seq
+                self.highest_send_ms = send_ms
+            elif seq in self._seen:
+                self.duplicates += 1
+                return False
+            elif delta < 0:
+                self.reordered += 1
+                self.late = True
+                if _seq_delta(seq, self.first) > 0:
+                    self.lost -= 1   # 간격으로 이미 손실에 포함됐던 것
+                else:
+                    self.first = seq
+            else:
+                self.lost += delta - 1
+                self.highest = seq
+                self.highest_send_ms = send_ms
+        else:
+            self.highest = self.first = seq
+            self.highest_send_ms = send_ms
+        self._seen[seq] = None
+        if len(self._seen) > self.window:
+            del self._seen[next(iter(self._seen))]
+        self.received += 1
+        if send_ms is not None:
+            transit = arrival_ms - send_ms
+            if self._transit is not None:
+                self.jitter_ms += (abs(transit - self._transit) - self.jitter_ms) / 16.0
+            self._transit = transit
+        return True
+
+    @property
+    def loss_rate(self) -> float:
+        expected = self.received + self.lost
+        return self.lost / expected if expected else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'received': self.received,
+            'lost': self.lost,
+            'loss_rate': self.loss_rate,
+            'reordered': self.reordered,
+            'duplicates': self.duplicates,
+            'late_dropped': self.late_dropped,
+            'restarts': self.restarts,
+            'jitter_ms': self.jitter_ms,
+        }
+
+
+class DatagramDecoder:
+    """Split datagrams into ``(device_id, lines)`` and keep per-device ``SequenceStats``.
+
+    With ``drop_late`` a datagram older than the device's highest accepted
+    seq is counted (``late_dropped``) but not returned, so every device's
+    rows come out in sequence order.
+    """
+
+    def __init__(self, window: int = 1024, drop_late: bool = False):
+        self.window = window
+        self.drop_late = drop_late
+        self.devices: Dict[str, SequenceStats] = {}
+        self.datagrams = 0
+        self.bad_datagrams = 0
+
+    def decode(self, data: bytes, addr, arrival_ms: Optional[float] = None) -> Optional[Tuple[str, List[bytes]]]:
+        """Lines of one datagram and the device that sent it; None for duplicates, bad headers and (``drop_late``) late datagrams."""
+        self.datagrams += 1
+        lines = data.split(b"\n")
+        if lines and not lines[-1]:
+            lines.pop()
+        if not data.startswith(DATAGRAM_MAGIC):
+            return (addr[0] if isinstance(addr, tuple) else str(addr)), lines
+        try:
+            device, seq, send_ms = lines[0][len(DATAGRAM_MAGIC):].split()
+            device_id = device.decode('utf-8')
+            seq, send = int(seq), float(send_ms)
+        except ValueError:
+            self.bad_datagrams += 1
+            return None
+        stats = self.devices.get(device_id)
+        if stats is None:
+            stats = self.devices[device_id] = SequenceStats(self.window)
+        if arrival_ms is None:
+            arrival_ms = time.monotonic() * 1000.0
+        if not stats.update(seq, arrival_ms, send):
+            return None
+        if self.drop_late and stats.late:
+            stats.late_dropped += 1
+            return None
+        return device_id, lines[1:]
+
+    def stats(self) -> Dict[str, Dict]:
+        return {device: stats.to_dict() for device, stats in self.devices.items()}
+
+
+class GloveSink(BufferedLineWriter):
+    """One glove's CSV file, written in batches."""
+
+    def __init__(self, path: Path, width: int, flush_bytes: int = 1 << 16, flush_interval_s: float = 0.25):
+        super().__init__(path, CSV_HEADERS.get(width, ','.join(CSV_LAYOUTS[width])), flush_bytes, flush_interval_s)
+        self.width = width
+        self.last_arduino_ms: Optional[int] = None
+
+    @property
+    def rows(self) -> int:
+        return self.lines
+
+    def write_rows(self, rows: Sequence[bytes]):
+        self.write_lines(rows)
+
+
+class _UdpProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server: "IngestServer"):
+        self.server = server
+
+    def datagram_received(self, data: bytes, addr):
+        self.server.ingest_datagram(data, addr)
+
+
+class IngestServer:
+    """asyncio front end: any number of persistent glove connections (or UDP devices), one sink per glove."""
+
+    def __init__(self, out_dir: Path = Path('.'), layouts: Sequence[int] = DEFAULT_LAYOUTS,
+                 flush_bytes: int = 1 << 16, flush_interval_s: float = 0.25, read_size: int = 1 << 16,
+                 on_records: Optional[RecordsCallback] = None):
+        """
+        Args:
+            out_dir: directory of the per-glove ``imu_wifi_<glove>_<start time>.csv`` files.
+            layouts: accepted row field counts (keys of ``CSV_LAYOUTS``).
+            flush_bytes: write a glove's buffered rows once this many bytes are pending.
+            flush_interval_s: and at least this often.
+            read_size: maximum bytes taken from a connection per read.
+            on_records: called with ``(glove_id, records)`` for every parsed batch.
+        """
+        self.out_dir = Path(out_dir)
+        self.layouts = tuple(layouts)
+        self.flush_bytes = flush_bytes
+        self.flush_interval_s = flush_interval_s
+        self.read_size = read_size
+        self.on_records = on_records
+        self.started = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.sinks: Dict[str, GloveSink] = {}
+        self.datagrams = DatagramDecoder()
+        self._flusher: Optional[asyncio.Task] = None
+        self._udp: Optional[asyncio.DatagramTransport] = None
+        self.connections = 0
+        self.active = 0
+        self.rows = 0
+        self.bad_rows = 0
+
+    def sink_path(self, glove_id: str) -> Path:
+        safe = re.sub(r'[^0-9A-Za-z_.-]+', '_', glove_id) or 'glove'
+        return self.out_dir / f"imu_wifi_{safe}_{self.started}.csv"
+
+    def ingest(self, glove_id: str, lines: List[bytes]):
+        """Validate one batch of lines from ``glove_id`` and queue the valid rows on its sink."""
+        if not lines:
+            return
+        sink = self.sinks.get(glove_id)
+        records, valid = parse_csv_lines(lines, last_arduino_ms=sink.last_arduino_ms if sink else None,
+                                         layouts=(sink.width,) if sink else self.layouts)
+        idx = np.flatnonzero(valid)
+        if len(idx) and sink is None:
+            # 첫 유효 행의 형식으로 파일을 열고, 같은 배치의 다른 형식 행은 버림
+            width = lines[idx[0]].count(b',') + 1
+            sink = self.sinks[glove_id] = GloveSink(self.sink_path(glove_id), width, self.flush_bytes,
+                                                    self.flush_interval_s)
+            logger.info(f"glove {glove_id}: {width}-field rows → {sink.path}")
+            idx = np.array([i for i in idx if lines[i].count(b',') + 1 == width], dtype=np.int64)
+        self.bad_rows += len(lines) - len(idx)
+        if not len(idx):
+            return
+        self.rows += len(idx)
+        if len(idx) == len(lines):
+            sink.write_rows([line.strip() for line in lines])
+        else:
+            sink.write_rows([lines[i].strip() for i in idx])
+            records = records[idx]
+        sink.last_arduino_ms = int(records['timestamp_ms'][-1])
+        if self.on_records is not None:
+            self.on_records(glove_id, records)
+
+    def ingest_datagram(self, data: bytes, addr, arrival_ms: Optional[float] = None):
+        decoded = self.datagrams.decode(data, addr, arrival_ms)
+        if decoded is not None:
+            self.ingest(*decoded)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = writer.get_extra_info('peername')
+        glove_id = peer[0] if isinstance(peer, tuple) else 'local'
+        framer = LineFramer()
+        first = True
+        self.connections += 1
+        self.active += 1
+        try:
+            while True:
+                chunk = await reader.read(self.read_size)
+                lines = framer.feed(chunk) if chunk else framer.finish()
+                if first and lines:
+                    first = False
+                    if lines[0].startswith(b"GLOVE "):
+                        glove_id = lines[0][6:].strip().decode('utf-8', 'replace') or glove_id
+                        lines = lines[1:]
+                self.ingest(glove_id, lines)
+                if not chunk:
+                    break
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            self.active -= 1
+            self.bad_rows += framer.discarded_lines
+            writer.close()
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval_s)
+            now = time.monotonic()
+            for sink in self.sinks.values():
+                sink.poll(now)
+
+    def flush(self):
+        for sink in self.sinks.values():
+            sink.flush()
+
+    def _start_flusher(self):
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_periodically(), name="wifi-ingest-flush")
+
+    async def start(self, host: str = "0.0.0.0", port: int = 5000) -> asyncio.base_events.Server:
+        self._start_flusher()
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def start_udp(self, host: str = "0.0.0.0", port: int = 5000,
+                        recv_buffer: int = 1 << 21) -> asyncio.DatagramTransport:
+        """Receive datagrams on ``host:port``; the socket receive buffer is raised to ``recv_buffer`` bytes."""
+        self._start_flusher()
+        loop = asyncio.get_running_loop()
+        self._udp, _ = await loop.create_datagram_endpoint(lambda: _UdpProtocol(self), local_addr=(host, port))
+        try:
+            self._udp.get_extra_info('socket').setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, recv_buffer)
+        except OSError:
+            pass
+        return self._udp
+
+    async def close(self):
+        if self._udp is not None:
+            self._udp.close()
+            self._udp = None
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        for sink in self.sinks.values():
+            sink.close()
+
+    def stats(self) -> Dict:
+        return {
+            'connections': self.connections,
+            'active': self.active,
+            'gloves': len(self.sinks),
+            'rows': self.rows,
+            'bad_rows': self.bad_rows,
+            'flushes': sum(sink.flushes for sink in self.sinks.values()),
+            'datagrams': self.datagrams.datagrams,
+            'bad_datagrams': self.datagrams.bad_datagrams,
+        }
+
+
+async def _serve(args):
+    server = IngestServer(args.out_dir, flush_bytes=args.flush_kib * 1024, flush_interval_s=args.flush_ms / 1000.0)
+    if args.udp:
+        await server.start_udp(args.host, args.port)
+        listener = None
+    else:
+        listener = await server.start(args.host, args.port)
+    print(f"[+] Server listening on {'UDP' if args.udp else 'TCP'} port {args.port}...")
+    last_rows, last = 0, time.monotonic()
+    try:
+        while True:
+            await asyncio.sleep(args.stats_interval)
+            now, stats = time.monotonic(), server.stats()
+            logger.info(f"gloves {stats['gloves']} (connections {stats['active']}), rows {stats['rows']} "
+                        f"({(stats['rows'] - last_rows) / (now - last):.0f}/s), bad {stats['bad_rows']}")
+            for device, seq in server.datagrams.stats().items():
+                logger.info(f"  {device}: {seq['received']} datagrams, lost {seq['lost']} "
+                            f"({seq['loss_rate'] * 100:.2f}%), reordered {seq['reordered']}, "
+                            f"duplicates {seq['duplicates']}, jitter {seq['jitter_ms']:.1f} ms")
+            last_rows, last = stats['rows'], now
+    finally:
+        if listener is not None:
+            listener.close()
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect CSV rows from Wi-Fi gloves over persistent TCP connections.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--udp", action="store_true", help="Receive sequence-numbered UDP datagrams instead of TCP.")
+    parser.add_argument("--out-dir", type=Path, default=Path('.'))
+    parser.add_argument("--flush-kib", type=int, default=64)
+    parser.add_argument("--flush-ms", type=float, default=250.0)
+    parser.add_argument("--stats-interval", type=float, default=10.0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()